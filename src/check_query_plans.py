@@ -0,0 +1,184 @@
+"""
+주요 조회 쿼리의 실행 계획(EXPLAIN) 확인. 큰 테이블을 전체 스캔(type=ALL)하는 쿼리가 있으면 실패(종료 코드 1).
+
+옵티마이저는 행이 적은 테이블에서 인덱스 대신 전체 스캔을 고르기도 하므로,
+TABLE_ROWS가 --min-rows보다 적은 테이블은 검사하지 않는다 (event_types, users 같은 작은 참조 테이블 포함).
+
+EXPLAIN의 table 열은 별칭(el, e, h 등, 뷰는 뷰 정의 안의 별칭)이므로 쿼리마다 별칭 → 실제 테이블 표를 둔다.
+검사가 실제로 동작하는지 확인하도록 전체 스캔이 나와야 하는 대조 쿼리(CONTROL_QUERIES)도 함께 실행하며,
+대조 쿼리가 걸리지 않으면 실패로 본다.
+
+실행 (src 폴더에서, schema_migrations.py 적용 후):
+    python check_query_plans.py --target client
+    python check_query_plans.py --target server --min-rows 0   # 데이터가 적어도 모두 검사
+"""
+
+import argparse
+import sys
+from datetime import datetime, timedelta
+
+from env_config import get_db_config
+from schema_migrations import MIGRATIONS, TARGET_DIRS, _connect
+
+_now = datetime.now()
+_week_ago = _now - timedelta(days=7)
+
+# v_event_details 정의(admin_ui/database_schema.sql) 안의 별칭
+VIEW_ALIASES = {"el": "event_logs", "et": "event_types", "u": "users"}
+SERVER_ALIASES = {"e": "emergency_events", "u": "users"}
+
+# (이름, 쿼리, 파라미터, 별칭 → 테이블)
+KEY_QUERIES = {
+    "client": [
+        ("EventLog.search 사용자+기간",
+         "SELECT * FROM v_event_details WHERE user_id = %s AND occurred_at >= %s AND occurred_at <= %s "
+         "ORDER BY occurred_at DESC LIMIT 100",
+         (1, _week_ago, _now), VIEW_ALIASES),
+        ("EventLog.search 타입+기간",
+         "SELECT * FROM v_event_details WHERE event_type = %s AND occurred_at >= %s AND occurred_at <= %s "
+         "ORDER BY occurred_at DESC LIMIT 100",
+         ("낙상", _week_ago, _now), VIEW_ALIASES),
+        ("EventLog.search_page 다음 페이지 (키셋)",
+         "SELECT * FROM v_event_details WHERE user_id = %s AND occurred_at >= %s AND occurred_at <= %s "
+         "AND (occurred_at < %s OR (occurred_at = %s AND event_id < %s)) "
+         "ORDER BY occurred_at DESC, event_id DESC LIMIT 201",
+         (1, _week_ago, _now, _now, _now, 1000), VIEW_ALIASES),
+        ("EventLog.aggregate 사용자+기간+신뢰도",
+         "SELECT event_type, event_status, COUNT(*) AS count FROM v_event_details "
+         "WHERE user_id = %s AND occurred_at >= %s AND occurred_at <= %s AND confidence >= %s "
+         "GROUP BY event_type, event_status",
+         (1, _week_ago, _now, 0.5), VIEW_ALIASES),
+        ("EventLog.get_recent 전체",
+         "SELECT * FROM v_event_details ORDER BY occurred_at DESC LIMIT 10",
+         None, VIEW_ALIASES),
+        ("EventLog.get_recent 사용자",
+         "SELECT * FROM v_event_details WHERE user_id = %s ORDER BY occurred_at DESC LIMIT 10",
+         (1,), VIEW_ALIASES),
+        ("EventLog.get_statistics",
+         "SELECT et.type_name, COUNT(*) AS count, AVG(el.duration_seconds) AS avg_duration "
+         "FROM event_logs el JOIN event_types et ON el.event_type_id = et.event_type_id "
+         "WHERE el.occurred_at >= %s GROUP BY et.type_name",
+         (_week_ago,), {"el": "event_logs", "et": "event_types"}),
+        ("EventLog.get_recent_fall_event",
+         "SELECT el.*, et.type_name FROM event_logs el JOIN event_types et ON el.event_type_id = et.event_type_id "
+         "WHERE et.type_name IN ('낙상중', '낙상') ORDER BY el.occurred_at DESC LIMIT 1",
+         None, {"el": "event_logs", "et": "event_types"}),
+        ("대시보드 집계 (최근 30일)",
+         "SELECT h.event_type_id, SUM(h.event_count) FROM event_rollup_hourly h "
+         "WHERE h.hour_start >= %s GROUP BY h.event_type_id",
+         (_now - timedelta(days=30),), {"h": "event_rollup_hourly"}),
+    ],
+    "server": [
+        ("EventManageWindow 전체 최근순",
+         "SELECT e.event_id, e.user_id, e.received_at, u.name FROM emergency_events e "
+         "LEFT JOIN users u ON e.user_id = u.user_id ORDER BY e.received_at DESC, e.event_id DESC LIMIT 201",
+         None, SERVER_ALIASES),
+        ("EventManageWindow 다음 페이지 (키셋)",
+         "SELECT e.event_id, e.user_id, e.received_at, u.name FROM emergency_events e "
+         "LEFT JOIN users u ON e.user_id = u.user_id "
+         "WHERE (e.received_at < %s OR (e.received_at = %s AND e.event_id < %s)) "
+         "ORDER BY e.received_at DESC, e.event_id DESC LIMIT 201",
+         (_now, _now, 1000), SERVER_ALIASES),
+        ("EventManageWindow user_id 앞부분",
+         "SELECT e.event_id, e.user_id, e.received_at, u.name FROM emergency_events e "
+         "LEFT JOIN users u ON e.user_id = u.user_id WHERE e.user_id LIKE %s "
+         "ORDER BY e.received_at DESC, e.event_id DESC LIMIT 201",
+         ("user%",), SERVER_ALIASES),
+        ("EventManageWindow 타입",
+         "SELECT e.event_id, e.user_id, e.received_at FROM emergency_events e "
+         "WHERE e.event_type = %s ORDER BY e.received_at DESC, e.event_id DESC LIMIT 201",
+         ("ALERT",), SERVER_ALIASES),
+    ],
+}
+
+# 대조 쿼리: 인덱스 없는 열 조건이라 반드시 전체 스캔 → 검사가 이를 잡지 못하면 검사 자체가 고장난 것
+CONTROL_QUERIES = {
+    "client": [
+        ("대조: event_logs notes 검색 (전체 스캔)",
+         "SELECT el.event_id FROM event_logs el WHERE el.notes LIKE %s",
+         ("%확인%",), {"el": "event_logs"}),
+    ],
+    "server": [
+        ("대조: emergency_events message 검색 (전체 스캔)",
+         "SELECT e.event_id FROM emergency_events e WHERE e.message LIKE %s",
+         ("%쓰러짐%",), SERVER_ALIASES),
+    ],
+}
+
+
+def _table_rows(cur) -> dict:
+    cur.execute("SELECT TABLE_NAME, TABLE_ROWS FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE()")
+    return {row["TABLE_NAME"]: row["TABLE_ROWS"] or 0 for row in cur.fetchall()}
+
+
+def full_scans(plan: list[dict], aliases: dict, watched: set, rows_by_table: dict, min_rows: int) -> list[str]:
+    """EXPLAIN 행 중 검사 대상 큰 테이블의 전체 스캔(type=ALL) 설명 목록. table 열의 별칭은 aliases로 실제 이름으로 바꾼다."""
+    problems = []
+    for row in plan:
+        alias = row.get("table") or ""
+        table = aliases.get(alias, alias)
+        if row.get("type") != "ALL" or table not in watched:
+            continue
+        if rows_by_table.get(table, 0) < min_rows:
+            continue
+        problems.append(f"{table}({alias}) 전체 스캔 (rows≈{row.get('rows')})")
+    return problems
+
+
+def check_plans(config: dict, target: str, min_rows: int = 1000) -> tuple[bool, list[str]]:
+    """KEY_QUERIES를 EXPLAIN. 전체 스캔이 없고 대조 쿼리의 전체 스캔은 잡히면 (True, 로그)."""
+    # 검사 대상 = 마이그레이션에서 인덱스를 관리하는 큰 테이블 (+ 대시보드 집계 테이블)
+    watched = {step[1] for _v, _n, steps in MIGRATIONS[target] for step in steps if step[0] == "index"}
+    if target == "client":
+        watched.add("event_rollup_hourly")
+    ok = True
+    log = []
+    conn = _connect(config)
+    try:
+        with conn.cursor() as cur:
+            rows_by_table = _table_rows(cur)
+            checks = [(q, False) for q in KEY_QUERIES[target]] + [(q, True) for q in CONTROL_QUERIES[target]]
+            for (name, query, params, aliases), expect_scan in checks:
+                try:
+                    cur.execute("EXPLAIN " + query, params)
+                    plan = cur.fetchall()
+                except Exception as exc:
+                    ok = False
+                    log.append(f"[FAIL] {name}: EXPLAIN 실패 ({exc})")
+                    continue
+                problems = full_scans(plan, aliases, watched, rows_by_table, min_rows)
+                keys = ", ".join(f"{r.get('table')}:{r.get('key') or '-'}" for r in plan)
+                if expect_scan:
+                    tables = set(aliases.values()) & watched
+                    if all(rows_by_table.get(t, 0) < min_rows for t in tables):
+                        log.append(f"[SKIP] {name}: 행 수가 --min-rows보다 적음")
+                    elif problems:
+                        log.append(f"[ OK ] {name}: 전체 스캔 감지됨 | {keys}")
+                    else:
+                        ok = False
+                        log.append(f"[FAIL] {name}: 전체 스캔을 감지하지 못함 (별칭 표 확인) | {keys}")
+                elif problems:
+                    ok = False
+                    log.append(f"[FAIL] {name}: {'; '.join(problems)} | {keys}")
+                else:
+                    log.append(f"[ OK ] {name}: {keys}")
+    finally:
+        conn.close()
+    return ok, log
+
+
+def main():
+    parser = argparse.ArgumentParser(description="주요 쿼리 EXPLAIN 검사 (전체 스캔 시 실패)")
+    parser.add_argument("--target", choices=sorted(KEY_QUERIES), required=True)
+    parser.add_argument("--min-rows", type=int, default=1000, help="이보다 행이 적은 테이블은 검사하지 않음")
+    args = parser.parse_args()
+
+    ok, log = check_plans(get_db_config(base_dir=TARGET_DIRS[args.target]), args.target, args.min_rows)
+    for line in log:
+        print(line)
+    print("[QueryPlan] 통과" if ok else "[QueryPlan] 전체 스캔 쿼리가 있습니다.")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,12 @@
 # Admin UI (gui_ver4 기준) - 관리자 탭 임베드용
-from .admin_ui_widget import AdminUiWidget
+# AdminUiWidget은 처음 사용할 때 import (PyQt6/DB 모듈을 끌어오므로,
+# 포즈 워커처럼 admin_ui 하위 모듈만 쓰는 spawn 프로세스에서는 로드하지 않음)
 
 __all__ = ["AdminUiWidget"]
+
+
+def __getattr__(name):
+    if name == "AdminUiWidget":
+        from .admin_ui_widget import AdminUiWidget
+        return AdminUiWidget
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -11,6 +11,11 @@ from collections import deque
 import json
 from pathlib import Path
 
+try:
+    from .window_stats import SlidingWindowStats
+except ImportError:  # 독립 실행 테스트 (python accuracy_monitor.py)
+    from window_stats import SlidingWindowStats
+
 
 class AccuracyMonitor:
     """실시간 정확도 측정 및 기록"""
@@ -33,6 +38,9 @@ class AccuracyMonitor:
         # 현재 세션 데이터
         self.current_ground_truth = None  # 사용자가 지정한 실제 상태
         self.predictions_buffer = deque(maxlen=30)  # 최근 30개 예측
+        # 최근 5분 정확도 / 평균 신뢰도 (누적 합 기반, 조회 시 버퍼를 다시 더하지 않음)
+        self.recent_accuracy = SlidingWindowStats(300, bucket_seconds=1.0)
+        self.recent_confidence = SlidingWindowStats(300, bucket_seconds=1.0)
         
         # 통계
         self.total_samples = 0
@@ -95,6 +103,11 @@ class AccuracyMonitor:
             self.correct_predictions += 1
             self.current_minute_data['correct'] += 1
         
+        now = time.time()
+        self.recent_accuracy.add(1.0 if self.current_ground_truth == predicted_state else 0.0,
+                                 label=predicted_state, now=now)
+        self.recent_confidence.add(confidence, label=predicted_state, now=now)
+        
         # 버퍼에 추가
         self.predictions_buffer.append({
             'timestamp': time.time(),
@@ -161,6 +174,10 @@ class AccuracyMonitor:
             return 0.0
         return round(self.correct_predictions / self.total_samples * 100, 2)
     
+    def get_recent_accuracy(self):
+        """최근 5분 정확도"""
+        return round(self.recent_accuracy.mean() * 100, 2)
+    
     def get_class_accuracy(self, class_name):
         """클래스별 정확도"""
         total = sum(self.confusion_matrix[class_name].values())
@@ -181,6 +198,9 @@ class AccuracyMonitor:
                 'Fallen': self.get_class_accuracy('Fallen')
             },
             'confusion_matrix': self.confusion_matrix,
+            'recent_accuracy': self.get_recent_accuracy(),
+            'recent_mean_confidence': self.recent_confidence.mean(),
+            'recent_class_counts': self.recent_accuracy.label_counts(),
             'elapsed_time': time.time() - self.start_time
         }
     
@@ -121,7 +121,7 @@ class AdminUiWidget(QWidget):
         from .users_page import UsersPage
         from .settings_page import SettingsPage
         from .training_page import TrainingPage
-        from .model_selection_dialog import get_model_config_from_env
+        from .model_config import get_model_config_from_env
 
         # 0: 대시보드, 1: 모니터링
         self.page_stack.addWidget(DashboardPage(self.user_info, self.db))
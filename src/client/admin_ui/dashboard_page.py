@@ -10,9 +10,12 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
 from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QFont, QColor
 from PyQt6.QtCharts import QChart, QChartView, QPieSeries, QBarSeries, QBarSet, QBarCategoryAxis, QValueAxis
-from .database_models import DatabaseManager, EventLog
+from .database_models import DatabaseManager, EventLog, EventRollup
 from datetime import datetime, timedelta
 
+# 낙상/쓰러짐 카드에 합산하는 이벤트 타입
+FALL_TYPE_NAMES = ('낙상', '쓰러짐')
+
 
 class DashboardPage(QWidget):
     """대시보드 페이지"""
@@ -22,12 +25,16 @@ class DashboardPage(QWidget):
         self.user_info = user_info
         self.db = db
         self.event_model = EventLog(db)
+        self.rollup = EventRollup(db)
         self.init_ui()
         
-        # 자동 업데이트 타이머
+        # 마지막으로 화면에 반영한 데이터 기준 (최대 event_id, 집계 버전, 수정 횟수, 시간 구간)
+        self._last_mark = None
+        
+        # 자동 업데이트 타이머: 5초마다 변경 여부만 확인하고, 바뀐 경우에만 다시 조회/그리기
+        # 페이지가 보일 때만 동작 (showEvent/hideEvent, 관리자 UI가 모든 클라이언트에 포함되므로 유휴 CPU 절약)
         self.update_timer = QTimer()
-        self.update_timer.timeout.connect(self.update_dashboard)
-        self.update_timer.start(5000)  # 5초마다 업데이트
+        self.update_timer.timeout.connect(self.check_for_changes)
         
         # 초기 데이터 로드
         self.update_dashboard()
@@ -122,11 +129,12 @@ class DashboardPage(QWidget):
         # 차트 참조 저장
         chart_view.series = series
         chart_view.chart = chart
+        chart_view.slices = {}  # 이벤트 타입 → QPieSlice (값만 갱신)
         
         return chart_view
     
     def create_bar_chart(self) -> QChartView:
-        """막대 차트 생성"""
+        """막대 차트 생성 (시리즈/축은 한 번만 만들고 값만 갱신)"""
         series = QBarSeries()
         
         chart = QChart()
@@ -134,6 +142,15 @@ class DashboardPage(QWidget):
         chart.setTitle('시간대별 이벤트 발생 (최근 7일)')
         chart.setAnimationOptions(QChart.AnimationOption.SeriesAnimations)
         
+        axis_x = QBarCategoryAxis()
+        chart.addAxis(axis_x, Qt.AlignmentFlag.AlignBottom)
+        series.attachAxis(axis_x)
+        
+        axis_y = QValueAxis()
+        axis_y.setLabelFormat('%d')
+        chart.addAxis(axis_y, Qt.AlignmentFlag.AlignLeft)
+        series.attachAxis(axis_y)
+        
         chart_view = QChartView(chart)
         chart_view.setRenderHint(chart_view.renderHints())
         chart_view.setStyleSheet("background-color: white; border-radius: 10px;")
@@ -141,6 +158,9 @@ class DashboardPage(QWidget):
         # 차트 참조 저장
         chart_view.series = series
         chart_view.chart = chart
+        chart_view.axis_x = axis_x
+        chart_view.axis_y = axis_y
+        chart_view.bar_sets = {}  # 이벤트 타입 → QBarSet
         
         return chart_view
     
@@ -184,15 +204,53 @@ class DashboardPage(QWidget):
         
         return table
     
+    def showEvent(self, event):
+        super().showEvent(event)
+        if not self.update_timer.isActive():
+            self.update_timer.start(5000)
+            self.check_for_changes()
+    
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.update_timer.stop()
+    
+    def check_for_changes(self):
+        """변경 여부 확인 (평소 쿼리 1개). 새 이벤트/수정이 있거나 집계 버전/시간 구간이 바뀐 경우에만 갱신"""
+        try:
+            mark = self.rollup.high_water_mark()
+            if mark is None:
+                return
+            # 커밋 대기 시간(COMMIT_LAG_SEC) 때문에 미뤄진 이벤트가 있으면 여기서 반영 (반영되면 version 변경)
+            if mark['max_event_id'] > mark['last_event_id'] and self.rollup.refresh():
+                mark = self.rollup.high_water_mark() or mark
+            # 오늘/최근 30일/7일 구간은 시간이 지나면 이벤트가 없어도 바뀜 → 1시간 단위로 다시 계산
+            hour_bucket = datetime.now().strftime('%Y%m%d%H')
+            key = (mark['max_event_id'], mark['version'], mark['edit_seq'], hour_bucket)
+            if key != self._last_mark:
+                self.update_dashboard()
+        except Exception as e:
+            print(f"대시보드 변경 확인 오류: {e}")
+    
     def update_dashboard(self):
         """대시보드 데이터 업데이트"""
         try:
+            user_id = self._filter_user_id()
+            
+            # 새 이벤트를 집계 테이블에 반영한 뒤 숫자 전체를 한 번에 조회
+            # (event_logs 전체를 세지 않으므로 이벤트가 쌓여도 갱신 비용 일정)
+            self.rollup.refresh()
+            mark = self.rollup.high_water_mark()
+            counts = self.rollup.get_dashboard_counts(user_id=user_id)
+            if mark is not None:
+                self._last_mark = (mark['max_event_id'], mark['version'], mark['edit_seq'],
+                                   datetime.now().strftime('%Y%m%d%H'))
+            
             # 통계 데이터
-            self.update_statistics()
+            self.update_statistics(counts)
             
             # 차트 데이터
-            self.update_pie_chart()
-            self.update_bar_chart()
+            self.update_pie_chart(counts)
+            self.update_bar_chart(counts)
             
             # 최근 이벤트
             self.update_recent_events()
@@ -200,146 +258,87 @@ class DashboardPage(QWidget):
         except Exception as e:
             print(f"대시보드 업데이트 오류: {e}")
     
-    def update_statistics(self):
+    def _filter_user_id(self):
+        """관리자는 전체, 일반 사용자는 본인 이벤트만"""
+        return None if self.user_info['user_type'] == '관리자' else self.user_info['user_id']
+    
+    def update_statistics(self, counts: dict):
         """통계 카드 업데이트"""
-        user_id = None if self.user_info['user_type'] == '관리자' else self.user_info['user_id']
-        
-        # 총 이벤트
-        total_query = "SELECT COUNT(*) as count FROM event_logs"
-        params = []
-        if user_id:
-            total_query += " WHERE user_id = %s"
-            params.append(user_id)
-        
-        total_result = self.db.execute_query(total_query, tuple(params) if params else None)
-        total_count = total_result[0]['count'] if total_result else 0
-        self.card_total.value_label.setText(str(total_count))
-        
-        # 오늘 이벤트
-        today_query = f"{total_query} {'AND' if user_id else 'WHERE'} DATE(occurred_at) = CURDATE()"
-        today_result = self.db.execute_query(today_query, tuple(params) if params else None)
-        today_count = today_result[0]['count'] if today_result else 0
-        self.card_today.value_label.setText(str(today_count))
-        
-        # 낙상/쓰러짐 (최근 30일)
-        fall_query = """
-        SELECT COUNT(*) as count 
-        FROM event_logs el
-        JOIN event_types et ON el.event_type_id = et.event_type_id
-        WHERE et.type_name IN ('낙상', '쓰러짐')
-        AND el.occurred_at >= DATE_SUB(NOW(), INTERVAL 30 DAY)
-        """
-        if user_id:
-            fall_query += " AND el.user_id = %s"
-        
-        fall_result = self.db.execute_query(fall_query, (user_id,) if user_id else None)
-        fall_count = fall_result[0]['count'] if fall_result else 0
-        self.card_fall.value_label.setText(str(fall_count))
+        by_type = counts['by_type_30d']
         
-        # 정상 (최근 30일)
-        normal_query = """
-        SELECT COUNT(*) as count 
-        FROM event_logs el
-        JOIN event_types et ON el.event_type_id = et.event_type_id
-        WHERE et.type_name = '정상'
-        AND el.occurred_at >= DATE_SUB(NOW(), INTERVAL 30 DAY)
-        """
-        if user_id:
-            normal_query += " AND el.user_id = %s"
-        
-        normal_result = self.db.execute_query(normal_query, (user_id,) if user_id else None)
-        normal_count = normal_result[0]['count'] if normal_result else 0
-        self.card_normal.value_label.setText(str(normal_count))
+        # 총 이벤트 / 오늘 이벤트
+        self.card_total.value_label.setText(str(counts['total']))
+        self.card_today.value_label.setText(str(counts['today']))
+        
+        # 낙상/쓰러짐, 정상 (최근 30일)
+        fall_count = sum(by_type.get(name, 0) for name in FALL_TYPE_NAMES)
+        self.card_fall.value_label.setText(str(fall_count))
+        self.card_normal.value_label.setText(str(by_type.get('정상', 0)))
     
-    def update_pie_chart(self):
-        """파이 차트 업데이트"""
-        user_id = None if self.user_info['user_type'] == '관리자' else self.user_info['user_id']
-        
-        query = """
-        SELECT et.type_name, COUNT(*) as count
-        FROM event_logs el
-        JOIN event_types et ON el.event_type_id = et.event_type_id
-        WHERE el.occurred_at >= DATE_SUB(NOW(), INTERVAL 30 DAY)
-        """
-        if user_id:
-            query += " AND el.user_id = %s"
-        query += " GROUP BY et.type_name"
-        
-        results = self.db.execute_query(query, (user_id,) if user_id else None)
-        
-        # 시리즈 업데이트
+    def update_pie_chart(self, counts: dict):
+        """파이 차트 업데이트 (기존 조각 값만 바꾸고, 없어진 타입만 제거)"""
         series = self.pie_chart_view.series
-        series.clear()
-        
-        for row in results:
-            series.append(row['type_name'], row['count'])
+        slices = self.pie_chart_view.slices
+        by_type = counts['by_type_30d']
+        
+        for type_name in list(slices):
+            if type_name not in by_type:
+                series.remove(slices.pop(type_name))
+        
+        for type_name, count in by_type.items():
+            pie_slice = slices.get(type_name)
+            if pie_slice is None:
+                slices[type_name] = series.append(type_name, count)
+            elif pie_slice.value() != count:
+                pie_slice.setValue(count)
     
-    def update_bar_chart(self):
-        """막대 차트 업데이트"""
-        user_id = None if self.user_info['user_type'] == '관리자' else self.user_info['user_id']
-        
-        # 최근 7일 데이터
-        query = """
-        SELECT 
-            DATE(occurred_at) as date,
-            et.type_name,
-            COUNT(*) as count
-        FROM event_logs el
-        JOIN event_types et ON el.event_type_id = et.event_type_id
-        WHERE el.occurred_at >= DATE_SUB(CURDATE(), INTERVAL 7 DAY)
-        """
-        if user_id:
-            query += " AND el.user_id = %s"
-        query += " GROUP BY DATE(occurred_at), et.type_name ORDER BY date"
-        
-        results = self.db.execute_query(query, (user_id,) if user_id else None)
-        
-        # 데이터 구조화
+    def update_bar_chart(self, counts: dict):
+        """막대 차트 업데이트 (시리즈/축 재생성 없이 카테고리와 막대 값만 갱신)"""
+        # 데이터 구조화 (최근 7일, 날짜순)
         data_by_type = {}
         dates = []
         
-        for row in results:
-            date_str = row['date'].strftime('%m/%d')
-            if date_str not in dates:
-                dates.append(date_str)
-            
-            type_name = row['type_name']
-            if type_name not in data_by_type:
-                data_by_type[type_name] = {}
-            
-            data_by_type[type_name][date_str] = row['count']
+        for day in sorted(counts['daily_7d']):
+            date_str = day.strftime('%m/%d')
+            dates.append(date_str)
+            for type_name, count in counts['daily_7d'][day].items():
+                data_by_type.setdefault(type_name, {})[date_str] = count
         
-        # 차트 업데이트
-        chart = self.bar_chart_view.chart
-        chart.removeAllSeries()
+        view = self.bar_chart_view
+        series = view.series
+        bar_sets = view.bar_sets
         
-        # 축 먼저 제거
-        for axis in chart.axes():
-            chart.removeAxis(axis)
+        if view.axis_x.categories() != dates:
+            view.axis_x.setCategories(dates)
         
-        series = QBarSeries()
+        for type_name in list(bar_sets):
+            if type_name not in data_by_type:
+                series.remove(bar_sets.pop(type_name))
         
+        max_value = 0
         for type_name, data in data_by_type.items():
-            bar_set = QBarSet(type_name)
-            for date in dates:
-                bar_set.append(data.get(date, 0))
-            series.append(bar_set)
-        
-        chart.addSeries(series)
-        
-        # 축 설정
-        axis_x = QBarCategoryAxis()
-        axis_x.append(dates)
-        chart.addAxis(axis_x, Qt.AlignmentFlag.AlignBottom)
-        series.attachAxis(axis_x)
-        
-        axis_y = QValueAxis()
-        chart.addAxis(axis_y, Qt.AlignmentFlag.AlignLeft)
-        series.attachAxis(axis_y)
+            values = [data.get(date, 0) for date in dates]
+            max_value = max([max_value] + values)
+            bar_set = bar_sets.get(type_name)
+            if bar_set is None:
+                bar_set = QBarSet(type_name)
+                bar_set.append(values)
+                series.append(bar_set)
+                bar_sets[type_name] = bar_set
+                continue
+            if bar_set.count() != len(values):
+                bar_set.remove(0, bar_set.count())
+                bar_set.append(values)
+                continue
+            for i, value in enumerate(values):
+                if bar_set.at(i) != value:
+                    bar_set.replace(i, value)
+        
+        view.axis_y.setRange(0, max(1, max_value))
     
     def update_recent_events(self):
         """최근 이벤트 테이블 업데이트"""
-        user_id = None if self.user_info['user_type'] == '관리자' else self.user_info['user_id']
+        user_id = self._filter_user_id()
         
         events = self.event_model.get_recent(user_id=user_id, limit=10)
         
@@ -12,6 +12,8 @@ from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Any
 import json
 
+from .event_archive import EventArchive
+
 _GUI_DIR = os.path.dirname(os.path.abspath(__file__))
 
 
@@ -219,6 +221,37 @@ class EventLog:
     
     def __init__(self, db: DatabaseManager):
         self.db = db
+        self.archive = EventArchive.from_env()  # 보관 기간이 지나 파일로 옮긴 이벤트
+    
+    def _archive_filters(self, **filters) -> Optional[Dict]:
+        """검색 시작일이 보관 기준일 이전이면 보관 파일 조회 조건 (아직 DB에 남은 행은 _live_ids로 제외), 아니면 None"""
+        if not self.archive.covers(filters.get('start_date')):
+            return None
+        return dict(filters, exclude=self._live_ids)
+    
+    def _live_ids(self, event_ids: List[int]) -> set:
+        """보관 파일 행 중 아직 event_logs에 남아 있는 event_id.
+        
+        보관 작업이 파일을 쓴 뒤 DELETE를 마치기 전에 멈추면 같은 행이 양쪽에 있으므로
+        검색/count/aggregate가 두 번 세지 않도록 DB에 없는 행만 보관 행으로 취급한다.
+        EventArchive가 삭제 대기(또는 정보 없는) 파일의 행에 대해서만 호출하므로 보통은 조회하지 않는다.
+        """
+        live_ids = set()
+        for i in range(0, len(event_ids), 1000):
+            chunk = event_ids[i:i + 1000]
+            placeholders = ", ".join(["%s"] * len(chunk))
+            rows = self.db.execute_query(
+                f"SELECT event_id FROM event_logs WHERE event_id IN ({placeholders})", tuple(chunk))
+            live_ids.update(r['event_id'] for r in rows)
+        return live_ids
+    
+    @staticmethod
+    def _merge_archive(rows: List[Dict], archived: List[Dict], limit: int) -> List[Dict]:
+        """DB 행과 보관 행을 (occurred_at, event_id) 내림차순으로 합쳐 limit개"""
+        live_ids = {r['event_id'] for r in rows}
+        merged = rows + [r for r in archived if r['event_id'] not in live_ids]
+        merged.sort(key=lambda r: (r['occurred_at'], r['event_id']), reverse=True)
+        return merged[:limit]
     
     def create(self, user_id: int, event_type: str, confidence: float = None,
                hip_height: float = None, spine_angle: float = None,
@@ -260,7 +293,11 @@ class EventLog:
             kwargs.get('notes')
         )
         
-        return self.db.execute_update(query, params)
+        event_id = self.db.execute_update(query, params)
+        if event_id:
+            # 대시보드 집계 테이블에 새 이벤트 반영 (마지막 반영 이후 이벤트만 더함)
+            EventRollup(self.db).refresh()
+        return event_id
     
     def update_status(self, event_id: int, status: str, 
                      action_taken: str = None, action_result: str = None) -> bool:
@@ -272,7 +309,7 @@ class EventLog:
         WHERE event_id = %s
         """
         params = (status, action_taken, action_result, status, event_id)
-        return self.db.execute_update(query, params) > 0
+        return self._edited(self.db.execute_update(query, params) > 0)
     
     def update_action(self, event_id: int, action_taken: str, action_result: str = None) -> bool:
         """이벤트 조치 업데이트 (긴급 호출 전용)"""
@@ -282,7 +319,40 @@ class EventLog:
         WHERE event_id = %s
         """
         params = (action_taken, action_result, event_id)
-        return self.db.execute_update(query, params) > 0
+        return self._edited(self.db.execute_update(query, params) > 0)
+    
+    def update(self, event_id: int, event_type: str = None, event_status: str = None, notes: str = None) -> bool:
+        """이벤트 수정 (상세 화면). 타입이 바뀌면 대시보드 집계도 같은 트랜잭션에서 옮긴다."""
+        update_parts = []
+        params = []
+        if event_type:
+            event_types = self.db.execute_query(
+                "SELECT event_type_id FROM event_types WHERE type_name = %s", (event_type,))
+            if event_types:
+                update_parts.append("event_type_id = %s")
+                params.append(event_types[0]['event_type_id'])
+        if event_status is not None:
+            update_parts.append("event_status = %s")
+            params.append(event_status)
+        if notes is not None:
+            update_parts.append("notes = %s")
+            params.append(notes)
+        if not update_parts:
+            return True  # 수정할 내용 없음
+        params.append(event_id)
+        query = f"UPDATE event_logs SET {', '.join(update_parts)} WHERE event_id = %s"
+        affected = EventRollup(self.db).change_event(event_id, query, tuple(params))
+        if affected is None:
+            return False
+        # 같은 값으로 저장하면 바뀐 행 0이지만 실패는 아님 → 행 존재 여부로 판단
+        return affected > 0 or bool(
+            self.db.execute_query("SELECT event_id FROM event_logs WHERE event_id = %s", (event_id,)))
+    
+    def delete(self, event_id: int) -> bool:
+        """이벤트 삭제 (대시보드 집계에서도 뺌)"""
+        affected = EventRollup(self.db).change_event(
+            event_id, "DELETE FROM event_logs WHERE event_id = %s", (event_id,))
+        return bool(affected)
     
     def get_recent_fall_event(self, user_id: int = None) -> Optional[Dict]:
         """가장 최근 낙상 이벤트 조회 (Falling 또는 Fallen)"""
@@ -310,13 +380,20 @@ class EventLog:
         SET duration_seconds = TIMESTAMPDIFF(SECOND, occurred_at, NOW())
         WHERE event_id = %s
         """
-        return self.db.execute_update(query, (event_id,)) > 0
+        return self._edited(self.db.execute_update(query, (event_id,)) > 0)
     
-    def search(self, user_id: int = None, event_type: str = None,
-               start_date: datetime = None, end_date: datetime = None,
-               limit: int = 100) -> List[Dict]:
-        """이벤트 검색"""
-        query = "SELECT * FROM v_event_details WHERE 1=1"
+    def _edited(self, success: bool) -> bool:
+        """수정 성공 시 대시보드 변경 감지용 edit_seq 증가"""
+        if success:
+            EventRollup(self.db).note_edit()
+        return success
+    
+    @staticmethod
+    def _search_where(user_id: int = None, event_type: str = None,
+                      start_date: datetime = None, end_date: datetime = None,
+                      min_confidence: float = None, status: str = None):
+        """search/search_page/count/aggregate 공통 WHERE 절과 파라미터"""
+        query = " WHERE 1=1"
         params = []
         
         if user_id:
@@ -335,10 +412,150 @@ class EventLog:
             query += " AND occurred_at <= %s"
             params.append(end_date)
         
+        if min_confidence:
+            query += " AND confidence >= %s"
+            params.append(min_confidence)
+        
+        if status:
+            query += " AND event_status = %s"
+            params.append(status)
+        
+        return query, params
+    
+    def search(self, user_id: int = None, event_type: str = None,
+               start_date: datetime = None, end_date: datetime = None,
+               min_confidence: float = None, status: str = None,
+               limit: int = 100) -> List[Dict]:
+        """이벤트 검색 (min_confidence 0~1, status = event_status, 모두 SQL에서 필터)
+        
+        DB 결과가 limit보다 적고 기간이 보관 기준일 이전까지 걸치면 보관 파일 행을 이어 붙인다.
+        """
+        where, params = self._search_where(user_id, event_type, start_date, end_date,
+                                           min_confidence, status)
+        query = "SELECT * FROM v_event_details" + where
         query += " ORDER BY occurred_at DESC LIMIT %s"
         params.append(limit)
         
-        return self.db.execute_query(query, tuple(params))
+        rows = self.db.execute_query(query, tuple(params))
+        if len(rows) < limit:
+            filters = self._archive_filters(
+                user_id=user_id, event_type=event_type, start_date=start_date, end_date=end_date,
+                min_confidence=min_confidence, status=status)
+            archived = self.archive.query(**filters, limit=limit) if filters else []
+            if archived:
+                rows = self._merge_archive(rows, archived, limit)
+        return rows
+    
+    def search_page(self, user_id: int = None, event_type: str = None,
+                    start_date: datetime = None, end_date: datetime = None,
+                    min_confidence: float = None, status: str = None,
+                    after: tuple = None, limit: int = 200) -> List[Dict]:
+        """이벤트 검색 (키셋 페이지)
+        
+        after: 이전 페이지 마지막 행의 (occurred_at, event_id). None이면 첫 페이지.
+        OFFSET 없이 (occurred_at, event_id) 내림차순으로 이어서 조회하므로
+        뒤쪽 페이지도 인덱스 범위 조회 비용이 같다.
+        """
+        where, params = self._search_where(user_id, event_type, start_date, end_date,
+                                           min_confidence, status)
+        query = "SELECT * FROM v_event_details" + where
+        if after is not None:
+            occurred_at, event_id = after
+            query += " AND (occurred_at < %s OR (occurred_at = %s AND event_id < %s))"
+            params.extend([occurred_at, occurred_at, event_id])
+        query += " ORDER BY occurred_at DESC, event_id DESC LIMIT %s"
+        params.append(limit)
+        
+        rows = self.db.execute_query(query, tuple(params))
+        if len(rows) < limit:
+            filters = self._archive_filters(
+                user_id=user_id, event_type=event_type, start_date=start_date, end_date=end_date,
+                min_confidence=min_confidence, status=status)
+            # 보관 파일은 이 페이지에 필요한 만큼만 최신 파일부터 읽는다
+            archived = self.archive.query(**filters, before=after, limit=limit) if filters else []
+            if archived:
+                rows = self._merge_archive(rows, archived, limit)
+        return rows
+    
+    def export_query(self, user_id: int = None, event_type: str = None,
+                     start_date: datetime = None, end_date: datetime = None,
+                     min_confidence: float = None, status: str = None) -> tuple:
+        """검색 조건 전체 결과 쿼리 (LIMIT 없음, search_page와 같은 순서). (query, params) 반환
+        
+        행이 많을 수 있으므로 execute_query 대신 export_service로 스트리밍한다.
+        보관 파일로 옮긴 이벤트는 export_archive_rows로 따로 받아 같은 순서로 합친다 (aggregate와 같은 범위).
+        """
+        where, params = self._search_where(user_id, event_type, start_date, end_date,
+                                           min_confidence, status)
+        query = ("SELECT * FROM v_event_details" + where +
+                 " ORDER BY occurred_at DESC, event_id DESC")
+        return query, tuple(params)
+    
+    def export_archive_rows(self, user_id: int = None, event_type: str = None,
+                            start_date: datetime = None, end_date: datetime = None,
+                            min_confidence: float = None, status: str = None):
+        """export_query와 같은 조건의 보관 행 (occurred_at, event_id 내림차순 이터레이터). 범위 밖이면 None"""
+        filters = self._archive_filters(
+            user_id=user_id, event_type=event_type, start_date=start_date, end_date=end_date,
+            min_confidence=min_confidence, status=status)
+        return self.archive.iter_rows(**filters) if filters else None
+    
+    def count(self, user_id: int = None, event_type: str = None,
+              start_date: datetime = None, end_date: datetime = None,
+              min_confidence: float = None, status: str = None) -> int:
+        """검색 조건에 맞는 이벤트 수 (행을 가져오지 않음)"""
+        where, params = self._search_where(user_id, event_type, start_date, end_date,
+                                           min_confidence, status)
+        results = self.db.execute_query("SELECT COUNT(*) AS count FROM v_event_details" + where,
+                                        tuple(params))
+        total = int(results[0]['count']) if results else 0
+        filters = self._archive_filters(
+            user_id=user_id, event_type=event_type, start_date=start_date, end_date=end_date,
+            min_confidence=min_confidence, status=status)
+        return total + (self.archive.count(**filters) if filters else 0)
+    
+    def aggregate(self, user_id: int = None, event_type: str = None,
+                  start_date: datetime = None, end_date: datetime = None,
+                  min_confidence: float = None, status: str = None) -> Dict:
+        """검색 조건 전체 범위의 집계 (LIMIT 없이 SQL에서 계산)
+        
+        반환: {'total': 전체 건수, 'by_type': {타입: 건수}, 'by_status': {상태: 건수},
+               'avg_confidence': 평균 신뢰도 또는 None}
+        """
+        where, params = self._search_where(user_id, event_type, start_date, end_date,
+                                           min_confidence, status)
+        query = (
+            "SELECT event_type, event_status, COUNT(*) AS count,"
+            " SUM(confidence) AS confidence_sum, COUNT(confidence) AS confidence_count"
+            " FROM v_event_details" + where +
+            " GROUP BY event_type, event_status"
+        )
+        results = self.db.execute_query(query, tuple(params))
+        
+        summary = {'total': 0, 'by_type': {}, 'by_status': {}, 'avg_confidence': None}
+        confidence_sum = 0.0
+        confidence_count = 0
+        for r in results:
+            count = int(r['count'])
+            summary['total'] += count
+            summary['by_type'][r['event_type']] = summary['by_type'].get(r['event_type'], 0) + count
+            summary['by_status'][r['event_status']] = summary['by_status'].get(r['event_status'], 0) + count
+            confidence_sum += float(r['confidence_sum'] or 0)
+            confidence_count += int(r['confidence_count'] or 0)
+        # 보관 파일로 옮긴 이벤트 (행을 모아 두지 않고 하나씩 센다)
+        filters = self._archive_filters(
+            user_id=user_id, event_type=event_type, start_date=start_date, end_date=end_date,
+            min_confidence=min_confidence, status=status)
+        for r in (self.archive.iter_rows(**filters) if filters else []):
+            summary['total'] += 1
+            summary['by_type'][r['event_type']] = summary['by_type'].get(r['event_type'], 0) + 1
+            summary['by_status'][r['event_status']] = summary['by_status'].get(r['event_status'], 0) + 1
+            if r.get('confidence') is not None:
+                confidence_sum += r['confidence']
+                confidence_count += 1
+        if confidence_count:
+            summary['avg_confidence'] = confidence_sum / confidence_count
+        return summary
     
     def get_recent(self, user_id: int = None, limit: int = 50) -> List[Dict]:
         """최근 이벤트 조회"""
@@ -379,6 +596,294 @@ class EventLog:
         return {r['type_name']: r for r in results}
 
 
+class EventRollup:
+    """대시보드용 이벤트 집계 (사용자 × 이벤트 타입 × 1시간 / 전체 누적).
+
+    event_logs를 매번 세지 않도록 refresh()가 마지막 반영 event_id 이후 이벤트만 집계 테이블에 더한다.
+    EventLog.create 직후와 대시보드 갱신 시 호출 (다른 프로세스가 넣은 이벤트도 다음 refresh에 반영).
+    이미 반영된 이벤트의 삭제/타입 변경은 change_event()가 같은 트랜잭션에서 집계를 맞춘다.
+    rebuild()는 집계가 어긋났을 때(직접 SQL 수정 등) 관리용으로 다시 만든다.
+    """
+
+    # AUTO_INCREMENT 번호는 커밋 순서와 다를 수 있음: 작은 번호가 늦게 커밋되면 MAX(event_id)까지
+    # 반영한 뒤에 나타나 영원히 빠진다. 생성된 지 이 시간이 지난 행까지만 반영 (그 안에 커밋된다고 가정)
+    COMMIT_LAG_SEC = 5
+
+    TABLES = [
+        """
+        CREATE TABLE IF NOT EXISTS event_rollup_hourly (
+            user_id INT NOT NULL,
+            event_type_id INT NOT NULL,
+            hour_start DATETIME NOT NULL,
+            event_count INT NOT NULL DEFAULT 0,
+            PRIMARY KEY (user_id, event_type_id, hour_start),
+            INDEX idx_rollup_hour (hour_start)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS event_rollup_totals (
+            user_id INT NOT NULL,
+            event_type_id INT NOT NULL,
+            total_count INT NOT NULL DEFAULT 0,
+            PRIMARY KEY (user_id, event_type_id)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS event_rollup_state (
+            state_id TINYINT PRIMARY KEY,
+            last_event_id INT NOT NULL DEFAULT 0,
+            version BIGINT NOT NULL DEFAULT 0,
+            edit_seq BIGINT NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+        """,
+        "INSERT IGNORE INTO event_rollup_state (state_id, last_event_id, version) VALUES (1, 0, 0)",
+    ]
+
+    # 대시보드 숫자 전체를 한 번에 조회 (section별 행: total / today / type30 / day7)
+    DASHBOARD_QUERY = """
+    SELECT 'total' AS section, NULL AS type_name, NULL AS day, SUM(r.total_count) AS count
+    FROM event_rollup_totals r
+    WHERE {user_filter}
+    UNION ALL
+    SELECT 'today', NULL, NULL, SUM(h.event_count)
+    FROM event_rollup_hourly h
+    WHERE h.hour_start >= CURDATE() AND {hour_user_filter}
+    UNION ALL
+    SELECT 'type30', et.type_name, NULL, SUM(h.event_count)
+    FROM event_rollup_hourly h
+    JOIN event_types et ON h.event_type_id = et.event_type_id
+    WHERE h.hour_start >= DATE_FORMAT(DATE_SUB(NOW(), INTERVAL 30 DAY), '%Y-%m-%d %H:00:00') AND {hour_user_filter}
+    GROUP BY et.type_name
+    UNION ALL
+    SELECT 'day7', et.type_name, DATE(h.hour_start), SUM(h.event_count)
+    FROM event_rollup_hourly h
+    JOIN event_types et ON h.event_type_id = et.event_type_id
+    WHERE h.hour_start >= DATE_SUB(CURDATE(), INTERVAL 7 DAY) AND {hour_user_filter}
+    GROUP BY et.type_name, DATE(h.hour_start)
+    """
+
+    _tables_ready = False
+
+    def __init__(self, db: DatabaseManager):
+        self.db = db
+
+    def ensure_tables(self) -> bool:
+        """집계 테이블 생성 (프로세스당 한 번)."""
+        if EventRollup._tables_ready:
+            return True
+        for query in self.TABLES:
+            try:
+                conn = self.db.get_connection()
+                cursor = conn.cursor()
+                cursor.execute(query)
+                conn.commit()
+                cursor.close()
+                conn.close()
+            except Error as e:
+                print(f"집계 테이블 생성 오류: {e}")
+                return False
+        # edit_seq 이전에 만든 상태 테이블에는 컬럼 추가
+        if not self.db.execute_query("SHOW COLUMNS FROM event_rollup_state LIKE 'edit_seq'"):
+            self.db.execute_update(
+                "ALTER TABLE event_rollup_state ADD COLUMN edit_seq BIGINT NOT NULL DEFAULT 0 AFTER version")
+        EventRollup._tables_ready = True
+        return True
+
+    def refresh(self) -> int:
+        """마지막 반영 이후 event_logs를 집계 테이블에 더함. 새로 반영한 event_id 구간 크기 반환 (0: 변경 없음).
+
+        상태 행을 FOR UPDATE로 잠그므로 여러 클라이언트가 동시에 호출해도 두 번 더해지지 않는다.
+        created_at이 COMMIT_LAG_SEC보다 최근인 행은 다음 refresh로 미룬다 (그보다 작은 번호가 아직 커밋 전일 수 있음).
+        """
+        if not self.ensure_tables():
+            return 0
+        conn = None
+        try:
+            conn = self.db.get_connection()
+            cursor = conn.cursor()
+            conn.start_transaction()
+            cursor.execute("SELECT last_event_id FROM event_rollup_state WHERE state_id = 1 FOR UPDATE")
+            row = cursor.fetchone()
+            last_id = row[0] if row else 0
+            # event_id 범위로 새 행만 훑음 (created_at 인덱스 불필요)
+            cursor.execute(
+                """
+                SELECT COALESCE(MAX(event_id), 0) FROM event_logs
+                WHERE event_id > %s AND created_at < NOW() - INTERVAL %s SECOND
+                """,
+                (last_id, self.COMMIT_LAG_SEC),
+            )
+            max_id = cursor.fetchone()[0]
+            if max_id <= last_id:
+                conn.rollback()
+                cursor.close()
+                return 0
+            cursor.execute(
+                """
+                INSERT INTO event_rollup_hourly (user_id, event_type_id, hour_start, event_count)
+                SELECT user_id, event_type_id, DATE_FORMAT(occurred_at, '%Y-%m-%d %H:00:00'), COUNT(*)
+                FROM event_logs
+                WHERE event_id > %s AND event_id <= %s
+                GROUP BY user_id, event_type_id, DATE_FORMAT(occurred_at, '%Y-%m-%d %H:00:00')
+                ON DUPLICATE KEY UPDATE event_count = event_count + VALUES(event_count)
+                """,
+                (last_id, max_id),
+            )
+            cursor.execute(
+                """
+                INSERT INTO event_rollup_totals (user_id, event_type_id, total_count)
+                SELECT user_id, event_type_id, COUNT(*)
+                FROM event_logs
+                WHERE event_id > %s AND event_id <= %s
+                GROUP BY user_id, event_type_id
+                ON DUPLICATE KEY UPDATE total_count = total_count + VALUES(total_count)
+                """,
+                (last_id, max_id),
+            )
+            cursor.execute(
+                "UPDATE event_rollup_state SET last_event_id = %s, version = version + 1 WHERE state_id = 1",
+                (max_id,),
+            )
+            conn.commit()
+            cursor.close()
+            return max_id - last_id
+        except Error as e:
+            print(f"이벤트 집계 오류: {e}")
+            if conn is not None:
+                try:
+                    conn.rollback()
+                except Error:
+                    pass
+            return 0
+        finally:
+            if conn is not None:
+                conn.close()
+
+    def _add(self, cursor, user_id: int, event_type_id: int, occurred_at, delta: int):
+        """집계 한 칸(시간/누적)에 delta 더하기 (호출 측 트랜잭션 안에서)."""
+        cursor.execute(
+            """
+            INSERT INTO event_rollup_hourly (user_id, event_type_id, hour_start, event_count)
+            VALUES (%s, %s, DATE_FORMAT(%s, '%Y-%m-%d %H:00:00'), %s)
+            ON DUPLICATE KEY UPDATE event_count = event_count + VALUES(event_count)
+            """,
+            (user_id, event_type_id, occurred_at, delta),
+        )
+        cursor.execute(
+            """
+            INSERT INTO event_rollup_totals (user_id, event_type_id, total_count)
+            VALUES (%s, %s, %s)
+            ON DUPLICATE KEY UPDATE total_count = total_count + VALUES(total_count)
+            """,
+            (user_id, event_type_id, delta),
+        )
+
+    def change_event(self, event_id: int, query: str, params: tuple) -> Optional[int]:
+        """event_logs 행 하나를 수정/삭제하는 query를 실행하고, 이미 집계된 행이면 집계도 같이 맞춤.
+
+        refresh()와 같은 상태 행 잠금을 잡으므로 반영 위치와 엇갈리지 않는다. 바뀐 행 수 반환 (오류 시 None).
+        """
+        if not self.ensure_tables():
+            return None
+        select = "SELECT user_id, event_type_id, occurred_at FROM event_logs WHERE event_id = %s"
+        conn = None
+        try:
+            conn = self.db.get_connection()
+            cursor = conn.cursor()
+            conn.start_transaction()
+            cursor.execute("SELECT last_event_id FROM event_rollup_state WHERE state_id = 1 FOR UPDATE")
+            row = cursor.fetchone()
+            last_id = row[0] if row else 0
+            cursor.execute(select + " FOR UPDATE", (event_id,))
+            before = cursor.fetchone()
+            cursor.execute(query, params)
+            affected = cursor.rowcount
+            if before is not None and affected and event_id <= last_id:
+                cursor.execute(select, (event_id,))
+                after = cursor.fetchone()
+                if after != before:
+                    self._add(cursor, *before, -1)
+                    if after is not None:
+                        self._add(cursor, *after, 1)
+                    cursor.execute("UPDATE event_rollup_state SET version = version + 1 WHERE state_id = 1")
+            if affected:
+                cursor.execute("UPDATE event_rollup_state SET edit_seq = edit_seq + 1 WHERE state_id = 1")
+            conn.commit()
+            cursor.close()
+            return affected
+        except Error as e:
+            print(f"이벤트 수정/집계 오류: {e}")
+            if conn is not None:
+                try:
+                    conn.rollback()
+                except Error:
+                    pass
+            return None
+        finally:
+            if conn is not None:
+                conn.close()
+
+    def note_edit(self):
+        """기존 이벤트 수정(상태/조치 등) 표시: 새 이벤트가 없어도 대시보드가 다시 조회하도록 edit_seq 증가."""
+        if self.ensure_tables():
+            self.db.execute_update("UPDATE event_rollup_state SET edit_seq = edit_seq + 1 WHERE state_id = 1")
+
+    def high_water_mark(self) -> Optional[Dict]:
+        """변경 감지용 (잠금 없는 단일 조회): event_logs 최대 event_id, 집계 반영 위치와 버전, 수정 횟수(edit_seq)."""
+        if not self.ensure_tables():
+            return None
+        rows = self.db.execute_query(
+            """
+            SELECT (SELECT COALESCE(MAX(event_id), 0) FROM event_logs) AS max_event_id,
+                   s.last_event_id, s.version, s.edit_seq
+            FROM event_rollup_state s
+            WHERE s.state_id = 1
+            """
+        )
+        return rows[0] if rows else None
+
+    def rebuild(self) -> bool:
+        """집계 테이블을 비우고 event_logs 전체로 다시 집계 (집계가 어긋났을 때 관리용).
+
+        보관 파일로 옮긴 이벤트(event_archive)는 다시 집계되지 않으므로 그만큼 건수가 줄어든다.
+        """
+        if not self.ensure_tables():
+            return False
+        self.db.execute_update("DELETE FROM event_rollup_hourly")
+        self.db.execute_update("DELETE FROM event_rollup_totals")
+        self.db.execute_update(
+            "UPDATE event_rollup_state SET last_event_id = 0, version = version + 1 WHERE state_id = 1"
+        )
+        self.refresh()
+        return True
+
+    def get_dashboard_counts(self, user_id: int = None) -> Dict:
+        """대시보드 숫자 (단일 쿼리).
+
+        Returns:
+            {'total': int, 'today': int, 'by_type_30d': {type_name: count},
+             'daily_7d': {date: {type_name: count}}}
+        """
+        if user_id:
+            query = self.DASHBOARD_QUERY.format(user_filter="r.user_id = %s", hour_user_filter="h.user_id = %s")
+            params = (user_id,) * 4
+        else:
+            query = self.DASHBOARD_QUERY.format(user_filter="1=1", hour_user_filter="1=1")
+            params = None
+        counts = {'total': 0, 'today': 0, 'by_type_30d': {}, 'daily_7d': {}}
+        for row in self.db.execute_query(query, params):
+            count = int(row['count'] or 0)
+            section = row['section']
+            if section in ('total', 'today'):
+                counts[section] = count
+            elif section == 'type30':
+                counts['by_type_30d'][row['type_name']] = count
+            elif section == 'day7':
+                counts['daily_7d'].setdefault(row['day'], {})[row['type_name']] = count
+        return counts
+
+
 class AutoReport:
     """자동신고 모델"""
     
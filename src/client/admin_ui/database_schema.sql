@@ -96,13 +96,15 @@ CREATE TABLE IF NOT EXISTS event_logs (
     -- 메타데이터
     notes TEXT,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    event_uid CHAR(32) NULL,  -- 로컬 저장소(event_store) 전송 키, 재전송 시 중복 방지
     
     FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE,
     FOREIGN KEY (event_type_id) REFERENCES event_types(event_type_id),
     INDEX idx_user_event (user_id, occurred_at),
     INDEX idx_event_type (event_type_id),
     INDEX idx_occurred_at (occurred_at),
-    INDEX idx_status (event_status)
+    INDEX idx_status (event_status),
+    UNIQUE KEY uq_event_uid (event_uid)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 -- ============================================================
@@ -171,6 +173,34 @@ CREATE TABLE IF NOT EXISTS login_history (
     INDEX idx_user_login (user_id, login_at)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
+-- ============================================================
+-- 대시보드 집계 테이블 (EventRollup.refresh가 event_logs 추가분을 반영)
+-- ============================================================
+CREATE TABLE IF NOT EXISTS event_rollup_hourly (
+    user_id INT NOT NULL,
+    event_type_id INT NOT NULL,
+    hour_start DATETIME NOT NULL,
+    event_count INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, event_type_id, hour_start),
+    INDEX idx_rollup_hour (hour_start)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE IF NOT EXISTS event_rollup_totals (
+    user_id INT NOT NULL,
+    event_type_id INT NOT NULL,
+    total_count INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, event_type_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE IF NOT EXISTS event_rollup_state (
+    state_id TINYINT PRIMARY KEY,
+    last_event_id INT NOT NULL DEFAULT 0,
+    version BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+INSERT IGNORE INTO event_rollup_state (state_id, last_event_id, version) VALUES (1, 0, 0);
+
 -- ============================================================
 -- 뷰 생성: 이벤트 상세 정보
 -- ============================================================
@@ -205,6 +235,7 @@ JOIN event_types et ON el.event_type_id = et.event_type_id;
 -- ============================================================
 -- 이벤트 검색 최적화
 CREATE INDEX idx_event_search ON event_logs(user_id, event_type_id, occurred_at);
+CREATE INDEX idx_type_occurred ON event_logs(event_type_id, occurred_at);
 
 -- 자동신고 검색 최적화
 CREATE INDEX idx_report_search ON auto_report_logs(event_id, report_target, sent_at);
@@ -0,0 +1,534 @@
+"""
+Home Safe Solution - event_logs 보관(아카이브)
+
+정상 이벤트가 사용자마다 몇 초 간격으로 쌓이므로, 보관 기간(EVENT_RETENTION_DAYS)이 지난 행은
+월/사용자별 압축 파일로 옮기고 MySQL에서는 지운다.
+- 파일: <보관 폴더>/YYYY-MM/user_<id>/events_<첫 event_id>-<끝 event_id>.csv.gz
+  (pyarrow가 있고 EVENT_ARCHIVE_FORMAT=parquet이면 .parquet)
+- 행 형식: v_event_details와 같은 컬럼 (검색 결과에 그대로 합칠 수 있도록)
+- 한 묶음(SELECT_BATCH행)마다: 상태 파일에 새 파일 정보(행 수, 시간/ID 범위)를 "삭제 대기(pending)"로 기록하고
+  보관 기준일을 묶음의 마지막 occurred_at 다음으로 올림 → 파일 쓰기(임시 파일 → rename) → 행을 작은 묶음으로 DELETE
+  (긴 잠금 없음) → 삭제 대기 해제. 중간에 멈추면 다음 실행이 먼저 삭제 대기 파일의 행을 마저 지우므로
+  같은 행이 두 파일에 쓰이지 않고, DB에서 지워진 행은 항상 기준일 안쪽이라 검색에서 빠지지 않는다.
+  삭제 대기 파일(과 정보가 없는 이전 버전 파일)의 행만 DB에 남아 있을 수 있으므로 EventLog는 그 행만 DB와 대조한다.
+- auto_report_logs가 있는 이벤트는 (ON DELETE CASCADE로 신고 기록이 지워지므로) 옮기지 않는다.
+- 대시보드 집계(event_rollup_*)는 옮기기 전에 refresh하므로 건수가 유지된다.
+
+EventLog.search/search_page/count/aggregate/export는 검색 시작일이 보관 기준일보다 이전이면 보관 파일도 함께 조회한다.
+읽기는 파일 정보의 시간 범위로 최신 파일부터 열고 필요한 행 수가 채워지면 멈추며(iter_rows),
+count는 조건이 사용자/기간뿐이면 파일 정보의 행 수만 더한다.
+실행: client/archive_events.py
+"""
+
+import csv
+import gzip
+import heapq
+import itertools
+import json
+import os
+import time
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set
+
+_GUI_DIR = os.path.dirname(os.path.abspath(__file__))
+
+DEFAULT_RETENTION_DAYS = 180
+SELECT_BATCH = 5000   # 한 번에 읽어 파일로 쓸 행 수
+DELETE_CHUNK = 500    # DELETE 한 번에 지울 행 수 (잠금 시간을 짧게)
+STATE_FILE = "archive_state.json"
+
+INT_COLUMNS = {"event_id", "user_id", "event_type_id", "duration_seconds"}
+FLOAT_COLUMNS = {"confidence", "hip_height", "spine_angle", "hip_velocity", "accuracy"}
+DATETIME_COLUMNS = {"occurred_at", "resolved_at", "created_at"}
+
+# v_event_details와 같은 컬럼 (el.* + 사용자 이름/이벤트 타입/심각도)
+ARCHIVE_SELECT = """
+SELECT el.*, u.name AS user_name, et.type_name AS event_type, et.severity
+FROM event_logs el
+JOIN users u ON el.user_id = u.user_id
+JOIN event_types et ON el.event_type_id = et.event_type_id
+WHERE el.occurred_at < %s
+  AND el.event_id <= %s
+  AND NOT EXISTS (SELECT 1 FROM auto_report_logs ar WHERE ar.event_id = el.event_id)
+  AND (el.occurred_at > %s OR (el.occurred_at = %s AND el.event_id > %s))
+ORDER BY el.occurred_at, el.event_id
+LIMIT %s
+"""
+
+
+def _to_datetime(value) -> Optional[datetime]:
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    text = str(value).strip()
+    for fmt in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M:%S.%f", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def _parse_row(raw: dict) -> dict:
+    """CSV 문자열 행 → DB 행과 같은 타입"""
+    row = {}
+    for key, value in raw.items():
+        if value == "" or value is None:
+            row[key] = None
+        elif key in INT_COLUMNS:
+            row[key] = int(value)
+        elif key in FLOAT_COLUMNS:
+            row[key] = float(value)
+        elif key in DATETIME_COLUMNS:
+            row[key] = _to_datetime(value)
+        else:
+            row[key] = value
+    return row
+
+
+def _format_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    return value
+
+
+def _months_between(start: Optional[datetime], end: Optional[datetime]):
+    """보관 폴더 이름(YYYY-MM) 필터. None이면 제한 없음"""
+    low = start.strftime("%Y-%m") if start else None
+    high = end.strftime("%Y-%m") if end else None
+    return low, high
+
+
+_EPOCH = datetime(1970, 1, 1)
+_NEWEST = (float("-inf"), float("-inf"))
+
+
+def _desc_key(occurred_at: Optional[datetime], event_id: int) -> tuple:
+    """heapq(최소 힙)에서 (occurred_at, event_id) 내림차순으로 꺼내기 위한 키"""
+    seconds = ((occurred_at or datetime.min) - _EPOCH).total_seconds()
+    return (-seconds, -event_id)
+
+
+class EventArchive:
+    """보관 파일 읽기/쓰기"""
+
+    def __init__(self, archive_dir: str, file_format: str = "csv"):
+        self.archive_dir = archive_dir
+        self.file_format = file_format
+        self._state: Optional[dict] = None
+        self._state_mtime = None
+
+    @classmethod
+    def from_env(cls) -> "EventArchive":
+        """.env EVENT_ARCHIVE_DIR(상대경로는 .env 폴더 기준), EVENT_ARCHIVE_FORMAT(csv|parquet)"""
+        base = os.environ.get("ADMIN_UI_ENV_DIR") or _GUI_DIR
+        archive_dir = os.environ.get("EVENT_ARCHIVE_DIR", "").strip() or "event_archive"
+        if not os.path.isabs(archive_dir):
+            archive_dir = os.path.abspath(os.path.join(base, archive_dir))
+        file_format = os.environ.get("EVENT_ARCHIVE_FORMAT", "csv").strip().lower()
+        return cls(archive_dir, "parquet" if file_format == "parquet" else "csv")
+
+    # --- 상태 (보관 기준일, 파일 정보) ---
+    def _state_path(self) -> str:
+        return os.path.join(self.archive_dir, STATE_FILE)
+
+    def state(self) -> dict:
+        """{'archived_before': 'YYYY-MM-DD HH:MM:SS', 'rows': 누적 행 수, 'bytes': 누적 파일 크기,
+        'files': {상대경로: 파일 정보}, 'pending': [DB 삭제 대기 상대경로]}. 파일 변경 시에만 다시 읽음"""
+        path = self._state_path()
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return {}
+        if self._state is None or mtime != self._state_mtime:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self._state = json.load(f)
+                self._state_mtime = mtime
+            except (OSError, ValueError):
+                return {}
+        return self._state
+
+    def archived_before(self) -> Optional[datetime]:
+        return _to_datetime(self.state().get("archived_before"))
+
+    def covers(self, start_date) -> bool:
+        """검색 시작일이 보관 기준일 이전이면 True (보관 파일도 조회해야 함)"""
+        horizon = self.archived_before()
+        if horizon is None:
+            return False
+        start = _to_datetime(start_date)
+        return start is None or start < horizon
+
+    def save_state(self, state: dict):
+        """상태 파일을 임시 파일 → rename으로 저장"""
+        os.makedirs(self.archive_dir, exist_ok=True)
+        tmp = self._state_path() + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, self._state_path())
+        # 같은 시각(mtime 해상도 안)에 연달아 저장해도 캐시가 옛 상태로 남지 않도록
+        self._state = state
+        self._state_mtime = os.path.getmtime(self._state_path())
+
+    def begin_batch(self, archived_before: datetime, files: Dict[str, dict]):
+        """파일을 쓰기 전에 호출: 파일 정보를 삭제 대기로 기록하고 보관 기준일을 앞으로만 옮긴다"""
+        state = dict(self.state())
+        previous = _to_datetime(state.get("archived_before"))
+        if previous is None or archived_before > previous:
+            state["archived_before"] = archived_before.strftime("%Y-%m-%d %H:%M:%S")
+        state["files"] = {**state.get("files", {}), **files}
+        state["pending"] = sorted(set(state.get("pending", [])) | set(files))
+        self.save_state(state)
+
+    def finish_batch(self, paths: List[str], written_bytes: int):
+        """DB 삭제가 끝난 파일의 삭제 대기 해제, 누적 행 수/크기 반영"""
+        state = dict(self.state())
+        done = set(paths)
+        infos = state.get("files", {})
+        state["pending"] = [p for p in state.get("pending", []) if p not in done]
+        state["rows"] = int(state.get("rows", 0)) + sum(int(infos.get(p, {}).get("rows", 0)) for p in done)
+        state["bytes"] = int(state.get("bytes", 0)) + written_bytes
+        self.save_state(state)
+
+    def forget(self, paths: List[str]):
+        """쓰기 전에 멈춰 만들어지지 않은 파일의 정보 삭제 (행은 DB에 그대로 있음)"""
+        state = dict(self.state())
+        gone = set(paths)
+        state["files"] = {p: info for p, info in state.get("files", {}).items() if p not in gone}
+        state["pending"] = [p for p in state.get("pending", []) if p not in gone]
+        self.save_state(state)
+
+    # --- 쓰기 ---
+    def partition_path(self, month: str, user_id: int, rows: List[dict]) -> str:
+        ext = "parquet" if self.file_format == "parquet" else "csv.gz"
+        return os.path.join(self.archive_dir, month, f"user_{user_id}",
+                            f"events_{rows[0]['event_id']}-{rows[-1]['event_id']}.{ext}")
+
+    def relpath(self, path: str) -> str:
+        """상태 파일의 키 (보관 폴더 기준 상대경로, '/' 구분)"""
+        return os.path.relpath(path, self.archive_dir).replace(os.sep, "/")
+
+    def abspath(self, relpath: str) -> str:
+        return os.path.join(self.archive_dir, *relpath.split("/"))
+
+    @staticmethod
+    def file_info(rows: List[dict]) -> dict:
+        """파일 정보: 행 수와 (occurred_at, event_id) 범위. rows는 (occurred_at, event_id) 오름차순"""
+        ids = [row["event_id"] for row in rows]
+        return {
+            "rows": len(rows),
+            "first": _format_value(rows[0]["occurred_at"]),
+            "last": _format_value(rows[-1]["occurred_at"]),
+            "min_id": min(ids),
+            "max_id": max(ids),
+        }
+
+    def write_partition(self, month: str, user_id: int, rows: List[dict]) -> tuple:
+        """한 파티션(월/사용자)의 행을 새 파일로 저장. (경로, 파일 크기) 반환"""
+        path = self.partition_path(month, user_id, rows)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + ".tmp"
+        if self.file_format == "parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            pq.write_table(pa.Table.from_pylist(rows), tmp, compression="zstd")
+        else:
+            columns = list(rows[0].keys())
+            with gzip.open(tmp, "wt", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(columns)
+                for row in rows:
+                    writer.writerow([_format_value(row.get(c)) for c in columns])
+        os.replace(tmp, path)
+        return path, os.path.getsize(path)
+
+    # --- 읽기 ---
+    def _files(self, user_id: Optional[int], start: Optional[datetime], end: Optional[datetime]) -> Iterator[str]:
+        if not os.path.isdir(self.archive_dir):
+            return
+        low, high = _months_between(start, end)
+        for month in sorted(os.listdir(self.archive_dir)):
+            month_dir = os.path.join(self.archive_dir, month)
+            if not os.path.isdir(month_dir):
+                continue
+            if (low and month < low) or (high and month > high):
+                continue
+            users = [f"user_{user_id}"] if user_id else sorted(os.listdir(month_dir))
+            for user_folder in users:
+                folder = os.path.join(month_dir, user_folder)
+                if not os.path.isdir(folder):
+                    continue
+                for name in sorted(os.listdir(folder)):
+                    if name.endswith(".csv.gz") or name.endswith(".parquet"):
+                        yield os.path.join(folder, name)
+
+    def _candidates(self, user_id: Optional[int], start: Optional[datetime], end: Optional[datetime],
+                    before: Optional[tuple]) -> List[tuple]:
+        """조회할 파일 [(경로, 파일 정보 또는 None, DB 대조 필요 여부)]. 정보가 있으면 범위 밖 파일은 열지 않고 뺀다"""
+        state = self.state()
+        infos = state.get("files", {})
+        pending = set(state.get("pending", []))
+        result = []
+        for path in self._files(user_id, start, end):
+            rel = self.relpath(path)
+            info = infos.get(rel)
+            if info is not None:
+                first = _to_datetime(info["first"])
+                last = _to_datetime(info["last"])
+                if (start and last < start) or (end and first > end):
+                    continue
+                if before is not None and (first, info["min_id"]) >= tuple(before):
+                    continue
+            # 정보가 없는 파일(이전 버전)과 삭제 대기 파일만 DB에 같은 행이 남아 있을 수 있다
+            result.append((path, info, info is None or rel in pending))
+        return result
+
+    @staticmethod
+    def read_file(path: str) -> Iterator[dict]:
+        if path.endswith(".parquet"):
+            import pyarrow.parquet as pq
+            yield from pq.read_table(path).to_pylist()
+            return
+        with gzip.open(path, "rt", newline="", encoding="utf-8") as f:
+            for raw in csv.DictReader(f):
+                yield _parse_row(raw)
+
+    def _load(self, path: str, start, end, event_type, min_confidence, status, before,
+              exclude: Optional[Callable[[List[int]], Set[int]]]) -> List[dict]:
+        """파일 하나에서 EventLog._search_where와 같은 조건에 맞는 행. exclude가 돌려준 event_id는 뺀다"""
+        rows = []
+        try:
+            for row in self.read_file(path):
+                occurred_at = row.get("occurred_at")
+                if start and (occurred_at is None or occurred_at < start):
+                    continue
+                if end and (occurred_at is None or occurred_at > end):
+                    continue
+                if event_type and row.get("event_type") != event_type:
+                    continue
+                if min_confidence and (row.get("confidence") or 0) < min_confidence:
+                    continue
+                if status and row.get("event_status") != status:
+                    continue
+                if before is not None and (occurred_at, row["event_id"]) >= tuple(before):
+                    continue
+                rows.append(row)
+        except Exception as e:
+            print(f"[Archive] 보관 파일 읽기 실패: {path} ({e})")
+            return []
+        if exclude is not None and rows:
+            live_ids = exclude([row["event_id"] for row in rows])
+            if live_ids:
+                rows = [row for row in rows if row["event_id"] not in live_ids]
+        return rows
+
+    def iter_rows(self, user_id: int = None, event_type: str = None,
+                  start_date=None, end_date=None,
+                  min_confidence: float = None, status: str = None,
+                  before: tuple = None,
+                  exclude: Callable[[List[int]], Set[int]] = None) -> Iterator[dict]:
+        """조건에 맞는 보관 행을 (occurred_at, event_id) 내림차순으로 하나씩.
+
+        파일 정보의 최신 시각 순으로 파일을 열고, 아직 열지 않은 파일에 더 최신 행이 있을 수 없을 때만
+        행을 내보내므로 앞쪽 몇 행만 쓰면 오래된 파일은 읽지 않는다.
+        before: 이 (occurred_at, event_id)보다 앞선 행만 (키셋 페이지).
+        exclude: event_id 목록 → 아직 DB에 있어 뺄 id 집합 (삭제 대기/정보 없는 파일에만 호출).
+        """
+        start = _to_datetime(start_date)
+        end = _to_datetime(end_date)
+        files = self._candidates(user_id, start, end, before)
+        # 파일이 가질 수 있는 가장 최신 행의 키 (정보가 없으면 맨 앞)
+        files.sort(key=lambda f: _desc_key(_to_datetime(f[1]["last"]), f[1]["max_id"]) if f[1] else _NEWEST)
+        heap = []
+        order = 0
+        last_id = None
+        i = 0
+        while True:
+            while i < len(files):
+                path, info, suspect = files[i]
+                upper = _desc_key(_to_datetime(info["last"]), info["max_id"]) if info else _NEWEST
+                if heap and upper > heap[0][0]:
+                    break
+                for row in self._load(path, start, end, event_type, min_confidence, status, before,
+                                      exclude if suspect else None):
+                    heapq.heappush(heap, (_desc_key(row.get("occurred_at"), row["event_id"]), order, row))
+                    order += 1
+                i += 1
+            if not heap:
+                return
+            _key, _order, row = heapq.heappop(heap)
+            if row["event_id"] == last_id:
+                continue  # 이전 버전 보관 작업이 같은 행을 두 파일에 쓴 경우 (키가 같아 연달아 나옴)
+            last_id = row["event_id"]
+            yield row
+
+    def query(self, user_id: int = None, event_type: str = None,
+              start_date=None, end_date=None,
+              min_confidence: float = None, status: str = None,
+              before: tuple = None, limit: int = None,
+              exclude: Callable[[List[int]], Set[int]] = None) -> List[dict]:
+        """iter_rows 앞에서 limit개 (occurred_at, event_id 내림차순). limit이 None이면 전체"""
+        return list(itertools.islice(
+            self.iter_rows(user_id, event_type, start_date, end_date, min_confidence, status, before, exclude),
+            limit))
+
+    def count(self, user_id: int = None, event_type: str = None,
+              start_date=None, end_date=None,
+              min_confidence: float = None, status: str = None,
+              exclude: Callable[[List[int]], Set[int]] = None) -> int:
+        """조건에 맞는 보관 행 수.
+
+        조건이 사용자/기간뿐이면 기간 안에 통째로 들어가는 파일은 파일 정보의 행 수를 더하고
+        (경계에 걸친 파일, 삭제 대기/정보 없는 파일만 읽음), 다른 조건이 있으면 파일을 읽어 센다.
+        """
+        start = _to_datetime(start_date)
+        end = _to_datetime(end_date)
+        by_info = not (event_type or min_confidence or status)
+        total = 0
+        seen = set()
+        for path, info, suspect in self._candidates(user_id, start, end, None):
+            if by_info and info is not None and not suspect:
+                if (start is None or _to_datetime(info["first"]) >= start) and \
+                        (end is None or _to_datetime(info["last"]) <= end):
+                    total += int(info["rows"])
+                    continue
+            for row in self._load(path, start, end, event_type, min_confidence, status, None,
+                                  exclude if suspect else None):
+                if row["event_id"] not in seen:
+                    seen.add(row["event_id"])
+                    total += 1
+        return total
+
+
+class EventArchiver:
+    """보관 기간이 지난 event_logs 행을 보관 파일로 옮기는 작업"""
+
+    def __init__(self, db, archive: EventArchive = None, retention_days: int = None,
+                 batch_size: int = SELECT_BATCH, delete_chunk: int = DELETE_CHUNK):
+        self.db = db
+        self.archive = archive or EventArchive.from_env()
+        if retention_days is None:
+            retention_days = int(os.environ.get("EVENT_RETENTION_DAYS", DEFAULT_RETENTION_DAYS))
+        self.retention_days = max(1, retention_days)
+        self.batch_size = batch_size
+        self.delete_chunk = delete_chunk
+
+    def _execute(self, query: str, params: tuple = None, fetch: bool = True):
+        """쿼리 실행. DatabaseManager.execute_query/update는 오류 시 빈 결과/0을 돌려주므로
+        보관 작업은 직접 실행해 오류를 그대로 올린다 (실패가 "옮길 행 없음"으로 보이지 않도록)."""
+        conn = self.db.get_connection()
+        try:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(query, params or ())
+            if fetch:
+                result = cursor.fetchall()
+            else:
+                conn.commit()
+                result = cursor.rowcount
+            cursor.close()
+            return result
+        finally:
+            conn.close()
+
+    def _avg_row_length(self) -> int:
+        rows = self.db.execute_query(
+            "SELECT AVG_ROW_LENGTH FROM information_schema.TABLES "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'event_logs'"
+        )
+        return int(rows[0]["AVG_ROW_LENGTH"] or 0) if rows else 0
+
+    def _delete(self, event_ids: List[int]):
+        """작은 묶음으로 나눠 삭제 (묶음마다 커밋)"""
+        for i in range(0, len(event_ids), self.delete_chunk):
+            chunk = event_ids[i:i + self.delete_chunk]
+            placeholders = ", ".join(["%s"] * len(chunk))
+            self._execute(f"DELETE FROM event_logs WHERE event_id IN ({placeholders})", tuple(chunk), fetch=False)
+
+    def _resume_pending(self):
+        """지난 실행이 DELETE를 마치기 전에 멈춘 파일: 파일이 있으면 그 행을 마저 지우고, 없으면 정보만 지운다"""
+        pending = list(self.archive.state().get("pending", []))
+        for rel in pending:
+            path = self.archive.abspath(rel)
+            if not os.path.exists(path):
+                self.archive.forget([rel])
+                continue
+            self._delete([row["event_id"] for row in self.archive.read_file(path)])
+            self.archive.finish_batch([rel], os.path.getsize(path))
+        if pending:
+            print(f"[Archive] 지난 실행에서 삭제가 끝나지 않은 파일 {len(pending)}개 정리")
+
+    def run(self, dry_run: bool = False) -> Dict:
+        """보관 실행. {'rows_moved', 'files', 'archive_bytes', 'db_bytes_estimate', 'bytes_saved', 'seconds'} 반환"""
+        from .database_models import EventRollup
+
+        started = time.perf_counter()
+        cutoff = datetime.now().replace(microsecond=0) - timedelta(days=self.retention_days)
+
+        # 옮길 행이 집계에 반영된 뒤에만 지운다
+        rollup = EventRollup(self.db)
+        rollup.refresh()
+        mark = rollup.high_water_mark()
+        if mark is None:
+            raise RuntimeError("event_rollup_state 조회 실패 (DB 연결/권한 확인)")
+        rolled_up_id = int(mark.get("last_event_id") or 0)
+
+        if not dry_run:
+            self._resume_pending()
+
+        avg_row = self._avg_row_length()
+        moved = 0
+        files = 0
+        written = 0
+        after = (datetime(1970, 1, 1), 0)
+        while True:
+            rows = self._execute(
+                ARCHIVE_SELECT,
+                (cutoff, rolled_up_id, after[0], after[0], after[1], self.batch_size),
+            )
+            if not rows:
+                break
+            after = (rows[-1]["occurred_at"], rows[-1]["event_id"])
+            if dry_run:
+                moved += len(rows)
+                continue
+            partitions: Dict[tuple, List[dict]] = {}
+            for row in rows:
+                key = (row["occurred_at"].strftime("%Y-%m"), row["user_id"])
+                partitions.setdefault(key, []).append(row)
+            infos = {
+                self.archive.relpath(self.archive.partition_path(month, user_id, part_rows)):
+                    EventArchive.file_info(part_rows)
+                for (month, user_id), part_rows in partitions.items()
+            }
+            # 파일보다 상태를 먼저 기록 (기준일 이동 + 삭제 대기) → 어디서 멈춰도 다음 실행이 이어서 정리
+            self.archive.begin_batch(after[0] + timedelta(seconds=1), infos)
+            batch_written = 0
+            for (month, user_id), part_rows in partitions.items():
+                _path, size = self.archive.write_partition(month, user_id, part_rows)
+                files += 1
+                batch_written += size
+            written += batch_written
+            # 파일을 모두 쓴 뒤에만 삭제
+            self._delete([row["event_id"] for row in rows])
+            self.archive.finish_batch(list(infos), batch_written)
+            moved += len(rows)
+            print(f"[Archive] {moved}행 이동 (~{after[0]})")
+
+        db_bytes = moved * avg_row
+        result = {
+            "cutoff": cutoff,
+            "rows_moved": moved,
+            "files": files,
+            "archive_bytes": written,
+            "db_bytes_estimate": db_bytes,
+            "bytes_saved": max(0, db_bytes - written),
+            "seconds": time.perf_counter() - started,
+            "dry_run": dry_run,
+        }
+        return result
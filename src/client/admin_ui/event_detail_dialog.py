@@ -381,18 +381,20 @@ class EventDetailDialog(QDialog):
             start_time = (occurred_at - timedelta(minutes=5)).strftime('%Y-%m-%d %H:%M:%S')
             end_time = (occurred_at + timedelta(minutes=5)).strftime('%Y-%m-%d %H:%M:%S')
             
-            # 관련 이벤트 조회
-            events = self.event_log_model.search(
+            # 관련 이벤트 조회 (건수는 COUNT, 목록은 표시할 만큼만)
+            filters = dict(
                 user_id=None,  # 동일 사용자만 (구현 필요)
                 start_date=start_time,
                 end_date=end_time
             )
+            total = self.event_log_model.count(**filters) - 1  # 현재 이벤트 제외
+            events = self.event_log_model.search(limit=11, **filters)
             
             # 현재 이벤트 제외
             events = [e for e in events if e['event_id'] != self.event_data['event_id']]
             
-            if events:
-                msg = f'전후 5분 이내에 {len(events)}개의 이벤트가 있습니다:\n\n'
+            if total > 0 and events:
+                msg = f'전후 5분 이내에 {total}개의 이벤트가 있습니다:\n\n'
                 for e in events[:10]:  # 최대 10개만
                     event_time = e['occurred_at']
                     if isinstance(event_time, str):
@@ -401,8 +403,8 @@ class EventDetailDialog(QDialog):
                         time_str = event_time.strftime('%H:%M:%S')
                     msg += f'• [{time_str}] {e["event_type"]} (신뢰도: {e["confidence"]*100:.0f}%)\n'
                 
-                if len(events) > 10:
-                    msg += f'\n... 외 {len(events)-10}개'
+                if total > 10:
+                    msg += f'\n... 외 {total-10}개'
                 
                 QMessageBox.information(self, '관련 이벤트', msg)
             else:
@@ -0,0 +1,351 @@
+"""
+Home Safe Solution - 이벤트 로컬 저장 후 전송 (store-and-forward)
+
+모니터링 중 이벤트를 중앙 MySQL에 바로 INSERT하면 네트워크 DB가 느리거나 끊겼을 때 화면 루프가 멈추므로,
+- add(): 메모리 버퍼에 넣고 즉시 반환 (이벤트마다 DB 왕복 없음)
+- 기록 스레드: 버퍼를 로컬 SQLite(WAL)에 묶음 단위 트랜잭션으로 저장
+- 전송 스레드: 미전송 행을 MySQL event_logs에 여러 행 INSERT로 전송, 실패 시 지수 백오프로 재시도
+  event_uid(UNIQUE)로 중복을 막으므로 전송 후 표시 전에 끊겨 다시 보내도 한 번만 들어간다.
+- 발생 시각(occurred_at)은 로컬 기록 시각을 그대로 전송 (장애 동안의 이벤트도 실제 시각 유지)
+
+.env EVENT_STORE_PATH (기본: .env 폴더의 event_store.db). MySQL 쪽 event_uid 컬럼은 schema_migrations client v2.
+"""
+
+import atexit
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional
+
+_GUI_DIR = os.path.dirname(os.path.abspath(__file__))
+
+WRITE_BATCH = 200          # 기록 스레드가 한 트랜잭션에 넣는 최대 행 수
+WRITE_INTERVAL_SEC = 0.5   # 버퍼가 차지 않아도 이 간격으로 로컬 저장
+SYNC_BATCH = 500           # MySQL INSERT 한 번에 보낼 행 수
+SYNC_INTERVAL_SEC = 2.0
+RETRY_BASE_SEC = 1.0
+RETRY_MAX_SEC = 60.0
+# 전송 완료 행 보관 기간 (이후 로컬에서 정리)
+SENT_RETENTION_SEC = 7 * 24 * 3600
+
+STATUS_PENDING = "pending"
+STATUS_SENT = "sent"
+STATUS_REJECTED = "rejected"  # 서버에 없는 이벤트 타입 등 재시도해도 실패하는 행
+
+COLUMNS = (
+    "event_uid", "user_id", "event_type", "event_status", "occurred_at",
+    "confidence", "hip_height", "spine_angle", "hip_velocity", "accuracy",
+    "video_path", "thumbnail_path", "notes",
+)
+
+MYSQL_INSERT = """
+INSERT INTO event_logs (event_uid, user_id, event_type_id, event_status, occurred_at,
+                        confidence, hip_height, spine_angle, hip_velocity, accuracy,
+                        video_path, thumbnail_path, notes)
+VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+ON DUPLICATE KEY UPDATE event_uid = event_uid
+"""
+
+
+def default_store_path() -> str:
+    base = os.environ.get("ADMIN_UI_ENV_DIR") or _GUI_DIR
+    path = os.environ.get("EVENT_STORE_PATH", "").strip() or "event_store.db"
+    return path if os.path.isabs(path) else os.path.abspath(os.path.join(base, path))
+
+
+def _connect(db_path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(db_path, check_same_thread=False, timeout=10.0)
+    # WAL: 기록 스레드가 쓰는 동안 전송 스레드가 읽어도 서로 막지 않음
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+class EventStore:
+    """로컬 SQLite 이벤트 저장소 + MySQL 일괄 전송"""
+
+    def __init__(self, db, db_path: str = None):
+        self.db = db  # DatabaseManager (중앙 MySQL)
+        self._db_path = db_path or default_store_path()
+        self._buffer: List[tuple] = []
+        self._buffer_lock = threading.Lock()
+        self._write_wake = threading.Event()
+        self._sync_wake = threading.Event()
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._event_type_ids: Dict[str, int] = {}
+        self._sync_failures = 0
+        self._last_sync_error = ""
+        self._synced_total = 0
+        conn = _connect(self._db_path)
+        try:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS pending_events (
+                    local_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    event_uid TEXT NOT NULL UNIQUE,
+                    user_id INTEGER NOT NULL,
+                    event_type TEXT NOT NULL,
+                    event_status TEXT NOT NULL,
+                    occurred_at TEXT NOT NULL,
+                    confidence REAL,
+                    hip_height REAL,
+                    spine_angle REAL,
+                    hip_velocity REAL,
+                    accuracy REAL,
+                    video_path TEXT,
+                    thumbnail_path TEXT,
+                    notes TEXT,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    sent_ts REAL,
+                    last_error TEXT
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_pending_events_status ON pending_events (status, local_id)")
+            conn.execute(
+                "DELETE FROM pending_events WHERE status = ? AND sent_ts < ?",
+                (STATUS_SENT, time.time() - SENT_RETENTION_SEC),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    # --- 기록 ---
+    def add(self, user_id: int, event_type: str, confidence: float = None,
+            hip_height: float = None, spine_angle: float = None,
+            hip_velocity: float = None, accuracy: float = None, **kwargs) -> str:
+        """EventLog.create와 같은 인자. 버퍼에 넣고 event_uid 반환 (DB 대기 없음)"""
+        event_uid = uuid.uuid4().hex
+        row = (
+            event_uid, user_id, event_type, kwargs.get("event_status", "발생"),
+            datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            confidence, hip_height, spine_angle, hip_velocity, accuracy,
+            kwargs.get("video_path"), kwargs.get("thumbnail_path"), kwargs.get("notes"),
+        )
+        with self._buffer_lock:
+            self._buffer.append(row)
+            full = len(self._buffer) >= WRITE_BATCH
+        if full:
+            self._write_wake.set()
+        return event_uid
+
+    def _write_buffer(self, conn: sqlite3.Connection) -> int:
+        with self._buffer_lock:
+            rows, self._buffer = self._buffer, []
+        if not rows:
+            return 0
+        placeholders = ", ".join(["?"] * len(COLUMNS))
+        with conn:  # 한 트랜잭션
+            conn.executemany(
+                f"INSERT OR IGNORE INTO pending_events ({', '.join(COLUMNS)}) VALUES ({placeholders})",
+                rows,
+            )
+        self._sync_wake.set()
+        return len(rows)
+
+    def _run_writer(self):
+        conn = _connect(self._db_path)
+        try:
+            while not self._stop.is_set():
+                self._write_wake.wait(timeout=WRITE_INTERVAL_SEC)
+                self._write_wake.clear()
+                try:
+                    self._write_buffer(conn)
+                except sqlite3.Error as e:
+                    print(f"[EventStore] 로컬 저장 실패: {e}")
+            # 종료 시 남은 버퍼 저장
+            self._write_buffer(conn)
+        finally:
+            conn.close()
+
+    # --- 전송 ---
+    def _load_event_types(self) -> Dict[str, int]:
+        if not self._event_type_ids:
+            rows = self.db.execute_query("SELECT event_type_id, type_name FROM event_types")
+            self._event_type_ids = {r["type_name"]: r["event_type_id"] for r in rows}
+        return self._event_type_ids
+
+    def sync_once(self, conn: sqlite3.Connection) -> int:
+        """미전송 행을 최대 SYNC_BATCH개 전송. 전송한 행 수 반환 (실패 시 예외)"""
+        rows = conn.execute(
+            f"SELECT local_id, {', '.join(COLUMNS)} FROM pending_events "
+            "WHERE status = ? ORDER BY local_id LIMIT ?",
+            (STATUS_PENDING, SYNC_BATCH),
+        ).fetchall()
+        if not rows:
+            return 0
+        type_ids = self._load_event_types()
+        if not type_ids:
+            raise RuntimeError("event_types 조회 실패")
+        params = []
+        sent_ids = []
+        rejected = []  # (local_id, 사유)
+        for row in rows:
+            local_id, values = row[0], dict(zip(COLUMNS, row[1:]))
+            type_id = type_ids.get(values["event_type"])
+            if type_id is None:
+                rejected.append((local_id, "unknown event_type"))
+                continue
+            params.append((
+                values["event_uid"], values["user_id"], type_id, values["event_status"], values["occurred_at"],
+                values["confidence"], values["hip_height"], values["spine_angle"], values["hip_velocity"],
+                values["accuracy"], values["video_path"], values["thumbnail_path"], values["notes"],
+            ))
+            sent_ids.append(local_id)
+
+        if params:
+            bad = self._insert_rows(params)
+            if bad:
+                rejected.extend((sent_ids[i], error) for i, error in bad.items())
+                sent_ids = [local_id for i, local_id in enumerate(sent_ids) if i not in bad]
+
+        now = time.time()
+        with conn:
+            if sent_ids:
+                conn.executemany(
+                    "UPDATE pending_events SET status = ?, sent_ts = ?, last_error = NULL WHERE local_id = ?",
+                    [(STATUS_SENT, now, i) for i in sent_ids],
+                )
+            if rejected:
+                conn.executemany(
+                    "UPDATE pending_events SET status = ?, last_error = ? WHERE local_id = ?",
+                    [(STATUS_REJECTED, error, i) for i, error in rejected],
+                )
+        if rejected:
+            print(f"[EventStore] 전송 제외 {len(rejected)}건 (예: {rejected[0][1]})")
+        if sent_ids:
+            # 대시보드 집계는 이벤트마다가 아니라 전송 묶음마다 한 번 반영
+            from .database_models import EventRollup
+            EventRollup(self.db).refresh()
+        return len(sent_ids) + len(rejected)
+
+    def _insert_rows(self, params: List[tuple]) -> Dict[int, str]:
+        """MySQL에 여러 행 INSERT. 데이터 오류로 거절된 행 {params 인덱스: 오류} 반환 (연결 오류는 예외).
+
+        여러 행 INSERT는 한 행만 잘못돼도(없는 user_id, 범위 초과 값 등) 전체가 실패하므로,
+        그때는 행별로 다시 보내 문제 행만 골라낸다 (나머지 행이 계속 막히지 않도록).
+        """
+        from mysql.connector import DataError, IntegrityError
+
+        mysql_conn = self.db.get_connection()
+        try:
+            cursor = mysql_conn.cursor()
+            try:
+                # executemany → 여러 행 INSERT 한 문장, event_uid 중복은 무시 (재전송해도 안전)
+                cursor.executemany(MYSQL_INSERT, params)
+                mysql_conn.commit()
+                cursor.close()
+                return {}
+            except (DataError, IntegrityError):
+                mysql_conn.rollback()
+            bad = {}
+            for i, row in enumerate(params):
+                try:
+                    cursor.execute(MYSQL_INSERT, row)
+                except (DataError, IntegrityError) as e:
+                    bad[i] = str(e)[:200]  # 실패한 문장만 취소되고 트랜잭션은 유지
+            mysql_conn.commit()
+            cursor.close()
+            return bad
+        finally:
+            mysql_conn.close()
+
+    def _run_sync(self):
+        conn = _connect(self._db_path)
+        try:
+            while not self._stop.is_set():
+                self._sync_wake.clear()
+                try:
+                    sent = self.sync_once(conn)
+                    self._synced_total += sent
+                    if self._sync_failures:
+                        print(f"[EventStore] MySQL 전송 재개 (미전송 {self.pending_count()}건)")
+                    self._sync_failures = 0
+                    self._last_sync_error = ""
+                    if sent >= SYNC_BATCH:
+                        continue  # 밀린 행이 더 있음
+                    wait = SYNC_INTERVAL_SEC
+                except Exception as e:
+                    self._event_type_ids = {}
+                    wait = min(RETRY_MAX_SEC, RETRY_BASE_SEC * (2 ** self._sync_failures))
+                    self._sync_failures += 1
+                    self._last_sync_error = str(e)
+                    print(f"[EventStore] MySQL 전송 실패 ({self._sync_failures}회): {e} → {wait:.0f}초 후 재시도")
+                self._sync_wake.wait(timeout=wait)
+        finally:
+            conn.close()
+
+    # --- 상태 / 수명 ---
+    def pending_count(self) -> int:
+        conn = _connect(self._db_path)
+        try:
+            row = conn.execute("SELECT COUNT(*) FROM pending_events WHERE status = ?", (STATUS_PENDING,)).fetchone()
+        finally:
+            conn.close()
+        with self._buffer_lock:
+            buffered = len(self._buffer)
+        return (int(row[0]) if row else 0) + buffered
+
+    def stats(self) -> dict:
+        return {
+            "pending": self.pending_count(),
+            "synced": self._synced_total,
+            "sync_failures": self._sync_failures,
+            "last_error": self._last_sync_error,
+        }
+
+    def flush(self, timeout: float = 3.0) -> bool:
+        """버퍼를 로컬에 저장하고 전송될 때까지 최대 timeout초 대기. 모두 전송되면 True"""
+        self._write_wake.set()
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            self._sync_wake.set()
+            if self.pending_count() == 0:
+                return True
+            time.sleep(0.1)
+        return False
+
+    def start(self):
+        if self._threads:
+            return
+        self._stop.clear()
+        for target, name in ((self._run_writer, "event-store-writer"), (self._run_sync, "event-store-sync")):
+            thread = threading.Thread(target=target, name=name, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float = 3.0):
+        """남은 버퍼를 로컬에 저장하고 종료 (미전송 행은 다음 실행 때 전송)"""
+        self._stop.set()
+        self._write_wake.set()
+        self._sync_wake.set()
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+        self._threads = []
+
+
+_store: Optional[EventStore] = None
+_store_lock = threading.Lock()
+
+
+def get_event_store(db) -> EventStore:
+    """프로세스 공용 EventStore (처음 호출 시 시작, 프로세스 종료 시 버퍼 저장)"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = EventStore(db)
+            _store.start()
+            atexit.register(_store.stop)
+        return _store
+
+
+def stop_event_store():
+    global _store
+    with _store_lock:
+        if _store is not None:
+            _store.stop()
+            _store = None
@@ -0,0 +1,90 @@
+"""
+Home Safe Solution - 이벤트 검색 결과 테이블 모델
+EventManagementPage / SearchDialog 공용 (키셋 페이지 조회, keyset_table_model 사용)
+"""
+
+import os
+import sys
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QColor
+
+# client/admin_ui -> 프로젝트 루트(src)의 공용 모듈
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
+
+from keyset_table_model import Column, KeysetTableModel  # noqa: E402
+
+# 이벤트 타입별 배경색 (연한 초록/주황/빨강)
+EVENT_TYPE_COLORS = {
+    '정상': QColor(46, 204, 113, 50),
+    '낙상중': QColor(243, 156, 18, 50),
+    '낙상': QColor(231, 76, 60, 50),
+}
+
+# 처리 상태 필터 (event_logs.event_status ENUM)
+STATUS_FILTERS = ['전체', '발생', '조치중', '완료']
+
+_CENTER = Qt.AlignmentFlag.AlignCenter
+
+
+def _time_text(event: dict) -> str:
+    occurred_at = event['occurred_at']
+    if isinstance(occurred_at, str):
+        return occurred_at
+    return occurred_at.strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _confidence_text(event: dict) -> str:
+    confidence = event.get('confidence') or 0
+    return f'{confidence*100:.1f}%'
+
+
+def _hip_text(event: dict) -> str:
+    hip_height = event.get('hip_height')
+    return f'{hip_height:.1f}' if hip_height else '-'
+
+
+def _spine_text(event: dict) -> str:
+    spine_angle = event.get('spine_angle')
+    return f'{spine_angle:.1f}°' if spine_angle else '-'
+
+
+EVENT_COLUMNS = [
+    Column('ID', lambda e: str(e['event_id'])),
+    Column('발생 시간', _time_text),
+    Column('이벤트 타입', lambda e: e['event_type'], _CENTER,
+           lambda e: EVENT_TYPE_COLORS.get(e['event_type'])),
+    Column('신뢰도', _confidence_text, _CENTER),
+    Column('Hip Height', _hip_text, _CENTER),
+    Column('Spine Angle', _spine_text, _CENTER),
+    Column('Status', lambda e: e.get('event_status') or '발생', _CENTER),
+    Column('비고', lambda e: e.get('notes') or ''),
+]
+
+
+def event_key(event: dict) -> tuple:
+    """키셋 정렬 키 (EventLog.search_page의 after)"""
+    return (event['occurred_at'], event['event_id'])
+
+
+def create_event_model(parent=None) -> KeysetTableModel:
+    return KeysetTableModel(EVENT_COLUMNS, key_fn=event_key, parent=parent)
+
+
+def summary_text(summary: dict | None, loaded: int) -> str:
+    """검색 결과 통계 문구. summary = EventLog.aggregate() (LIMIT과 무관한 전체 범위 집계)"""
+    if summary is None:
+        return f'검색 결과: {loaded}건'
+    by_type = summary['by_type']
+    text = (
+        f'검색 결과: {summary["total"]}건  '
+        f'(정상: {by_type.get("정상", 0)}건, 낙상중: {by_type.get("낙상중", 0)}건, '
+        f'낙상: {by_type.get("낙상", 0)}건)'
+    )
+    if summary['avg_confidence'] is not None:
+        text += f'  평균 신뢰도: {summary["avg_confidence"]*100:.1f}%'
+    if loaded < summary['total']:
+        text += f'  | 표시 {loaded}건 (스크롤하면 더 불러옵니다)'
+    return text
@@ -0,0 +1,250 @@
+"""
+Home Safe Solution - 조회 결과 내보내기 (CSV / Excel)
+
+화면 테이블을 셀 단위로 읽거나 결과 전체를 fetchall로 받지 않고,
+별도 DB 연결의 unbuffered 커서로 chunk 단위로 받아 바로 파일에 쓴다 (행 수와 무관하게 메모리 일정).
+백그라운드 스레드(QThread)에서 실행하며 진행 상황을 시그널로 알린다.
+
+    job = ExportJob(db, query, params, '/tmp/events.csv', headers, row_fn)
+    job.progress.connect(...)   # (쓴 행 수, 전체 행 수 또는 0)
+    job.finished_ok.connect(...)  # (파일 경로, 행 수, 소요 초)
+    job.failed.connect(...)     # 오류 메시지
+    job.start()
+
+보관 파일로 옮긴 이벤트(EventLog.export_archive_rows)는 archived_rows로 넘기면
+DB 결과와 (occurred_at, event_id) 내림차순으로 합쳐 쓴다.
+
+xlsx는 openpyxl(write-only 모드)이 설치된 경우에만 지원한다.
+시트 하나의 최대 행 수(XLSX_MAX_ROWS)를 넘으면 머리글을 다시 쓴 새 시트(events_2, ...)로 이어 쓴다.
+"""
+
+import csv
+import heapq
+import os
+import time
+from typing import Callable, Iterable, Optional
+
+import mysql.connector
+from PyQt6.QtCore import Qt, QThread, pyqtSignal
+from PyQt6.QtWidgets import QFileDialog, QMessageBox, QProgressDialog
+
+from .database_models import DatabaseManager
+
+FETCH_CHUNK = 2000
+PROGRESS_EVERY = 10000  # 진행 시그널 간격 (행)
+XLSX_MAX_ROWS = 1048576  # Excel 시트 하나의 최대 행 수 (머리글 포함)
+
+EXPORT_FILE_FILTER = 'CSV Files (*.csv);;Excel Files (*.xlsx)'
+
+
+def export_format(filepath: str) -> str:
+    return 'xlsx' if filepath.lower().endswith('.xlsx') else 'csv'
+
+
+class ExportCancelled(Exception):
+    pass
+
+
+class _CsvSink:
+    def __init__(self, filepath: str):
+        # Excel에서 한글이 깨지지 않도록 BOM 포함
+        self._file = open(filepath, 'w', newline='', encoding='utf-8-sig')
+        self._writer = csv.writer(self._file)
+
+    def write(self, values: list):
+        self._writer.writerow(values)
+
+    def close(self):
+        self._file.close()
+
+
+class _XlsxSink:
+    def __init__(self, filepath: str):
+        try:
+            from openpyxl import Workbook
+        except ImportError:
+            raise RuntimeError('xlsx 내보내기에는 openpyxl이 필요합니다 (pip install openpyxl). CSV로 저장하세요.')
+        self._filepath = filepath
+        # write_only: 행을 메모리에 쌓지 않고 임시 파일로 흘려 씀
+        self._workbook = Workbook(write_only=True)
+        self._sheet = self._workbook.create_sheet('events')
+        self._sheets = 1
+        self._sheet_rows = 0
+        self._headers: list | None = None  # 첫 행 (새 시트에 다시 씀)
+
+    def write(self, values: list):
+        if self._headers is None:
+            self._headers = values
+        elif self._sheet_rows >= XLSX_MAX_ROWS:
+            self._sheets += 1
+            self._sheet = self._workbook.create_sheet(f'events_{self._sheets}')
+            self._sheet.append(self._headers)
+            self._sheet_rows = 1
+        self._sheet.append(values)
+        self._sheet_rows += 1
+
+    def close(self):
+        self._workbook.save(self._filepath)
+
+
+def stream_query_to_file(
+    db: DatabaseManager,
+    query: str,
+    params: tuple,
+    filepath: str,
+    headers: list,
+    row_fn: Callable[[dict], list],
+    on_progress: Optional[Callable[[int], None]] = None,
+    should_stop: Optional[Callable[[], bool]] = None,
+    archived_rows: Optional[Iterable[dict]] = None,
+) -> int:
+    """쿼리 결과를 파일로 스트리밍. 쓴 행 수 반환.
+
+    archived_rows: 쿼리와 같은 순서(occurred_at, event_id 내림차순)의 보관 행. 있으면 DB 행과 합쳐 쓴다.
+
+    커넥션 풀(5개)을 오래 점유하지 않도록 내보내기 전용 연결을 따로 연다.
+    should_stop()이 True가 되면 ExportCancelled (쓰던 파일은 삭제).
+    """
+    conn = mysql.connector.connect(**db.config)
+    try:
+        sink = _XlsxSink(filepath) if export_format(filepath) == 'xlsx' else _CsvSink(filepath)
+    except Exception:
+        conn.close()
+        raise
+    rows_written = 0
+    completed = False
+    try:
+        # buffered=False: 결과를 클라이언트 메모리에 모두 받지 않고 fetchmany마다 소켓에서 읽음
+        cursor = conn.cursor(dictionary=True, buffered=False)
+        cursor.execute(query, params or ())
+        sink.write(headers)
+
+        def db_rows():
+            while True:
+                chunk = cursor.fetchmany(FETCH_CHUNK)
+                if not chunk:
+                    return
+                yield from chunk
+
+        source = db_rows()
+        if archived_rows is not None:
+            source = heapq.merge(source, archived_rows,
+                                 key=lambda r: (r['occurred_at'], r['event_id']), reverse=True)
+        for row in source:
+            sink.write(row_fn(row))
+            rows_written += 1
+            if rows_written % FETCH_CHUNK == 0:
+                if should_stop is not None and should_stop():
+                    raise ExportCancelled()
+                if on_progress is not None:
+                    on_progress(rows_written)
+        cursor.close()
+        completed = True
+    finally:
+        try:
+            # 읽다 만 결과가 남아 있어도 연결 종료로 정리
+            conn.close()
+        except Exception:
+            pass
+        sink.close()
+        if not completed:
+            try:
+                os.remove(filepath)
+            except OSError:
+                pass
+    return rows_written
+
+
+class ExportJob(QThread):
+    """백그라운드 내보내기 작업"""
+
+    progress = pyqtSignal(int, int)        # 쓴 행 수, 전체 행 수(모르면 0)
+    finished_ok = pyqtSignal(str, int, float)  # 파일 경로, 행 수, 소요 초
+    failed = pyqtSignal(str)
+
+    def __init__(self, db: DatabaseManager, query: str, params: tuple, filepath: str,
+                 headers: list, row_fn: Callable[[dict], list], total: int = 0, parent=None,
+                 archived_rows: Optional[Iterable[dict]] = None):
+        super().__init__(parent)
+        self.db = db
+        self.query = query
+        self.params = params
+        self.filepath = filepath
+        self.headers = headers
+        self.row_fn = row_fn
+        self.total = total
+        self.archived_rows = archived_rows
+        self._cancelled = False
+        self._last_progress = 0
+
+    def cancel(self):
+        self._cancelled = True
+
+    def _on_progress(self, rows: int):
+        if rows - self._last_progress >= PROGRESS_EVERY:
+            self._last_progress = rows
+            self.progress.emit(rows, self.total)
+
+    def run(self):
+        started = time.perf_counter()
+        try:
+            rows = stream_query_to_file(
+                self.db, self.query, self.params, self.filepath, self.headers, self.row_fn,
+                on_progress=self._on_progress, should_stop=lambda: self._cancelled,
+                archived_rows=self.archived_rows,
+            )
+        except ExportCancelled:
+            self.failed.emit('내보내기가 취소되었습니다.')
+            return
+        except Exception as e:
+            print(f"[Export] 내보내기 실패: {e}")
+            self.failed.emit(str(e))
+            return
+        self.progress.emit(rows, self.total or rows)
+        elapsed = time.perf_counter() - started
+        print(f"[Export] {rows}행 → {os.path.basename(self.filepath)} ({elapsed:.1f}초)")
+        self.finished_ok.emit(self.filepath, rows, elapsed)
+
+
+def start_export(parent, db: DatabaseManager, query: str, params: tuple, headers: list,
+                 row_fn: Callable[[dict], list], default_name: str, total: int = 0,
+                 archived_rows: Optional[Iterable[dict]] = None) -> Optional[ExportJob]:
+    """저장 위치를 묻고 진행 대화상자와 함께 내보내기 시작. 취소하면 None.
+
+    반환된 ExportJob은 끝날 때까지 호출 측이 참조를 유지해야 한다.
+    """
+    filepath, _ = QFileDialog.getSaveFileName(
+        parent, '내보내기', os.path.expanduser(f'~/Downloads/{default_name}.csv'), EXPORT_FILE_FILTER
+    )
+    if not filepath:
+        return None
+
+    job = ExportJob(db, query, params, filepath, headers, row_fn, total, parent, archived_rows)
+    dialog = QProgressDialog('내보내는 중...', '취소', 0, total or 0, parent)
+    dialog.setWindowTitle('내보내기')
+    dialog.setWindowModality(Qt.WindowModality.WindowModal)
+    dialog.setMinimumDuration(500)
+    dialog.canceled.connect(job.cancel)
+
+    def on_progress(rows: int, total_rows: int):
+        if total_rows:
+            dialog.setMaximum(total_rows)
+            dialog.setValue(min(rows, total_rows))
+        dialog.setLabelText(f'내보내는 중... {rows:,}행')
+
+    def on_finished(path: str, rows: int, elapsed: float):
+        dialog.reset()
+        QMessageBox.information(
+            parent, '성공',
+            f'내보내기를 완료했습니다!\n\n파일: {path}\n{rows:,}행, {elapsed:.1f}초'
+        )
+
+    def on_failed(message: str):
+        dialog.reset()
+        QMessageBox.warning(parent, '내보내기', f'내보내기 실패:\n{message}')
+
+    job.progress.connect(on_progress)
+    job.finished_ok.connect(on_finished)
+    job.failed.connect(on_failed)
+    job.start()
+    return job
@@ -329,5 +329,8 @@ class MainWindow(QMainWindow):
                 page = self.page_stack.widget(i)
                 if hasattr(page, 'stop_monitoring'):
                     page.stop_monitoring()
+        # 로컬 저장소 버퍼 저장 (미전송 이벤트는 다음 실행 때 전송)
+        from .event_store import stop_event_store
+        stop_event_store()
         
         event.accept()
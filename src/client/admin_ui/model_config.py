@@ -0,0 +1,80 @@
+"""
+낙상 감지 모델 목록과 .env USE_MODEL 해석 (Qt 없음).
+
+모델 선택 다이얼로그(model_selection_dialog)와 통합 러너(unified_fall_runner)가 함께 사용한다.
+러너는 헤드리스 엣지 데몬/서버 판정 워커에서도 쓰이므로 여기서는 PyQt6를 import하지 않는다.
+"""
+
+import os
+import sys
+
+_GUI_DIR = os.path.dirname(os.path.abspath(__file__))
+# client/admin_ui -> 프로젝트 루트(src)의 env_config
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(_GUI_DIR))
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
+
+from env_config import get_config  # noqa: E402
+
+_STGCN_PATH = os.path.join(_GUI_DIR, "checkpoints_finetuned", "best_model_finetuned.pth")
+
+# 선택 다이얼로그에 표시하는 모델
+MODELS = {
+    'random_forest': {
+        'name': 'Random Forest',
+        'accuracy': 94.50,
+        'description': '프레임 단위 즉시 추론\n빠른 응답 속도 (0.01ms)',
+        'icon': '🌲',
+        'type': 'random_forest',
+        'model_path': None,
+        'inference_type': 'frame'
+    },
+    'stgcn_finetuned': {
+        'name': 'ST-GCN (Fine-tuned v2)',
+        'accuracy': 99.63,
+        'description': '60프레임 시퀀스 분석\nPYSKL Pre-trained + 대규모 데이터',
+        'icon': '🚀',
+        'type': 'stgcn',
+        'model_path': _STGCN_PATH,
+        'inference_type': 'sequence',
+        'model_version': 'finetuned'
+    }
+}
+
+
+def get_model_config_from_env() -> dict:
+    """
+    .env의 USE_MODEL(RandomForest | ST-GCN-Original | ST-GCN-Fine-tuned)을 읽어
+    모델 설정 dict 반환. ADMIN_UI_ENV_DIR 또는 admin_ui 디렉터리의 .env 사용.
+    .env는 env_config 캐시로 읽으므로 실행 중 USE_MODEL을 바꾸면 다음 호출부터 반영된다.
+    """
+    base = os.environ.get("ADMIN_UI_ENV_DIR") or _GUI_DIR
+    use_model = get_config(base).get_str("USE_MODEL", "RandomForest") or "RandomForest"
+    use_model_lower = use_model.lower().replace("-", "").replace(" ", "")
+
+    if "stgcnfinetuned" in use_model_lower or "finetuned" in use_model_lower:
+        model_path = _STGCN_PATH
+        return {
+            "key": "stgcn_finetuned",
+            "name": "ST-GCN (Fine-tuned v2)",
+            "type": "stgcn",
+            "model_path": model_path if os.path.exists(model_path) else None,
+            "inference_type": "sequence",
+        }
+    if "stgcnoriginal" in use_model_lower or "original" in use_model_lower:
+        model_path = os.path.join(_GUI_DIR, "checkpoints", "best_model_binary.pth")
+        return {
+            "key": "stgcn_original",
+            "name": "ST-GCN (Original)",
+            "type": "stgcn",
+            "model_path": model_path if os.path.exists(model_path) else None,
+            "inference_type": "sequence",
+        }
+    # 기본: RandomForest
+    return {
+        "key": "random_forest",
+        "name": "Random Forest",
+        "type": "random_forest",
+        "model_path": None,
+        "inference_type": "frame",
+    }
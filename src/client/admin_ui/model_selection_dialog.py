@@ -14,35 +14,17 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont
 
-
-_GUI_DIR = os.path.dirname(os.path.abspath(__file__))
-_STGCN_PATH = os.path.join(_GUI_DIR, "checkpoints_finetuned", "best_model_finetuned.pth")
+# 모델 목록/USE_MODEL 해석은 Qt 없는 model_config에 둠 (헤드리스 러너도 사용)
+try:
+    from .model_config import MODELS
+except ImportError:  # 독립 실행 테스트 (python model_selection_dialog.py)
+    from model_config import MODELS
 
 
 class ModelSelectionDialog(QDialog):
     """낙상 감지 모델 선택 다이얼로그"""
 
-    MODELS = {
-        'random_forest': {
-            'name': 'Random Forest',
-            'accuracy': 94.50,
-            'description': '프레임 단위 즉시 추론\n빠른 응답 속도 (0.01ms)',
-            'icon': '🌲',
-            'type': 'random_forest',
-            'model_path': None,
-            'inference_type': 'frame'
-        },
-        'stgcn_finetuned': {
-            'name': 'ST-GCN (Fine-tuned v2)',
-            'accuracy': 99.63,
-            'description': '60프레임 시퀀스 분석\nPYSKL Pre-trained + 대규모 데이터',
-            'icon': '🚀',
-            'type': 'stgcn',
-            'model_path': _STGCN_PATH,
-            'inference_type': 'sequence',
-            'model_version': 'finetuned'
-        }
-    }
+    MODELS = MODELS
     
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -276,56 +258,6 @@ def show_model_selection_dialog(parent=None) -> dict:
         }
 
 
-def get_model_config_from_env() -> dict:
-    """
-    .env의 USE_MODEL(RandomForest | ST-GCN-Original | ST-GCN-Fine-tuned)을 읽어
-    모델 설정 dict 반환. ADMIN_UI_ENV_DIR 또는 admin_ui 디렉터리의 .env 사용.
-    """
-    base = os.environ.get("ADMIN_UI_ENV_DIR") or _GUI_DIR
-    env_path = os.path.join(base, ".env")
-    if os.path.isfile(env_path):
-        try:
-            from dotenv import load_dotenv
-            load_dotenv(env_path, override=False)
-        except ImportError:
-            with open(env_path, "r", encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith("#") and "=" in line:
-                        k, v = line.split("=", 1)
-                        os.environ.setdefault(k.strip(), v.strip())
-
-    use_model = (os.environ.get("USE_MODEL") or "RandomForest").strip()
-    use_model_lower = use_model.lower().replace("-", "").replace(" ", "")
-
-    if "stgcnfinetuned" in use_model_lower or "finetuned" in use_model_lower:
-        model_path = os.path.join(_GUI_DIR, "checkpoints_finetuned", "best_model_finetuned.pth")
-        return {
-            "key": "stgcn_finetuned",
-            "name": "ST-GCN (Fine-tuned v2)",
-            "type": "stgcn",
-            "model_path": model_path if os.path.exists(model_path) else None,
-            "inference_type": "sequence",
-        }
-    if "stgcnoriginal" in use_model_lower or "original" in use_model_lower:
-        model_path = os.path.join(_GUI_DIR, "checkpoints", "best_model_binary.pth")
-        return {
-            "key": "stgcn_original",
-            "name": "ST-GCN (Original)",
-            "type": "stgcn",
-            "model_path": model_path if os.path.exists(model_path) else None,
-            "inference_type": "sequence",
-        }
-    # 기본: RandomForest
-    return {
-        "key": "random_forest",
-        "name": "Random Forest",
-        "type": "random_forest",
-        "model_path": None,
-        "inference_type": "frame",
-    }
-
-
 # 테스트
 if __name__ == '__main__':
     import sys
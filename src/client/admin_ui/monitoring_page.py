@@ -16,10 +16,9 @@ QTimer 기반 - 안정적
 
 import sys
 import os
-import csv
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                              QFrame, QPushButton, QTextEdit, QGroupBox, QMessageBox,
-                             QRadioButton, QButtonGroup, QFileDialog, QApplication)
+                             QRadioButton, QButtonGroup, QApplication)
 from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QFont, QImage, QPixmap
 import cv2
@@ -31,6 +30,7 @@ import time
 
 # OneEuroFilter
 from .one_euro_filter import KeypointFilter
+from .window_stats import SlidingWindowStats
 
 # YOLO Pose
 try:
@@ -61,11 +61,12 @@ _GUI_DIR = os.path.dirname(os.path.abspath(__file__))
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
 class AccuracyTracker:
-    """5분 정확도 추적"""
+    """5분 정확도 추적 (정답 여부를 1/0 값으로 누적, 예측 클래스별 개수 포함)"""
     
     def __init__(self, window_seconds=300):
         self.window_seconds = window_seconds
-        self.predictions = deque()
+        # 1초 단위로 묶어 보관 (프레임마다 기록해도 항목 수는 구간 초 수 이하)
+        self.stats = SlidingWindowStats(window_seconds, bucket_seconds=1.0)
         self.ground_truth = 'Normal'
     
     def set_ground_truth(self, state):
@@ -73,29 +74,18 @@ class AccuracyTracker:
             self.ground_truth = state
     
     def record_prediction(self, predicted_state):
-        current_time = time.time()
         is_correct = (self.ground_truth == predicted_state)
-        
-        self.predictions.append({
-            'timestamp': current_time,
-            'ground_truth': self.ground_truth,
-            'predicted': predicted_state,
-            'correct': is_correct
-        })
-        
-        cutoff_time = current_time - self.window_seconds
-        while self.predictions and self.predictions[0]['timestamp'] < cutoff_time:
-            self.predictions.popleft()
+        self.stats.add(1.0 if is_correct else 0.0, label=predicted_state)
     
     def get_accuracy(self):
-        if len(self.predictions) == 0:
-            return 0.0
-        correct_count = sum(1 for p in self.predictions if p['correct'])
-        total_count = len(self.predictions)
-        return (correct_count / total_count) * 100
+        return self.stats.mean() * 100
     
     def get_sample_count(self):
-        return len(self.predictions)
+        return self.stats.count()
+    
+    def get_class_counts(self):
+        """최근 구간 예측 클래스별 개수"""
+        return self.stats.label_counts()
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
@@ -107,6 +97,7 @@ class MonitoringPage(QWidget):
         super().__init__(**kwargs)
         self.user_info = user_info
         self.db = db
+        self.export_job = None  # 결과 저장 (export_service)
         self._input_config = input_config
         self._model_config = model_config
         self.cap = None
@@ -150,7 +141,7 @@ class MonitoringPage(QWidget):
         if model_config is None:
             model_config = show_model_selection_dialog(self)
         if model_config is None:
-            from .model_selection_dialog import get_model_config_from_env
+            from .model_config import get_model_config_from_env
             model_config = get_model_config_from_env()
         self.model_type = model_config['type']  # 'random_forest' or 'stgcn'
         self.model_name = model_config.get('name', 'Unknown')
@@ -181,6 +172,9 @@ class MonitoringPage(QWidget):
         # EventLog 모델 초기화
         from .database_models import EventLog
         self.event_log_model = EventLog(db)
+        # 감지 이벤트는 로컬 저장소에 넣고 백그라운드로 MySQL 전송 (화면 루프에서 DB 대기 없음)
+        from .event_store import get_event_store
+        self.event_store = get_event_store(db)
         
         # Keypoint 필터 초기화
         self.filter_strength = 'medium'  # 'none', 'light', 'medium', 'strong'
@@ -1434,7 +1428,7 @@ class MonitoringPage(QWidget):
             # 정확도 가져오기 (최근 5분 평균)
             accuracy = float(self.accuracy_tracker.get_accuracy())
             
-            event_id = self.event_log_model.create(
+            event_uid = self.event_store.add(
                 user_id=self.user_info['user_id'],
                 event_type=event_type,
                 confidence=confidence,
@@ -1446,13 +1440,10 @@ class MonitoringPage(QWidget):
                 notes=f'AI Detection - {self.class_names[prediction]}'
             )
             
-            if event_id:
-                if prediction == 0:
-                    self.safe_add_log(f"[DB] Normal saved (ID: {event_id}, Acc: {accuracy:.1f}%)")
-                else:
-                    self.safe_add_log(f"[DB] {event_type} saved (ID: {event_id}, Acc: {accuracy:.1f}%)")
+            if prediction == 0:
+                self.safe_add_log(f"[DB] Normal queued (UID: {event_uid[:8]}, Acc: {accuracy:.1f}%)")
             else:
-                self.safe_add_log(f"[DB] Failed to save {event_type}")
+                self.safe_add_log(f"[DB] {event_type} queued (UID: {event_uid[:8]}, Acc: {accuracy:.1f}%)")
                 
         except Exception as e:
             print(f"[ERROR] DB 저장 실패: {e}")
@@ -1489,6 +1480,10 @@ class MonitoringPage(QWidget):
         """긴급 호출 버튼 클릭"""
         self.add_log("[ALERT] Emergency Call activated!")
         
+        # 로컬 저장소에 남은 이벤트를 먼저 전송 (방금 감지한 낙상이 조회되도록)
+        if not self.event_store.flush(timeout=3.0):
+            self.add_log("[DB] Pending events not yet synced")
+        
         # 가장 최근 낙상 이벤트 조회
         recent_fall = self.event_log_model.get_recent_fall_event(user_id=self.user_info['user_id'])
         
@@ -1772,12 +1767,6 @@ class MonitoringPage(QWidget):
             confidence: 예측 신뢰도 (0.0 ~ 1.0)
         """
         try:
-            # EventLog 모델 임포트
-            from .database_models import EventLog
-            
-            # EventLog 인스턴스 생성
-            event_log = EventLog(self.db)
-            
             # 이벤트 타입 매핑 (영문 -> 한글)
             event_type_map = {
                 'Normal': '정상',
@@ -1788,8 +1777,8 @@ class MonitoringPage(QWidget):
             korean_event_type = event_type_map.get(event_type, '낙상')
             
             accuracy = self.accuracy_tracker.get_accuracy()
-            # DB에 이벤트 저장
-            event_id = event_log.create(
+            # 로컬 저장소에 넣고 백그라운드로 DB 전송
+            event_uid = self.event_store.add(
                 user_id=self.user_info['user_id'],  # 기존 구조에 맞춤
                 event_type=korean_event_type,
                 confidence=confidence,
@@ -1801,10 +1790,7 @@ class MonitoringPage(QWidget):
                 notes=f'{event_type} detected with {confidence*100:.1f}% confidence'
             )
             
-            if event_id:
-                self.add_log(f"[DB] Event saved: ID={event_id}, Type={korean_event_type}, Conf={confidence:.2f}, Acc={accuracy:.1f}%")
-            else:
-                self.add_log(f"[ERROR] Failed to save event to DB")
+            self.add_log(f"[DB] Event queued: UID={event_uid[:8]}, Type={korean_event_type}, Conf={confidence:.2f}, Acc={accuracy:.1f}%")
         
         except Exception as e:
             self.add_log(f"[ERROR] DB save error: {str(e)[:50]}")
@@ -1914,81 +1900,57 @@ class MonitoringPage(QWidget):
             self.safe_add_log("[VIDEO] 반복 재생 OFF")
     
     def save_results_to_csv(self):
-        """분석 결과 CSV로 저장"""
+        """분석 결과 CSV/Excel로 저장 (DB에서 스트리밍, 행 수 제한 없음)"""
         if self.input_type != "file":
             self.safe_add_log("[WARN] 동영상 파일 모드에서만 사용 가능")
             return
         
+        if self.export_job is not None and self.export_job.isRunning():
+            self.safe_add_log("[WARN] 이미 저장 중입니다")
+            return
+        
         try:
-            # 저장 경로 선택
-            default_filename = f"fall_detection_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-            filepath, _ = QFileDialog.getSaveFileName(
-                self,
-                "결과 저장",
-                os.path.expanduser(f"~/Downloads/{default_filename}"),
-                "CSV Files (*.csv);;All Files (*.*)"
-            )
-            
-            if not filepath:
-                return
+            from .export_service import start_export
+            
+            query = """
+            SELECT event_id, occurred_at, et.type_name, confidence, accuracy
+            FROM event_logs el
+            JOIN event_types et ON el.event_type_id = et.event_type_id
+            WHERE el.user_id = %s
+            ORDER BY occurred_at DESC
+            """
+            headers = [
+                "Frame Number",
+                "Time (seconds)",
+                "Event Type",
+                "Confidence",
+                "Detection Accuracy (%)",
+                "Timestamp"
+            ]
             
-            # CSV 저장
-            with open(filepath, "w", newline="", encoding="utf-8") as f:
-                writer = csv.writer(f)
-                
-                writer.writerow([
-                    "Frame Number",
-                    "Time (seconds)",
-                    "Event Type",
-                    "Confidence",
-                    "Detection Accuracy (%)",
-                    "Timestamp"
-                ])
-                
-                try:
-                    from .database_models import EventLog
-                    event_log = EventLog(self.db)
-                    
-                    query = """
-                    SELECT event_id, occurred_at, et.type_name, confidence, accuracy
-                    FROM event_logs el
-                    JOIN event_types et ON el.event_type_id = et.event_type_id
-                    WHERE el.user_id = %s
-                    ORDER BY occurred_at DESC
-                    LIMIT 1000
-                    """
-                    
-                    results = self.db.execute_query(query, (self.user_info["user_id"],))
-                    
-                    for row in results:
-                        writer.writerow([
-                            row.get("event_id", "N/A"),
-                            "N/A",
-                            row.get("type_name", "Unknown"),
-                            f"{row.get('confidence', 0):.2f}",
-                            f"{row.get('accuracy', 0):.1f}",
-                            row.get("occurred_at", "N/A")
-                        ])
-                
-                except Exception as e:
-                    print(f"[WARN] DB 조회 실패: {e}")
-                    writer.writerow([
-                        self.frame_count,
-                        f"{self.current_frame_num / self.original_fps:.2f}",
-                        "Analysis Complete",
-                        "N/A",
-                        "N/A",
-                        datetime.now().isoformat()
-                    ])
-            
-            self.safe_add_log(f"[SAVE] 결과 저장: {os.path.basename(filepath)}")
-            
-            msg = QMessageBox(self)
-            msg.setIcon(QMessageBox.Icon.Information)
-            msg.setWindowTitle("저장 완료")
-            msg.setText(f"분석 결과가 저장되었습니다.")
-            msg.setInformativeText(filepath)
-            msg.exec()
+            def row_fn(row):
+                return [
+                    row.get("event_id", "N/A"),
+                    "N/A",
+                    row.get("type_name") or "Unknown",
+                    f"{row.get('confidence') or 0:.2f}",
+                    f"{row.get('accuracy') or 0:.1f}",
+                    row.get("occurred_at", "N/A")
+                ]
+            
+            default_name = f"fall_detection_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            self.export_job = start_export(
+                self, self.db, query, (self.user_info["user_id"],), headers, row_fn, default_name
+            )
+            if self.export_job is not None:
+                self.export_job.finished_ok.connect(
+                    lambda path, rows, _elapsed: self.safe_add_log(
+                        f"[SAVE] 결과 저장: {os.path.basename(path)} ({rows}행)"
+                    )
+                )
+                self.export_job.failed.connect(
+                    lambda message: self.safe_add_log(f"[ERROR] 저장 실패: {message}")
+                )
             
         except Exception as e:
             self.safe_add_log(f"[ERROR] 저장 실패: {str(e)}")
@@ -0,0 +1,319 @@
+"""
+YOLO Pose 워커 프로세스 풀.
+
+같은 프로세스의 YOLO 추론은 Qt 이벤트 루프/업링크 스레드와 GIL을 나눠 쓰므로,
+포즈 추론만 워커 프로세스로 옮긴다.
+- 프레임: multiprocessing.shared_memory 슬롯 링에 복사 (큐로 프레임을 pickle하지 않음)
+- 작업/결과: (작업 번호, 슬롯, shape) / (작업 번호, 키포인트, 박스) 작은 메시지만 큐로 전달
+- 워커 N개가 공용 작업 큐에서 가져가 처리, detect()는 입력 순서대로 결과 반환
+  (스트림마다 이전 결과를 받은 뒤 다음 프레임을 넣으므로 스트림별 순서 유지)
+
+.env POSE_WORKERS=N (N>0)이면 FallModels가 자동으로 사용 → UnifiedFallRunner/BatchedFallBackend 변경 없음.
+FallModels는 start(wait_ready=False)로 시작하고 워커가 준비(ready)되기 전에는 같은 프로세스 YOLO를 쓴다.
+결과 수집 스레드가 워커 생존을 확인해 죽은 워커를 다시 띄우고, 처리 중이던 작업은 오류로 끝내 슬롯을 돌려받는다.
+"""
+
+import itertools
+import multiprocessing as mp
+import os
+import queue
+import threading
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+_GUI_DIR = os.path.dirname(os.path.abspath(__file__))
+
+DEFAULT_YOLO_PATH = os.path.join(_GUI_DIR, "models", "yolo11s-pose.pt")
+# 슬롯 1개 크기 (1920x1080 BGR). 더 큰 프레임은 submit 시 ValueError
+DEFAULT_SLOT_BYTES = 1920 * 1080 * 3
+WORKER_MAX_BATCH = 8
+READY_TIMEOUT_SEC = 120.0
+SLOT_TIMEOUT_SEC = 5.0      # 빈 슬롯 대기 상한 (넘으면 TimeoutError, 호출 스레드가 멈추지 않도록)
+HEALTH_CHECK_SEC = 1.0      # 결과 수집 스레드의 워커 생존 확인 간격
+MAX_RESPAWNS = 5            # 워커 재시작 상한 (모델 로드 자체가 실패하는 경우 무한 재시작 방지)
+
+
+def _worker_main(yolo_path: str, shm_name: str, slot_bytes: int, torch_threads: int, job_q, result_q):
+    """워커: 공유 메모리 슬롯의 프레임으로 YOLO Pose 실행 (대기 작업이 여러 개면 배치)."""
+    try:
+        import torch
+        torch.set_num_threads(max(1, torch_threads))
+    except Exception:
+        pass
+    # unified_fall_runner는 Qt 대화상자 모듈까지 import하므로 워커에서는 YOLO만 직접 사용
+    # (admin_ui/__init__은 AdminUiWidget을 지연 import하므로 패키지 import 시 PyQt6를 불러오지 않음)
+    from ultralytics import YOLO
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        model = YOLO(yolo_path)
+        result_q.put(("__ready__", os.getpid(), None))
+        while True:
+            jobs = [job_q.get()]
+            if jobs[0] is None:
+                break
+            stop = False
+            while len(jobs) < WORKER_MAX_BATCH:
+                try:
+                    job = job_q.get_nowait()
+                except queue.Empty:
+                    break
+                if job is None:
+                    stop = True
+                    break
+                jobs.append(job)
+            frames = [
+                np.ndarray(shape, dtype=np.uint8, buffer=shm.buf, offset=slot * slot_bytes)
+                for _job_id, slot, shape in jobs
+            ]
+            try:
+                results = model(frames if len(frames) > 1 else frames[0], verbose=False)
+                for i, (job_id, _slot, _shape) in enumerate(jobs):
+                    r = results[i] if results is not None and i < len(results) else None
+                    if r is None or r.keypoints is None or r.boxes is None:
+                        result_q.put((job_id, np.zeros((0, 17, 3), np.float32), np.zeros((0, 4), np.float32)))
+                        continue
+                    result_q.put((
+                        job_id,
+                        r.keypoints.data.cpu().numpy().astype(np.float32, copy=False),
+                        r.boxes.xyxy.cpu().numpy().astype(np.float32, copy=False),
+                    ))
+            except Exception as e:
+                for job_id, _slot, _shape in jobs:
+                    result_q.put((job_id, None, str(e)))
+            del frames  # 공유 메모리 버퍼 참조 해제 (close 전에 필요)
+            if stop:
+                break
+    finally:
+        shm.close()
+
+
+class _PoseJob:
+    __slots__ = ("job_id", "slot", "event", "result", "error")
+
+    def __init__(self, slot: int):
+        self.job_id = 0
+        self.slot = slot
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class PoseWorkerPool:
+    """공유 메모리 프레임 링 + YOLO Pose 워커 프로세스 N개."""
+
+    def __init__(
+        self,
+        workers: int = 2,
+        yolo_path: str = DEFAULT_YOLO_PATH,
+        slots: int | None = None,
+        slot_bytes: int = DEFAULT_SLOT_BYTES,
+        torch_threads: int | None = None,
+    ):
+        self._num_workers = max(1, workers)
+        self._yolo_path = yolo_path
+        self._num_slots = slots or self._num_workers * WORKER_MAX_BATCH
+        self._slot_bytes = slot_bytes
+        self._torch_threads = torch_threads or max(1, (os.cpu_count() or 1) // self._num_workers)
+        self._shm: shared_memory.SharedMemory | None = None
+        self._free_slots: queue.Queue[int] = queue.Queue()
+        self._jobs: dict[int, _PoseJob] = {}
+        self._jobs_lock = threading.Lock()
+        self._job_ids = itertools.count(1)
+        self._procs: list = []
+        self._job_q = None
+        self._result_q = None
+        self._result_thread: threading.Thread | None = None
+        self._started = False
+        self._ready_pids: set[int] = set()
+        self._respawns = 0
+        self.failed = False  # 재시작 상한 초과: 호출 측은 같은 프로세스 실행으로 전환
+
+    @property
+    def workers(self) -> int:
+        return self._num_workers
+
+    @property
+    def ready(self) -> bool:
+        """워커가 하나 이상 모델 로드를 마쳤고 풀이 정상이면 True."""
+        return self._started and not self.failed and bool(self._ready_pids)
+
+    def _spawn_worker(self):
+        proc = self._ctx.Process(
+            target=_worker_main,
+            args=(self._yolo_path, self._shm.name, self._slot_bytes, self._torch_threads, self._job_q, self._result_q),
+            daemon=True,
+        )
+        proc.start()
+        return proc
+
+    def start(self, wait_ready: bool = True):
+        """공유 메모리 생성 + 워커 시작. wait_ready면 모든 워커의 모델 로드를 기다린다."""
+        if self._started:
+            return
+        if not os.path.exists(self._yolo_path):
+            raise FileNotFoundError(self._yolo_path)
+        self._ctx = mp.get_context("spawn")
+        self._shm = shared_memory.SharedMemory(create=True, size=self._num_slots * self._slot_bytes)
+        for slot in range(self._num_slots):
+            self._free_slots.put(slot)
+        self._job_q = self._ctx.Queue()
+        self._result_q = self._ctx.Queue()
+        self._procs = [self._spawn_worker() for _ in range(self._num_workers)]
+        self._started = True
+        self._result_thread = threading.Thread(target=self._collect_results, name="pose-pool-results", daemon=True)
+        self._result_thread.start()
+        print(f"[PoseWorkerPool] 워커 {self._num_workers}개 시작 (torch threads/worker={self._torch_threads})")
+        if wait_ready:
+            deadline = time.monotonic() + READY_TIMEOUT_SEC
+            while len(self._ready_pids) < self._num_workers:
+                if self.failed or time.monotonic() > deadline:
+                    self.stop()
+                    raise RuntimeError("포즈 워커 모델 로드 실패/시간 초과")
+                time.sleep(0.1)
+
+    def stop(self):
+        if not self._started:
+            return
+        self._started = False
+        for _ in self._procs:
+            self._job_q.put(None)
+        for proc in self._procs:
+            proc.join(timeout=3)
+            if proc.is_alive():
+                proc.terminate()
+        self._procs = []
+        self._result_q.put(("__stop__", None, None))
+        if self._result_thread is not None:
+            self._result_thread.join(timeout=2)
+            self._result_thread = None
+        # 결과를 기다리던 호출자 해제
+        with self._jobs_lock:
+            for job in self._jobs.values():
+                job.error = "pool stopped"
+                job.event.set()
+            self._jobs.clear()
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def submit(self, frame: np.ndarray) -> _PoseJob:
+        """프레임을 빈 슬롯에 복사하고 작업 등록 (빈 슬롯이 없으면 대기)."""
+        if not self._started:
+            raise RuntimeError("PoseWorkerPool이 시작되지 않았습니다")
+        if frame.dtype != np.uint8 or frame.nbytes > self._slot_bytes:
+            raise ValueError(f"슬롯에 넣을 수 없는 프레임: {frame.shape} {frame.dtype}")
+        try:
+            slot = self._free_slots.get(timeout=SLOT_TIMEOUT_SEC)
+        except queue.Empty:
+            raise TimeoutError("포즈 워커 빈 슬롯 없음")
+        view = np.ndarray(frame.shape, dtype=np.uint8, buffer=self._shm.buf, offset=slot * self._slot_bytes)
+        view[...] = frame
+        del view
+        job = _PoseJob(slot)
+        job.job_id = next(self._job_ids)
+        with self._jobs_lock:
+            self._jobs[job.job_id] = job
+        self._job_q.put((job.job_id, slot, frame.shape))
+        return job
+
+    def _abandon(self, job: _PoseJob):
+        """응답을 기다리지 않을 작업: 등록 해제하고 슬롯 반환 (늦게 온 결과는 _collect_results가 무시).
+
+        워커가 아직 그 슬롯을 읽는 중이면 다음 프레임과 섞일 수 있지만, 그 결과는 버려지므로 영향 없음.
+        """
+        with self._jobs_lock:
+            owned = self._jobs.pop(job.job_id, None) is not None
+        if owned:
+            self._free_slots.put(job.slot)
+
+    def detect(self, frames: list, timeout: float | None = 30.0) -> list:
+        """detect_poses와 같은 형식: 프레임 목록 → 프레임별 PoseDetections (입력 순서)."""
+        from .unified_fall_runner import PoseDetections
+
+        jobs = []
+        try:
+            for f in frames:
+                jobs.append(self.submit(f))
+            detections = []
+            for job in jobs:
+                if not job.event.wait(timeout):
+                    raise TimeoutError("포즈 워커 응답 없음")
+                if job.error is not None:
+                    raise RuntimeError(f"포즈 워커 오류: {job.error}")
+                keypoints, boxes = job.result
+                detections.append(PoseDetections(keypoints, boxes))
+            return detections
+        finally:
+            # 시간 초과/오류로 끝난 작업의 슬롯 회수 (완료된 작업은 이미 반환됨)
+            for job in jobs:
+                if not job.event.is_set():
+                    self._abandon(job)
+
+    def _check_workers(self):
+        """죽은 워커를 다시 띄우고, 처리 중이던 작업은 오류로 끝냄 (어느 워커가 가져갔는지 모르므로 전부).
+
+        재시작 상한을 넘으면 죽은 워커를 목록에서 빼고(failed) 이후에는 검사하지 않는다.
+        """
+        if self.failed or not self._started:
+            return
+        dead = [i for i, proc in enumerate(self._procs) if not proc.is_alive()]
+        if not dead:
+            return
+        with self._jobs_lock:
+            jobs = list(self._jobs.values())
+            self._jobs.clear()
+        for job in jobs:
+            job.error = "pose worker died"
+            self._free_slots.put(job.slot)
+            job.event.set()
+        for i in dead:
+            print(f"[PoseWorkerPool] 워커 종료 감지 (exitcode={self._procs[i].exitcode})")
+            self._ready_pids.discard(self._procs[i].pid)
+            self._procs[i].join(timeout=0)  # 종료된 프로세스 회수
+            if self._respawns >= MAX_RESPAWNS:
+                self.failed = True
+                continue
+            self._respawns += 1
+            self._procs[i] = self._spawn_worker()
+            print(f"[PoseWorkerPool] 워커 재시작 ({self._respawns}/{MAX_RESPAWNS})")
+        if self.failed:
+            # 죽은 워커를 남겨 두면 다음 검사마다 같은 종료가 다시 감지되므로 살아 있는 워커만 남김 (stop에서 정리)
+            self._procs = [proc for proc in self._procs if proc.is_alive()]
+            print("[PoseWorkerPool] 워커 재시작 상한 초과 - 같은 프로세스 실행으로 전환")
+
+    def _collect_results(self):
+        next_check = time.monotonic() + HEALTH_CHECK_SEC
+        while True:
+            try:
+                msg = self._result_q.get(timeout=HEALTH_CHECK_SEC)
+            except queue.Empty:
+                msg = None
+            except (EOFError, OSError):
+                return
+            # 다른 워커 결과가 계속 와도 주기적으로 생존 확인
+            if time.monotonic() >= next_check:
+                self._check_workers()
+                next_check = time.monotonic() + HEALTH_CHECK_SEC
+            if msg is None:
+                continue
+            job_id, keypoints, boxes = msg
+            if job_id == "__stop__":
+                return
+            if job_id == "__ready__":
+                self._ready_pids.add(keypoints)  # ("__ready__", pid, None)
+                continue
+            with self._jobs_lock:
+                job = self._jobs.pop(job_id, None)
+            if job is None:
+                continue
+            if keypoints is None:
+                job.error = boxes
+            else:
+                job.result = (keypoints, boxes)
+            # 워커가 결과를 보낸 뒤에는 슬롯을 다시 쓰지 않으므로 재사용 가능
+            self._free_slots.put(job.slot)
+            job.event.set()
@@ -4,12 +4,14 @@ Home Safe Solution - 이벤트 검색 다이얼로그
 
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel,
                              QPushButton, QDateEdit, QTimeEdit, QComboBox,
-                             QTableWidget, QTableWidgetItem, QHeaderView,
+                             QTableView, QHeaderView,
                              QSpinBox, QGroupBox, QMessageBox, QAbstractItemView)
 from PyQt6.QtCore import Qt, QDate, QTime, QDateTime
-from PyQt6.QtGui import QFont, QColor
+from PyQt6.QtGui import QFont
 from datetime import datetime, timedelta
 from .database_models import DatabaseManager, EventLog
+from .event_table_model import STATUS_FILTERS, create_event_model, summary_text
+from .export_service import start_export
 
 
 class SearchDialog(QDialog):
@@ -20,6 +22,10 @@ class SearchDialog(QDialog):
         self.db = db
         self.user_info = user_info
         self.event_log_model = EventLog(db)
+        self.model = create_event_model(self)  # 검색 결과 (스크롤 시 키셋 페이지 조회)
+        self.summary = None  # 검색 조건 전체 범위 집계 (EventLog.aggregate)
+        self.filters = None  # 마지막 검색 조건 (내보내기에 사용)
+        self.export_job = None
         self.init_ui()
     
     def init_ui(self):
@@ -50,7 +56,7 @@ class SearchDialog(QDialog):
                 font-weight: bold;
                 min-height: 30px;
             }
-            QTableWidget {
+            QTableView {
                 background-color: white;
                 alternate-background-color: #f0f0f0;
                 selection-background-color: #3498db;
@@ -147,6 +153,18 @@ class SearchDialog(QDialog):
         self.min_confidence.setFixedWidth(100)
         filter_layout.addWidget(self.min_confidence)
         
+        filter_layout.addSpacing(20)
+        
+        # 처리 상태
+        status_label = QLabel('처리 상태:')
+        status_label.setFixedWidth(100)
+        filter_layout.addWidget(status_label)
+        
+        self.status_combo = QComboBox()
+        self.status_combo.addItems(STATUS_FILTERS)
+        self.status_combo.setFixedWidth(120)
+        filter_layout.addWidget(self.status_combo)
+        
         filter_layout.addStretch()
         search_layout.addLayout(filter_layout)
         
@@ -198,13 +216,10 @@ class SearchDialog(QDialog):
         self.stats_label.setStyleSheet('color: #2c3e50;')
         result_layout.addWidget(self.stats_label)
         
-        # 테이블
-        self.table = QTableWidget()
-        self.table.setColumnCount(8)
-        self.table.setHorizontalHeaderLabels([
-            'ID', '발생 시간', '이벤트 타입', '신뢰도', 
-            'Hip Height', 'Spine Angle', 'Status', '비고'
-        ])
+        # 테이블 (모델이 보이는 행만 그리고, 스크롤이 끝에 닿으면 다음 페이지 조회)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.model.page_loaded.connect(self.update_statistics)
         
         # 테이블 설정
         self.table.setAlternatingRowColors(True)
@@ -214,7 +229,7 @@ class SearchDialog(QDialog):
         self.table.verticalHeader().setVisible(False)
         
         # ===== 더블클릭 이벤트 연결 ===== ✅
-        self.table.cellDoubleClicked.connect(self.on_row_double_clicked)
+        self.table.doubleClicked.connect(self.on_row_double_clicked)
         
         # 컬럼 너비 조정
         header = self.table.horizontalHeader()
@@ -273,6 +288,7 @@ class SearchDialog(QDialog):
         self.end_time.setTime(QTime(23, 59))
         self.event_type_combo.setCurrentIndex(0)
         self.min_confidence.setValue(0)
+        self.status_combo.setCurrentIndex(0)
         self.search_events()
     
     def search_events(self):
@@ -290,177 +306,57 @@ class SearchDialog(QDialog):
             if event_type == '전체':
                 event_type = None
             
-            # 최소 신뢰도
+            # 최소 신뢰도, 처리 상태 (SQL에서 필터)
             min_conf = self.min_confidence.value() / 100.0
+            status = self.status_combo.currentText()
+            if status == '전체':
+                status = None
             
-            # DB 검색
-            events = self.event_log_model.search(
+            self.filters = filters = dict(
                 user_id=self.user_info['user_id'],
                 event_type=event_type,
                 start_date=start_str,
                 end_date=end_str,
-                min_confidence=min_conf
+                min_confidence=min_conf,
+                status=status
             )
             
-            # 테이블 업데이트
-            self.update_table(events)
+            # 통계는 조회한 페이지가 아니라 검색 범위 전체를 SQL로 집계
+            self.summary = self.event_log_model.aggregate(**filters)
             
-            # 통계 업데이트
-            self.update_statistics(events)
+            # DB 검색 (첫 페이지만 조회, 나머지는 스크롤 시 이어서 조회)
+            def fetch_page(after, limit):
+                return self.event_log_model.search_page(after=after, limit=limit, **filters)
+            
+            self.model.reset(fetch_page)
             
         except Exception as e:
             QMessageBox.critical(self, '오류', f'검색 중 오류 발생:\n{str(e)}')
             print(f"[ERROR] 검색 오류: {e}")
     
-    def update_table(self, events: list):
-        """테이블 업데이트"""
-        self.table.setRowCount(0)
-        self.events_data = []  # ✅ 전체 이벤트 데이터 저장
-        
-        for event in events:
-            row = self.table.rowCount()
-            self.table.insertRow(row)
-            
-            # ✅ 전체 이벤트 데이터 저장
-            self.events_data.append(event)
-            
-            # ID
-            self.table.setItem(row, 0, QTableWidgetItem(str(event['event_id'])))
-            
-            # 발생 시간
-            occurred_at = event['occurred_at']
-            if isinstance(occurred_at, str):
-                time_str = occurred_at
-            else:
-                time_str = occurred_at.strftime('%Y-%m-%d %H:%M:%S')
-            self.table.setItem(row, 1, QTableWidgetItem(time_str))
-            
-            # 이벤트 타입 (색상 적용)
-            event_type = event['event_type']
-            type_item = QTableWidgetItem(event_type)
-            if event_type == '정상':
-                type_item.setBackground(QColor(46, 204, 113, 50))  # 연한 초록
-            elif event_type == '낙상중':
-                type_item.setBackground(QColor(243, 156, 18, 50))  # 연한 주황
-            elif event_type == '낙상':
-                type_item.setBackground(QColor(231, 76, 60, 50))   # 연한 빨강
-            type_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.table.setItem(row, 2, type_item)
-            
-            # 신뢰도
-            confidence = event.get('confidence', 0)
-            conf_item = QTableWidgetItem(f'{confidence*100:.1f}%')
-            conf_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.table.setItem(row, 3, conf_item)
-            
-            # Hip Height
-            hip_height = event.get('hip_height')
-            hip_str = f'{hip_height:.1f}' if hip_height else '-'
-            hip_item = QTableWidgetItem(hip_str)
-            hip_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.table.setItem(row, 4, hip_item)
-            
-            # Spine Angle
-            spine_angle = event.get('spine_angle')
-            spine_str = f'{spine_angle:.1f}°' if spine_angle else '-'
-            spine_item = QTableWidgetItem(spine_str)
-            spine_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.table.setItem(row, 5, spine_item)
-            
-            # Status
-            status = event.get('event_status', '발생')
-            status_item = QTableWidgetItem(status)
-            status_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.table.setItem(row, 6, status_item)
-            
-            # 비고
-            notes = event.get('notes', '')
-            self.table.setItem(row, 7, QTableWidgetItem(notes))
-    
-    def update_statistics(self, events: list):
-        """통계 업데이트"""
-        total = len(events)
-        
-        # 타입별 개수
-        normal_count = sum(1 for e in events if e['event_type'] == '정상')
-        falling_count = sum(1 for e in events if e['event_type'] == '낙상중')
-        fallen_count = sum(1 for e in events if e['event_type'] == '낙상')
-        
-        stats_text = (
-            f'검색 결과: {total}건  '
-            f'(정상: {normal_count}건, 낙상중: {falling_count}건, 낙상: {fallen_count}건)'
-        )
-        
-        self.stats_label.setText(stats_text)
-    
-    def on_row_double_clicked(self, row: int, column: int):
-        """테이블 행 더블클릭 시 상세 조회"""
-        try:
-            # 해당 행의 이벤트 데이터 가져오기
-            if not hasattr(self, 'events_data') or row >= len(self.events_data):
-                QMessageBox.warning(self, '오류', '이벤트 데이터를 찾을 수 없습니다.')
-                return
-            
-            event_data = self.events_data[row]
-            
-            # 상세 조회 다이얼로그 열기
-            from event_detail_dialog import EventDetailDialog
-            
-            detail_dialog = EventDetailDialog(event_data, self.db, self)
-            result = detail_dialog.exec()
-            
-            # 다이얼로그가 accept()로 닫혔으면 (삭제 성공)
-            if result == QDialog.DialogCode.Accepted:
-                # 검색 재실행 (목록 갱신)
-                self.search_events()
-            elif detail_dialog.is_modified:
-                # 수정만 된 경우도 목록 갱신
-                self.search_events()
-                
-        except Exception as e:
-            QMessageBox.critical(self, '오류', f'상세 조회 중 오류:\n{str(e)}')
-            print(f"[ERROR] 상세 조회 오류: {e}")
-            import traceback
-            traceback.print_exc()
+    def update_statistics(self, loaded: int):
+        """통계 업데이트 (전체 집계 + 지금까지 불러온 행 수)"""
+        self.stats_label.setText(summary_text(self.summary, loaded))
     
     def export_to_excel(self):
-        """Excel 내보내기"""
-        if self.table.rowCount() == 0:
+        """Excel/CSV 내보내기 (화면에 불러온 행이 아니라 검색 결과 전체를 DB에서 스트리밍)"""
+        if self.model.rowCount() == 0 or self.filters is None:
             QMessageBox.warning(self, '경고', '내보낼 데이터가 없습니다.')
             return
+        if self.export_job is not None and self.export_job.isRunning():
+            QMessageBox.information(self, '내보내기', '이미 내보내는 중입니다.')
+            return
         
         try:
-            from datetime import datetime
-            import csv
-            
-            # 파일명 생성
+            query, params = self.event_log_model.export_query(**self.filters)
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            filename = f'event_search_{timestamp}.csv'
-            
-            # CSV 저장
-            with open(filename, 'w', newline='', encoding='utf-8-sig') as f:
-                writer = csv.writer(f)
-                
-                # 헤더
-                headers = []
-                for col in range(self.table.columnCount()):
-                    headers.append(self.table.horizontalHeaderItem(col).text())
-                writer.writerow(headers)
-                
-                # 데이터
-                for row in range(self.table.rowCount()):
-                    row_data = []
-                    for col in range(self.table.columnCount()):
-                        item = self.table.item(row, col)
-                        row_data.append(item.text() if item else '')
-                    writer.writerow(row_data)
-            
-            QMessageBox.information(
-                self, 
-                '성공', 
-                f'검색 결과를 내보냈습니다!\n\n파일: {filename}'
+            self.export_job = start_export(
+                self, self.db, query, params,
+                self.model.headers(), self.model.row_texts,
+                f'event_search_{timestamp}',
+                total=self.summary['total'] if self.summary else 0,
+                archived_rows=self.event_log_model.export_archive_rows(**self.filters)
             )
-            
         except Exception as e:
             QMessageBox.critical(self, '오류', f'내보내기 실패:\n{str(e)}')
 
@@ -29,14 +29,22 @@ def select_target_person_from_results(results, method='largest', frame_shape=Non
     boxes = results[0].boxes
     if kp is None or boxes is None:
         return None
-    kp_data = kp.data.cpu().numpy()
-    boxes_data = boxes.xyxy.cpu().numpy()
-    if len(kp_data) == 0 or len(boxes_data) == 0:
+    return select_target_person(kp.data.cpu().numpy(), boxes.xyxy.cpu().numpy(), method=method)
+
+
+def select_target_person(keypoints_all, boxes_xyxy, method='largest'):
+    """select_target_person_from_results의 배열 버전 (배치/워커 프로세스 결과용).
+
+    keypoints_all: (N, 17, 3), boxes_xyxy: (N, 4)
+    """
+    if keypoints_all is None or boxes_xyxy is None:
         return None
-    if len(kp_data) == 1:
+    if len(keypoints_all) == 0 or len(boxes_xyxy) == 0:
+        return None
+    if len(keypoints_all) == 1:
         return 0
     if method == 'largest':
-        areas = [(b[2] - b[0]) * (b[3] - b[1]) for b in boxes_data]
+        areas = [(b[2] - b[0]) * (b[3] - b[1]) for b in boxes_xyxy]
         return int(np.argmax(areas))
     return 0
 
@@ -238,6 +246,32 @@ def predict_fall_rf(features, rf_model=None, feature_columns=None):
         return 0, [1.0, 0.0, 0.0]
 
 
+def predict_fall_rf_batch(features_list, rf_model=None, feature_columns=None):
+    """
+    predict_fall_rf의 배치 버전 (여러 카메라 피처를 한 번의 predict_proba로 처리).
+
+    Returns:
+        [(prediction, proba), ...] - features_list와 같은 순서
+    """
+    if not features_list:
+        return []
+    if rf_model is None or not feature_columns:
+        return [predict_fall_rf(f, rf_model, feature_columns) for f in features_list]
+    try:
+        import pandas as pd
+        df = pd.DataFrame([{col: f.get(col, 0) for col in feature_columns} for f in features_list])
+        results = []
+        for proba in rf_model.predict_proba(df):
+            if len(proba) == 2:
+                prediction = 0 if proba[0] > proba[1] else 2
+                results.append((prediction, [float(proba[0]), 0.0, float(proba[1])]))
+            else:
+                results.append((int(np.argmax(proba)), [float(p) for p in proba]))
+        return results
+    except Exception:
+        return [(0, [1.0, 0.0, 0.0]) for _ in features_list]
+
+
 def load_rf_model_if_available():
     """관리자 모드와 동일한 RF 모델/feature_columns 로드."""
     import joblib
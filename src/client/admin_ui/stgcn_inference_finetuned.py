@@ -300,6 +300,40 @@ class STGCNInference:
         
         return label, confidence, normal_prob, fall_prob
     
+    def predict_batch(self, sequences: List[List[np.ndarray]]) -> List[Tuple[str, float, float, float]]:
+        """
+        여러 스트림의 키포인트 시퀀스를 한 번의 forward로 예측 (멀티 카메라 공용 백엔드용)
+
+        Args:
+            sequences: 스트림별 키포인트 리스트 (각각 최소 sequence_length 이상)
+
+        Returns:
+            [(예측 레이블, 신뢰도, normal_prob, fall_prob), ...] - 입력 순서와 동일
+        """
+        if not sequences:
+            return []
+        batch = []
+        for keypoints_list in sequences:
+            if len(keypoints_list) < self.sequence_length:
+                raise ValueError(f"Need at least {self.sequence_length} frames, got {len(keypoints_list)}")
+            batch.append(self.preprocess(list(keypoints_list)[-self.sequence_length:]))
+        x = torch.cat(batch, dim=0)
+
+        with torch.no_grad():
+            output = self.model(x)
+            probs = torch.softmax(output, dim=1)
+            pred_idx = output.argmax(dim=1).tolist()
+
+        results = []
+        for i, idx in enumerate(pred_idx):
+            results.append((
+                self.LABELS[idx],
+                probs[i, idx].item(),
+                probs[i, 0].item(),
+                probs[i, 1].item(),
+            ))
+        return results
+
     def update(self, keypoints: np.ndarray) -> Optional[Tuple[str, float]]:
         """
         새 프레임 추가 및 추론 (버퍼가 충분하면)
@@ -2,10 +2,14 @@
 통합 낙상 감지 러너 - 사용자 탭/관리자 탭 공용.
 한 프레임 입력 -> (스켈레톤+상태 오버레이된 프레임, 상태문자열, 낙상여부) 반환.
 .env USE_MODEL (RandomForest | ST-GCN-Original | ST-GCN-Fine-tuned) 기반.
+
+모델(FallModels)과 스트림별 상태(UnifiedFallRunner)를 분리해, 여러 카메라가
+하나의 모델을 공유하고 포즈/분류를 배치로 처리할 수 있다 (client/multi_camera.py).
+    begin_frame → detect_poses(배치) → update_pose → classify_batch(배치) → finish_frame
 """
 
 import os
-import time
+import multiprocessing as mp
 import numpy as np
 import cv2
 from collections import deque
@@ -27,12 +31,15 @@ except ImportError:
     STGCN_AVAILABLE = False
 
 from .one_euro_filter import KeypointFilter
-from .model_selection_dialog import get_model_config_from_env
+from .window_stats import SlidingWindowStats
+from .model_config import get_model_config_from_env
+from env_config import get_config  # model_config가 프로젝트 루트를 sys.path에 추가
 from .shared_fall_logic import (
     extract_features_v3b,
     predict_fall_rf,
     load_rf_model_if_available,
-    select_target_person_from_results,
+    predict_fall_rf_batch,
+    select_target_person,
 )
 
 
@@ -57,52 +64,56 @@ def _draw_skeleton(frame, keypoints):
     return frame
 
 
-class UnifiedFallRunner:
-    """
-    통합 낙상 감지: YOLO Pose + USE_MODEL(RandomForest / ST-GCN).
-    process(frame) -> (annotated_frame, state_str, is_fallen).
-    """
+class FallModels:
+    """YOLO Pose + 분류기(RF / ST-GCN). 카메라 여러 대가 한 인스턴스를 공유 (스트림 상태 없음)."""
 
-    def __init__(self, env_dir: str):
+    def __init__(self, env_dir: str, pose_workers: int | None = None):
         """
-        env_dir: .env가 있는 디렉터리 (예: client 디렉터리). 이 경로를 ADMIN_UI_ENV_DIR로 설정해 get_model_config_from_env 사용.
+        pose_workers: YOLO Pose 워커 프로세스 수 (pose_worker_pool). None이면 .env POSE_WORKERS, 0이면 같은 프로세스에서 실행.
         """
         self._env_dir = os.path.abspath(env_dir)
+        self.yolo_model = None
+
+        if YOLO_AVAILABLE:
+            yolo_path = os.path.join(_GUI_DIR, "models", "yolo11s-pose.pt")
+            if os.path.exists(yolo_path):
+                self.yolo_model = YOLO(yolo_path)
+
+        self._load_classifier(self._model_config())
+
+        self.pose_pool = None
+        if pose_workers is None:
+            pose_workers = get_config(self._env_dir).get_int("POSE_WORKERS", 0)
+        # 워커 프로세스 안(서버 판정 워커 등, daemon 프로세스)에서는 자식 프로세스를 만들 수 없음
+        if pose_workers > 0 and self.yolo_model is not None and not mp.current_process().daemon:
+            try:
+                from .pose_worker_pool import PoseWorkerPool
+                self.pose_pool = PoseWorkerPool(workers=pose_workers, yolo_path=yolo_path)
+                # 모델 로드를 기다리지 않음 (UI 멈춤 방지). 준비 전에는 같은 프로세스 YOLO 사용
+                self.pose_pool.start(wait_ready=False)
+            except Exception as e:
+                print(f"[UnifiedFallRunner] 포즈 워커 시작 실패: {e}, 같은 프로세스에서 실행")
+                self.pose_pool = None
+
+    def _model_config(self) -> dict:
         prev = os.environ.get("ADMIN_UI_ENV_DIR")
         os.environ["ADMIN_UI_ENV_DIR"] = self._env_dir
         try:
-            model_config = get_model_config_from_env()
+            return get_model_config_from_env()
         finally:
             if prev is not None:
                 os.environ["ADMIN_UI_ENV_DIR"] = prev
-            elif "ADMIN_UI_ENV_DIR" in os.environ and os.environ["ADMIN_UI_ENV_DIR"] == self._env_dir:
-                os.environ["ADMIN_UI_ENV_DIR"] = self._env_dir  # 유지
 
+    def _load_classifier(self, model_config: dict):
+        self.model_key = model_config.get("key")
         self.model_type = model_config["type"]
         self.model_name = model_config.get("name", "Unknown")
         self.stgcn_model_path = model_config.get("model_path")
-        self.yolo_model = None
         self.stgcn_model = None
-        self.keypoints_buffer = []
-        self.stgcn_buffer_size = 60
-        self.keypoint_filter = KeypointFilter(filter_strength="medium")
-        self.class_names = {0: "Normal", 1: "Falling", 2: "Fallen"}
-        self.class_colors = {0: (0, 255, 0), 1: (0, 165, 255), 2: (0, 0, 255)}
-        self._last_pred = (0, [1.0, 0.0, 0.0])  # prediction, proba
-        self._frame_size_set = False
-        self._history = []
-        # RF용 181차원 피처 추출 상태 (관리자 탭과 동일)
-        self._rf_feature_state = {'prev_keypoints': None, 'prev2_keypoints': None, 'feature_history': []}
-
-        if YOLO_AVAILABLE:
-            yolo_path = os.path.join(_GUI_DIR, "models", "yolo11s-pose.pt")
-            if os.path.exists(yolo_path):
-                self.yolo_model = YOLO(yolo_path)
 
         if self.model_type == "stgcn" and STGCN_AVAILABLE and self.stgcn_model_path and os.path.exists(self.stgcn_model_path):
             try:
                 self.stgcn_model = STGCNInference(model_path=self.stgcn_model_path)
-                self.keypoints_buffer = []
             except Exception as e:
                 print(f"[UnifiedFallRunner] ST-GCN 로드 실패: {e}, RF 사용")
                 self.model_type = "random_forest"
@@ -115,19 +126,155 @@ class UnifiedFallRunner:
             self.rf_model, self.feature_columns = load_rf_model_if_available()
             if self.rf_model:
                 print(f"[UnifiedFallRunner] RF 모델 로드 ({len(self.feature_columns or [])} features)")
+        self._stgcn_err_count = 0
 
-        # .env SHOWINFO, DEBUG_UI: 오버레이 표시 및 관리자 탭과 동일 UI 여부
+    def reload_classifier(self) -> bool:
+        """.env USE_MODEL 변경 반영: 분류기만 다시 로드 (YOLO/포즈 워커 유지). 다시 로드했으면 True.
+
+        모델을 공유하는 러너가 여러 개여도 같은 설정이면 한 번만 로드한다.
+        """
+        model_config = self._model_config()
+        if model_config.get("key") == self.model_key:
+            return False
+        print(f"[UnifiedFallRunner] 모델 변경: {self.model_name} → {model_config.get('name')}")
+        self._load_classifier(model_config)
+        return True
+
+    def detect_poses(self, frames: list) -> list["PoseDetections"]:
+        """포즈 워커 풀이 준비됐으면 워커 프로세스에서, 아니면 같은 프로세스 YOLO로 실행."""
+        if self.pose_pool is not None and self.pose_pool.ready:
+            return self.pose_pool.detect(frames)
+        return detect_poses(self.yolo_model, frames)
+
+    def close(self):
+        if self.pose_pool is not None:
+            self.pose_pool.stop()
+            self.pose_pool = None
+
+
+class PoseDetections:
+    """프레임 1장의 포즈 검출 결과 (배열만 보관 → 프로세스 간 전달 가능)."""
+
+    __slots__ = ("keypoints", "boxes")
+
+    def __init__(self, keypoints: np.ndarray | None = None, boxes: np.ndarray | None = None):
+        self.keypoints = keypoints if keypoints is not None else np.zeros((0, 17, 3), dtype=np.float32)
+        self.boxes = boxes if boxes is not None else np.zeros((0, 4), dtype=np.float32)
+
+    def __len__(self) -> int:
+        return len(self.keypoints)
+
+
+def detect_poses(yolo_model, frames: list) -> list[PoseDetections]:
+    """YOLO Pose를 프레임 여러 장에 한 번에 실행."""
+    if not frames:
+        return []
+    results = yolo_model(frames if len(frames) > 1 else frames[0], verbose=False)
+    detections = []
+    for i in range(len(frames)):
+        r = results[i] if results is not None and i < len(results) else None
+        if r is None or r.keypoints is None or r.boxes is None:
+            detections.append(PoseDetections())
+            continue
+        detections.append(PoseDetections(
+            r.keypoints.data.cpu().numpy().astype(np.float32, copy=False),
+            r.boxes.xyxy.cpu().numpy().astype(np.float32, copy=False),
+        ))
+    return detections
+
+
+def classify_batch(models: FallModels, inputs: list) -> list:
+    """update_pose()가 만든 분류 입력들을 모델 종류별로 묶어 한 번에 예측.
+
+    inputs[i]: ("stgcn", keypoints_sequence) | ("rf", features) | None
+    Returns: [(prediction, proba) | None, ...]
+    """
+    results = [None] * len(inputs)
+    stgcn_idx = [i for i, item in enumerate(inputs) if item is not None and item[0] == "stgcn"]
+    rf_idx = [i for i, item in enumerate(inputs) if item is not None and item[0] == "rf"]
+    if stgcn_idx and models.stgcn_model is not None:
         try:
-            env_path = os.path.join(self._env_dir, ".env")
-            if os.path.isfile(env_path):
-                from dotenv import load_dotenv
-                load_dotenv(env_path, override=False)
-        except Exception:
-            pass
-        self._show_info = (os.environ.get("SHOWINFO", "true").strip().lower() == "true")
-        self._debug_ui = (os.environ.get("DEBUG_UI", "false").strip().lower() == "true")
+            preds = models.stgcn_model.predict_batch([inputs[i][1] for i in stgcn_idx])
+            for i, (label, _confidence, normal_prob, fall_prob) in zip(stgcn_idx, preds):
+                if label == "Fall":
+                    results[i] = (2, [0.0, 0.0, float(fall_prob)])
+                else:
+                    results[i] = (0, [float(normal_prob), 0.0, float(fall_prob)])
+        except Exception as e:
+            models._stgcn_err_count += 1
+            if models._stgcn_err_count <= 3:
+                print(f"[UnifiedFallRunner] ST-GCN predict 오류: {e}")
+    if rf_idx:
+        preds = predict_fall_rf_batch(
+            [inputs[i][1] for i in rf_idx],
+            rf_model=models.rf_model,
+            feature_columns=models.feature_columns,
+        )
+        for i, pred in zip(rf_idx, preds):
+            results[i] = pred
+    return results
+
+
+class UnifiedFallRunner:
+    """
+    통합 낙상 감지: YOLO Pose + USE_MODEL(RandomForest / ST-GCN).
+    process(frame) -> (annotated_frame, state_str, is_fallen).
+    """
+
+    def __init__(self, env_dir: str, draw_overlays: bool = True, models: FallModels | None = None):
+        """
+        env_dir: .env가 있는 디렉터리 (예: client 디렉터리). 이 경로를 ADMIN_UI_ENV_DIR로 설정해 get_model_config_from_env 사용.
+        draw_overlays: False면 스켈레톤/상태 오버레이를 그리지 않음 (헤드리스 edge_daemon용, 판정 결과는 동일).
+        models: 다른 러너와 공유할 FallModels (멀티 카메라). None이면 새로 로드.
+        """
+        self._env_dir = os.path.abspath(env_dir)
+        self._draw = draw_overlays
+        self.models = models if models is not None else FallModels(self._env_dir)
+        self.yolo_model = self.models.yolo_model
+        self._sync_classifier()
+        self.stgcn_buffer_size = 60
+        self.keypoint_filter = KeypointFilter(filter_strength="medium")
+        self.class_names = {0: "Normal", 1: "Falling", 2: "Fallen"}
+        self.class_colors = {0: (0, 255, 0), 1: (0, 165, 255), 2: (0, 0, 255)}
+        self._last_pred = (0, [1.0, 0.0, 0.0])  # prediction, proba
+        # 최근 5분 confidence (1초 단위 묶음, 오버레이는 누적 평균만 읽음)
+        self._history = SlidingWindowStats(300.0, bucket_seconds=1.0)
+        # 최근 프레임 포즈 (키포인트 텔레메트리 전송용): 인물 미검출 시 None, track_id는 추적 미지원으로 항상 -1
+        self.last_keypoints = None
+        self.last_track_id = -1
+        self.last_frame_size = (0, 0)
+
+        # .env SHOWINFO, DEBUG_UI: 오버레이 표시 및 관리자 탭과 동일 UI 여부
+        # (env_config 캐시 구독: 실행 중 .env를 고치면 재시작 없이 반영, USE_MODEL은 다음 프레임에서 모델 교체)
+        self._config = get_config(self._env_dir)
+        self._show_info = self._config.get_bool("SHOWINFO", True)
+        self._debug_ui = self._config.get_bool("DEBUG_UI", False)
+        self._model_change_pending = False
+        self._config.subscribe(self._on_config_changed)
         self._frame_count = 0
 
+    def _sync_classifier(self):
+        """공유 FallModels의 분류기 참조를 가져오고 분류기별 스트림 상태 초기화."""
+        self.model_type = self.models.model_type
+        self.model_name = self.models.model_name
+        self.stgcn_model_path = self.models.stgcn_model_path
+        self.stgcn_model = self.models.stgcn_model
+        self.rf_model = self.models.rf_model
+        self.feature_columns = self.models.feature_columns
+        self.keypoints_buffer = []
+        self._frame_size_set = False
+        # RF용 181차원 피처 추출 상태 (관리자 탭과 동일)
+        self._rf_feature_state = {'prev_keypoints': None, 'prev2_keypoints': None, 'feature_history': []}
+
+    def _on_config_changed(self, changed: dict):
+        """.env 변경 알림 (어느 스레드에서든 호출될 수 있어 모델 교체는 플래그만 세움)."""
+        if "SHOWINFO" in changed:
+            self._show_info = self._config.get_bool("SHOWINFO", True)
+        if "DEBUG_UI" in changed:
+            self._debug_ui = self._config.get_bool("DEBUG_UI", False)
+        if "USE_MODEL" in changed:
+            self._model_change_pending = True
+
     def process(self, frame: np.ndarray):
         """
         BGR 프레임 한 장 처리.
@@ -138,83 +285,111 @@ class UnifiedFallRunner:
         """
         if frame is None or frame.size == 0:
             return frame, "Normal", False
+        frame = self.begin_frame(frame)
+        if self.yolo_model is None:
+            return self.finish_without_pose(frame)
+        try:
+            detections = self.models.detect_poses([frame])[0]
+            frame, person_found, classifier_input = self.update_pose(frame, detections)
+            prediction = classify_batch(self.models, [classifier_input])[0]
+            return self.finish_frame(frame, person_found, prediction)
+        except Exception as e:
+            self._log_error(e)
+        return frame, "Normal", False
+
+    def begin_frame(self, frame: np.ndarray) -> np.ndarray:
+        """프레임 처리 시작: 좌우 반전, 프레임 번호/최근 포즈 초기화."""
+        self._config.poll()  # .env 변경 확인 (1초에 한 번 stat)
+        if self._model_change_pending:
+            self._model_change_pending = False
+            self.models.reload_classifier()
+            self._sync_classifier()
         self._frame_count += 1
         frame = cv2.flip(frame, 1)
-        state_str = "Normal"
-        is_fallen = False
         h, w = frame.shape[:2]
+        self.last_keypoints = None
+        self.last_track_id = -1
+        self.last_frame_size = (w, h)
+        return frame
 
-        if self.yolo_model is None:
+    def finish_without_pose(self, frame: np.ndarray):
+        """YOLO 모델이 없을 때의 결과."""
+        if self._draw:
             if self._show_info:
                 self._draw_status_overlay(frame, yolo_on=False)
             cv2.putText(frame, "YOLO not loaded", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
-            return frame, state_str, is_fallen
+        return frame, "Normal", False
 
-        try:
-            results = self.yolo_model(frame, verbose=False)
-            if not results or results[0].keypoints is None:
-                if self._show_info:
-                    self._draw_status_overlay(frame, yolo_on=True)
-                self._draw_prediction_overlay(frame, self._last_pred[0], self._last_pred[1])
-                return frame, self.class_names.get(self._last_pred[0], "Normal"), self._last_pred[0] == 2
-            keypoints_all = results[0].keypoints.data.cpu().numpy()
-            if len(keypoints_all) == 0:
-                if self._show_info:
-                    self._draw_status_overlay(frame, yolo_on=True)
-                self._draw_prediction_overlay(frame, self._last_pred[0], self._last_pred[1])
-                return frame, self.class_names.get(self._last_pred[0], "Normal"), self._last_pred[0] == 2
-            target_idx = select_target_person_from_results(results, method='largest')
-            kp = keypoints_all[target_idx] if target_idx is not None else keypoints_all[0]
-            kp_filtered = self.keypoint_filter.apply(kp)
+    def update_pose(self, frame: np.ndarray, detections: PoseDetections):
+        """대상자 선택 + 키포인트 필터 + 분류기 입력 준비 (스트림별 상태 갱신).
+
+        Returns:
+            (frame, person_found, classifier_input)
+            classifier_input: ("stgcn", 시퀀스) | ("rf", 피처) | None (버퍼링 중 등 분류 불가)
+        """
+        if len(detections) == 0:
+            return frame, False, None
+        target_idx = select_target_person(detections.keypoints, detections.boxes, method='largest')
+        kp = detections.keypoints[target_idx] if target_idx is not None else detections.keypoints[0]
+        kp_filtered = self.keypoint_filter.apply(kp)
+        self.last_keypoints = np.array(kp_filtered, dtype=np.float32)
+        # target_idx는 이번 프레임 검출 순번일 뿐 프레임 간 같은 인물이 아님 → 추적기가 생기기 전까지 -1 유지
+        if self._draw:
             frame = _draw_skeleton(frame, [kp_filtered])
 
-            if self.model_type == "stgcn" and self.stgcn_model is not None:
-                if not self._frame_size_set and hasattr(self.stgcn_model, "set_frame_size"):
-                    self.stgcn_model.set_frame_size(w, h)
-                    self._frame_size_set = True
-                self.keypoints_buffer.append(np.asarray(kp_filtered, dtype=np.float32).copy())
-                if len(self.keypoints_buffer) > self.stgcn_buffer_size:
-                    self.keypoints_buffer.pop(0)
-                if len(self.keypoints_buffer) >= self.stgcn_buffer_size:
-                    try:
-                        label, confidence, normal_prob, fall_prob = self.stgcn_model.predict(self.keypoints_buffer)
-                        if label == "Fall":
-                            state_str = "Fallen"
-                            is_fallen = True
-                            self._last_pred = (2, [0.0, 0.0, float(fall_prob)])
-                        else:
-                            state_str = "Normal"
-                            self._last_pred = (0, [float(normal_prob), 0.0, float(fall_prob)])
-                    except Exception as e:
-                        if not hasattr(self, "_stgcn_err_count"):
-                            self._stgcn_err_count = 0
-                        self._stgcn_err_count += 1
-                        if self._stgcn_err_count <= 3:
-                            print(f"[UnifiedFallRunner] ST-GCN predict 오류: {e}")
-            else:
-                features = extract_features_v3b(kp_filtered, self._rf_feature_state)
-                if features:
-                    pred, proba = predict_fall_rf(
-                        features,
-                        rf_model=self.rf_model,
-                        feature_columns=self.feature_columns,
-                    )
-                    self._last_pred = (pred, proba)
-                    state_str = self.class_names[pred]
-                    is_fallen = pred == 2
-            # 최근 5분 평균 confidence 업데이트
-            self._record_history(self._last_pred[0], self._last_pred[1])
+        if self.model_type == "stgcn" and self.stgcn_model is not None:
+            if not self._frame_size_set and hasattr(self.stgcn_model, "set_frame_size"):
+                h, w = frame.shape[:2]
+                self.stgcn_model.set_frame_size(w, h)
+                self._frame_size_set = True
+            self.keypoints_buffer.append(np.asarray(kp_filtered, dtype=np.float32).copy())
+            if len(self.keypoints_buffer) > self.stgcn_buffer_size:
+                self.keypoints_buffer.pop(0)
+            if len(self.keypoints_buffer) >= self.stgcn_buffer_size:
+                return frame, True, ("stgcn", list(self.keypoints_buffer))
+            return frame, True, None
+        features = extract_features_v3b(kp_filtered, self._rf_feature_state)
+        return frame, True, (("rf", features) if features else None)
+
+    def finish_frame(self, frame: np.ndarray, person_found: bool, prediction):
+        """분류 결과 반영 + 오버레이. prediction: (prediction, proba) 또는 None."""
+        if not person_found:
+            # 인물 미검출: 직전 판정 유지
             if self._show_info:
                 self._draw_status_overlay(frame, yolo_on=True)
             self._draw_prediction_overlay(frame, self._last_pred[0], self._last_pred[1])
-        except Exception as e:
-            if not hasattr(self, "_log_count"):
-                self._log_count = 0
-            self._log_count += 1
-            if self._log_count % 100 == 1:
-                print(f"[UnifiedFallRunner] {e}")
+            return frame, self.class_names.get(self._last_pred[0], "Normal"), self._last_pred[0] == 2
+        state_str = "Normal"
+        is_fallen = False
+        if prediction is not None:
+            self._last_pred = prediction
+            state_str = self.class_names[prediction[0]]
+            is_fallen = prediction[0] == 2
+        # 최근 5분 평균 confidence 업데이트
+        self._record_history(self._last_pred[0], self._last_pred[1])
+        if self._show_info:
+            self._draw_status_overlay(frame, yolo_on=True)
+        self._draw_prediction_overlay(frame, self._last_pred[0], self._last_pred[1])
         return frame, state_str, is_fallen
 
+    def _log_error(self, e: Exception):
+        if not hasattr(self, "_log_count"):
+            self._log_count = 0
+        self._log_count += 1
+        if self._log_count % 100 == 1:
+            print(f"[UnifiedFallRunner] {e}")
+
+    def get_last_pose(self):
+        """최근 process() 결과 포즈.
+
+        Returns:
+            (keypoints(17x3) 또는 None, track_id, prediction, confidence, (width, height))
+            좌표는 process()가 반환한 (좌우 반전된) 프레임 기준.
+        """
+        prediction, proba = self._last_pred
+        confidence = float(proba[prediction]) if proba is not None and prediction < len(proba) else 0.0
+        return self.last_keypoints, self.last_track_id, prediction, confidence, self.last_frame_size
+
     def _record_history(self, prediction: int, proba):
         """최근 5분간 confidence 이력 저장 (정확도 대신 평균 confidence 사용)."""
         try:
@@ -222,17 +397,14 @@ class UnifiedFallRunner:
                 return
             if prediction < 0 or prediction >= len(proba):
                 return
-            conf = float(proba[prediction])
-            now = time.time()
-            self._history.append((now, conf))
-            cutoff = now - 300.0  # 최근 5분
-            # 오래된 항목 제거
-            self._history = [(t, c) for (t, c) in self._history if t >= cutoff]
+            self._history.add(float(proba[prediction]), label=prediction)
         except Exception:
             pass
 
     def _draw_status_overlay(self, frame, yolo_on: bool):
         """SHOWINFO=true 시: Frame, YOLO Pose ON/OFF. DEBUG_UI=true 시 관리자 탭과 동일한 FN Detection Acc 박스+진행바."""
+        if not self._draw:
+            return
         h, w = frame.shape[:2]
         cv2.putText(frame, f"Frame: {self._frame_count}", (10, 30),
                     cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
@@ -247,7 +419,7 @@ class UnifiedFallRunner:
             cv2.rectangle(frame, (box_x, 10), (w - 10, 90), (180, 180, 180), 2)
             cv2.putText(frame, "Recent 5 min", (box_x + 12, 38),
                         cv2.FONT_HERSHEY_SIMPLEX, 0.8, (220, 220, 220), 2)
-            avg_conf = sum(c for _, c in self._history) / len(self._history) if self._history else 0.0
+            avg_conf = self._history.mean()
             cv2.putText(frame, f"Detection Acc: {avg_conf*100:.1f}%", (box_x + 12, 70),
                         cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
 
@@ -255,7 +427,7 @@ class UnifiedFallRunner:
         """관리자 탭과 동일: Recent 5 min, FN Detection Acc, 진행바 (지표: 최근 5분 평균 신뢰도)."""
         try:
             h, w = frame.shape[:2]
-            avg_conf = sum(c for _, c in self._history) / len(self._history) if self._history else 0.0
+            avg_conf = self._history.mean()
             accuracy = avg_conf * 100.0
             box_x = w - 250
             box_y = 10
@@ -289,6 +461,8 @@ class UnifiedFallRunner:
 
     def _draw_prediction_overlay(self, frame, prediction, proba):
         """상태 오버레이. DEBUG_UI=true 시 관리자 탭과 동일 스타일 (아이콘, 클래스별 확률바)."""
+        if not self._draw:
+            return
         if self._debug_ui:
             if (self.model_type == "stgcn" and self.stgcn_model is not None and
                 len(getattr(self, "keypoints_buffer", [])) < getattr(self, "stgcn_buffer_size", 60)):
@@ -0,0 +1,88 @@
+"""
+최근 N초 구간 통계 (정확도, 평균 신뢰도, 클래스별 개수).
+
+기록할 때 누적 합/개수를 갱신하고, 구간을 벗어난 항목은 deque 앞에서 빼면서 누적값에서 뺀다.
+조회(mean/count/label_count)는 구간 전체를 다시 더하지 않는다 (프레임마다 호출해도 O(1)).
+
+    stats = SlidingWindowStats(300, bucket_seconds=1.0)
+    stats.add(confidence, label=prediction)
+    stats.mean()          # 최근 5분 평균
+    stats.label_counts()  # {label: 개수}
+
+bucket_seconds > 0 이면 그 간격의 표본을 한 항목으로 묶는다 (30fps × 5분 = 9000개 → 300개).
+이때 구간 경계는 최대 bucket_seconds만큼 일찍 잘린다.
+"""
+
+import time
+from collections import deque
+
+
+class SlidingWindowStats:
+    """시간 구간 이동 통계 (누적 합 + deque 제거)"""
+
+    def __init__(self, window_seconds: float = 300.0, bucket_seconds: float = 0.0):
+        self.window_seconds = float(window_seconds)
+        self.bucket_seconds = float(bucket_seconds)
+        # 항목: [시작 시각, 개수, 값 합, {label: 개수}]
+        self._entries = deque()
+        self._count = 0
+        self._sum = 0.0
+        self._labels = {}
+
+    def add(self, value: float = 0.0, label=None, now: float | None = None):
+        now = time.time() if now is None else now
+        value = float(value)
+        last = self._entries[-1] if self._entries else None
+        if last is not None and self.bucket_seconds > 0 and now - last[0] < self.bucket_seconds:
+            entry = last
+            entry[1] += 1
+            entry[2] += value
+        else:
+            entry = [now, 1, value, {}]
+            self._entries.append(entry)
+        if label is not None:
+            entry[3][label] = entry[3].get(label, 0) + 1
+            self._labels[label] = self._labels.get(label, 0) + 1
+        self._count += 1
+        self._sum += value
+        self._evict(now)
+
+    def _evict(self, now: float):
+        cutoff = now - self.window_seconds
+        entries = self._entries
+        while entries and entries[0][0] < cutoff:
+            _start, count, total, labels = entries.popleft()
+            self._count -= count
+            self._sum -= total
+            for label, n in labels.items():
+                remaining = self._labels[label] - n
+                if remaining:
+                    self._labels[label] = remaining
+                else:
+                    del self._labels[label]
+        if not entries:
+            self._count = 0
+            self._sum = 0.0  # 빼기 누적 오차 초기화
+
+    def count(self, now: float | None = None) -> int:
+        self._evict(time.time() if now is None else now)
+        return self._count
+
+    def mean(self, now: float | None = None) -> float:
+        """구간 내 값 평균 (표본이 없으면 0.0)"""
+        self._evict(time.time() if now is None else now)
+        return self._sum / self._count if self._count else 0.0
+
+    def label_count(self, label, now: float | None = None) -> int:
+        self._evict(time.time() if now is None else now)
+        return self._labels.get(label, 0)
+
+    def label_counts(self, now: float | None = None) -> dict:
+        self._evict(time.time() if now is None else now)
+        return dict(self._labels)
+
+    def clear(self):
+        self._entries.clear()
+        self._count = 0
+        self._sum = 0.0
+        self._labels = {}
@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+"""
+AlarmOutbox: 낙상 알람 로컬 영구 대기열 (SQLite) + 백그라운드 전송.
+
+- enqueue(): 알람을 먼저 로컬 DB에 기록하고 즉시 반환 (Qt 스레드에서 네트워크 대기 없음)
+- 워커 스레드가 api_client.post_alarm(공유 Session)으로 전송, 실패 시 지수 백오프로 재시도
+- 408/429 외의 4xx(요청 형식 오류 등)는 다시 보내도 실패하므로 재시도하지 않고 dead 상태로 남김
+- 서버 미가동 중 발생한 알람도 프로그램 재시작 후 이어서 전송 (event_id로 서버에서 중복 제거)
+- 상태 변화(pending → sent / dead)를 리스너로 알림 (UI 표시용)
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Callable
+
+from api_client import post_alarm
+
+_SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DB_PATH = os.path.join(_SCRIPT_DIR, "alarm_outbox.db")
+
+RETRY_BASE_SEC = 1.0
+RETRY_MAX_SEC = 60.0
+# 전송 완료 기록 보관 기간 (이후 정리)
+SENT_RETENTION_SEC = 7 * 24 * 3600
+
+STATUS_PENDING = "pending"
+STATUS_SENT = "sent"
+STATUS_DEAD = "dead"  # 재시도해도 실패하는 알람 (last_error에 서버 응답 기록)
+# 4xx 중 재시도하면 성공할 수 있는 응답 (요청 시간 초과, 요청 과다)
+RETRYABLE_4XX = {408, 429}
+
+# (event_id, status, message)
+OutboxListener = Callable[[str, str, str], None]
+
+
+class AlarmOutbox:
+    """SQLite 기반 알람 outbox. DB 접근은 self._lock으로 직렬화."""
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH,
+                 sender: Callable[[dict], tuple[bool, str, int | None]] = post_alarm):
+        self._db_path = db_path
+        self._sender = sender
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._listeners: list[OutboxListener] = []
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS alarm_outbox (
+                    event_id TEXT PRIMARY KEY,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    next_try_ts REAL NOT NULL,
+                    created_ts REAL NOT NULL,
+                    sent_ts REAL,
+                    last_error TEXT
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_alarm_outbox_due ON alarm_outbox (status, next_try_ts)"
+            )
+            self._conn.execute(
+                "DELETE FROM alarm_outbox WHERE status = ? AND sent_ts < ?",
+                (STATUS_SENT, time.time() - SENT_RETENTION_SEC),
+            )
+            self._conn.commit()
+
+    def add_listener(self, listener: OutboxListener):
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: OutboxListener):
+        try:
+            self._listeners.remove(listener)
+        except ValueError:
+            pass
+
+    def _notify(self, event_id: str, status: str, message: str):
+        for listener in list(self._listeners):
+            try:
+                listener(event_id, status, message)
+            except Exception as e:
+                print(f"[AlarmOutbox] listener 오류: {e}")
+
+    def enqueue(self, payload: dict) -> str:
+        """알람을 대기열에 기록하고 event_id 반환. payload에 event_id가 없으면 새로 발급."""
+        data = dict(payload)
+        event_id = data.get("event_id") or uuid.uuid4().hex
+        data["event_id"] = event_id
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO alarm_outbox (event_id, payload, status, next_try_ts, created_ts) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (event_id, json.dumps(data, ensure_ascii=False), STATUS_PENDING, now, now),
+            )
+            self._conn.commit()
+        self._notify(event_id, STATUS_PENDING, "")
+        self._wake.set()
+        return event_id
+
+    def pending_count(self) -> int:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM alarm_outbox WHERE status = ?", (STATUS_PENDING,)
+            ).fetchone()
+        return int(row[0]) if row else 0
+
+    def dead_count(self) -> int:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM alarm_outbox WHERE status = ?", (STATUS_DEAD,)
+            ).fetchone()
+        return int(row[0]) if row else 0
+
+    def _next_due(self) -> tuple[str, dict, int] | float | None:
+        """전송할 항목 (event_id, payload, attempts), 아직 없으면 다음 재시도까지 남은 초, 대기열이 비면 None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT event_id, payload, attempts, next_try_ts FROM alarm_outbox "
+                "WHERE status = ? ORDER BY next_try_ts LIMIT 1",
+                (STATUS_PENDING,),
+            ).fetchone()
+        if row is None:
+            return None
+        event_id, payload, attempts, next_try_ts = row
+        wait = next_try_ts - time.time()
+        if wait > 0:
+            return wait
+        return event_id, json.loads(payload), attempts
+
+    def _mark_sent(self, event_id: str):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE alarm_outbox SET status = ?, sent_ts = ?, last_error = NULL WHERE event_id = ?",
+                (STATUS_SENT, time.time(), event_id),
+            )
+            self._conn.commit()
+
+    def _mark_dead(self, event_id: str, attempts: int, error: str):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE alarm_outbox SET status = ?, attempts = ?, last_error = ? WHERE event_id = ?",
+                (STATUS_DEAD, attempts + 1, error, event_id),
+            )
+            self._conn.commit()
+
+    def _mark_failed(self, event_id: str, attempts: int, error: str) -> float:
+        delay = min(RETRY_MAX_SEC, RETRY_BASE_SEC * (2 ** attempts))
+        with self._lock:
+            self._conn.execute(
+                "UPDATE alarm_outbox SET attempts = ?, next_try_ts = ?, last_error = ? WHERE event_id = ?",
+                (attempts + 1, time.time() + delay, error, event_id),
+            )
+            self._conn.commit()
+        return delay
+
+    def flush_once(self) -> float | None:
+        """전송 가능한 항목 1건 처리. 다음 처리까지 대기할 초(없으면 None) 반환."""
+        due = self._next_due()
+        if due is None or isinstance(due, float):
+            return due
+        event_id, payload, attempts = due
+        try:
+            ok, msg, status = self._sender(payload)
+        except Exception as e:
+            ok, msg, status = False, str(e), None
+        if ok:
+            self._mark_sent(event_id)
+            self._notify(event_id, STATUS_SENT, "")
+            return 0.0
+        if status is not None and 400 <= status < 500 and status not in RETRYABLE_4XX:
+            self._mark_dead(event_id, attempts, f"HTTP {status}: {msg}")
+            print(f"[AlarmOutbox] 전송 거부 ({event_id}, HTTP {status}): {msg} → 재시도하지 않음")
+            self._notify(event_id, STATUS_DEAD, msg)
+            return 0.0
+        delay = self._mark_failed(event_id, attempts, msg)
+        print(f"[AlarmOutbox] 전송 실패 ({event_id}, {attempts + 1}회): {msg} → {delay:.0f}초 후 재시도")
+        self._notify(event_id, STATUS_PENDING, msg)
+        return delay
+
+    def _run(self):
+        while not self._stop.is_set():
+            # 전송 전에 clear → 전송 중 들어온 enqueue 신호는 다음 wait에서 바로 깨움
+            self._wake.clear()
+            wait = self.flush_once()
+            if wait == 0.0:
+                continue
+            self._wake.wait(timeout=wait if wait is not None else RETRY_MAX_SEC)
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="alarm-outbox", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            if self._thread.is_alive():
+                # 전송 중 (요청 타임아웃 대기) → 데몬 스레드가 끝나면서 정리되도록 연결 유지
+                return
+            self._thread = None
+        with self._lock:
+            self._conn.close()
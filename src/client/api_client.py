@@ -1,6 +1,9 @@
 import os
 import sys
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 _SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 _PROJECT_ROOT = os.path.dirname(_SCRIPT_DIR)
@@ -9,6 +12,27 @@ if _PROJECT_ROOT not in sys.path:
 
 from env_config import get_api_config
 
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
+
+
+def _get_session() -> requests.Session:
+    """모든 API 호출이 공유하는 Session (TCP 연결 재사용).
+
+    연결 단계 실패만 백오프로 재시도한다. 요청이 서버에 도달한 뒤의 실패(읽기 타임아웃, 5xx)는
+    중복 처리 위험이 있어 재시도하지 않으며, 알람은 alarm_outbox가 event_id로 재전송한다.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            retry = Retry(total=2, connect=2, read=0, status=0, backoff_factor=0.3, allowed_methods=None)
+            adapter = HTTPAdapter(pool_connections=2, pool_maxsize=4, max_retries=retry)
+            session = requests.Session()
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session = session
+        return _session
+
 
 def _base_url() -> str:
     config = get_api_config(base_dir=_SCRIPT_DIR)
@@ -27,7 +51,7 @@ def register_user(payload: dict) -> tuple[bool, str]:
     호출 측에는 사용자용 일반 메시지를 돌려준다.
     """
     try:
-        resp = requests.post(f"{_base_url()}/users/register", json=payload, timeout=5)
+        resp = _get_session().post(f"{_base_url()}/users/register", json=payload, timeout=5)
     except Exception as exc:
         return False, f"요청 실패: {exc}"
     if resp.status_code == 200:
@@ -47,7 +71,7 @@ def register_user(payload: dict) -> tuple[bool, str]:
 
 def login_user(user_id: str, password: str) -> tuple[bool, str]:
     try:
-        resp = requests.post(
+        resp = _get_session().post(
             f"{_base_url()}/auth/login",
             json={"user_id": user_id, "password": password},
             timeout=5,
@@ -71,7 +95,7 @@ def login_user(user_id: str, password: str) -> tuple[bool, str]:
 def login_admin(user_id: str, password: str) -> tuple[bool, str]:
     """관리자 전용 로그인 API 호출 (/auth/admin_login)."""
     try:
-        resp = requests.post(
+        resp = _get_session().post(
             f"{_base_url()}/auth/admin_login",
             json={"user_id": user_id, "password": password},
             timeout=5,
@@ -93,7 +117,7 @@ def login_admin(user_id: str, password: str) -> tuple[bool, str]:
 
 def health_check() -> tuple[bool, str]:
     try:
-        resp = requests.get(f"{_base_url()}/health", timeout=3)
+        resp = _get_session().get(f"{_base_url()}/health", timeout=3)
     except Exception as exc:
         return False, f"요청 실패: {exc}"
     if resp.status_code == 200:
@@ -103,7 +127,7 @@ def health_check() -> tuple[bool, str]:
 
 def keepalive(user_id: str) -> tuple[bool, str]:
     try:
-        resp = requests.post(
+        resp = _get_session().post(
             f"{_base_url()}/keepalive",
             json={"user_id": user_id},
             timeout=3,
@@ -115,18 +139,25 @@ def keepalive(user_id: str) -> tuple[bool, str]:
     return False, resp.text
 
 
-def send_alarm(payload: dict) -> tuple[bool, str]:
+def post_alarm(payload: dict) -> tuple[bool, str, int | None]:
+    """알람 1건 전송. (성공 여부, 메시지, HTTP 상태 코드 - 요청 자체가 실패하면 None). AlarmOutbox 기본 sender."""
     try:
-        resp = requests.post(f"{_base_url()}/alarm", json=payload, timeout=5)
+        resp = _get_session().post(f"{_base_url()}/alarm", json=payload, timeout=5)
     except Exception as exc:
-        return False, f"요청 실패: {exc}"
+        return False, f"요청 실패: {exc}", None
     if resp.status_code == 200:
-        return True, "ok"
+        return True, "ok", resp.status_code
     try:
         data = resp.json()
         detail = data.get("detail")
         if detail:
-            return False, str(detail)
+            return False, str(detail), resp.status_code
     except Exception:
         pass
-    return False, "알람 전송에 실패했습니다."
+    return False, "알람 전송에 실패했습니다.", resp.status_code
+
+
+def send_alarm(payload: dict) -> tuple[bool, str]:
+    """알람 1건 전송. 일반적으로 직접 호출하지 않고 alarm_outbox.AlarmOutbox를 통해 전송."""
+    ok, msg, _status = post_alarm(payload)
+    return ok, msg
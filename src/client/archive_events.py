@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+event_logs 보관 작업: 보관 기간이 지난 이벤트를 월/사용자별 압축 파일로 옮기고 DB에서 삭제 (admin_ui/event_archive).
+
+.env 설정 (client 폴더):
+    EVENT_RETENTION_DAYS=180          # 이보다 오래된 이벤트를 옮김
+    EVENT_ARCHIVE_DIR=event_archive   # 상대경로는 client 폴더 기준
+    EVENT_ARCHIVE_FORMAT=csv          # csv(.csv.gz) | parquet (pyarrow 필요)
+
+실행 (client 폴더에서, cron 등으로 하루 한 번):
+    python archive_events.py
+    python archive_events.py --days 90 --dry-run   # 옮길 행 수만 확인
+"""
+
+import argparse
+import os
+import sys
+
+_SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+_PROJECT_ROOT = os.path.dirname(_SCRIPT_DIR)
+if _SCRIPT_DIR not in sys.path:
+    sys.path.insert(0, _SCRIPT_DIR)
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
+
+from env_config import ensure_env_file, load_env
+
+
+def _format_bytes(size: int) -> str:
+    value = float(size)
+    for unit in ("B", "KB", "MB"):
+        if value < 1024:
+            return f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} GB"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="event_logs 보관 (오래된 이벤트 → 압축 파일)")
+    parser.add_argument("--days", type=int, default=None, help="보관 기간(일). 기본: .env EVENT_RETENTION_DAYS")
+    parser.add_argument("--dry-run", action="store_true", help="옮길 행 수만 세고 파일 쓰기/삭제는 하지 않음")
+    args = parser.parse_args()
+
+    ensure_env_file(base_dir=_SCRIPT_DIR)
+    load_env(base_dir=_SCRIPT_DIR)
+    os.environ["ADMIN_UI_ENV_DIR"] = _SCRIPT_DIR  # admin_ui DB/보관 폴더는 클라이언트 .env 사용
+
+    from admin_ui.database_models import DatabaseManager
+    from admin_ui.event_archive import EventArchiver
+
+    archiver = EventArchiver(DatabaseManager(), retention_days=args.days)
+    print(f"[Archive] 보관 기간 {archiver.retention_days}일, 폴더: {archiver.archive.archive_dir} "
+          f"({archiver.archive.file_format})")
+    try:
+        result = archiver.run(dry_run=args.dry_run)
+    except Exception as e:
+        print(f"[Archive] 보관 실패: {e}")
+        return 1
+
+    if result["dry_run"]:
+        print(f"[Archive] (dry-run) {result['cutoff']} 이전 이벤트 {result['rows_moved']}행을 옮길 수 있습니다.")
+        return 0
+    print(f"[Archive] 기준: {result['cutoff']} 이전")
+    print(f"  옮긴 행      : {result['rows_moved']}")
+    print(f"  보관 파일    : {result['files']}개, {_format_bytes(result['archive_bytes'])}")
+    print(f"  DB 크기(추정): {_format_bytes(result['db_bytes_estimate'])} → 절감 {_format_bytes(result['bytes_saved'])}")
+    print(f"  소요 시간    : {result['seconds']:.1f}초")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
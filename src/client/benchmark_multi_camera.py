@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""
+멀티 카메라 처리량 벤치마크 (CPU 기준).
+
+카메라 1/2/4/8대를 흉내 내는 입력 스레드가 같은 영상 프레임을 최대 속도로 제출하고,
+BatchedFallBackend가 처리한 프레임 수로 전체/카메라별 fps를 측정한다.
+    batched  : 모델 1벌 공유 + 카메라 프레임을 배치로 추론 (max_batch = 카메라 수)
+    unbatched: 모델 1벌 공유 + 프레임 1장씩 추론 (max_batch = 1, 기존 방식과 같은 연산량)
+
+실행 (client 폴더에서):
+    python benchmark_multi_camera.py --video ../../data/sample.mp4
+    python benchmark_multi_camera.py --cameras 1 2 4 --duration 15 --device cpu
+영상이 없으면 합성 프레임을 사용 (사람이 없으므로 분류기 단계는 거의 실행되지 않음).
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+import cv2
+import numpy as np
+
+_SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+_PROJECT_ROOT = os.path.dirname(_SCRIPT_DIR)
+if _SCRIPT_DIR not in sys.path:
+    sys.path.insert(0, _SCRIPT_DIR)
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
+
+from admin_ui.unified_fall_runner import FallModels
+from multi_camera import BatchedFallBackend
+
+
+def load_frames(video: str | None, width: int, height: int, limit: int = 300) -> list[np.ndarray]:
+    frames = []
+    if video:
+        cap = cv2.VideoCapture(video)
+        while len(frames) < limit:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            frames.append(cv2.resize(frame, (width, height)))
+        cap.release()
+    if not frames:
+        rng = np.random.default_rng(0)
+        frames = [rng.integers(0, 255, (height, width, 3), dtype=np.uint8) for _ in range(30)]
+    return frames
+
+
+def run_case(models: FallModels, frames: list[np.ndarray], cameras: int, max_batch: int, duration: float) -> dict:
+    backend = BatchedFallBackend(models, _SCRIPT_DIR, max_batch=max_batch)
+    stop = threading.Event()
+    done_events = {}
+
+    def _feeder(stream_id: str, offset: int):
+        # 결과가 나오면 바로 다음 프레임 제출 (카메라가 처리 속도보다 빠른 경우와 같음, 버리는 프레임 없이 측정)
+        i = offset
+        event = done_events[stream_id]
+        while not stop.is_set():
+            backend.submit(stream_id, frames[i % len(frames)].copy())
+            i += 1
+            event.wait(timeout=1.0)
+            event.clear()
+
+    for c in range(cameras):
+        stream_id = f"cam{c + 1}"
+        done_events[stream_id] = threading.Event()
+        backend.register(stream_id, lambda *_args, e=done_events[stream_id]: e.set())
+    backend.start()
+    feeders = [
+        threading.Thread(target=_feeder, args=(f"cam{c + 1}", c * 7), daemon=True)
+        for c in range(cameras)
+    ]
+    for t in feeders:
+        t.start()
+    # 워밍업 (모델 첫 실행 비용 제외)
+    time.sleep(min(3.0, duration / 3))
+    before = {k: v["processed"] for k, v in backend.stats()["streams"].items()}
+    batches_before = backend.stats()["batches"]
+    t0 = time.perf_counter()
+    time.sleep(duration)
+    elapsed = time.perf_counter() - t0
+    stats = backend.stats()
+    stop.set()
+    for e in done_events.values():
+        e.set()
+    backend.stop()
+    for t in feeders:
+        t.join(timeout=2.0)
+
+    per_camera = {k: (v["processed"] - before.get(k, 0)) / elapsed for k, v in stats["streams"].items()}
+    latency = [v["latency_ms"] for v in stats["streams"].values()]
+    batches = stats["batches"] - batches_before
+    return {
+        "cameras": cameras,
+        "max_batch": max_batch,
+        "total_fps": sum(per_camera.values()),
+        "min_camera_fps": min(per_camera.values()) if per_camera else 0.0,
+        "avg_batch": sum(v * elapsed for v in per_camera.values()) / batches if batches else 0.0,
+        "latency_ms": sum(latency) / len(latency) if latency else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="멀티 카메라 공유 백엔드 처리량 벤치마크")
+    parser.add_argument("--video", default=None, help="입력 영상 파일 (없으면 합성 프레임)")
+    parser.add_argument("--cameras", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--duration", type=float, default=10.0, help="케이스별 측정 시간(초)")
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    parser.add_argument("--device", default="cpu", help="YOLO 실행 장치 (기본 cpu)")
+    args = parser.parse_args()
+
+    os.environ["ADMIN_UI_ENV_DIR"] = _SCRIPT_DIR
+    models = FallModels(_SCRIPT_DIR)
+    if models.yolo_model is None:
+        print("[Benchmark] YOLO Pose 모델이 없어 측정할 수 없습니다 (admin_ui/models/yolo11s-pose.pt).")
+        return 1
+    if args.device:
+        models.yolo_model.to(args.device)
+    frames = load_frames(args.video, args.width, args.height)
+    print(f"[Benchmark] model={models.model_name}, 프레임 {len(frames)}장 ({args.width}x{args.height}), "
+          f"torch threads={_torch_threads()}")
+
+    for n in args.cameras:
+        for max_batch in (1, n) if n > 1 else (1,):
+            r = run_case(models, frames, n, max_batch, args.duration)
+            mode = "batched" if max_batch > 1 else "unbatched"
+            print(f"  cameras={n:<2} {mode:<9} total {r['total_fps']:6.1f} fps | "
+                  f"camera min {r['min_camera_fps']:5.1f} fps | avg batch {r['avg_batch']:.1f} | "
+                  f"latency {r['latency_ms']:6.1f} ms")
+    return 0
+
+
+def _torch_threads() -> int:
+    try:
+        import torch
+        return torch.get_num_threads()
+    except Exception:
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
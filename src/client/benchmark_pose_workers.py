@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""
+YOLO Pose 실행 위치 벤치마크: 같은 프로세스 vs 포즈 워커 프로세스 풀 (admin_ui/pose_worker_pool).
+
+스트림 1/2/4개를 흉내 내는 스레드가 결과를 받는 즉시 다음 프레임을 넣고(스트림별 순서 유지),
+측정 동안 10ms 주기로 깨어나는 "UI 루프" 스레드의 지연(GIL 경합)도 함께 기록한다.
+    inproc   : FallModels.detect_poses (같은 프로세스 YOLO)
+    workers=N: PoseWorkerPool (공유 메모리 슬롯으로 프레임 전달)
+
+실행 (client 폴더에서):
+    python benchmark_pose_workers.py --video ../../data/sample.mp4
+    python benchmark_pose_workers.py --streams 1 4 --workers 1 2 4 --duration 15
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+_SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+_PROJECT_ROOT = os.path.dirname(_SCRIPT_DIR)
+if _SCRIPT_DIR not in sys.path:
+    sys.path.insert(0, _SCRIPT_DIR)
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
+
+from admin_ui.unified_fall_runner import FallModels, detect_poses
+from admin_ui.pose_worker_pool import PoseWorkerPool
+from benchmark_multi_camera import load_frames
+
+UI_TICK_SEC = 0.01
+
+
+def _ui_loop(stop: threading.Event, lateness: list):
+    """UI 이벤트 루프 대용: 10ms마다 깨어나며 예정 시각보다 늦은 정도 기록."""
+    next_tick = time.perf_counter() + UI_TICK_SEC
+    while not stop.is_set():
+        time.sleep(max(0.0, next_tick - time.perf_counter()))
+        now = time.perf_counter()
+        lateness.append(max(0.0, now - next_tick))
+        next_tick = max(next_tick + UI_TICK_SEC, now)
+
+
+def run_case(pose_fn, frames: list, streams: int, duration: float) -> dict:
+    stop = threading.Event()
+    counts = [0] * streams
+    measuring = threading.Event()
+
+    def _stream(idx: int):
+        i = idx * 7
+        while not stop.is_set():
+            pose_fn([frames[i % len(frames)]])
+            i += 1
+            if measuring.is_set():
+                counts[idx] += 1
+
+    threads = [threading.Thread(target=_stream, args=(k,), daemon=True) for k in range(streams)]
+    for t in threads:
+        t.start()
+    time.sleep(min(3.0, duration / 3))  # 워밍업
+    lateness: list[float] = []
+    ui_stop = threading.Event()
+    ui = threading.Thread(target=_ui_loop, args=(ui_stop, lateness), daemon=True)
+    measuring.set()
+    ui.start()
+    t0 = time.perf_counter()
+    time.sleep(duration)
+    elapsed = time.perf_counter() - t0
+    measuring.clear()
+    ui_stop.set()
+    stop.set()
+    ui.join(timeout=1.0)
+    for t in threads:
+        t.join(timeout=5.0)
+
+    lateness.sort()
+    return {
+        "total_fps": sum(counts) / elapsed,
+        "min_stream_fps": min(counts) / elapsed if counts else 0.0,
+        "ui_p95_ms": lateness[int(len(lateness) * 0.95)] * 1000 if lateness else 0.0,
+        "ui_max_ms": lateness[-1] * 1000 if lateness else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="YOLO Pose 같은 프로세스 vs 워커 프로세스 벤치마크")
+    parser.add_argument("--video", default=None, help="입력 영상 파일 (없으면 합성 프레임)")
+    parser.add_argument("--streams", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2])
+    parser.add_argument("--duration", type=float, default=10.0, help="케이스별 측정 시간(초)")
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    args = parser.parse_args()
+
+    os.environ["ADMIN_UI_ENV_DIR"] = _SCRIPT_DIR
+    models = FallModels(_SCRIPT_DIR, pose_workers=0)
+    if models.yolo_model is None:
+        print("[Benchmark] YOLO Pose 모델이 없어 측정할 수 없습니다 (admin_ui/models/yolo11s-pose.pt).")
+        return 1
+    frames = load_frames(args.video, args.width, args.height)
+    print(f"[Benchmark] 프레임 {len(frames)}장 ({args.width}x{args.height}), CPU {os.cpu_count()}개")
+
+    def _print(name: str, streams: int, r: dict):
+        print(f"  streams={streams:<2} {name:<10} total {r['total_fps']:6.1f} fps | "
+              f"stream min {r['min_stream_fps']:5.1f} fps | UI 지연 p95 {r['ui_p95_ms']:6.1f} ms, "
+              f"max {r['ui_max_ms']:6.1f} ms")
+
+    yolo_lock = threading.Lock()  # YOLO 모델 1개를 여러 스레드가 동시에 호출하지 않도록 (러너와 같은 조건)
+
+    def inproc(batch):
+        with yolo_lock:
+            return detect_poses(models.yolo_model, batch)
+
+    for n in args.streams:
+        _print("inproc", n, run_case(inproc, frames, n, args.duration))
+    for w in args.workers:
+        pool = PoseWorkerPool(workers=w)
+        pool.start()
+        try:
+            for n in args.streams:
+                _print(f"workers={w}", n, run_case(pool.detect, frames, n, args.duration))
+        finally:
+            pool.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
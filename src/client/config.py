@@ -9,6 +9,20 @@ DEFAULT_CONFIG = {
     "rtsp_enable": False,
     "webcam_enable": False,
     "rtsp_url": "",
+    # 멀티 카메라 (edge_daemon): [{"id": "cam1", "source": "rtsp://... 또는 카메라 번호", "user_id": "", "enabled": true}]
+    # user_id는 users에 등록된 ID (비우면 데몬 user_id, 서버 영상은 user_id당 카메라 1대만 전송)
+    # 비어 있으면 위 rtsp_enable/webcam_enable 단일 카메라 설정 사용
+    "cameras": [],
+    # 서버 전송 방식: video(JPEG) | keypoints(키포인트 텔레메트리만, 영상 미전송) | both
+    "stream_mode": "video",
+    # 낙상 판정 위치: local(클라이언트에서 판정, 기본) | server(원본 영상만 전송, 서버 워커 풀에서 판정)
+    "inference": "local",
+    # 서버 영상 업링크 적응 범위 (uplink_controller)
+    "uplink_min_quality": 40,
+    "uplink_max_quality": 80,
+    "uplink_min_scale": 0.5,
+    "uplink_min_fps": 5,
+    "uplink_max_fps": 30,
 }
 
 
@@ -41,3 +55,28 @@ def save_config(data: dict) -> None:
     out = {k: data.get(k, v) for k, v in DEFAULT_CONFIG.items()}
     with open(path, "w", encoding="utf-8") as f:
         json.dump(out, f, ensure_ascii=False, indent=2)
+
+
+def get_cameras(data: dict | None = None) -> list[dict]:
+    """카메라 목록 (id, source, user_id). cameras가 비어 있으면 기존 단일 카메라 설정에서 1대 구성."""
+    data = data if data is not None else load_config()
+    cameras = []
+    for i, cam in enumerate(data.get("cameras") or []):
+        if not isinstance(cam, dict) or not cam.get("enabled", True):
+            continue
+        source = cam.get("source")
+        if source is None or str(source).strip() == "":
+            continue
+        cameras.append({
+            "id": str(cam.get("id") or f"cam{i + 1}"),
+            "source": str(source).strip(),
+            "user_id": (cam.get("user_id") or "").strip(),
+        })
+    if cameras:
+        return cameras
+    rtsp_url = (data.get("rtsp_url") or "").strip()
+    if data.get("rtsp_enable", False) and rtsp_url:
+        return [{"id": "cam1", "source": rtsp_url, "user_id": ""}]
+    if data.get("webcam_enable", False):
+        return [{"id": "cam1", "source": "0", "user_id": ""}]
+    return []
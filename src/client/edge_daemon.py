@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+"""
+AI Care Edge Daemon - GUI 없이 낙상 감지 + 서버 업링크 실행 (헤드리스 엣지 장비용).
+
+MainWindow와 같은 설정(devices_config.json, .env)과 같은 부품을 쓰되 Qt 화면/오버레이 그리기 없이
+카메라별 캡처 → 공유 배치 추론(multi_camera.BatchedFallBackend) → 알람(outbox) / 영상·키포인트 업링크를 처리한다.
+devices_config.json "cameras"에 여러 대를 지정하면 한 프로세스가 모델 한 벌로 모두 처리한다.
+로컬 HTTP로 상태 확인:
+    GET /health   {"status": "ok" | "degraded", ...}
+    GET /metrics  카메라별 처리 fps, 배치 크기/지연, 업링크/알람 대기 통계 (JSON)
+
+실행 (client 폴더에서):
+    python edge_daemon.py --user-id user01
+    python edge_daemon.py --user-id user01 --source rtsp://... --metrics-port 8765
+"""
+
+import argparse
+import fcntl
+import json
+import os
+import signal
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+_PROJECT_ROOT = os.path.dirname(_SCRIPT_DIR)
+if _SCRIPT_DIR not in sys.path:
+    sys.path.insert(0, _SCRIPT_DIR)
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
+
+from env_config import ensure_env_file, load_env, read_env_values
+import config as client_config
+from api_client import keepalive
+from stream_uplink import WS_KEEPALIVE_SEC
+from alarm_outbox import AlarmOutbox
+from multi_camera import BatchedFallBackend, CameraPipeline, DEFAULT_MAX_BATCH
+
+# GUI 클라이언트와 같은 잠금 파일 (한 장비에서 카메라를 두 프로세스가 잡지 않도록)
+LOCK_PATH = "/tmp/ai_care_client.lock"
+
+
+def camera_user_id(user_id: str, camera: dict) -> str:
+    """카메라의 서버 사용자 ID (users 테이블에 등록된 값). 카메라별 지정값 우선, 없으면 데몬 user_id.
+
+    알람에는 이 user_id와 camera_id를 따로 보낸다 (user_id를 카메라별로 만들어 붙이지 않음).
+    """
+    return camera.get("user_id") or user_id
+
+
+class EdgeDaemon:
+    """카메라 파이프라인 + 공유 추론 백엔드 + 알람 outbox."""
+
+    def __init__(
+        self,
+        user_id: str,
+        cameras: list[dict],
+        max_batch: int = DEFAULT_MAX_BATCH,
+        draw_overlays: bool = False,
+    ):
+        from admin_ui.unified_fall_runner import FallModels
+
+        self._user_id = user_id
+        self._stop = threading.Event()
+        self.started_at = time.time()
+        cfg = client_config.load_config()
+        stream_mode = (cfg.get("stream_mode") or "video").strip().lower()
+        self.models = FallModels(_SCRIPT_DIR)
+        self.backend = BatchedFallBackend(self.models, _SCRIPT_DIR, max_batch=max_batch, draw_overlays=draw_overlays)
+        self.outbox = AlarmOutbox()
+        self.pipelines = []
+        streaming = set()
+        for cam in cameras:
+            cam_user = camera_user_id(user_id, cam)
+            # 서버 스트림(/ws/{user_id})은 사용자당 하나: 같은 user_id의 두 번째 카메라부터는 알람만 전송
+            uplink_stream = cam_user not in streaming
+            if uplink_stream:
+                streaming.add(cam_user)
+            else:
+                print(f"[EdgeDaemon] {cam['id']}: {cam_user} 영상은 다른 카메라가 전송 중 - 알람만 전송 (카메라별 user_id 지정 시 영상도 전송)")
+            self.pipelines.append(
+                CameraPipeline(cam, cam_user, self.backend, self.outbox, cfg, stream_mode, uplink_stream=uplink_stream)
+            )
+
+    @property
+    def model_name(self) -> str:
+        return self.models.model_name
+
+    def run(self):
+        self.outbox.start()
+        self.backend.start()
+        for p in self.pipelines:
+            p.start()
+        while not self._stop.is_set():
+            # 웹소켓이 끊긴 동안은 HTTP keepalive로 접속 상태 유지
+            for p in self.pipelines:
+                if p.uplink_stream and not p.stream.connected:
+                    keepalive(p.user_id)
+            self._stop.wait(WS_KEEPALIVE_SEC)
+        for p in self.pipelines:
+            p.stop()
+        self.backend.stop()
+        self.models.close()
+        self.outbox.stop()
+
+    def stop(self):
+        self._stop.set()
+
+    def status(self) -> dict:
+        cameras = [p.status() for p in self.pipelines]
+        for cam in cameras:
+            cam.pop("uplink", None)
+        healthy = bool(cameras) and all(
+            c["capture_open"] and c["last_frame_age_sec"] is not None and c["last_frame_age_sec"] < 5
+            for c in cameras
+        )
+        return {
+            "status": "ok" if healthy else "degraded",
+            "user_id": self._user_id,
+            "model": self.model_name,
+            "uptime_sec": time.time() - self.started_at,
+            "fps_total": sum(c["fps"] for c in cameras),
+            "alarms_pending": self.outbox.pending_count(),
+            "alarms_dead": self.outbox.dead_count(),
+            "cameras": cameras,
+        }
+
+    def metrics_dict(self) -> dict:
+        return {
+            **self.status(),
+            "cameras": [p.status() for p in self.pipelines],
+            "backend": self.backend.stats(),
+        }
+
+
+def _make_handler(daemon: EdgeDaemon):
+    class _Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == "/health":
+                body = daemon.status()
+                code = 200 if body["status"] == "ok" else 503
+            elif self.path == "/metrics":
+                body, code = daemon.metrics_dict(), 200
+            else:
+                body, code = {"detail": "not found"}, 404
+            data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    return _Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AI Care 헤드리스 엣지 데몬")
+    parser.add_argument("--user-id", default=None, help="서버 사용자 ID (기본: .env EDGE_USER_ID)")
+    parser.add_argument("--source", default=None, help="영상 소스 (카메라 번호 또는 RTSP URL). 기본: devices_config.json")
+    parser.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH, help="카메라 프레임 배치 최대 크기")
+    parser.add_argument("--metrics-host", default="127.0.0.1")
+    parser.add_argument("--metrics-port", type=int, default=8765, help="0이면 상태 HTTP 비활성")
+    parser.add_argument("--overlay", action="store_true", help="업링크 영상에 스켈레톤/상태 오버레이 그리기")
+    args = parser.parse_args()
+
+    ensure_env_file(base_dir=_SCRIPT_DIR)
+    load_env(base_dir=_SCRIPT_DIR)
+    os.environ["ADMIN_UI_ENV_DIR"] = _SCRIPT_DIR  # 통합 모델이 client/.env 사용
+    user_id = args.user_id or (read_env_values(base_dir=_SCRIPT_DIR).get("EDGE_USER_ID") or "").strip()
+    if not user_id:
+        print("[EdgeDaemon] --user-id 또는 .env EDGE_USER_ID가 필요합니다.")
+        return 2
+
+    lock_file = open(LOCK_PATH, "w")
+    try:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        print("[EdgeDaemon] 클라이언트 프로세스가 이미 실행 중입니다.")
+        return 1
+
+    if args.source:
+        cameras = [{"id": "cam1", "source": args.source, "user_id": ""}]
+    else:
+        cameras = client_config.get_cameras()
+    if not cameras:
+        print("[EdgeDaemon] devices_config.json에 사용 가능한 영상 장치가 없습니다.")
+        return 2
+
+    daemon = EdgeDaemon(user_id, cameras, max_batch=args.max_batch, draw_overlays=args.overlay)
+    print(f"[EdgeDaemon] user_id={user_id}, model={daemon.model_name}, 카메라 {len(cameras)}대")
+
+    httpd = None
+    if args.metrics_port:
+        httpd = ThreadingHTTPServer((args.metrics_host, args.metrics_port), _make_handler(daemon))
+        threading.Thread(target=httpd.serve_forever, name="edge-metrics", daemon=True).start()
+        print(f"[EdgeDaemon] 상태 확인: http://{args.metrics_host}:{args.metrics_port}/health, /metrics")
+
+    signal.signal(signal.SIGINT, lambda *_: daemon.stop())
+    signal.signal(signal.SIGTERM, lambda *_: daemon.stop())
+    try:
+        daemon.run()
+    finally:
+        if httpd is not None:
+            httpd.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -99,13 +99,16 @@ CREATE TABLE event_logs (
     notes TEXT,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     accuracy FLOAT DEFAULT NULL COMMENT '정상 탐지율 (최근 5분 평균, %)',
+    event_uid CHAR(32) NULL COMMENT '클라이언트 로컬 저장소(event_store) 전송 키 (중복 전송 방지)',
     FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE,
     FOREIGN KEY (event_type_id) REFERENCES event_types(event_type_id),
     INDEX idx_user_event (user_id, occurred_at),
     INDEX idx_event_type (event_type_id),
     INDEX idx_occurred_at (occurred_at),
     INDEX idx_status (event_status),
-    INDEX idx_event_search (user_id, event_type_id, occurred_at)
+    INDEX idx_event_search (user_id, event_type_id, occurred_at),
+    INDEX idx_type_occurred (event_type_id, occurred_at),
+    UNIQUE KEY uq_event_uid (event_uid)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 -- 4. 자동신고 로그 테이블
@@ -191,6 +194,34 @@ INSERT INTO system_settings (setting_key, setting_value, setting_type, descripti
 ('confidence_threshold', '0.7', 'float', '낙상 감지 신뢰도 임계값')
 ON DUPLICATE KEY UPDATE setting_id=setting_id;
 
+-- ============================================================
+-- 대시보드 집계 테이블 (EventRollup.refresh가 event_logs 추가분을 반영)
+-- ============================================================
+CREATE TABLE IF NOT EXISTS event_rollup_hourly (
+    user_id INT NOT NULL,
+    event_type_id INT NOT NULL,
+    hour_start DATETIME NOT NULL,
+    event_count INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, event_type_id, hour_start),
+    INDEX idx_rollup_hour (hour_start)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE IF NOT EXISTS event_rollup_totals (
+    user_id INT NOT NULL,
+    event_type_id INT NOT NULL,
+    total_count INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, event_type_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE IF NOT EXISTS event_rollup_state (
+    state_id TINYINT PRIMARY KEY,
+    last_event_id INT NOT NULL DEFAULT 0,
+    version BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+INSERT IGNORE INTO event_rollup_state (state_id, last_event_id, version) VALUES (1, 0, 0);
+
 -- ============================================================
 -- 뷰 (add_column 반영: accuracy 포함)
 -- ============================================================
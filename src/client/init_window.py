@@ -29,6 +29,7 @@ from env_config import (
     database_exists,
     run_setup_sql_file,
 )
+from schema_migrations import apply_migrations
 from login_window import LoginWindow
 from main_window import MainWindow
 from api_client import health_check
@@ -142,6 +143,13 @@ class InitWindow(QMainWindow):
             self.close()
             QApplication.instance().quit()
             return
+
+        # 3) 스키마 마이그레이션 (검색 인덱스 등, 실패해도 실행은 계속)
+        ok_mig, mig_log = apply_migrations(db_config, "client")
+        for line in mig_log:
+            print(f"[Migration] {line}")
+        if not ok_mig:
+            print("[Migration] 일부 마이그레이션 적용 실패 - 다음 실행 시 다시 시도합니다.")
         config_path = client_config.get_config_path()
         config_existed = os.path.isfile(config_path)
         cfg = client_config.load_config()
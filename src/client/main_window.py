@@ -2,13 +2,12 @@ import os
 import sys
 
 import cv2
-import threading
 import time
 import json
 import numpy as np
 from PyQt6 import uic
 from PyQt6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QTextEdit, QPushButton, QMessageBox
-from PyQt6.QtCore import QTimer, Qt
+from PyQt6.QtCore import QTimer, Qt, QObject, pyqtSignal
 from PyQt6.QtGui import QImage, QPixmap
 
 _SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -16,10 +15,15 @@ _PROJECT_ROOT = os.path.dirname(_SCRIPT_DIR)
 if _PROJECT_ROOT not in sys.path:
     sys.path.insert(0, _PROJECT_ROOT)
 
-from env_config import read_env_values, update_env_file, resolve_path_from_base
+from env_config import get_config, read_env_values, update_env_file, resolve_path_from_base
 import config as client_config
-from api_client import keepalive, get_ws_url, send_alarm
+from api_client import keepalive, send_alarm
+from alarm_outbox import AlarmOutbox, STATUS_DEAD, STATUS_SENT
 from get_device_id import get_device_id
+from uplink_controller import UplinkController
+from stream_uplink import StreamUplink
+from keypoint_telemetry import encode_keypoints
+
 
 
 class TestMessageDialog(QDialog):
@@ -72,6 +76,12 @@ class TestMessageDialog(QDialog):
             QMessageBox.warning(self, "실패", f"전송 실패: {msg}")
 
 
+class _ClientSignalBridge(QObject):
+    """워커 스레드 → Qt 스레드 전달용."""
+
+    outbox_changed = pyqtSignal(str, str, str)  # event_id, status, message
+
+
 class MainWindow(QDialog):
     """클라이언트 메인 (탭 기반)."""
 
@@ -115,25 +125,42 @@ class MainWindow(QDialog):
         self._video_timer.timeout.connect(self._update_frame)
         self._keepalive_timer = QTimer(self)
         self._keepalive_timer.timeout.connect(self._send_keepalive)
-        self._stream_thread = None
-        self._stream_stop = threading.Event()
-        self._latest_frame = None
-        self._latest_lock = threading.Lock()
+        device_cfg = client_config.load_config()
+        self._uplink = UplinkController(device_cfg)
+        # video | keypoints | both (keypoints: 개인정보 보호/저대역폭 현장용, 영상 대신 포즈만 전송)
+        stream_mode = (device_cfg.get("stream_mode") or "video").strip().lower()
+        # server: 로컬 모델 없이 원본 영상만 전송하고 낙상 판정/알람은 서버가 담당 (저사양 단말용)
+        self._server_inference = (device_cfg.get("inference") or "local").strip().lower() == "server"
+        self._stream = StreamUplink(self._user_id, self._uplink, stream_mode, server_inference=self._server_inference)
+        self._uplink_timer = QTimer(self)
+        self._uplink_timer.timeout.connect(self._update_uplink_status)
         self._fall_runner = None  # 통합 낙상 감지 (admin_ui.unified_fall_runner)
         self._ai_enabled = False
         self._frame_idx = 0
         self._last_alarm_ts = 0.0
+        # 알람은 로컬 outbox에 먼저 기록하고 백그라운드에서 전송 (서버 중단 시에도 유실 없음)
+        self._signals = _ClientSignalBridge(self)
+        self._signals.outbox_changed.connect(self._on_outbox_changed)
+        self._outbox = AlarmOutbox()
+        self._outbox_listener = self._signals.outbox_changed.emit
+        self._outbox.add_listener(self._outbox_listener)
+        self._outbox.start()
         # 현재 모드(user/admin)를 미리 읽어서 저장
         env = read_env_values(base_dir=_SCRIPT_DIR)
         self._mode = (env.get("MODE") or "user").strip().lower()
         self._apply_mode()
         os.environ["ADMIN_UI_ENV_DIR"] = _SCRIPT_DIR  # 통합 모델이 client/.env 사용
-        self._init_ai()
+        if self._server_inference:
+            if hasattr(self, "event_text"):
+                self.event_text.append("[AI] 서버 판정 모드 - 로컬 모델 미사용")
+        else:
+            self._init_ai()
         # admin 모드에서는 사용자 탭의 카메라/RTSP를 열지 않음
         if self._mode != "admin":
             self._init_video()
         self._keepalive_timer.start(5000)
         self._start_streaming()
+        self._uplink_timer.start(1000)
         self._init_debug()
 
     def _apply_mode(self):
@@ -236,8 +263,8 @@ class MainWindow(QDialog):
         if not ret or frame is None:
             return
         annotated = self._process_ai(frame)
-        with self._latest_lock:
-            self._latest_frame = annotated.copy()
+        # annotated는 이후 수정하지 않으므로 복사 없이 참조만 교체 (업링크 스레드는 읽기만 함)
+        self._stream.publish_frame(annotated)
         h, w, ch = frame.shape
         bytes_per_line = ch * w
         rgb = cv2.cvtColor(annotated, cv2.COLOR_BGR2RGB)
@@ -278,12 +305,21 @@ class MainWindow(QDialog):
             return frame
         try:
             annotated, state_str, is_fallen = self._fall_runner.process(frame)
+            if self._stream.sends_keypoints:
+                self._update_telemetry()
             if is_fallen:
                 self._send_fall_event()
             return annotated
         except Exception:
             return frame
 
+    def _update_telemetry(self):
+        """최근 포즈를 키포인트 텔레메트리 패킷(~120 bytes)으로 만들어 업링크 대기."""
+        keypoints, track_id, prediction, confidence, (w, h) = self._fall_runner.get_last_pose()
+        self._frame_idx += 1
+        packet = encode_keypoints(self._frame_idx, w, h, keypoints, prediction, confidence, track_id)
+        self._stream.publish_telemetry(packet)
+
     def _send_fall_event(self):
         now = time.time()
         if now - self._last_alarm_ts < 10:
@@ -293,9 +329,7 @@ class MainWindow(QDialog):
             ts = time.strftime("%Y-%m-%d %H:%M:%S")
             self.event_text.append(f"[ALERT] {ts} 쓰러짐 감지 되었다")
         # 관리자 모드(또는 관리자 계정)에서는 서버로 이벤트를 보내지 않음
-        from env_config import read_env_values
-        env = read_env_values(base_dir=_SCRIPT_DIR)
-        mode = (env.get("MODE") or "user").strip().lower()
+        mode = get_config(_SCRIPT_DIR).get_str("MODE", "user").lower()
         if mode == "admin" or (self._user_id and self._user_id.lower() == "admin"):
             # 개발/테스트용으로만 콘솔에 남기고 서버 알람 전송은 차단
             print("[INFO] 관리자 모드에서 발생한 이벤트는 서버로 전송하지 않습니다.")
@@ -307,10 +341,25 @@ class MainWindow(QDialog):
             "device_id": get_device_id(),
             "user_id": self._user_id,
             "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "sent_ts": time.time(),  # 서버 알람 지연 측정용
         }
-        ok, msg = send_alarm(payload)
-        if hasattr(self, "event_text"):
-            self.event_text.append(f"[서버] 쓰러짐 이벤트 전송 {'완료' if ok else f'실패: {msg}'}")
+        self._outbox.enqueue(payload)
+
+    def _on_outbox_changed(self, event_id: str, status: str, message: str):
+        """outbox 상태 변화 표시 (대기 / 재시도 / 전송 완료 / 전송 거부)."""
+        if not hasattr(self, "event_text"):
+            return
+        short_id = event_id[:8]
+        if status == STATUS_SENT:
+            self.event_text.append(f"[서버] 쓰러짐 이벤트 전송 완료 ({short_id})")
+        elif status == STATUS_DEAD:
+            self.event_text.append(f"[서버] 쓰러짐 이벤트 전송 거부 - 재시도하지 않음 ({short_id}): {message}")
+        elif message:
+            self.event_text.append(
+                f"[서버] 쓰러짐 이벤트 전송 대기 ({short_id}, 미전송 {self._outbox.pending_count()}건): {message}"
+            )
+        else:
+            self.event_text.append(f"[서버] 쓰러짐 이벤트 전송 대기 ({short_id})")
 
     def _on_admin_logout(self):
         """관리자 탭에서 로그아웃 요청 시 사용자 탭으로 전환."""
@@ -333,42 +382,26 @@ class MainWindow(QDialog):
         self.btn_test_message.clicked.connect(_open_test_dialog)
 
     def _start_streaming(self):
-        if not self._user_id:
-            return
-        self._stream_stop.clear()
-        self._stream_thread = threading.Thread(target=self._stream_loop, daemon=True)
-        self._stream_thread.start()
+        # 연결이 끊긴 동안은 _send_keepalive가 HTTP로 대신 전송
+        self._stream.start()
 
-    def _stream_loop(self):
-        try:
-            import asyncio
-            import websockets
-        except Exception:
+    def _update_uplink_status(self):
+        """업링크 실제 전송 fps/bitrate 및 현재 품질 단계 표시."""
+        if not hasattr(self, "video_title"):
             return
-
-        async def _send():
-            uri = get_ws_url(self._user_id)
-            try:
-                async with websockets.connect(uri, max_size=2**20) as ws:
-                    while not self._stream_stop.is_set():
-                        frame = None
-                        with self._latest_lock:
-                            if self._latest_frame is not None:
-                                frame = self._latest_frame.copy()
-                        if frame is None:
-                            await asyncio.sleep(0.03)
-                            continue
-                        ok, buffer = cv2.imencode(".jpg", frame, [int(cv2.IMWRITE_JPEG_QUALITY), 80])
-                        if ok:
-                            await ws.send(buffer.tobytes())
-                        await asyncio.sleep(0.03)
-            except Exception:
-                return
-
-        asyncio.run(_send())
+        pending = self._outbox.pending_count()
+        pending_text = f" · 알람 전송 대기 {pending}건" if pending else ""
+        if not self._stream.connected:
+            self.video_title.setText(f"영상 화면 (서버 미연결{pending_text})")
+            return
+        st = self._uplink.stats()
+        self.video_title.setText(
+            f"영상 화면 (업로드 {st['fps']:.1f} fps / {st['kbps']:.0f} kbps, {st['tier']} · "
+            f"Q{st['quality']} · {int(st['scale'] * 100)}% · 최대 {st['target_fps']} fps{pending_text})"
+        )
 
     def _send_keepalive(self):
-        if not self._user_id:
+        if not self._user_id or self._stream.connected:
             return
         keepalive(self._user_id)
 
@@ -378,7 +411,17 @@ class MainWindow(QDialog):
         mode = (env.get("MODE") or "user").strip().lower()
         if mode == "admin":
             update_env_file(base_dir=_SCRIPT_DIR, updates={"MODE": "user"})
-        self._stream_stop.set()
+        self._stream.stop()
+        self._outbox.remove_listener(self._outbox_listener)
+        self._outbox.stop()
+        if self._fall_runner is not None:
+            self._fall_runner.models.close()  # 포즈 워커 프로세스/공유 메모리 정리
+        if hasattr(self, "_admin_ui_widget") and self._admin_ui_widget:
+            try:
+                from client.admin_ui.event_store import stop_event_store
+            except ImportError:
+                from admin_ui.event_store import stop_event_store
+            stop_event_store()  # 관리자 모니터링 이벤트 버퍼 저장
         if self._cap is not None:
             self._cap.release()
             self._cap = None
@@ -0,0 +1,388 @@
+# -*- coding: utf-8 -*-
+"""
+멀티 카메라: 카메라별 캡처 스레드 + 공유 배치 추론 백엔드.
+
+- BatchedFallBackend: FallModels(YOLO Pose + RF/ST-GCN) 한 벌을 모든 카메라가 공유.
+  카메라마다 최신 프레임 1장만 대기(늦은 프레임은 버림)하고, 모인 프레임을 한 번에
+  detect_poses / classify_batch로 처리한다. 카메라별 상태(필터, ST-GCN 버퍼, 직전 판정)는
+  카메라마다 UnifiedFallRunner가 따로 가진다.
+- CameraPipeline: 캡처 스레드 1개 + 결과 처리 (업링크 스트림, 알람, 통계).
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Callable
+
+import cv2
+import numpy as np
+
+from admin_ui.unified_fall_runner import FallModels, UnifiedFallRunner, classify_batch
+from alarm_outbox import AlarmOutbox
+from get_device_id import get_device_id
+from keypoint_telemetry import encode_keypoints
+from stream_uplink import StreamUplink
+from uplink_controller import UplinkController
+
+DEFAULT_MAX_BATCH = 8
+# 첫 프레임 도착 후 다른 카메라 프레임을 기다리는 최대 시간 (배치 크기 vs 지연)
+DEFAULT_MAX_WAIT_SEC = 0.005
+ALARM_COOLDOWN_SEC = 10
+CAPTURE_RETRY_SEC = 3
+# 연속 읽기 실패가 이만큼이면 캡처 장치 재연결 (RTSP 끊김 등)
+MAX_READ_FAILURES = 30
+METRICS_WINDOW_SEC = 5.0
+
+# (frame, state_str, is_fallen, runner)
+ResultCallback = Callable[[np.ndarray, str, bool, UnifiedFallRunner], None]
+# 배치 처리가 예외로 끝나 결과가 없을 때 그 배치의 스트림마다 호출 (예외)
+ErrorCallback = Callable[[Exception], None]
+# 프레임 목록 → 프레임별 PoseDetections (기본: FallModels.detect_poses, POSE_WORKERS면 워커 프로세스)
+PoseFn = Callable[[list], list]
+
+
+def open_capture(source: str):
+    """카메라 번호("0") 또는 RTSP/파일 경로로 VideoCapture 열기. 실패 시 None."""
+    if source.isdigit():
+        cap = cv2.VideoCapture(int(source))
+    else:
+        cap = cv2.VideoCapture(source, cv2.CAP_FFMPEG)
+    if not cap.isOpened():
+        cap.release()
+        return None
+    return cap
+
+
+class _Stream:
+    __slots__ = ("stream_id", "runner", "on_result", "on_error", "pending", "pending_ts", "processed", "dropped",
+                 "latencies")
+
+    def __init__(self, stream_id: str, runner: UnifiedFallRunner, on_result: ResultCallback,
+                 on_error: ErrorCallback | None = None):
+        self.stream_id = stream_id
+        self.runner = runner
+        self.on_result = on_result
+        self.on_error = on_error
+        self.pending: np.ndarray | None = None
+        self.pending_ts = 0.0
+        self.processed = 0
+        self.dropped = 0
+        self.latencies: deque[float] = deque(maxlen=200)
+
+
+class BatchedFallBackend:
+    """여러 스트림의 프레임을 모아 배치로 판정하는 공유 백엔드 (처리 스레드 1개)."""
+
+    def __init__(
+        self,
+        models: FallModels,
+        env_dir: str,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        max_wait_sec: float = DEFAULT_MAX_WAIT_SEC,
+        draw_overlays: bool = False,
+        pose_fn: PoseFn | None = None,
+    ):
+        self.models = models
+        self._env_dir = env_dir
+        self._max_batch = max(1, max_batch)
+        self._max_wait_sec = max_wait_sec
+        self._draw = draw_overlays
+        self._pose_fn = pose_fn or models.detect_poses
+        self._cond = threading.Condition()
+        self._streams: dict[str, _Stream] = {}
+        self._order: list[str] = []
+        self._rr = 0  # 배치가 max_batch보다 많을 때 공평하게 돌아가며 선택
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._batches = 0
+        self._batch_frames = 0
+
+    def register(self, stream_id: str, on_result: ResultCallback,
+                 on_error: ErrorCallback | None = None) -> UnifiedFallRunner:
+        """스트림 추가. 스트림 전용 러너(모델은 공유)를 반환.
+
+        on_error: 이 스트림 프레임이 든 배치가 실패하면 호출 (결과를 기다리는 쪽이 처리 중 상태를 풀 수 있도록).
+        """
+        runner = UnifiedFallRunner(env_dir=self._env_dir, draw_overlays=self._draw, models=self.models)
+        with self._cond:
+            self._streams[stream_id] = _Stream(stream_id, runner, on_result, on_error)
+            self._order.append(stream_id)
+        return runner
+
+    def unregister(self, stream_id: str):
+        with self._cond:
+            self._streams.pop(stream_id, None)
+            if stream_id in self._order:
+                self._order.remove(stream_id)
+
+    def submit(self, stream_id: str, frame: np.ndarray):
+        """스트림의 대기 프레임 교체 (이전 프레임이 아직 처리 전이면 버림)."""
+        if frame is None or frame.size == 0:
+            return
+        with self._cond:
+            stream = self._streams.get(stream_id)
+            if stream is None:
+                return
+            if stream.pending is not None:
+                stream.dropped += 1
+            stream.pending = frame
+            stream.pending_ts = time.monotonic()
+            self._cond.notify()
+
+    def _take_batch(self) -> list[tuple[_Stream, np.ndarray, float]]:
+        with self._cond:
+            while not self._stop.is_set() and not any(s.pending is not None for s in self._streams.values()):
+                self._cond.wait(timeout=0.5)
+            if self._stop.is_set():
+                return []
+            # 다른 카메라 프레임이 곧 도착하면 같은 배치로 묶음
+            deadline = time.monotonic() + self._max_wait_sec
+            while True:
+                ready = sum(1 for s in self._streams.values() if s.pending is not None)
+                remaining = deadline - time.monotonic()
+                if ready >= min(self._max_batch, len(self._streams)) or remaining <= 0:
+                    break
+                self._cond.wait(timeout=remaining)
+            batch = []
+            n = len(self._order)
+            for k in range(n):
+                stream = self._streams[self._order[(self._rr + k) % n]]
+                if stream.pending is None:
+                    continue
+                batch.append((stream, stream.pending, stream.pending_ts))
+                stream.pending = None
+                if len(batch) >= self._max_batch:
+                    break
+            self._rr = (self._rr + 1) % max(1, n)
+            return batch
+
+    def _process_batch(self, batch: list[tuple[_Stream, np.ndarray, float]]):
+        frames = [s.runner.begin_frame(f) for s, f, _ in batch]
+        if self.models.yolo_model is None:
+            results = [s.runner.finish_without_pose(f) for (s, _, _), f in zip(batch, frames)]
+        else:
+            detections = self._pose_fn(frames)
+            staged = [s.runner.update_pose(f, d) for (s, _, _), f, d in zip(batch, frames, detections)]
+            predictions = classify_batch(self.models, [st[2] for st in staged])
+            results = [
+                s.runner.finish_frame(st[0], st[1], p)
+                for (s, _, _), st, p in zip(batch, staged, predictions)
+            ]
+        done = time.monotonic()
+        self._batches += 1
+        self._batch_frames += len(batch)
+        for (stream, _, submitted), (frame, state_str, is_fallen) in zip(batch, results):
+            stream.processed += 1
+            stream.latencies.append(done - submitted)
+            try:
+                stream.on_result(frame, state_str, is_fallen, stream.runner)
+            except Exception as e:
+                print(f"[BatchedFallBackend] {stream.stream_id} 결과 처리 오류: {e}")
+
+    def _run(self):
+        while not self._stop.is_set():
+            batch = self._take_batch()
+            if not batch:
+                continue
+            try:
+                self._process_batch(batch)
+            except Exception as e:
+                print(f"[BatchedFallBackend] 배치 처리 오류: {e}")
+                for stream, _, _ in batch:
+                    if stream.on_error is None:
+                        continue
+                    try:
+                        stream.on_error(e)
+                    except Exception as cb_error:
+                        print(f"[BatchedFallBackend] {stream.stream_id} 오류 처리 실패: {cb_error}")
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="fall-backend", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0):
+        self._stop.set()
+        with self._cond:
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def stats(self) -> dict:
+        """평균 배치 크기와 스트림별 처리/버림 수, 평균 지연(ms, 제출 → 판정 완료)."""
+        with self._cond:
+            streams = {
+                s.stream_id: {
+                    "processed": s.processed,
+                    "dropped": s.dropped,
+                    "latency_ms": (sum(s.latencies) / len(s.latencies) * 1000) if s.latencies else 0.0,
+                }
+                for s in self._streams.values()
+            }
+        return {
+            "batches": self._batches,
+            "avg_batch": self._batch_frames / self._batches if self._batches else 0.0,
+            "streams": streams,
+        }
+
+
+class CameraMetrics:
+    """카메라별 처리 통계 (결과 콜백에서 기록, HTTP 스레드에서 조회)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._frames: deque[float] = deque()
+        self.total_frames = 0
+        self.falls = 0
+        self.read_failures = 0
+        self.capture_open = False
+        self.last_state = "Normal"
+        self.last_frame_ts = 0.0
+
+    def record(self, state: str):
+        now = time.monotonic()
+        with self._lock:
+            self._frames.append(now)
+            self._trim(now)
+            self.total_frames += 1
+            self.last_state = state
+            self.last_frame_ts = time.time()
+
+    def _trim(self, now: float):
+        cutoff = now - METRICS_WINDOW_SEC
+        while self._frames and self._frames[0] < cutoff:
+            self._frames.popleft()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            self._trim(time.monotonic())
+            return {
+                "fps": len(self._frames) / METRICS_WINDOW_SEC,
+                "total_frames": self.total_frames,
+                "falls": self.falls,
+                "read_failures": self.read_failures,
+                "capture_open": self.capture_open,
+                "last_state": self.last_state,
+                "last_frame_age_sec": time.time() - self.last_frame_ts if self.last_frame_ts else None,
+            }
+
+
+class CameraPipeline:
+    """카메라 1대: 캡처 스레드 → 공유 백엔드 → 업링크/알람."""
+
+    def __init__(
+        self,
+        camera: dict,
+        user_id: str,
+        backend: BatchedFallBackend,
+        outbox: AlarmOutbox,
+        device_cfg: dict,
+        stream_mode: str = "video",
+        uplink_stream: bool = True,
+    ):
+        self.camera_id = camera["id"]
+        self.source = camera["source"]
+        self.user_id = user_id
+        # 서버 스트림은 user_id당 하나: 같은 사용자의 두 번째 카메라부터는 알람만 전송
+        self.uplink_stream = uplink_stream
+        self._backend = backend
+        self._outbox = outbox
+        self.metrics = CameraMetrics()
+        self.uplink = UplinkController(device_cfg)
+        self.stream = StreamUplink(user_id if uplink_stream else "", self.uplink, stream_mode)
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._last_alarm_ts = 0.0
+        self._frame_idx = 0
+        backend.register(self.camera_id, self._on_result)
+
+    def _on_result(self, frame: np.ndarray, state_str: str, is_fallen: bool, runner: UnifiedFallRunner):
+        self.metrics.record(state_str)
+        if self.uplink_stream:
+            self._publish(frame, runner)
+        if is_fallen:
+            self._send_fall_event()
+
+    def _publish(self, frame: np.ndarray, runner: UnifiedFallRunner):
+        if self.stream.sends_keypoints:
+            keypoints, track_id, prediction, confidence, (w, h) = runner.get_last_pose()
+            self._frame_idx += 1
+            self.stream.publish_telemetry(
+                encode_keypoints(self._frame_idx, w, h, keypoints, prediction, confidence, track_id)
+            )
+        if self.stream.sends_video:
+            self.stream.publish_frame(frame)
+
+    def _send_fall_event(self):
+        now = time.time()
+        if now - self._last_alarm_ts < ALARM_COOLDOWN_SEC:
+            return
+        self._last_alarm_ts = now
+        self.metrics.falls += 1
+        event_id = self._outbox.enqueue({
+            "event_type": "ALERT",
+            "message": "쓰러짐 발생",
+            "device_id": get_device_id(),
+            "user_id": self.user_id,
+            "camera_id": self.camera_id,
+            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "sent_ts": now,
+        })
+        print(f"[CameraPipeline] {self.camera_id}: 쓰러짐 감지 → 알람 대기열 등록 ({event_id[:8]})")
+
+    def _capture_loop(self):
+        cap = None
+        failures = 0
+        while not self._stop.is_set():
+            if cap is None:
+                cap = open_capture(self.source)
+                self.metrics.capture_open = cap is not None
+                if cap is None:
+                    self._stop.wait(CAPTURE_RETRY_SEC)
+                    continue
+                print(f"[CameraPipeline] {self.camera_id}: 영상 장치 연결됨")
+                failures = 0
+            ret, frame = cap.read()
+            if not ret or frame is None:
+                failures += 1
+                self.metrics.read_failures += 1
+                if failures >= MAX_READ_FAILURES:
+                    print(f"[CameraPipeline] {self.camera_id}: 프레임 수신 실패 지속 → 장치 재연결")
+                    cap.release()
+                    cap = None
+                    self.metrics.capture_open = False
+                else:
+                    self._stop.wait(0.01)
+                continue
+            failures = 0
+            self._backend.submit(self.camera_id, frame)
+        if cap is not None:
+            cap.release()
+        self.metrics.capture_open = False
+
+    def start(self):
+        self.stream.start()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._capture_loop, name=f"capture-{self.camera_id}", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        self.stream.stop(timeout=timeout)
+        self._backend.unregister(self.camera_id)
+
+    def status(self) -> dict:
+        return {
+            "camera_id": self.camera_id,
+            "user_id": self.user_id,
+            "uplink_stream": self.uplink_stream,
+            "server_connected": self.stream.connected,
+            **self.metrics.snapshot(),
+            "uplink": self.uplink.stats(),
+        }
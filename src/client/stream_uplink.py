@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+"""
+StreamUplink: 서버 /ws/{user_id} 업링크 스레드 (GUI/헤드리스 공용).
+
+- 캡처 쪽은 publish_frame / publish_telemetry로 최신 값만 교체 (대기열 없음, 늦은 프레임은 버림)
+- 업링크 스레드가 UplinkController 기준 fps/품질로 JPEG 또는 키포인트 패킷 전송
+- 웹소켓 제어 메시지: keepalive 송신, 서버 tier 요청 수신
+- server_inference=True: 접속 직후 {"type": "mode", "inference": "server"} 전송 (서버가 낙상 판정, 영상 전송 고정)
+- 연결이 끊기면 WS_RECONNECT_SEC 후 재접속 (끊긴 동안 connected=False → 호출 측이 HTTP keepalive로 대체)
+"""
+
+import json
+import threading
+import time
+
+from api_client import get_ws_url
+from uplink_controller import UplinkController
+
+WS_KEEPALIVE_SEC = 5
+WS_RECONNECT_SEC = 3
+STREAM_MODES = ("video", "keypoints", "both")
+
+
+class StreamUplink:
+    """최신 프레임/텔레메트리를 서버로 올리는 백그라운드 업링크."""
+
+    def __init__(
+        self,
+        user_id: str,
+        uplink: UplinkController,
+        stream_mode: str = "video",
+        server_inference: bool = False,
+    ):
+        self._user_id = user_id
+        self._uplink = uplink
+        self._server_inference = server_inference
+        # 서버 판정은 원본 영상이 필요하므로 키포인트 전용 모드 불가
+        if server_inference:
+            stream_mode = "video"
+        self._stream_mode = stream_mode if stream_mode in STREAM_MODES else "video"
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._connected = False
+        self._latest_lock = threading.Lock()
+        self._latest_frame = None
+        self._latest_seq = 0  # 새 프레임마다 증가 (같은 프레임 재전송 방지)
+        self._latest_telemetry = None
+        self._latest_telemetry_seq = 0
+
+    @property
+    def connected(self) -> bool:
+        return self._connected
+
+    @property
+    def stream_mode(self) -> str:
+        return self._stream_mode
+
+    @property
+    def server_inference(self) -> bool:
+        return self._server_inference
+
+    @property
+    def sends_video(self) -> bool:
+        return self._stream_mode in ("video", "both")
+
+    @property
+    def sends_keypoints(self) -> bool:
+        return self._stream_mode in ("keypoints", "both")
+
+    def publish_frame(self, frame):
+        """전송할 최신 프레임 교체. frame은 이후 수정하지 않아야 함 (복사 없이 참조만 보관)."""
+        with self._latest_lock:
+            self._latest_frame = frame
+            self._latest_seq += 1
+
+    def publish_telemetry(self, packet: bytes):
+        """전송할 최신 키포인트 패킷(keypoint_telemetry) 교체."""
+        with self._latest_lock:
+            self._latest_telemetry = packet
+            self._latest_telemetry_seq += 1
+
+    def start(self):
+        if not self._user_id or (self._thread is not None and self._thread.is_alive()):
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="stream-uplink", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None):
+        self._stop.set()
+        if timeout is not None and self._thread is not None:
+            self._thread.join(timeout=timeout)
+
+    def _run(self):
+        try:
+            import asyncio
+            import websockets
+        except Exception:
+            return
+
+        uplink = self._uplink
+        stop = self._stop
+
+        async def _keepalive(ws):
+            """영상이 없을 때도 접속 상태 유지용 제어 메시지 전송 (HTTP keepalive 대체)."""
+            while not stop.is_set():
+                await ws.send(json.dumps({"type": "keepalive"}))
+                await asyncio.sleep(WS_KEEPALIVE_SEC)
+
+        async def _receive_control(ws):
+            """서버 제어 메시지 수신 (tier 요청 등)."""
+            async for message in ws:
+                if isinstance(message, bytes):
+                    continue
+                try:
+                    uplink.on_control(json.loads(message))
+                except ValueError:
+                    continue
+
+        async def _send():
+            uri = get_ws_url(self._user_id)
+            async with websockets.connect(uri, max_size=2**20) as ws:
+                if self._server_inference:
+                    await ws.send(json.dumps({"type": "mode", "inference": "server"}))
+                self._connected = True
+                ka_task = asyncio.create_task(_keepalive(ws))
+                rx_task = asyncio.create_task(_receive_control(ws))
+                try:
+                    sent_seq = 0
+                    sent_kp_seq = 0
+                    send_video = self.sends_video
+                    send_keypoints = self.sends_keypoints
+                    while not stop.is_set():
+                        tick = time.monotonic()
+                        with self._latest_lock:
+                            frame, seq = self._latest_frame, self._latest_seq
+                            packet, kp_seq = self._latest_telemetry, self._latest_telemetry_seq
+                        if send_keypoints and packet is not None and kp_seq != sent_kp_seq:
+                            await ws.send(packet)
+                            sent_kp_seq = kp_seq
+                        if send_video and frame is not None and seq != sent_seq and not uplink.should_skip(ws):
+                            data = uplink.encode(frame)
+                            if data:
+                                t0 = time.monotonic()
+                                await ws.send(data)
+                                uplink.on_sent(len(data), time.monotonic() - t0)
+                            sent_seq = seq
+                        # 목표 fps 간격 유지 (인코딩/전송 시간 차감)
+                        await asyncio.sleep(max(0.0, uplink.interval - (time.monotonic() - tick)))
+                finally:
+                    self._connected = False
+                    ka_task.cancel()
+                    rx_task.cancel()
+
+        # 연결이 끊기면 재접속
+        while not stop.is_set():
+            try:
+                asyncio.run(_send())
+            except Exception:
+                pass
+            stop.wait(WS_RECONNECT_SEC)
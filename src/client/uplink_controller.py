@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+"""
+UplinkController: 서버 영상 업링크 적응형 비트레이트 제어.
+
+- 전송 소요시간(EWMA)과 소켓 송신 버퍼 적체량으로 네트워크 상태 판단
+- 혼잡 시: JPEG 품질 → 해상도 → 프레임레이트 순으로 낮춤 / 안정 시 역순으로 복구
+- 송신 버퍼가 쌓여 있으면 해당 프레임은 건너뜀 (backpressure)
+- 서버가 요청한 단계(tier: thumbnail / normal / full)의 너비·품질·fps 상한 적용
+- 실제 전송 fps / bitrate 통계 제공
+"""
+
+import threading
+import time
+from collections import deque
+
+import cv2
+import numpy as np
+
+DEFAULT_BOUNDS = {
+    "uplink_min_quality": 40,
+    "uplink_max_quality": 80,
+    "uplink_min_scale": 0.5,
+    "uplink_min_fps": 5,
+    "uplink_max_fps": 30,
+}
+QUALITY_STEP = 10
+SCALE_STEP = 0.25
+FPS_STEP = 5
+# 송신 버퍼에 이 이상 쌓여 있으면 프레임 건너뜀
+BACKLOG_SKIP_BYTES = 256 * 1024
+# 이만큼 연속으로 여유가 있으면 한 단계 상향
+UPGRADE_AFTER_GOOD_SENDS = 30
+EWMA_ALPHA = 0.2
+STATS_WINDOW_SEC = 3.0
+
+
+class UplinkController:
+    """품질/해상도/fps를 설정 범위 안에서 조정하는 업링크 컨트롤러 (스트림 스레드 전용, stats()만 다른 스레드에서 호출)."""
+
+    def __init__(self, bounds: dict | None = None):
+        b = dict(DEFAULT_BOUNDS)
+        b.update({k: v for k, v in (bounds or {}).items() if k in DEFAULT_BOUNDS and v is not None})
+        self.min_quality = int(b["uplink_min_quality"])
+        self.max_quality = max(self.min_quality, int(b["uplink_max_quality"]))
+        self.min_scale = min(1.0, max(0.1, float(b["uplink_min_scale"])))
+        self.min_fps = max(1, int(b["uplink_min_fps"]))
+        self.max_fps = max(self.min_fps, int(b["uplink_max_fps"]))
+        # 설정 상한 (tier 상한과 합쳐 실제 상한 계산)
+        self._cfg_max_quality = self.max_quality
+        self._cfg_max_fps = self.max_fps
+        self.tier = "full"
+        self.max_width = 0  # 0 = 원본 해상도
+
+        self.quality = self.max_quality
+        self.scale = 1.0
+        self.fps = self.max_fps
+        self._send_ewma = 0.0
+        self._good_sends = 0
+        self._skipped = 0
+        self._sent: deque[tuple[float, int]] = deque()
+        self._stats_lock = threading.Lock()
+
+    def set_tier(self, tier: str, max_width: int = 0, max_quality: int | None = None, max_fps: int | None = None):
+        """서버 제어 메시지 {"type": "tier", ...} 반영. 설정 범위 안에서 상한을 정하고 현재 값을 맞춘다."""
+        self.tier = tier
+        self.max_width = max(0, int(max_width or 0))
+        q = self._cfg_max_quality if max_quality is None else int(max_quality)
+        self.max_quality = max(self.min_quality, min(self._cfg_max_quality, q))
+        f = self._cfg_max_fps if max_fps is None else int(max_fps)
+        self.max_fps = max(self.min_fps, min(self._cfg_max_fps, f))
+        # 단계가 바뀌면 새 상한에서 다시 시작 (혼잡하면 on_sent에서 곧 하향)
+        self.quality = self.max_quality
+        self.fps = self.max_fps
+        self._good_sends = 0
+        self._send_ewma = 0.0
+
+    def on_control(self, message: dict):
+        """서버 제어 메시지 처리 (현재는 tier만)."""
+        if message.get("type") == "tier":
+            self.set_tier(
+                message.get("tier", "full"),
+                max_width=message.get("max_width", 0),
+                max_quality=message.get("max_quality"),
+                max_fps=message.get("max_fps"),
+            )
+
+    @property
+    def interval(self) -> float:
+        """현재 목표 fps 기준 프레임 간격(초)."""
+        return 1.0 / self.fps
+
+    def should_skip(self, ws) -> bool:
+        """송신 버퍼에 이전 프레임이 쌓여 있으면 True (이번 프레임 건너뜀)."""
+        transport = getattr(ws, "transport", None)
+        if transport is None:
+            return False
+        try:
+            backlog = transport.get_write_buffer_size()
+        except Exception:
+            return False
+        if backlog > BACKLOG_SKIP_BYTES:
+            self._skipped += 1
+            self._degrade()
+            return True
+        return False
+
+    def encode(self, frame: np.ndarray) -> bytes | None:
+        """현재 해상도/품질로 JPEG 인코딩."""
+        h, w = frame.shape[:2]
+        scale = self.scale
+        if self.max_width and w * scale > self.max_width:
+            scale = self.max_width / w
+        if scale < 1.0:
+            frame = cv2.resize(frame, (max(1, int(w * scale)), max(1, int(h * scale))),
+                               interpolation=cv2.INTER_AREA)
+        ok, buffer = cv2.imencode(".jpg", frame, [int(cv2.IMWRITE_JPEG_QUALITY), int(self.quality)])
+        return buffer.tobytes() if ok else None
+
+    def on_sent(self, nbytes: int, send_sec: float):
+        """전송 완료 후 호출. 전송 시간이 프레임 간격의 절반을 넘으면 하향, 여유가 지속되면 상향."""
+        now = time.monotonic()
+        with self._stats_lock:
+            self._sent.append((now, nbytes))
+            self._trim(now)
+        self._send_ewma = send_sec if self._send_ewma == 0.0 else (
+            EWMA_ALPHA * send_sec + (1 - EWMA_ALPHA) * self._send_ewma
+        )
+        budget = self.interval * 0.5
+        if self._send_ewma > budget:
+            self._degrade()
+        elif self._send_ewma < budget * 0.3:
+            self._good_sends += 1
+            if self._good_sends >= UPGRADE_AFTER_GOOD_SENDS:
+                self._upgrade()
+        else:
+            self._good_sends = 0
+
+    def _degrade(self):
+        self._good_sends = 0
+        if self.quality > self.min_quality:
+            self.quality = max(self.min_quality, self.quality - QUALITY_STEP)
+        elif self.scale > self.min_scale:
+            self.scale = max(self.min_scale, self.scale - SCALE_STEP)
+        elif self.fps > self.min_fps:
+            self.fps = max(self.min_fps, self.fps - FPS_STEP)
+        # 단계가 바뀌면 새 설정 기준으로 다시 측정
+        self._send_ewma = 0.0
+
+    def _upgrade(self):
+        self._good_sends = 0
+        if self.fps < self.max_fps:
+            self.fps = min(self.max_fps, self.fps + FPS_STEP)
+        elif self.scale < 1.0:
+            self.scale = min(1.0, self.scale + SCALE_STEP)
+        elif self.quality < self.max_quality:
+            self.quality = min(self.max_quality, self.quality + QUALITY_STEP)
+
+    def _trim(self, now: float):
+        cutoff = now - STATS_WINDOW_SEC
+        while self._sent and self._sent[0][0] < cutoff:
+            self._sent.popleft()
+
+    def stats(self) -> dict:
+        """최근 STATS_WINDOW_SEC 기준 실제 전송 fps, bitrate(kbps)와 현재 설정."""
+        with self._stats_lock:
+            self._trim(time.monotonic())
+            count = len(self._sent)
+            total = sum(n for _, n in self._sent)
+        return {
+            "fps": count / STATS_WINDOW_SEC,
+            "kbps": total * 8 / 1000.0 / STATS_WINDOW_SEC,
+            "quality": self.quality,
+            "scale": self.scale,
+            "target_fps": self.fps,
+            "tier": self.tier,
+            "skipped": self._skipped,
+        }
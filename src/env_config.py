@@ -1,4 +1,7 @@
 import os
+import threading
+import time
+import weakref
 from dotenv import load_dotenv
 
 # 모델 경로는 base_dir 기준 상대경로 (예: client/ 또는 프로젝트 루트)
@@ -15,6 +18,7 @@ DEFAULT_ENV = {
     "USE_MODEL": "RandomForest",  # 낙상 감지: RandomForest | ST-GCN-Original | ST-GCN-Fine-tuned
     "SHOWINFO": "true",  # 사용자 탭 영상 오버레이: Frame, YOLO Pose ON, Detection Acc 표시 (true/false)
     "DEBUG_UI": "true",  # true: 사용자 탭 오버레이를 관리자 탭과 동일하게 (FN Detection Acc, 진행바, 예측 박스)
+    "POSE_WORKERS": "0",  # YOLO Pose 워커 프로세스 수 (0: 같은 프로세스에서 실행, 1 이상: 공유 메모리로 프레임 전달)
 }
 
 
@@ -64,9 +68,133 @@ def _read_env_file(env_path: str) -> dict:
     return result
 
 
-def read_env_values(base_dir: str | None = None) -> dict:
+# 프로세스 시작 시 이미 있던 환경변수 (.env보다 우선, load_dotenv(override=False)와 같은 우선순위)
+_PROCESS_ENV_KEYS = frozenset(os.environ)
+
+# .env 변경 확인(stat) 최소 간격. 같은 프로세스의 update_env_file은 즉시 반영
+CHECK_INTERVAL_SEC = 1.0
+
+
+class EnvConfig:
+    """.env 한 파일의 캐시. 처음 한 번 파싱하고, 파일 mtime이 바뀌면 다시 읽어 구독자에게 알린다.
+
+    요청/프레임마다 호출해도 파일을 열지 않는다 (CHECK_INTERVAL_SEC마다 stat 한 번).
+        config = get_config(base_dir)
+        config.get_bool("SHOWINFO", True)
+        config.subscribe(callback)   # callback({키: 새 값 또는 None})
+    """
+
+    def __init__(self, env_path: str):
+        self.env_path = env_path
+        self._lock = threading.Lock()
+        self._values: dict = {}
+        self._mtime = None
+        self._next_check = 0.0
+        self._listeners = []
+        self._load()
+
+    def _stat_mtime(self):
+        try:
+            return os.stat(self.env_path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _load(self) -> dict:
+        """파일을 다시 읽고 바뀐 키 반환"""
+        mtime = self._stat_mtime()
+        values = _read_env_file(self.env_path) if mtime is not None else {}
+        with self._lock:
+            old = self._values
+            self._values = values
+            self._mtime = mtime
+            self._next_check = time.monotonic() + CHECK_INTERVAL_SEC
+        return {k: values.get(k) for k in set(old) | set(values) if old.get(k) != values.get(k)}
+
+    def poll(self, force: bool = False) -> dict:
+        """파일이 바뀌었으면 다시 읽고 구독자에게 알림. 바뀐 키 반환"""
+        if not force:
+            if time.monotonic() < self._next_check:
+                return {}
+            mtime = self._stat_mtime()
+            if mtime == self._mtime:
+                self._next_check = time.monotonic() + CHECK_INTERVAL_SEC
+                return {}
+        changed = self._load()
+        if changed:
+            self._notify(changed)
+        return changed
+
+    def values(self) -> dict:
+        """.env 파일 값 (복사본)"""
+        self.poll()
+        with self._lock:
+            return dict(self._values)
+
+    def get(self, key: str, default: str | None = None) -> str | None:
+        """프로세스 환경변수 → .env → default → DEFAULT_ENV 순"""
+        if key in _PROCESS_ENV_KEYS and key in os.environ:
+            return os.environ[key]
+        self.poll()
+        value = self._values.get(key)
+        if value is None:
+            value = default if default is not None else DEFAULT_ENV.get(key)
+        return value
+
+    def get_str(self, key: str, default: str | None = None) -> str:
+        return (self.get(key, default) or "").strip()
+
+    def get_bool(self, key: str, default: bool = False) -> bool:
+        return self.get_str(key, "true" if default else "false").lower() == "true"
+
+    def get_int(self, key: str, default: int = 0) -> int:
+        try:
+            return int(self.get_str(key, str(default)))
+        except ValueError:
+            return default
+
+    def subscribe(self, callback):
+        """값 변경 시 callback(changed) 호출. 바운드 메서드는 약한 참조 (객체가 사라지면 자동 해제)"""
+        if hasattr(callback, "__self__"):
+            ref = weakref.WeakMethod(callback)
+        else:
+            ref = lambda: callback  # noqa: E731
+        with self._lock:
+            self._listeners.append(ref)
+        return callback
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            self._listeners = [ref for ref in self._listeners if ref() not in (None, callback)]
+
+    def _notify(self, changed: dict):
+        with self._lock:
+            self._listeners = [ref for ref in self._listeners if ref() is not None]
+            callbacks = [ref() for ref in self._listeners]
+        for callback in callbacks:
+            if callback is None:
+                continue
+            try:
+                callback(changed)
+            except Exception as exc:
+                print(f"[EnvConfig] 변경 알림 처리 실패: {exc}")
+
+
+_configs: dict = {}
+_configs_lock = threading.Lock()
+
+
+def get_config(base_dir: str | None = None) -> EnvConfig:
+    """base_dir/.env 공용 EnvConfig (경로별 하나)"""
     env_path = get_env_path(base_dir)
-    return _read_env_file(env_path)
+    with _configs_lock:
+        config = _configs.get(env_path)
+        if config is None:
+            config = _configs[env_path] = EnvConfig(env_path)
+        return config
+
+
+def read_env_values(base_dir: str | None = None) -> dict:
+    return get_config(base_dir).values()
 
 
 def update_env_file(base_dir: str | None, updates: dict) -> str:
@@ -76,6 +204,8 @@ def update_env_file(base_dir: str | None, updates: dict) -> str:
     with open(env_path, "w", encoding="utf-8") as f:
         for key, value in existing.items():
             f.write(f"{key}={value}\n")
+    # mtime 해상도와 무관하게 같은 프로세스에는 즉시 반영
+    get_config(base_dir).poll(force=True)
     return env_path
 
 
@@ -129,7 +259,9 @@ def get_db_config(base_dir: str | None = None) -> dict:
 
 def get_api_config(base_dir: str | None = None) -> dict:
     if base_dir:
-        load_env(base_dir)
+        # API 요청마다 호출되므로 load_dotenv 대신 캐시된 설정 사용
+        config = get_config(base_dir)
+        return {"host": config.get_str("API_HOST"), "port": config.get_int("API_PORT", 8000)}
     return {
         "host": os.environ.get("API_HOST", DEFAULT_ENV["API_HOST"]),
         "port": int(os.environ.get("API_PORT", DEFAULT_ENV["API_PORT"])),
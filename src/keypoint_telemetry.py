@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+키포인트 텔레메트리 바이너리 포맷 (client ↔ server 공용).
+
+/ws/{user_id} 웹소켓에서 JPEG 프레임 대신(또는 함께) 전송하는 압축 패킷.
+JPEG는 0xFFD8로 시작하므로 MAGIC으로 구분한다.
+
+레이아웃 (little-endian, 17 keypoints 기준 119 bytes):
+    magic      4s   b"KPT1"
+    seq        I    프레임 번호
+    width      H    원본 프레임 너비 (좌표계 기준)
+    height     H    원본 프레임 높이
+    track_id   h    대상 인물 추적 ID (-1 = 없음/추적 미지원)
+    state      B    0 Normal / 1 Falling / 2 Fallen
+    confidence B    예측 신뢰도 (0~255 → 0.0~1.0)
+    num_kp     B    키포인트 수 (COCO 17)
+    keypoints  num_kp x 3 float16 (x, y, conf)
+"""
+
+import struct
+from dataclasses import dataclass
+
+import numpy as np
+
+MAGIC = b"KPT1"
+_HEADER = struct.Struct("<4sIHHhBBB")
+STATE_NAMES = ("Normal", "Falling", "Fallen")
+
+# COCO 17 스켈레톤 연결
+SKELETON_CONNECTIONS = (
+    (0, 1), (0, 2), (1, 3), (2, 4), (5, 6),
+    (5, 7), (7, 9), (6, 8), (8, 10),
+    (5, 11), (6, 12), (11, 12),
+    (11, 13), (13, 15), (12, 14), (14, 16),
+)
+
+
+@dataclass
+class KeypointTelemetry:
+    seq: int
+    width: int
+    height: int
+    track_id: int
+    state: int
+    confidence: float
+    keypoints: np.ndarray | None  # (num_kp, 3) float32, 인물 미검출 시 None
+
+    @property
+    def state_name(self) -> str:
+        return STATE_NAMES[self.state] if 0 <= self.state < len(STATE_NAMES) else "Unknown"
+
+
+def encode_keypoints(
+    seq: int,
+    width: int,
+    height: int,
+    keypoints,
+    state: str | int = 0,
+    confidence: float = 0.0,
+    track_id: int = -1,
+) -> bytes:
+    """키포인트 1프레임을 패킷으로 인코딩. keypoints가 None이면 인물 없음(num_kp=0)."""
+    if isinstance(state, str):
+        state = STATE_NAMES.index(state) if state in STATE_NAMES else 0
+    kps = b""
+    num_kp = 0
+    if keypoints is not None:
+        arr = np.asarray(keypoints, dtype=np.float16).reshape(-1, 3)
+        num_kp = len(arr)
+        kps = arr.tobytes()
+    conf_byte = int(round(min(1.0, max(0.0, float(confidence))) * 255))
+    header = _HEADER.pack(
+        MAGIC, seq & 0xFFFFFFFF, int(width) & 0xFFFF, int(height) & 0xFFFF,
+        max(-1, min(32767, int(track_id))), int(state), conf_byte, num_kp,
+    )
+    return header + kps
+
+
+def is_keypoint_packet(data: bytes) -> bool:
+    return data[:4] == MAGIC
+
+
+def decode_keypoints(data: bytes) -> KeypointTelemetry | None:
+    """패킷 디코딩. 형식이 맞지 않으면 None."""
+    if len(data) < _HEADER.size or not is_keypoint_packet(data):
+        return None
+    _, seq, width, height, track_id, state, conf_byte, num_kp = _HEADER.unpack_from(data)
+    expected = _HEADER.size + num_kp * 3 * 2
+    if len(data) < expected:
+        return None
+    keypoints = None
+    if num_kp:
+        keypoints = np.frombuffer(data, dtype=np.float16, count=num_kp * 3, offset=_HEADER.size)
+        keypoints = keypoints.reshape(num_kp, 3).astype(np.float32)
+    return KeypointTelemetry(seq, width, height, track_id, state, conf_byte / 255.0, keypoints)
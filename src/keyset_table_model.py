@@ -0,0 +1,234 @@
+"""
+키셋 페이지 조회 테이블 모델 (클라이언트 이벤트 검색 / 서버 이벤트 조회 공용).
+
+QTableWidget에 행마다 item/위젯을 만드는 대신, 화면에 보이는 칸만 data()로 그린다.
+처음에는 한 페이지만 조회하고, 스크롤이 끝에 닿으면 Qt가 canFetchMore/fetchMore로 다음 페이지를 요청한다.
+다음 페이지는 OFFSET 대신 마지막 행의 정렬 키(예: occurred_at, event_id) 이후로 조회하므로
+결과가 아무리 많아도 페이지 조회 비용이 일정하다 (키셋 페이지네이션).
+fetch_page(after, limit)는 정렬 키 내림차순/오름차순 어느 쪽이든 "after 다음 행부터 limit개"를 반환하면 된다.
+
+    model = KeysetTableModel(columns, key_fn=lambda r: (r["occurred_at"], r["event_id"]))
+    model.reset(lambda after, limit: event_log.search_page(..., after=after, limit=limit))
+"""
+
+from collections import OrderedDict
+from typing import Any, Callable
+
+from PyQt6.QtCore import QAbstractTableModel, QEvent, QModelIndex, QRect, Qt, pyqtSignal
+from PyQt6.QtWidgets import QApplication, QStyle, QStyledItemDelegate, QStyleOptionButton
+
+DEFAULT_PAGE_SIZE = 200
+DEFAULT_CACHED_PAGES = 8
+
+# (after_key | None, limit) → 정렬 순서대로 최대 limit개 행 (dict)
+FetchPage = Callable[[Any, int], list]
+
+
+class Column:
+    """표시 컬럼: 헤더, 행 → 문자열, (선택) 정렬/배경색."""
+
+    __slots__ = ("header", "text", "align", "background")
+
+    def __init__(
+        self,
+        header: str,
+        text: Callable[[dict], str],
+        align: Qt.AlignmentFlag | None = None,
+        background: Callable[[dict], Any] | None = None,
+    ):
+        self.header = header
+        self.text = text
+        self.align = align
+        self.background = background
+
+
+class KeysetTableModel(QAbstractTableModel):
+    """키셋 페이지를 스크롤에 맞춰 이어 붙이는 읽기 전용 테이블 모델.
+
+    행 데이터는 최근에 본 페이지 max_cached_pages개만 보관하고, 페이지별 시작 키만 계속 남긴다.
+    밀려난 페이지를 다시 보면 저장해 둔 시작 키로 그 페이지만 다시 조회한다 (행 수와 무관하게 메모리 일정).
+    """
+
+    page_loaded = pyqtSignal(int)  # 지금까지 불러온 행 수
+
+    def __init__(
+        self,
+        columns: list[Column],
+        key_fn: Callable[[dict], Any],
+        page_size: int = DEFAULT_PAGE_SIZE,
+        max_cached_pages: int = DEFAULT_CACHED_PAGES,
+        parent=None,
+    ):
+        super().__init__(parent)
+        self._columns = columns
+        self._key_fn = key_fn
+        self._page_size = max(1, page_size)
+        self._max_cached_pages = max(2, max_cached_pages)
+        self._fetch_page: FetchPage | None = None
+        self._page_keys: list = []  # 페이지 i를 조회할 때 쓰는 after 키 (0번은 None)
+        self._pages: OrderedDict[int, list[dict]] = OrderedDict()  # LRU 페이지 캐시
+        self._next_key = None
+        self._row_count = 0
+        self._has_more = False
+
+    def reset(self, fetch_page: FetchPage | None):
+        """새 검색: 기존 행을 비우고 첫 페이지 조회. fetch_page 예외는 호출 측으로 전달."""
+        self.beginResetModel()
+        self._fetch_page = fetch_page
+        self._page_keys = []
+        self._pages.clear()
+        self._next_key = None
+        self._row_count = 0
+        self._has_more = fetch_page is not None
+        self.endResetModel()
+        if fetch_page is not None:
+            self.fetchMore(QModelIndex())
+
+    def row_data(self, row: int) -> dict | None:
+        if not 0 <= row < self._row_count:
+            return None
+        rows = self._page(row // self._page_size)
+        offset = row % self._page_size
+        return rows[offset] if offset < len(rows) else None
+
+    def loaded_count(self) -> int:
+        return self._row_count
+
+    def has_more(self) -> bool:
+        return self._has_more
+
+    def headers(self) -> list[str]:
+        return [c.header for c in self._columns]
+
+    def row_texts(self, row: dict) -> list[str]:
+        texts = []
+        for column in self._columns:
+            try:
+                texts.append(column.text(row))
+            except Exception:
+                texts.append("")
+        return texts
+
+    def _page(self, index: int) -> list[dict]:
+        rows = self._pages.get(index)
+        if rows is not None:
+            self._pages.move_to_end(index)
+            return rows
+        # 캐시에서 밀려난 페이지: 시작 키로 다시 조회
+        try:
+            rows = self._fetch_page(self._page_keys[index], self._page_size)
+        except Exception as e:
+            print(f"[KeysetTableModel] 페이지 {index} 재조회 실패: {e}")
+            rows = []
+        self._cache_page(index, rows)
+        return rows
+
+    def _cache_page(self, index: int, rows: list[dict]):
+        self._pages[index] = rows
+        self._pages.move_to_end(index)
+        while len(self._pages) > self._max_cached_pages:
+            self._pages.popitem(last=False)
+
+    # --- QAbstractTableModel ---
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._row_count
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._columns)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self.row_data(index.row())
+        if row is None:
+            return None
+        column = self._columns[index.column()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            try:
+                return column.text(row)
+            except Exception:
+                return ""
+        if role == Qt.ItemDataRole.TextAlignmentRole and column.align is not None:
+            return column.align
+        if role == Qt.ItemDataRole.BackgroundRole and column.background is not None:
+            return column.background(row)
+        if role == Qt.ItemDataRole.UserRole:
+            return row
+        return None
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self._columns[section].header
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        return not parent.isValid() and self._has_more
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or not self._has_more or self._fetch_page is None:
+            return
+        # 다음 페이지 존재 여부를 알기 위해 1행 더 조회
+        rows = self._fetch_page(self._next_key, self._page_size + 1)
+        self._has_more = len(rows) > self._page_size
+        rows = rows[: self._page_size]
+        if rows:
+            index = len(self._page_keys)
+            self.beginInsertRows(QModelIndex(), self._row_count, self._row_count + len(rows) - 1)
+            self._page_keys.append(self._next_key)
+            self._cache_page(index, rows)
+            self._next_key = self._key_fn(rows[-1])
+            self._row_count += len(rows)
+            self.endInsertRows()
+        self.page_loaded.emit(self._row_count)
+
+
+class ButtonDelegate(QStyledItemDelegate):
+    """셀에 버튼을 그리는 delegate (행마다 QPushButton 위젯을 만들지 않음).
+
+    enabled_fn(row)가 False인 행은 비활성 버튼으로 그리고 클릭을 무시한다.
+    """
+
+    clicked = pyqtSignal(int)  # 행 번호
+
+    def __init__(self, text: str, enabled_fn: Callable[[dict], bool] | None = None, parent=None):
+        super().__init__(parent)
+        self._text = text
+        self._enabled_fn = enabled_fn
+        self._pressed: tuple[int, int] | None = None
+
+    def _enabled(self, index: QModelIndex) -> bool:
+        if self._enabled_fn is None:
+            return True
+        row = index.data(Qt.ItemDataRole.UserRole)
+        return bool(row is not None and self._enabled_fn(row))
+
+    @staticmethod
+    def _button_rect(rect: QRect) -> QRect:
+        return rect.adjusted(4, 3, -4, -3)
+
+    def paint(self, painter, option, index):
+        button = QStyleOptionButton()
+        button.rect = self._button_rect(option.rect)
+        button.text = self._text
+        button.state = QStyle.StateFlag.State_Raised
+        if self._enabled(index):
+            button.state |= QStyle.StateFlag.State_Enabled
+            if self._pressed == (index.row(), index.column()):
+                button.state |= QStyle.StateFlag.State_Sunken
+        style = option.widget.style() if option.widget is not None else QApplication.style()
+        style.drawControl(QStyle.ControlElement.CE_PushButton, button, painter, option.widget)
+
+    def editorEvent(self, event, model, option, index):
+        if not self._enabled(index):
+            return False
+        if event.type() == QEvent.Type.MouseButtonPress and event.button() == Qt.MouseButton.LeftButton:
+            if self._button_rect(option.rect).contains(event.position().toPoint()):
+                self._pressed = (index.row(), index.column())
+                return True
+        elif event.type() == QEvent.Type.MouseButtonRelease and event.button() == Qt.MouseButton.LeftButton:
+            was_pressed = self._pressed == (index.row(), index.column())
+            self._pressed = None
+            if was_pressed and self._button_rect(option.rect).contains(event.position().toPoint()):
+                self.clicked.emit(index.row())
+                return True
+        return False
@@ -0,0 +1,206 @@
+"""
+버전별 스키마 마이그레이션 (클라이언트 home_safe_user / 서버 home_safe_admin 공용).
+
+setup SQL은 DB를 새로 만들 때만 실행되므로, 이미 운영 중인 DB에 필요한 인덱스 등은 여기서 버전 순서대로 적용한다.
+적용 이력은 각 DB의 schema_migrations 테이블에 남고, 인덱스/컬럼은 이미 있으면 건너뛴다 (여러 번 실행해도 안전).
+
+실행 (src 폴더에서):
+    python schema_migrations.py --target client          # client/.env DB에 적용
+    python schema_migrations.py --target server --status # 적용 현황만 출력
+쿼리 실행 계획 확인: check_query_plans.py
+"""
+
+import argparse
+import os
+import sys
+
+from env_config import get_db_config
+
+_SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+TARGET_DIRS = {
+    "client": os.path.join(_SCRIPT_DIR, "client"),
+    "server": os.path.join(_SCRIPT_DIR, "server"),
+}
+
+# (버전, 이름, 단계 목록). 단계: ("index", 테이블, 인덱스명, (컬럼, ...)) | ("unique", 테이블, 인덱스명, (컬럼, ...))
+#                             | ("column", 테이블, 컬럼명, 정의) | ("sql", 문장)
+MIGRATIONS = {
+    "client": [
+        (1, "event_logs_search_indexes", [
+            # 사용자별 최근/기간 검색 (EventLog.search/get_recent, user_id + occurred_at 범위)
+            ("index", "event_logs", "idx_user_event", ("user_id", "occurred_at")),
+            # 타입별 기간 검색, 최근 낙상 조회 (get_recent_fall_event, event_type 필터)
+            ("index", "event_logs", "idx_type_occurred", ("event_type_id", "occurred_at")),
+            # 전체 최근순 / 기간 통계 (get_recent, get_statistics). InnoDB 보조 인덱스는 PK(event_id)를 포함
+            ("index", "event_logs", "idx_occurred_at", ("occurred_at",)),
+            ("index", "event_logs", "idx_event_search", ("user_id", "event_type_id", "occurred_at")),
+        ]),
+        (2, "event_logs_event_uid", [
+            # 로컬 저장소(admin_ui/event_store) 일괄 전송 키. 재전송돼도 ON DUPLICATE KEY로 한 번만 저장
+            ("column", "event_logs", "event_uid", "CHAR(32) NULL"),
+            ("unique", "event_logs", "uq_event_uid", ("event_uid",)),
+        ]),
+    ],
+    "server": [
+        (1, "emergency_events_indexes", [
+            # 이벤트 조회 최근순 (EventManageWindow)
+            ("index", "emergency_events", "idx_received_at", ("received_at",)),
+            # user_id 앞부분 검색 + 최근순
+            ("index", "emergency_events", "idx_user_received", ("user_id", "received_at")),
+            ("index", "emergency_events", "idx_type_received", ("event_type", "received_at")),
+        ]),
+        (2, "alarm_receipts", [
+            # /alarm 중복 제거: 클라이언트 outbox가 재전송한 event_id를 서버 재시작 후에도 한 번만 처리
+            ("sql", """
+                CREATE TABLE IF NOT EXISTS alarm_receipts (
+                    event_uid   VARCHAR(64) NOT NULL,
+                    user_id     VARCHAR(16),
+                    received_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (event_uid),
+                    INDEX idx_received_at (received_at)
+                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+            """),
+        ]),
+    ],
+}
+
+
+def _connect(config: dict, connect_timeout: int = 5):
+    import pymysql
+    from pymysql.cursors import DictCursor
+
+    return pymysql.connect(
+        host=config["host"],
+        port=config["port"],
+        user=config["user"],
+        password=config["password"],
+        database=config["name"],
+        connect_timeout=connect_timeout,
+        charset="utf8mb4",
+        cursorclass=DictCursor,
+        autocommit=True,
+    )
+
+
+def _ensure_history_table(cur):
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INT PRIMARY KEY,
+            name VARCHAR(100) NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+        """
+    )
+
+
+def _table_exists(cur, table: str) -> bool:
+    cur.execute(
+        "SELECT 1 FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+        (table,),
+    )
+    return cur.fetchone() is not None
+
+
+def _index_exists(cur, table: str, index: str) -> bool:
+    cur.execute(
+        "SELECT 1 FROM information_schema.STATISTICS "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = %s LIMIT 1",
+        (table, index),
+    )
+    return cur.fetchone() is not None
+
+
+def _column_exists(cur, table: str, column: str) -> bool:
+    cur.execute(
+        "SELECT 1 FROM information_schema.COLUMNS "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = %s",
+        (table, column),
+    )
+    return cur.fetchone() is not None
+
+
+def _apply_step(cur, step: tuple) -> str:
+    if step[0] in ("index", "unique"):
+        _, table, index, columns = step
+        if not _table_exists(cur, table):
+            return f"건너뜀 (테이블 없음): {table}"
+        if _index_exists(cur, table, index):
+            return f"이미 있음: {table}.{index}"
+        cols = ", ".join(f"`{c}`" for c in columns)
+        kind = "UNIQUE INDEX" if step[0] == "unique" else "INDEX"
+        cur.execute(f"CREATE {kind} `{index}` ON `{table}` ({cols})")
+        return f"생성: {table}.{index} ({cols})"
+    if step[0] == "column":
+        _, table, column, definition = step
+        if not _table_exists(cur, table):
+            return f"건너뜀 (테이블 없음): {table}"
+        if _column_exists(cur, table, column):
+            return f"이미 있음: {table}.{column}"
+        cur.execute(f"ALTER TABLE `{table}` ADD COLUMN `{column}` {definition}")
+        return f"컬럼 추가: {table}.{column} {definition}"
+    cur.execute(step[1])
+    return "실행: " + " ".join(step[1].split())[:80]
+
+
+def applied_versions(config: dict) -> set[int]:
+    conn = _connect(config)
+    try:
+        with conn.cursor() as cur:
+            _ensure_history_table(cur)
+            cur.execute("SELECT version FROM schema_migrations")
+            return {row["version"] for row in cur.fetchall()}
+    finally:
+        conn.close()
+
+
+def apply_migrations(config: dict, target: str) -> tuple[bool, list[str]]:
+    """미적용 마이그레이션을 버전 순서대로 적용. (성공 여부, 로그) 반환. 실패한 버전에서 멈춘다."""
+    log = []
+    try:
+        conn = _connect(config)
+    except Exception as exc:
+        return False, [f"DB 연결 실패: {exc}"]
+    try:
+        with conn.cursor() as cur:
+            _ensure_history_table(cur)
+            cur.execute("SELECT version FROM schema_migrations")
+            done = {row["version"] for row in cur.fetchall()}
+            for version, name, steps in sorted(MIGRATIONS.get(target, []), key=lambda m: m[0]):
+                if version in done:
+                    continue
+                try:
+                    for step in steps:
+                        log.append(f"[v{version}] {_apply_step(cur, step)}")
+                    cur.execute("INSERT INTO schema_migrations (version, name) VALUES (%s, %s)", (version, name))
+                except Exception as exc:
+                    log.append(f"[v{version}] 실패: {exc}")
+                    return False, log
+                log.append(f"[v{version}] {name} 적용 완료")
+        return True, log
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="스키마 마이그레이션 적용")
+    parser.add_argument("--target", choices=sorted(MIGRATIONS), required=True)
+    parser.add_argument("--status", action="store_true", help="적용 현황만 출력")
+    args = parser.parse_args()
+
+    config = get_db_config(base_dir=TARGET_DIRS[args.target])
+    if args.status:
+        done = applied_versions(config)
+        for version, name, _steps in MIGRATIONS[args.target]:
+            print(f"  v{version} {name}: {'적용됨' if version in done else '미적용'}")
+        return 0
+    ok, log = apply_migrations(config, args.target)
+    for line in log:
+        print(line)
+    if not log:
+        print("[Migration] 적용할 마이그레이션이 없습니다.")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
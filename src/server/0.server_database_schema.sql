@@ -102,5 +102,22 @@ CREATE TABLE emergency_events (
     PRIMARY KEY (event_id),
     INDEX idx_user_id (user_id),
     INDEX idx_received_at (received_at),
-    INDEX idx_event_type (event_type)
+    INDEX idx_event_type (event_type),
+    INDEX idx_user_received (user_id, received_at),
+    INDEX idx_type_received (event_type, received_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+
+-- ============================================================
+-- 4. 알람 수신 기록 (클라이언트 event_id 중복 제거, /alarm)
+-- ============================================================
+DROP TABLE IF EXISTS alarm_receipts;
+
+CREATE TABLE alarm_receipts (
+    event_uid       VARCHAR(64) NOT NULL,
+    user_id         VARCHAR(16),
+    received_at     TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+    PRIMARY KEY (event_uid),
+    INDEX idx_received_at (received_at)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+AlarmBus: 프로세스 내 알람 pub/sub 채널.
+
+- POST /alarm 수신 즉시 모든 구독자에게 전달 (폴링 없음)
+- 구독자별 대기열 + 깨우기 콜백(notify). Qt는 pyqtSignal.emit, asyncio는 call_soon_threadsafe 사용
+- 구독자는 깨어날 때마다 drain()으로 쌓인 알람을 한 번에 처리
+- 알람 지연 측정: 클라이언트 전송(sent_ts) → 서버 수신(received_ts) → 구독자 처리 시각
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Callable
+
+LATENCY_HISTORY = 200
+
+
+class AlarmSubscription:
+    """구독자 1개의 대기열."""
+
+    def __init__(self, bus: "AlarmBus", notify: Callable[[], None] | None = None):
+        self._bus = bus
+        self._notify = notify
+        self._queue: deque[dict] = deque()
+        self._lock = threading.Lock()
+
+    def _push(self, alarm: dict):
+        with self._lock:
+            self._queue.append(alarm)
+        if self._notify is not None:
+            try:
+                self._notify()
+            except Exception as e:
+                print(f"[AlarmBus] notify 실패: {e}")
+
+    def drain(self) -> list[dict]:
+        """쌓인 알람 전부 꺼내기 (오래된 순)."""
+        with self._lock:
+            items = list(self._queue)
+            self._queue.clear()
+        return items
+
+    def close(self):
+        self._bus.unsubscribe(self)
+
+
+class AlarmBus:
+    """스레드 안전 알람 fan-out."""
+
+    def __init__(self):
+        self._subs: list[AlarmSubscription] = []
+        self._lock = threading.Lock()
+        self._server_latency: deque[float] = deque(maxlen=LATENCY_HISTORY)
+        self._e2e_latency: deque[float] = deque(maxlen=LATENCY_HISTORY)
+
+    def subscribe(self, notify: Callable[[], None] | None = None) -> AlarmSubscription:
+        sub = AlarmSubscription(self, notify)
+        with self._lock:
+            self._subs.append(sub)
+        return sub
+
+    def unsubscribe(self, sub: AlarmSubscription):
+        with self._lock:
+            if sub in self._subs:
+                self._subs.remove(sub)
+
+    def publish(self, alarm: dict):
+        with self._lock:
+            subs = list(self._subs)
+        for sub in subs:
+            sub._push(alarm)
+
+    @property
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subs)
+
+    def record_handled(self, alarm: dict, handled_ts: float | None = None):
+        """구독자가 알람을 화면에 표시한 시점 기록 (서버 내부 지연 / 클라이언트→표시 지연)."""
+        handled_ts = time.time() if handled_ts is None else handled_ts
+        received_ts = alarm.get("received_ts")
+        sent_ts = alarm.get("sent_ts")
+        with self._lock:
+            if received_ts:
+                self._server_latency.append(handled_ts - float(received_ts))
+            if sent_ts:
+                # 클라이언트/서버 시계 차이가 포함될 수 있음
+                self._e2e_latency.append(handled_ts - float(sent_ts))
+
+    def latency_stats(self) -> dict:
+        """최근 LATENCY_HISTORY건의 지연(ms) 요약."""
+        with self._lock:
+            server = list(self._server_latency)
+            e2e = list(self._e2e_latency)
+        return {
+            "subscribers": self.subscriber_count,
+            "server_ms": _summary_ms(server),
+            "end_to_end_ms": _summary_ms(e2e),
+        }
+
+
+def _summary_ms(values: list[float]) -> dict:
+    if not values:
+        return {"count": 0, "avg": 0.0, "p95": 0.0, "max": 0.0}
+    ordered = sorted(values)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return {
+        "count": len(values),
+        "avg": sum(values) / len(values) * 1000.0,
+        "p95": p95 * 1000.0,
+        "max": ordered[-1] * 1000.0,
+    }
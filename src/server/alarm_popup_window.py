@@ -5,25 +5,43 @@ import threading
 import time
 from datetime import datetime
 
-import cv2
-import numpy as np
 from PyQt6.QtWidgets import QDialog, QVBoxLayout, QLabel, QListWidget, QListWidgetItem
 from PyQt6.QtCore import QTimer, Qt
-from PyQt6.QtGui import QImage, QPixmap
 
 _SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 _PROJECT_ROOT = os.path.dirname(_SCRIPT_DIR)
 if _PROJECT_ROOT not in sys.path:
     sys.path.insert(0, _PROJECT_ROOT)
 
-from env_config import read_env_values
-from api_server import get_latest_frame
+from env_config import get_config
+from api_server import (
+    get_latest_frame_with_seq, get_frame_seq, get_latest_keypoints,
+    request_stream_tier, release_stream_tier,
+)
 from db_client import MySqlClient
+from clip_encoder import PRE_ROLL_SEC, ClipResult, get_encoder_pool
+from frame_ring import DEFAULT_RING_SECONDS
+from grid_renderer import GridCellRenderer
 
 MOV_DIR = os.path.join(_SCRIPT_DIR, "mov")
 POPUP_DURATION_SEC = 10
-RECORD_DURATION_SEC = 10
-RECORD_FPS = 30
+
+
+def clip_alarm_ts(payload: dict) -> float | None:
+    """클립 기준 시각. 링에 pre-roll이 남아 있을 만큼 최근 알람이면 발생 시각, 아니면 None.
+
+    sent_ts는 클라이언트가 알람을 만든 시각 (outbox가 payload째 보관하므로 재전송돼도 그대로).
+    서버 장애 후 재전송된 알람은 received_ts가 전달 시각이라 그 주변을 녹화하면 낙상 장면이 아니다.
+    (클라이언트/서버 시계는 동기화돼 있다고 가정, alarm_bus 지연 측정과 동일)
+    """
+    received_ts = float(payload.get("received_ts") or time.time())
+    sent_ts = payload.get("sent_ts")
+    if not sent_ts:
+        return received_ts
+    event_ts = min(float(sent_ts), received_ts)  # 클라이언트 시계가 빠르면 수신 시각 사용
+    if received_ts - event_ts > DEFAULT_RING_SECONDS - PRE_ROLL_SEC:
+        return None
+    return event_ts
 
 
 def _format_event_line(payload: dict) -> str:
@@ -43,6 +61,9 @@ class AlarmPopupWindow(QDialog):
         self._payload = payload
         self._db = db or MySqlClient(base_dir=_SCRIPT_DIR)
         self._event_list: list[dict] = [payload]
+        # 팝업이 열려 있는 동안 normal 단계 스트림 요청
+        self._tier_token = request_stream_tier(user_id, "normal")
+        self.finished.connect(self._release_stream_tier)
         self.setWindowTitle(f"알람 수신 - {user_id}")
         self.setMinimumSize(480, 400)
         self.resize(640, 520)
@@ -58,12 +79,16 @@ class AlarmPopupWindow(QDialog):
         self._close_timer.start(POPUP_DURATION_SEC * 1000)
 
         # SAVE_MOV=true 일 때만 녹화 후 저장, false면 이벤트만 DB 저장
-        save_mov = (read_env_values(base_dir=_SCRIPT_DIR).get("SAVE_MOV") or "true").strip().lower() == "true"
+        save_mov = get_config(_SCRIPT_DIR).get_bool("SAVE_MOV", True)
         if save_mov:
             self._start_auto_record()
         else:
             self._save_event_only()
 
+    def _release_stream_tier(self):
+        release_stream_tier(self._tier_token)
+        self._tier_token = None
+
     def _init_ui(self):
         layout = QVBoxLayout(self)
         # 영상 영역
@@ -72,6 +97,7 @@ class AlarmPopupWindow(QDialog):
         self.video_label.setMinimumSize(320, 240)
         self.video_label.setStyleSheet("background-color: #000; color: #ccc;")
         layout.addWidget(self.video_label)
+        self._renderer = GridCellRenderer(self.video_label)
 
         # 발생 이벤트 목록 (영상 바로 밑)
         layout.addWidget(QLabel("발생한 이벤트:"))
@@ -95,19 +121,16 @@ class AlarmPopupWindow(QDialog):
         self._append_event_to_list(payload)
 
     def _refresh_frame(self):
-        frame = get_latest_frame(self._user_id)
-        if frame is None:
+        if self._renderer.is_current(get_frame_seq(self._user_id)):
             return
-        h, w, ch = frame.shape
-        bytes_per_line = ch * w
-        qimg = QImage(frame.data, w, h, bytes_per_line, QImage.Format.Format_RGB888)
-        pix = QPixmap.fromImage(qimg).scaled(
-            self.video_label.width(),
-            self.video_label.height(),
-            Qt.AspectRatioMode.KeepAspectRatio,
-            Qt.TransformationMode.SmoothTransformation,
-        )
-        self.video_label.setPixmap(pix)
+        seq, frame = get_latest_frame_with_seq(self._user_id)
+        if frame is not None:
+            self._renderer.render(seq, frame)
+            return
+        # 키포인트 전용 클라이언트: 스켈레톤으로 표시
+        telemetry = get_latest_keypoints(self._user_id)
+        if telemetry is not None:
+            self._renderer.render_keypoints(seq, telemetry)
 
     def _save_event_only(self):
         """SAVE_MOV=false 시: 영상 없이 이벤트만 DB에 저장."""
@@ -135,62 +158,58 @@ class AlarmPopupWindow(QDialog):
             print(f"[AlarmPopup] DB 저장 실패: {e}")
 
     def _start_auto_record(self):
-        """응급 발생 시 10초 영상 자동 저장 및 DB 기록 (SAVE_MOV=true일 때)."""
-        payload = self._payload
-        thread = threading.Thread(
-            target=self._auto_record_worker,
-            args=(self._user_id, payload),
-            daemon=True,
-        )
-        thread.start()
+        """응급 발생 시 알람 전후 영상 자동 저장 및 DB 기록 (SAVE_MOV=true일 때).
 
-    def _auto_record_worker(self, user_id: str, payload: dict):
-        """백그라운드에서 10초 영상 수집, 파일 저장, DB 기록."""
+        녹화는 공용 인코더 풀(clip_encoder)에서 프레임 도착 즉시 기록되며,
+        파일이 완료된 시점에 emergency_events에 기록한다.
+        """
+        user_id = self._user_id
+        payload = self._payload
         try:
             os.makedirs(MOV_DIR, exist_ok=True)
         except OSError as e:
             print(f"[AlarmPopup] 폴더 생성 실패: {e}")
+            self._save_event_only()
+            return
+        alarm_ts = clip_alarm_ts(payload)
+        if alarm_ts is None:
+            # 지연 전달된 알람: 링에 발생 시점 영상이 없으므로 녹화하지 않고 표시만 남김
+            delay = float(payload.get("received_ts") or time.time()) - float(payload.get("sent_ts") or 0)
+            print(f"[AlarmPopup] {delay:.0f}초 지연 전달된 알람 - 발생 시점 영상이 없어 녹화하지 않습니다.")
+            self._payload = dict(payload, clip_skipped="delayed_delivery")  # raw_payload에 사유 기록
+            self._save_event_only()
             return
+        ts = datetime.fromtimestamp(alarm_ts).strftime("%Y%m%d_%H%M%S")
+        filepath = os.path.join(MOV_DIR, f"{user_id}_{ts}.mp4")
+        db = self._db
+        get_encoder_pool().submit(
+            user_id,
+            alarm_ts,
+            filepath,
+            lambda result: _on_clip_finalized(db, user_id, payload, result),
+        )
 
-        frames = []
-        interval = 1.0 / RECORD_FPS
-        start = time.time()
-        while (time.time() - start) < RECORD_DURATION_SEC:
-            frame = get_latest_frame(user_id)
-            if frame is not None:
-                bgr = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
-                frames.append(bgr)
-            time.sleep(interval)
-
-        video_path = None
-        if not frames:
-            print("[AlarmPopup] SAVE_MOV=true지만 수신된 영상 프레임이 없어 파일을 저장하지 않습니다. (클라이언트가 실시간 영상 전송 중인지 확인)")
-        if frames:
-            ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"{user_id}_{ts}.mp4"
-            filepath = os.path.join(MOV_DIR, filename)
-            try:
-                h, w = frames[0].shape[:2]
-                fourcc = cv2.VideoWriter_fourcc(*"mp4v")
-                writer = cv2.VideoWriter(filepath, fourcc, RECORD_FPS, (w, h))
-                for f in frames:
-                    writer.write(f)
-                writer.release()
-                video_path = filepath
-            except Exception as e:
-                print(f"[AlarmPopup] 영상 저장 실패: {e}")
-
-        # DB에 응급 이벤트 저장
-        try:
-            raw_json = json.dumps(payload, ensure_ascii=False) if payload else None
-            self._db.insert("emergency_events", {
-                "user_id": user_id,
-                "device_id": payload.get("device_id") or "",
-                "event_type": payload.get("event_type") or "ALERT",
-                "message": payload.get("message") or "",
-                "video_path": video_path or "",
-                "client_timestamp": payload.get("timestamp") or "",
-                "raw_payload": raw_json,
-            })
-        except Exception as e:
-            print(f"[AlarmPopup] DB 저장 실패: {e}")
+
+def _on_clip_finalized(db: MySqlClient, user_id: str, payload: dict, result: ClipResult):
+    """인코더 풀 스레드에서 호출: 완료된 클립 경로·통계와 함께 응급 이벤트 DB 기록."""
+    if result.video_path is None:
+        print("[AlarmPopup] SAVE_MOV=true지만 수신된 영상 프레임이 없어 파일을 저장하지 않습니다. (클라이언트가 실시간 영상 전송 중인지 확인)")
+    else:
+        print(
+            f"[AlarmPopup] 영상 저장: {result.video_path} "
+            f"({result.frames} frames, {result.fps:.1f} fps, {result.file_size / 1024:.0f} KB, encode {result.encode_sec:.2f}s)"
+        )
+    try:
+        raw = dict(payload) if payload else {}
+        raw["clip"] = result.to_dict()
+        db.insert("emergency_events", {
+            "user_id": user_id,
+            "device_id": payload.get("device_id") or "",
+            "event_type": payload.get("event_type") or "ALERT",
+            "message": payload.get("message") or "",
+            "video_path": result.video_path or "",
+            "client_timestamp": payload.get("timestamp") or "",
+            "raw_payload": json.dumps(raw, ensure_ascii=False),
+        })
+    except Exception as e:
+        print(f"[AlarmPopup] DB 저장 실패: {e}")
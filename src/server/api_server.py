@@ -1,27 +1,59 @@
 import os
+import json
 import time
+import asyncio
 import threading
+import uuid
+from collections import OrderedDict
 import numpy as np
 import cv2
-from collections import deque
 
 from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 from db_client import MySqlClient
 from env_config import get_api_config
+from frame_ring import FrameRing
+from alarm_bus import AlarmBus, AlarmSubscription
+from presence import PresenceWheel, PresenceListener
+from stream_tiers import TierDemand, tier_message
+from keypoint_telemetry import KeypointTelemetry, decode_keypoints, is_keypoint_packet
+from inference_service import ServerInference
 
 _SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 
 app = FastAPI(title="AI Care Server API")
 _db = MySqlClient(base_dir=_SCRIPT_DIR)
 _server_started = False
-_last_seen: dict[str, float] = {}
-_last_seen_lock = threading.Lock()
+# 접속 상태: 프레임/제어 메시지/HTTP keepalive 수신 시 touch, 10초 무응답 시 offline
+_presence = PresenceWheel(timeout_sec=10.0, tick_sec=1.0)
 _client_frames: dict[str, np.ndarray] = {}
+# user_id별 프레임 시퀀스 번호 (새 프레임 수신 시 1씩 증가). 화면 갱신 시 변경 여부 판단용.
+_client_frame_seq: dict[str, int] = {}
+# 키포인트 텔레메트리 모드 클라이언트의 최근 포즈 (영상 대신 스켈레톤 표시)
+_client_keypoints: dict[str, KeypointTelemetry] = {}
 _client_frames_lock = threading.Lock()
-_alarm_queue = deque()
-_alarm_lock = threading.Lock()
+# user_id별 최근 수신 JPEG 링 버퍼 (알람 녹화 pre-roll용). 연결 종료 후에도 유지.
+_frame_rings: dict[str, FrameRing] = {}
+_frame_rings_lock = threading.Lock()
+# 화면별 스트림 단계 요청 (격자/팝업/녹화) → 클라이언트 제어 메시지
+_tier_demand = TierDemand()
+_alarm_bus = AlarmBus()
+ALARM_STREAM_PING_SEC = 15
+# 클라이언트 outbox 재전송 중복 제거 (응답 유실 후 재시도 시 같은 알람이 두 번 뜨지 않도록).
+# alarm_receipts.event_uid(PK)에 INSERT IGNORE → 서버 재시작 후에도 유지. DB 오류 시에만 아래 메모리 기록 사용
+_seen_event_ids: OrderedDict[str, float] = OrderedDict()
+_seen_event_ids_lock = threading.Lock()
+SEEN_EVENT_IDS_MAX = 4096
+ALARM_RECEIPT_RETENTION_DAYS = 30
+_receipts_purged_ts = 0.0
+# 서버 판정 모드 클라이언트용 추론 워커 풀 (첫 서버 판정 클라이언트 접속 시 시작)
+_inference: ServerInference | None = None
+_inference_lock = threading.Lock()
+# user_id별 마지막 서버 판정 알람 시각 (같은 낙상으로 알람이 반복되지 않도록)
+_inference_alarm_ts: dict[str, float] = {}
+INFERENCE_ALARM_COOLDOWN_SEC = 10.0
 
 
 class RegisterRequest(BaseModel):
@@ -57,7 +89,10 @@ class AlarmRequest(BaseModel):
     message: str
     device_id: str | None = None
     user_id: str | None = None
+    camera_id: str | None = None  # 여러 카메라를 쓰는 엣지 장비의 카메라 ID (raw_payload에 기록)
     timestamp: str | None = None
+    sent_ts: float | None = None  # 클라이언트 전송 시각 (epoch, 지연 측정용)
+    event_id: str | None = None  # 클라이언트 발급 고유 ID (outbox 재전송 중복 제거)
 
 
 @app.get("/health")
@@ -124,18 +159,59 @@ def admin_login(payload: AdminLoginRequest):
 
 @app.post("/keepalive")
 def keepalive(payload: KeepAliveRequest):
-    now = time.time()
-    with _last_seen_lock:
-        _last_seen[payload.user_id] = now
+    """웹소켓을 열 수 없는 클라이언트용 HTTP keepalive (폴백)."""
+    _presence.touch(payload.user_id)
     return {"status": "ok"}
 
 
 @app.websocket("/ws/{user_id}")
 async def stream_ws(websocket: WebSocket, user_id: str):
+    """영상 업링크. 바이너리 = JPEG 프레임 또는 키포인트 패킷(keypoint_telemetry),
+    텍스트 = 제어 메시지(JSON, 예: {"type": "keepalive"}).
+
+    어떤 메시지든 수신 시 접속 상태를 갱신하므로 별도 HTTP keepalive가 필요 없다.
+    서버 → 클라이언트: 요청 단계가 바뀌면 {"type": "tier", ...} 전송 (stream_tiers.TIERS).
+    단계 변경은 TierDemand 리스너가 이 연결의 전송 태스크를 깨워 바로 보낸다 (클라이언트가 조용해도 전달).
+    """
     await websocket.accept()
+    server_inference = False
+    inference_tier_token = None
+    loop = asyncio.get_running_loop()
+    tier_changed = asyncio.Event()
+
+    def _on_tier_changed(changed_user: str, _tier: str):
+        if changed_user == user_id:
+            loop.call_soon_threadsafe(tier_changed.set)
+
+    _tier_demand.add_listener(_on_tier_changed)
+    tier_task = asyncio.create_task(_push_tiers(websocket, user_id, tier_changed))
     try:
         while True:
-            data = await websocket.receive_bytes()
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+            _presence.touch(user_id)
+            data = message.get("bytes")
+            if data is None:
+                control = _parse_control(message.get("text"))
+                if control.get("type") == "mode" and control.get("inference") == "server" and not server_inference:
+                    # 서버 판정: 원본 fps/화질(full) 유지 (normal 15fps면 ST-GCN 시간축이 30fps 학습 기준과 어긋남) + 워커 시작
+                    server_inference = True
+                    inference_tier_token = request_stream_tier(user_id, "full")
+                    await asyncio.to_thread(_get_inference().start)
+                    print(f"[API] {user_id}: 서버 판정 모드")
+                continue
+            if is_keypoint_packet(data):
+                telemetry = decode_keypoints(data)
+                if telemetry is None:
+                    continue
+                with _client_frames_lock:
+                    _client_keypoints[user_id] = telemetry
+                    # 영상도 함께 받는 경우(both)에는 영상 프레임 기준으로만 화면 갱신
+                    if user_id not in _client_frames:
+                        _client_frame_seq[user_id] = _client_frame_seq.get(user_id, 0) + 1
+                continue
+            received_ts = time.time()
             nparr = np.frombuffer(data, np.uint8)
             frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
             if frame is None:
@@ -143,27 +219,215 @@ async def stream_ws(websocket: WebSocket, user_id: str):
             rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
             with _client_frames_lock:
                 _client_frames[user_id] = rgb
+                seq = _client_frame_seq.get(user_id, 0) + 1
+                _client_frame_seq[user_id] = seq
+            _get_frame_ring(user_id).append(data, seq, received_ts)
+            if server_inference:
+                _get_inference().submit(user_id, data, received_ts)
     except WebSocketDisconnect:
         with _client_frames_lock:
             _client_frames.pop(user_id, None)
+            _client_keypoints.pop(user_id, None)
+            # 재접속 시에도 시퀀스가 되돌아가지 않도록 번호만 1 증가 (영상 없음 상태로 변경 알림)
+            _client_frame_seq[user_id] = _client_frame_seq.get(user_id, 0) + 1
+        _presence.remove(user_id)
+    finally:
+        _tier_demand.remove_listener(_on_tier_changed)
+        tier_task.cancel()
+        if server_inference:
+            _get_inference().remove(user_id)
+            release_stream_tier(inference_tier_token)
+
+
+async def _push_tiers(websocket: WebSocket, user_id: str, changed: asyncio.Event):
+    """연결 직후 현재 단계를 보내고, 이후 단계가 바뀔 때마다 전송 (이 연결의 tier 메시지는 여기서만 보냄)."""
+    sent_tier = None
+    try:
+        while True:
+            tier = _tier_demand.tier_for(user_id)
+            if tier != sent_tier:
+                await websocket.send_json(tier_message(tier))
+                sent_tier = tier
+            await changed.wait()
+            changed.clear()
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        # 연결 종료 중 전송 실패 - 수신 루프가 정리
+        print(f"[API] {user_id}: tier 전송 중단 ({e})")
+
+
+def _parse_control(text: str | None) -> dict:
+    if not text:
+        return {}
+    try:
+        control = json.loads(text)
+    except ValueError:
+        return {}
+    return control if isinstance(control, dict) else {}
+
+
+def _get_inference() -> ServerInference:
+    global _inference
+    with _inference_lock:
+        if _inference is None:
+            try:
+                workers = int(os.environ.get("INFERENCE_WORKERS", "2"))
+            except ValueError:
+                workers = 2
+            _inference = ServerInference(workers=workers, env_dir=_SCRIPT_DIR)
+            _inference.add_listener(_on_inference_result)
+        return _inference
+
+
+def _on_inference_result(user_id: str, result: dict):
+    """서버 판정 결과 (추론 결과 스레드). 쓰러짐이면 클라이언트 /alarm과 같은 형식으로 알람 발행."""
+    if not result.get("is_fallen"):
+        return
+    now = time.time()
+    if now - _inference_alarm_ts.get(user_id, 0.0) < INFERENCE_ALARM_COOLDOWN_SEC:
+        return
+    _inference_alarm_ts[user_id] = now
+    _alarm_bus.publish({
+        "event_type": "ALERT",
+        "message": "쓰러짐 발생 (서버 판정)",
+        "user_id": user_id,
+        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(result["received_ts"])),
+        "sent_ts": result["received_ts"],
+        "event_id": uuid.uuid4().hex,
+        "confidence": result.get("confidence"),
+        "source": "server_inference",
+        "received_at": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now)),
+        "received_ts": now,
+    })
+
+
+def _is_duplicate_event(event_id: str, user_id: str | None = None) -> bool:
+    """이미 받은 event_id면 True, 처음이면 기록 후 False.
+
+    alarm_receipts의 PK로 판단하므로 여러 요청이 동시에 와도 한 번만 False.
+    DB를 쓸 수 없으면 메모리 기록으로 대신한다 (알람 전달이 DB 상태에 막히지 않도록).
+    """
+    global _receipts_purged_ts
+    try:
+        inserted = _db.execute(
+            "INSERT IGNORE INTO alarm_receipts (event_uid, user_id) VALUES (%s, %s)",
+            (event_id, user_id),
+        )
+    except Exception as exc:
+        print(f"[Alarm] 수신 기록 실패 - 메모리 중복 제거 사용: {exc}")
+    else:
+        now = time.time()
+        if now - _receipts_purged_ts > 3600:
+            _receipts_purged_ts = now
+            try:
+                _db.execute(
+                    "DELETE FROM alarm_receipts WHERE received_at < NOW() - INTERVAL %s DAY",
+                    (ALARM_RECEIPT_RETENTION_DAYS,),
+                )
+            except Exception as exc:
+                print(f"[Alarm] 오래된 수신 기록 정리 실패: {exc}")
+        return inserted == 0
+    with _seen_event_ids_lock:
+        if event_id in _seen_event_ids:
+            _seen_event_ids.move_to_end(event_id)
+            return True
+        _seen_event_ids[event_id] = time.time()
+        while len(_seen_event_ids) > SEEN_EVENT_IDS_MAX:
+            _seen_event_ids.popitem(last=False)
+        return False
 
 
 @app.post("/alarm")
 def alarm(payload: AlarmRequest):
     data = payload.dict()
-    data["received_at"] = time.strftime("%Y-%m-%d %H:%M:%S")
-    with _alarm_lock:
-        _alarm_queue.append(data)
+    event_id = data.get("event_id")
+    if event_id and _is_duplicate_event(event_id, data.get("user_id")):
+        return {"status": "ok", "duplicate": True}
+    now = time.time()
+    data["received_at"] = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now))
+    data["received_ts"] = now  # 녹화 pre-roll/post-roll 및 지연 측정 기준 시각
+    _alarm_bus.publish(data)
     return {"status": "ok"}
 
 
-def get_keepalive_status(user_id: str, timeout_sec: int = 10) -> bool:
-    now = time.time()
-    with _last_seen_lock:
-        last = _last_seen.get(user_id)
-    if last is None:
-        return False
-    return (now - last) <= timeout_sec
+@app.get("/inference/stats")
+def inference_stats():
+    """서버 판정 워커/클라이언트별 처리 수와 지연 (서버 판정 클라이언트가 없으면 workers=0)."""
+    if _inference is None:
+        return {"workers": 0, "ready_workers": 0, "model": "", "clients": {}}
+    return _inference.stats()
+
+
+@app.get("/alarms/stats")
+def alarm_stats():
+    """알람 구독자 수 및 지연 통계."""
+    return _alarm_bus.latency_stats()
+
+
+def _subscribe_async() -> tuple[AlarmSubscription, asyncio.Event]:
+    """이벤트 루프용 구독: 알람 publish 시 asyncio.Event를 스레드 안전하게 set."""
+    loop = asyncio.get_running_loop()
+    wake = asyncio.Event()
+    sub = _alarm_bus.subscribe(lambda: loop.call_soon_threadsafe(wake.set))
+    return sub, wake
+
+
+@app.websocket("/alarms/ws")
+async def alarm_ws(websocket: WebSocket):
+    """관리 콘솔용 알람 구독 (여러 콘솔 동시 구독 가능). 유휴 시 ping 메시지 전송."""
+    await websocket.accept()
+    sub, wake = _subscribe_async()
+    try:
+        while True:
+            try:
+                await asyncio.wait_for(wake.wait(), timeout=ALARM_STREAM_PING_SEC)
+            except asyncio.TimeoutError:
+                await websocket.send_json({"type": "ping"})
+                continue
+            wake.clear()
+            for data in sub.drain():
+                await websocket.send_json({"type": "alarm", "data": data})
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+    finally:
+        sub.close()
+
+
+@app.get("/alarms/stream")
+async def alarm_sse():
+    """Server-Sent Events 알람 스트림 (브라우저 EventSource 등)."""
+    sub, wake = _subscribe_async()
+
+    async def _events():
+        try:
+            while True:
+                try:
+                    await asyncio.wait_for(wake.wait(), timeout=ALARM_STREAM_PING_SEC)
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"
+                    continue
+                wake.clear()
+                for data in sub.drain():
+                    yield f"event: alarm\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+        finally:
+            sub.close()
+
+    return StreamingResponse(_events(), media_type="text/event-stream")
+
+
+def get_keepalive_status(user_id: str) -> bool:
+    """접속 상태 조회 (O(1))."""
+    return _presence.is_online(user_id)
+
+
+def add_presence_listener(listener: PresenceListener):
+    """online/offline 전환 이벤트 구독. listener(user_id, online)는 수신/tick 스레드에서 호출된다."""
+    _presence.add_listener(listener)
+
+
+def remove_presence_listener(listener: PresenceListener):
+    _presence.remove_listener(listener)
 
 
 def get_latest_frame(user_id: str):
@@ -171,11 +435,59 @@ def get_latest_frame(user_id: str):
         return _client_frames.get(user_id)
 
 
-def pop_alarm():
-    with _alarm_lock:
-        if not _alarm_queue:
-            return None
-        return _alarm_queue.popleft()
+def get_latest_frame_with_seq(user_id: str) -> tuple[int, np.ndarray | None]:
+    """(시퀀스 번호, 최신 프레임) 반환. 수신 이력이 없으면 (0, None)."""
+    with _client_frames_lock:
+        return _client_frame_seq.get(user_id, 0), _client_frames.get(user_id)
+
+
+def get_latest_keypoints(user_id: str) -> KeypointTelemetry | None:
+    """키포인트 텔레메트리 모드 클라이언트의 최근 포즈."""
+    with _client_frames_lock:
+        return _client_keypoints.get(user_id)
+
+
+def get_frame_seq(user_id: str) -> int:
+    """최신 프레임 시퀀스 번호만 조회 (프레임 복사/변환 없이 변경 여부 확인용)."""
+    with _client_frames_lock:
+        return _client_frame_seq.get(user_id, 0)
+
+
+def _get_frame_ring(user_id: str) -> FrameRing:
+    with _frame_rings_lock:
+        ring = _frame_rings.get(user_id)
+        if ring is None:
+            ring = FrameRing()
+            _frame_rings[user_id] = ring
+        return ring
+
+
+def get_buffered_frames(user_id: str, since_ts: float, until_ts: float | None = None) -> list[tuple[float, int, bytes]]:
+    """링 버퍼에서 since_ts 이후 수신된 (수신시각, 시퀀스, jpeg) 목록 조회."""
+    with _frame_rings_lock:
+        ring = _frame_rings.get(user_id)
+    if ring is None:
+        return []
+    return ring.frames_between(since_ts, until_ts)
+
+
+def request_stream_tier(user_id: str, tier: str) -> int:
+    """user_id 스트림을 최소 tier 단계로 요청. 반환 토큰으로 release_stream_tier 호출."""
+    return _tier_demand.acquire(user_id, tier)
+
+
+def release_stream_tier(token: int | None):
+    _tier_demand.release(token)
+
+
+def subscribe_alarms(notify=None) -> AlarmSubscription:
+    """프로세스 내 알람 구독. notify는 알람 도착 시 (수신 스레드에서) 호출된다."""
+    return _alarm_bus.subscribe(notify)
+
+
+def record_alarm_handled(data: dict):
+    """구독자가 알람 표시를 마친 시점 기록 (지연 측정)."""
+    _alarm_bus.record_handled(data)
 
 
 def start_api_server():
@@ -183,6 +495,7 @@ def start_api_server():
     if _server_started:
         return
     _server_started = True
+    _presence.start()
     config = get_api_config(base_dir=_SCRIPT_DIR)
     host = config["host"]
     port = config["port"]
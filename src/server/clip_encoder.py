@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+"""
+알람 영상 클립 인코더 (스트리밍, 메모리 상한).
+
+- ClipEncoder: 도착한 JPEG를 1장씩 디코딩해 즉시 VideoWriter에 기록 (디코딩 프레임 누적 없음)
+  출력은 RECORD_FPS 고정이고, 각 프레임은 수신 시각에 해당하는 위치에 놓는다
+  (수신 간격이 길면 직전 프레임 반복, 짧으면 건너뜀). pre-roll(썸네일/일반 단계 10~15fps)과
+  녹화 중(full 단계 30fps) 전송 속도가 달라도 재생 시간이 실제 시간과 같다.
+- ClipEncoderPool: 모든 알람이 공유하는 작업 풀. 동시 인코딩 수를 MAX_CONCURRENT_ENCODES로 제한
+  구간 프레임은 submit 시점(pre-roll)과 구간 종료 시점(post-roll)에 링에서 복사 (_ClipCapture)
+- 인코딩 시간/파일 크기를 ClipResult로 반환, 파일 완료 시점에 콜백 호출 (DB 기록용)
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from typing import Callable
+
+import cv2
+import numpy as np
+
+from api_server import get_buffered_frames, request_stream_tier, release_stream_tier
+
+RECORD_FPS = 30
+PRE_ROLL_SEC = 5
+POST_ROLL_SEC = 5
+RECORD_POLL_SEC = 0.2
+MAX_CONCURRENT_ENCODES = 4
+# 출력 너비 고정 (높이는 첫 프레임 비율). pre-roll(썸네일 단계)과 녹화 중(full 단계) 해상도가 달라도 한 파일로 기록
+RECORD_WIDTH = 640
+
+
+@dataclass
+class ClipResult:
+    """완료된 클립 정보."""
+
+    video_path: str | None
+    frames: int
+    fps: float
+    encode_sec: float  # 디코딩+쓰기에 실제로 소요된 시간 (대기 시간 제외)
+    file_size: int
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class ClipEncoder:
+    """JPEG 프레임을 받는 즉시 mp4로 기록하는 인코더. 첫 프레임에서 파일을 연다.
+
+    start_ts를 주면 write_jpeg(jpeg, ts)의 ts로 출력 프레임 위치를 정한다 (고정 fps, 실제 시간 유지).
+    """
+
+    def __init__(self, filepath: str, fps: float = RECORD_FPS, width: int = RECORD_WIDTH,
+                 start_ts: float | None = None):
+        self._filepath = filepath
+        self._fps = float(fps)
+        self._width = width
+        self._start_ts = start_ts
+        self._writer = None
+        self._size: tuple[int, int] | None = None
+        self._last_bgr = None  # 간격을 채울 직전 프레임 (1장만 보관)
+        self._frames = 0
+        self._encode_sec = 0.0
+
+    def _slot(self, ts: float) -> int:
+        return int(round((ts - self._start_ts) * self._fps))
+
+    def _fill_until(self, slot: int):
+        """slot 직전까지 직전 프레임을 반복 기록."""
+        while self._last_bgr is not None and self._frames < slot:
+            self._writer.write(self._last_bgr)
+            self._frames += 1
+
+    def write_jpeg(self, jpeg: bytes, ts: float | None = None) -> bool:
+        start = time.perf_counter()
+        try:
+            slot = None
+            if ts is not None and self._start_ts is not None:
+                slot = self._slot(ts)
+                if slot < self._frames:
+                    return False  # 출력 fps보다 촘촘하게 도착한 프레임: 디코딩하지 않고 건너뜀
+            bgr = cv2.imdecode(np.frombuffer(jpeg, np.uint8), cv2.IMREAD_COLOR)
+            if bgr is None:
+                return False
+            if self._writer is None:
+                h, w = bgr.shape[:2]
+                out_h = int(round(self._width * h / w / 2.0)) * 2
+                self._size = (self._width, max(2, out_h))
+                fourcc = cv2.VideoWriter_fourcc(*"mp4v")
+                self._writer = cv2.VideoWriter(self._filepath, fourcc, self._fps, self._size)
+            if (bgr.shape[1], bgr.shape[0]) != self._size:
+                bgr = cv2.resize(bgr, self._size)
+            if slot is not None:
+                if self._last_bgr is None:
+                    self._last_bgr = bgr  # 첫 프레임 앞 빈 구간은 첫 프레임으로 채움
+                self._fill_until(slot)
+            self._writer.write(bgr)
+            self._frames += 1
+            self._last_bgr = bgr
+            return True
+        finally:
+            self._encode_sec += time.perf_counter() - start
+
+    def finalize(self, end_ts: float | None = None) -> ClipResult:
+        if self._writer is not None:
+            start = time.perf_counter()
+            if end_ts is not None and self._start_ts is not None:
+                # 마지막 프레임을 구간 끝까지 유지 (클립 길이 = 실제 구간 길이)
+                self._fill_until(self._slot(end_ts))
+            self._writer.release()
+            self._encode_sec += time.perf_counter() - start
+            self._writer = None
+            self._last_bgr = None
+        path = self._filepath if self._frames > 0 and os.path.isfile(self._filepath) else None
+        size = os.path.getsize(path) if path else 0
+        return ClipResult(path, self._frames, self._fps, self._encode_sec, size)
+
+
+class _ClipCapture:
+    """알람 1건의 구간 프레임 수집 (인코딩 작업과 분리).
+
+    링(FrameRing, 15초)이 밀어내기 전에 pre-roll은 submit() 호출 스레드에서 바로 복사하고,
+    post-roll은 구간이 끝나는 시각에 타이머 스레드가 복사한다.
+    인코딩 작업이 풀에서 오래 대기해도 클립 구간 프레임은 그대로 남는다.
+    """
+
+    def __init__(self, user_id: str, alarm_ts: float):
+        self.user_id = user_id
+        self.start_ts = alarm_ts - PRE_ROLL_SEC
+        self.end_ts = alarm_ts + POST_ROLL_SEC
+        self.pre_roll = get_buffered_frames(user_id, since_ts=self.start_ts, until_ts=self.end_ts)
+        self.post_roll: list = []
+        self.done = threading.Event()
+        # 녹화 구간 동안 원본 해상도(full) 스트림 요청
+        self._tier_token = request_stream_tier(user_id, "full")
+        delay = max(0.0, self.end_ts - time.time()) + RECORD_POLL_SEC  # 마감 직전 도착분 포함
+        timer = threading.Timer(delay, self._collect_post_roll)
+        timer.daemon = True
+        timer.start()
+
+    def _collect_post_roll(self):
+        try:
+            last_ts = self.pre_roll[-1][0] if self.pre_roll else self.start_ts
+            self.post_roll = get_buffered_frames(self.user_id, since_ts=last_ts, until_ts=self.end_ts)
+        except Exception as e:
+            print(f"[ClipEncoder] post-roll 수집 실패: {e}")
+        finally:
+            release_stream_tier(self._tier_token)
+            self.done.set()
+
+
+class ClipEncoderPool:
+    """알람 클립 인코딩 공유 풀 (동시 인코딩 수 제한 + 통계)."""
+
+    def __init__(self, max_workers: int = MAX_CONCURRENT_ENCODES):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="clip-encoder")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._active = 0
+        self._completed = 0
+        self._total_encode_sec = 0.0
+        self._total_bytes = 0
+
+    def submit(
+        self,
+        user_id: str,
+        alarm_ts: float,
+        filepath: str,
+        on_finished: Callable[[ClipResult], None],
+    ):
+        """alarm_ts 기준 pre-roll~post-roll 구간을 인코딩. 완료(파일 close) 후 on_finished(result) 호출.
+
+        pre-roll은 이 호출 시점에 복사한다 (알람이 몰려 작업이 대기해도 pre-roll 유지).
+        """
+        capture = _ClipCapture(user_id, alarm_ts)
+        with self._lock:
+            self._pending += 1
+        return self._executor.submit(self._run, capture, filepath, on_finished)
+
+    def _run(self, capture: _ClipCapture, filepath: str, on_finished: Callable[[ClipResult], None]):
+        with self._lock:
+            self._pending -= 1
+            self._active += 1
+        result = ClipResult(None, 0, float(RECORD_FPS), 0.0, 0)
+        try:
+            result = self._encode(capture, filepath)
+        except Exception as e:
+            print(f"[ClipEncoder] 영상 저장 실패: {e}")
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._completed += 1
+                self._total_encode_sec += result.encode_sec
+                self._total_bytes += result.file_size
+        on_finished(result)
+
+    def _encode(self, capture: _ClipCapture, filepath: str) -> ClipResult:
+        # 고정 fps로 쓰고 수신 시각 기준으로 배치 (pre-roll/녹화 중 전송 fps가 달라도 실제 시간 유지)
+        encoder = ClipEncoder(filepath, RECORD_FPS, start_ts=capture.start_ts)
+        for ts, _seq, jpeg in capture.pre_roll:
+            encoder.write_jpeg(jpeg, ts)
+        capture.done.wait(timeout=PRE_ROLL_SEC + POST_ROLL_SEC + 5.0)
+        for ts, _seq, jpeg in capture.post_roll:
+            encoder.write_jpeg(jpeg, ts)
+        return encoder.finalize(capture.end_ts)
+
+    def stats(self) -> dict:
+        """대기/진행/완료 수, 평균 인코딩 시간, 누적 파일 크기."""
+        with self._lock:
+            avg = self._total_encode_sec / self._completed if self._completed else 0.0
+            return {
+                "pending": self._pending,
+                "active": self._active,
+                "completed": self._completed,
+                "avg_encode_sec": avg,
+                "total_bytes": self._total_bytes,
+            }
+
+
+_pool: ClipEncoderPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_encoder_pool() -> ClipEncoderPool:
+    """프로세스 공용 인코더 풀 (최초 호출 시 생성)."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ClipEncoderPool()
+        return _pool
@@ -25,6 +25,7 @@ if _PROJECT_ROOT not in sys.path:
 
 from admin_login_window import AdminLoginWindow
 from env_config import get_db_config, test_db_connection
+from schema_migrations import apply_migrations
 
 
 class DbCheckWindow(QMainWindow):
@@ -77,8 +78,15 @@ class DbCheckWindow(QMainWindow):
         self.btn_retry.hide()
         app.processEvents()
         time.sleep(1)
-        success, error_msg = test_db_connection(get_db_config(base_dir=_SCRIPT_DIR))
+        db_config = get_db_config(base_dir=_SCRIPT_DIR)
+        success, error_msg = test_db_connection(db_config)
         if success:
+            # 스키마 마이그레이션 (이벤트 조회 인덱스 등, 실패해도 실행은 계속)
+            ok_mig, mig_log = apply_migrations(db_config, "server")
+            for line in mig_log:
+                print(f"[Migration] {line}")
+            if not ok_mig:
+                print("[Migration] 일부 마이그레이션 적용 실패 - 다음 실행 시 다시 시도합니다.")
             self.status_label.setText("DB 연결 확인 완료.")
             app.processEvents()
             time.sleep(0.5)
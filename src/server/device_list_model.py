@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+"""
+장치(사용자) 목록: 캐시된 사용자 디렉터리 + QAbstractListModel.
+
+- UserDirectory: users 테이블 캐시. 변경 알림 시 전체 재조회, 주기 동기화는 updated_at 증분 조회
+- DeviceListModel: 바뀐 행만 dataChanged / 추가·삭제된 행만 insert/remove (선택 상태 유지)
+"""
+
+from typing import Callable
+
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex
+from PyQt6.QtGui import QColor
+
+from db_client import MySqlClient
+
+_USER_COLUMNS = "index_no, user_id, name, phone, created_at, updated_at"
+_DISPLAY_KEYS = ("index_no", "user_id", "name", "phone")
+
+ONLINE_BG = QColor("#1b5e20")
+ONLINE_FG = QColor("#e8f5e9")
+OFFLINE_BG = QColor("#7f1d1d")
+OFFLINE_FG = QColor("#fee2e2")
+
+UserIdRole = Qt.ItemDataRole.UserRole
+IndexNoRole = Qt.ItemDataRole.UserRole + 1
+
+
+class UserDirectory:
+    """users 테이블 캐시 (user_id → row)."""
+
+    def __init__(self, db: MySqlClient):
+        self._db = db
+        self._rows: dict[str, dict] = {}
+        self._max_updated_at = None
+
+    def ordered_rows(self) -> list[dict]:
+        """created_at DESC 순 (기존 목록 정렬과 동일)."""
+        return sorted(
+            self._rows.values(),
+            key=lambda r: (r.get("created_at") is not None, r.get("created_at"), r.get("index_no") or 0),
+            reverse=True,
+        )
+
+    def _track_max(self, rows: list[dict]):
+        for row in rows:
+            updated = row.get("updated_at")
+            if updated is not None and (self._max_updated_at is None or updated > self._max_updated_at):
+                self._max_updated_at = updated
+
+    def reload(self):
+        """전체 재조회 (사용자 추가/수정/삭제 알림 시)."""
+        rows = self._db.fetch_all(f"SELECT {_USER_COLUMNS} FROM users")
+        self._rows = {r.get("user_id") or "": r for r in rows}
+        self._max_updated_at = None
+        self._track_max(rows)
+
+    def sync(self) -> bool:
+        """updated_at 증분 조회 + 건수 비교로 삭제 감지. 변경이 있으면 True."""
+        if self._max_updated_at is None:
+            self.reload()
+            return True
+        summary = self._db.fetch_one("SELECT COUNT(*) AS cnt FROM users") or {}
+        changed_rows = self._db.fetch_all(
+            f"SELECT {_USER_COLUMNS} FROM users WHERE updated_at >= %s",
+            (self._max_updated_at,),
+        )
+        changed = False
+        for row in changed_rows:
+            user_id = row.get("user_id") or ""
+            if self._rows.get(user_id) != row:
+                self._rows[user_id] = row
+                changed = True
+        self._track_max(changed_rows)
+        if int(summary.get("cnt") or 0) != len(self._rows):
+            # 삭제 또는 user_id 변경: 증분으로 알 수 없으므로 전체 재조회
+            self.reload()
+            changed = True
+        return changed
+
+
+class DeviceListModel(QAbstractListModel):
+    """장치 목록 모델. 표시 형식: "ON | index_no | user_id | name | phone"."""
+
+    def __init__(self, status_fn: Callable[[str], bool], parent=None):
+        super().__init__(parent)
+        self._status_fn = status_fn
+        self._rows: list[dict] = []
+        self._online: list[bool] = []
+        self._row_of: dict[str, int] = {}
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or not (0 <= index.row() < len(self._rows)):
+            return None
+        row = self._rows[index.row()]
+        online = self._online[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            fields = " | ".join(str(row.get(k) or "") for k in _DISPLAY_KEYS)
+            return f"{'ON' if online else 'OFF'} | {fields}"
+        if role == Qt.ItemDataRole.BackgroundRole:
+            return ONLINE_BG if online else OFFLINE_BG
+        if role == Qt.ItemDataRole.ForegroundRole:
+            return ONLINE_FG if online else OFFLINE_FG
+        if role == UserIdRole:
+            return row.get("user_id") or ""
+        if role == IndexNoRole:
+            return row.get("index_no")
+        return None
+
+    def _reindex(self):
+        self._row_of = {(r.get("user_id") or ""): i for i, r in enumerate(self._rows)}
+
+    def _row_changed(self, i: int):
+        idx = self.index(i)
+        self.dataChanged.emit(idx, idx)
+
+    def set_users(self, rows: list[dict]):
+        """새 목록과 비교해 삭제/추가/변경된 행만 반영."""
+        new_ids = [r.get("user_id") or "" for r in rows]
+        new_set = set(new_ids)
+
+        # 1) 삭제
+        structural = False
+        for i in range(len(self._rows) - 1, -1, -1):
+            if (self._rows[i].get("user_id") or "") not in new_set:
+                self.beginRemoveRows(QModelIndex(), i, i)
+                del self._rows[i]
+                del self._online[i]
+                self.endRemoveRows()
+                structural = True
+
+        # 2) 추가 (정렬 위치에 삽입). 순서가 바뀐 기존 행이 있으면 전체 리셋
+        present = {r.get("user_id") or "" for r in self._rows}
+        for i, (user_id, row) in enumerate(zip(new_ids, rows)):
+            current = (self._rows[i].get("user_id") or "") if i < len(self._rows) else None
+            if current == user_id:
+                if self._rows[i] != row:
+                    self._rows[i] = row
+                    self._row_changed(i)
+                continue
+            if user_id in present:
+                self._reset(rows)
+                return
+            self.beginInsertRows(QModelIndex(), i, i)
+            self._rows.insert(i, row)
+            self._online.insert(i, bool(self._status_fn(user_id)))
+            self.endInsertRows()
+            structural = True
+        if structural:
+            self._reindex()
+
+    def _reset(self, rows: list[dict]):
+        self.beginResetModel()
+        self._rows = list(rows)
+        self._online = [bool(self._status_fn(r.get("user_id") or "")) for r in self._rows]
+        self._reindex()
+        self.endResetModel()
+
+    def set_online(self, user_id: str, online: bool):
+        """접속 상태 전환: 해당 행만 갱신."""
+        i = self._row_of.get(user_id)
+        if i is None or self._online[i] == online:
+            return
+        self._online[i] = online
+        self._row_changed(i)
@@ -11,13 +11,12 @@ from PyQt6.QtWidgets import (
     QLabel,
     QLineEdit,
     QPushButton,
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
     QComboBox,
     QMessageBox,
     QHeaderView,
+    QAbstractItemView,
 )
-from PyQt6.QtCore import Qt
 
 _SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 _PROJECT_ROOT = os.path.dirname(_SCRIPT_DIR)
@@ -26,6 +25,30 @@ if _PROJECT_ROOT not in sys.path:
 
 from db_client import MySqlClient
 from event_video_player_window import EventVideoPlayerWindow
+from keyset_table_model import ButtonDelegate, Column, KeysetTableModel
+
+PLAY_COLUMN = 7
+
+
+def _text(key: str):
+    return lambda row: str(row.get(key) or "")
+
+
+def _received_text(row: dict) -> str:
+    recv = row.get("received_at")
+    return recv.strftime("%Y-%m-%d %H:%M:%S") if recv else ""
+
+
+EVENT_COLUMNS = [
+    Column("event_id", _text("event_id")),
+    Column("user_id", _text("user_id")),
+    Column("name", _text("name")),
+    Column("event_type", _text("event_type")),
+    Column("message", _text("message")),
+    Column("received_at", _received_text),
+    Column("video_path", _text("video_path")),
+    Column("영상 재생", lambda row: ""),  # ButtonDelegate가 그림
+]
 
 
 class EventManageWindow(QDialog):
@@ -47,7 +70,7 @@ class EventManageWindow(QDialog):
         search_layout = QHBoxLayout()
         search_layout.addWidget(QLabel("user_id:"))
         self.ed_user_id = QLineEdit()
-        self.ed_user_id.setPlaceholderText("검색 (비워두면 전체)")
+        self.ed_user_id.setPlaceholderText("앞부분 검색 (비워두면 전체)")
         search_layout.addWidget(self.ed_user_id)
         search_layout.addWidget(QLabel("event_type:"))
         self.cb_event_type = QComboBox()
@@ -62,16 +85,21 @@ class EventManageWindow(QDialog):
         search_layout.addStretch()
         layout.addLayout(search_layout)
 
-        # 테이블
-        self.table = QTableWidget()
-        self.table.setColumnCount(8)
-        self.table.setHorizontalHeaderLabels([
-            "event_id", "user_id", "name", "event_type", "message", "received_at", "video_path", "영상 재생"
-        ])
-        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        # 테이블 (보이는 행만 그리고, 스크롤이 끝에 닿으면 (received_at, event_id) 키셋으로 다음 페이지 조회)
+        self.model = KeysetTableModel(
+            EVENT_COLUMNS, key_fn=lambda row: (row["received_at"], row["event_id"]), parent=self
+        )
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        # 행마다 QPushButton을 만들지 않고 delegate로 버튼을 그림
+        self.play_delegate = ButtonDelegate("영상 재생", enabled_fn=lambda row: bool(row.get("video_path")), parent=self)
+        self.play_delegate.clicked.connect(self._on_play_clicked)
+        self.table.setItemDelegateForColumn(PLAY_COLUMN, self.play_delegate)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
         self.table.horizontalHeader().setSectionResizeMode(4, QHeaderView.ResizeMode.Stretch)
         self.table.horizontalHeader().setSectionResizeMode(6, QHeaderView.ResizeMode.Stretch)
-        self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
         layout.addWidget(self.table)
 
     def _load_events(self):
@@ -83,53 +111,48 @@ class EventManageWindow(QDialog):
         conditions = []
         params = []
         if user_id:
-            conditions.append("user_id LIKE %s")
-            params.append(f"%{user_id}%")
+            # 앞부분 일치 검색 (idx_user_received 인덱스 범위 조회, '%...%'는 전체 스캔)
+            escaped = user_id.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            conditions.append("e.user_id LIKE %s")
+            params.append(f"{escaped}%")
         if event_type:
-            conditions.append("event_type = %s")
+            conditions.append("e.event_type = %s")
             params.append(event_type)
-        where_clause = " AND ".join(conditions) if conditions else "1=1"
-        sql = f"""
-            SELECT e.event_id, e.user_id, e.device_id, e.event_type, e.message,
-                   e.video_path, e.client_timestamp, e.received_at,
-                   u.name, u.phone
-            FROM emergency_events e
-            LEFT JOIN users u ON e.user_id = u.user_id
-            WHERE {where_clause}
-            ORDER BY e.received_at DESC
-            LIMIT 500
-        """
+
+        def fetch_page(after, limit):
+            page_conditions = list(conditions)
+            page_params = list(params)
+            if after is not None:
+                received_at, event_id = after
+                page_conditions.append("(e.received_at < %s OR (e.received_at = %s AND e.event_id < %s))")
+                page_params.extend([received_at, received_at, event_id])
+            where_clause = " AND ".join(page_conditions) if page_conditions else "1=1"
+            sql = f"""
+                SELECT e.event_id, e.user_id, e.device_id, e.event_type, e.message,
+                       e.video_path, e.client_timestamp, e.received_at,
+                       u.name, u.phone
+                FROM emergency_events e
+                LEFT JOIN users u ON e.user_id = u.user_id
+                WHERE {where_clause}
+                ORDER BY e.received_at DESC, e.event_id DESC
+                LIMIT %s
+            """
+            page_params.append(limit)
+            return self._db.fetch_all(sql, tuple(page_params))
 
         try:
-            rows = self._db.fetch_all(sql, tuple(params) if params else None)
+            self.model.reset(fetch_page)
         except Exception as e:
             QMessageBox.warning(self, "오류", f"조회 실패: {e}")
             return
+        # 내용 기준 폭은 첫 페이지에서 한 번만 맞춤 (ResizeToContents는 모든 행을 측정)
+        self.table.resizeColumnsToContents()
 
-        self.table.setRowCount(len(rows))
-        for i, row in enumerate(rows):
-            self.table.setItem(i, 0, QTableWidgetItem(str(row.get("event_id") or "")))
-            self.table.setItem(i, 1, QTableWidgetItem(str(row.get("user_id") or "")))
-            self.table.setItem(i, 2, QTableWidgetItem(str(row.get("name") or "")))
-            self.table.setItem(i, 3, QTableWidgetItem(str(row.get("event_type") or "")))
-            self.table.setItem(i, 4, QTableWidgetItem(str(row.get("message") or "")))
-            recv = row.get("received_at")
-            recv_str = recv.strftime("%Y-%m-%d %H:%M:%S") if recv else ""
-            self.table.setItem(i, 5, QTableWidgetItem(recv_str))
-            video_path = row.get("video_path") or ""
-            self.table.setItem(i, 6, QTableWidgetItem(video_path))
-            btn = QPushButton("영상 재생")
-            btn.setProperty("video_path", video_path)
-            btn.setProperty("event_id", row.get("event_id"))
-            btn.setEnabled(bool(video_path))
-            btn.clicked.connect(self._on_play_clicked)
-            self.table.setCellWidget(i, 7, btn)
-
-    def _on_play_clicked(self):
-        btn = self.sender()
-        if not isinstance(btn, QPushButton):
+    def _on_play_clicked(self, row_index: int):
+        row = self.model.row_data(row_index)
+        if row is None:
             return
-        video_path = btn.property("video_path") or ""
+        video_path = row.get("video_path") or ""
         if not video_path:
             QMessageBox.warning(self, "오류", "영상 경로가 없습니다.")
             return
@@ -137,7 +160,7 @@ class EventManageWindow(QDialog):
         if not os.path.isfile(video_path):
             QMessageBox.warning(self, "오류", "영상 파일을 찾을 수 없습니다.")
             return
-        evt_id = btn.property("event_id")
+        evt_id = row.get("event_id")
         title = f"이벤트 영상 재생 (event_id={evt_id})"
         player = EventVideoPlayerWindow(video_path=video_path, title=title, parent=self)
         player.exec()
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""
+FrameRing: user_id별 최근 N초 압축(JPEG) 프레임 링 버퍼.
+
+- 수신한 JPEG 바이트를 디코딩 없이 (수신시각, 시퀀스, jpeg) 로 보관
+- 보관 시간(max_seconds)과 총 바이트(max_bytes) 둘 다로 메모리 상한 유지
+- 알람 녹화 시 알람 이전(pre-roll) 구간 + 이후(post-roll) 구간을 실제 수신 시각 기준으로 조회
+"""
+
+import threading
+import time
+from collections import deque
+
+DEFAULT_RING_SECONDS = 15.0
+DEFAULT_RING_MAX_BYTES = 8 * 1024 * 1024  # 사용자당 8MB (640x480 JPEG 약 30KB 기준 ~270 프레임)
+
+
+class FrameRing:
+    """스레드 안전한 시간/용량 제한 JPEG 링 버퍼."""
+
+    def __init__(self, max_seconds: float = DEFAULT_RING_SECONDS, max_bytes: int = DEFAULT_RING_MAX_BYTES):
+        self._max_seconds = max_seconds
+        self._max_bytes = max_bytes
+        self._frames: deque[tuple[float, int, bytes]] = deque()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def append(self, jpeg: bytes, seq: int, ts: float | None = None):
+        """수신 프레임 추가 후 오래된/용량 초과 프레임 제거."""
+        ts = time.time() if ts is None else ts
+        with self._lock:
+            self._frames.append((ts, seq, jpeg))
+            self._total_bytes += len(jpeg)
+            self._evict(ts)
+
+    def _evict(self, now: float):
+        cutoff = now - self._max_seconds
+        while self._frames and (self._frames[0][0] < cutoff or self._total_bytes > self._max_bytes):
+            _, _, old = self._frames.popleft()
+            self._total_bytes -= len(old)
+
+    def frames_between(self, since_ts: float, until_ts: float | None = None) -> list[tuple[float, int, bytes]]:
+        """since_ts < 수신시각 <= until_ts 인 프레임 목록 (오래된 순)."""
+        with self._lock:
+            return [
+                f for f in self._frames
+                if f[0] > since_ts and (until_ts is None or f[0] <= until_ts)
+            ]
+
+    @property
+    def total_bytes(self) -> int:
+        with self._lock:
+            return self._total_bytes
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._frames)
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+GridCellRenderer: 서버 격자 타일 1칸의 영상 렌더링 상태.
+
+- api_server 프레임 시퀀스 번호로 새 프레임이 없으면 다시 그리지 않음
+- 셀 크기별로 스케일된 QPixmap 캐시 (크기만 바뀌면 원본 pixmap에서 재스케일)
+- 작은 셀은 FastTransformation, 큰 셀(팝업 등)은 SmoothTransformation
+- 셀별 실제 렌더링 fps 계산 (운영자 표시용)
+- 키포인트 텔레메트리 모드 클라이언트는 셀 크기에 맞춰 스켈레톤을 직접 그림
+"""
+
+import time
+from collections import deque
+
+import numpy as np
+from PyQt6.QtWidgets import QLabel
+from PyQt6.QtGui import QImage, QPixmap, QPainter, QPen, QColor
+from PyQt6.QtCore import Qt, QPointF
+
+from keypoint_telemetry import KeypointTelemetry, SKELETON_CONNECTIONS
+
+# 이 너비 이하의 셀은 빠른 스케일링 사용 (4x4 격자 썸네일 수준)
+FAST_SCALE_MAX_WIDTH = 320
+FPS_WINDOW_SEC = 2.0
+KEYPOINT_CONF_MIN = 0.5
+# 상태별 색상 (클라이언트 오버레이와 동일: Normal 초록 / Falling 주황 / Fallen 빨강)
+STATE_COLORS = {0: QColor(0, 255, 0), 1: QColor(255, 165, 0), 2: QColor(255, 0, 0)}
+
+
+class GridCellRenderer:
+    """QLabel 하나에 대한 변경 감지 렌더러."""
+
+    def __init__(self, label: QLabel, fps_window_sec: float = FPS_WINDOW_SEC):
+        self._label = label
+        self._fps_window_sec = fps_window_sec
+        self._render_times: deque[float] = deque()
+        self.reset()
+
+    def reset(self):
+        """셀 배정 해제/변경 시 캐시 초기화."""
+        self._last_seq = -1
+        self._source_pix: QPixmap | None = None
+        self._scaled_size: tuple[int, int] | None = None
+        self._render_times.clear()
+
+    def _target_size(self) -> tuple[int, int]:
+        return self._label.width(), self._label.height()
+
+    def is_current(self, seq: int) -> bool:
+        """시퀀스·셀 크기 모두 마지막 렌더링과 같으면 True (다시 그릴 필요 없음)."""
+        return seq == self._last_seq and self._scaled_size == self._target_size()
+
+    def render(self, seq: int, frame: np.ndarray | None) -> bool:
+        """필요할 때만 다시 그림. 실제로 그렸으면 True."""
+        size = self._target_size()
+        if seq == self._last_seq:
+            if self._scaled_size == size or self._source_pix is None:
+                return False
+            # 새 프레임은 없고 셀 크기만 바뀜 → 캐시된 원본에서 재스케일
+            self._apply_scaled(size)
+            return True
+
+        self._last_seq = seq
+        if frame is None:
+            self._source_pix = None
+            self._scaled_size = None
+            self._label.setPixmap(QPixmap())
+            self._label.setText("영상 없음")
+            return True
+
+        h, w, ch = frame.shape
+        bytes_per_line = ch * w
+        qimg = QImage(frame.data, w, h, bytes_per_line, QImage.Format.Format_RGB888)
+        self._source_pix = QPixmap.fromImage(qimg)
+        self._apply_scaled(size)
+        self._render_times.append(time.monotonic())
+        return True
+
+    def render_keypoints(self, seq: int, telemetry: KeypointTelemetry) -> bool:
+        """키포인트 텔레메트리를 셀 크기에 맞춰 스켈레톤으로 그림. 실제로 그렸으면 True."""
+        size = self._target_size()
+        if self.is_current(seq):
+            return False
+        self._last_seq = seq
+        w, h = size
+        pix = QPixmap(max(1, w), max(1, h))
+        pix.fill(QColor("#000"))
+        painter = QPainter(pix)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, w > FAST_SCALE_MAX_WIDTH)
+        color = STATE_COLORS.get(telemetry.state, QColor("#fff"))
+        kps = telemetry.keypoints
+        if kps is not None and telemetry.width and telemetry.height:
+            # 원본 좌표계 → 셀 (비율 유지, 가운데 정렬)
+            ratio = min(w / telemetry.width, h / telemetry.height)
+            ox = (w - telemetry.width * ratio) / 2
+            oy = (h - telemetry.height * ratio) / 2
+            pts = [QPointF(ox + float(x) * ratio, oy + float(y) * ratio) for x, y, _ in kps]
+            painter.setPen(QPen(QColor(0, 128, 255), 2))
+            for i, j in SKELETON_CONNECTIONS:
+                if i < len(kps) and j < len(kps) and kps[i][2] > KEYPOINT_CONF_MIN and kps[j][2] > KEYPOINT_CONF_MIN:
+                    painter.drawLine(pts[i], pts[j])
+            painter.setPen(QPen(color, 4))
+            for pt, kp in zip(pts, kps):
+                if kp[2] > KEYPOINT_CONF_MIN:
+                    painter.drawPoint(pt)
+        painter.setPen(color)
+        painter.drawText(6, h - 6, f"{telemetry.state_name} {telemetry.confidence * 100:.0f}%")
+        painter.end()
+        # 스켈레톤은 셀 크기로 바로 그리므로 원본 pixmap 캐시 없음 (크기 변경 시 다음 패킷에서 다시 그림)
+        self._source_pix = None
+        self._scaled_size = size
+        self._label.setPixmap(pix)
+        self._render_times.append(time.monotonic())
+        return True
+
+    def _apply_scaled(self, size: tuple[int, int]):
+        w, h = size
+        mode = (
+            Qt.TransformationMode.FastTransformation
+            if w <= FAST_SCALE_MAX_WIDTH
+            else Qt.TransformationMode.SmoothTransformation
+        )
+        pix = self._source_pix.scaled(w, h, Qt.AspectRatioMode.KeepAspectRatio, mode)
+        self._scaled_size = size
+        self._label.setPixmap(pix)
+
+    @property
+    def fps(self) -> float:
+        """최근 FPS_WINDOW_SEC 동안 새 프레임을 그린 횟수 기준 fps."""
+        now = time.monotonic()
+        cutoff = now - self._fps_window_sec
+        while self._render_times and self._render_times[0] < cutoff:
+            self._render_times.popleft()
+        return len(self._render_times) / self._fps_window_sec
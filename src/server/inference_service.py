@@ -0,0 +1,366 @@
+# -*- coding: utf-8 -*-
+"""
+서버 측 낙상 판정 (thin client 모드).
+
+클라이언트가 {"type": "mode", "inference": "server"}를 보내면 /ws/{user_id}로 받은 JPEG를
+워커 프로세스 풀에서 판정한다. 워커마다 FallModels 한 벌 + multi_camera.BatchedFallBackend로
+담당 클라이언트 프레임을 배치 처리한다.
+
+- 상태 격리: 클라이언트는 처음 배정된 워커에 고정 (필터/ST-GCN 버퍼가 그 워커의 러너에만 존재)
+- 공평성: 클라이언트별 처리 중 프레임 최대 1장. 결과가 오기 전에 도착한 프레임은 최신 1장만 대기
+  (빠른 클라이언트가 워커 큐를 독점하지 않음), 워커 안에서는 라운드로빈 배치
+- 클라이언트별 지연(수신 → 판정 완료), 처리/버림 수 통계
+- 워커가 죽으면 담당 클라이언트의 처리 중 프레임을 비우고 워커를 다시 띄움 (상한 초과 시 남은 워커로 재배정)
+- 판정이 실패한 프레임은 워커가 error 결과로 돌려주고, 그래도 INFLIGHT_TIMEOUT_SEC 안에 결과가 없으면
+  처리 중 표시를 풀어 다음 프레임을 보낸다 (결과 하나를 잃어도 그 클라이언트가 멈추지 않도록)
+"""
+
+import itertools
+import multiprocessing as mp
+import os
+import queue
+import sys
+import threading
+import time
+from collections import deque
+from typing import Callable
+
+_SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+_PROJECT_ROOT = os.path.dirname(_SCRIPT_DIR)
+_CLIENT_DIR = os.path.join(_PROJECT_ROOT, "client")
+
+DEFAULT_WORKERS = 2
+DEFAULT_MAX_BATCH = 8
+LATENCY_WINDOW = 200
+HEALTH_CHECK_SEC = 1.0
+MAX_RESPAWNS = 5
+INFLIGHT_TIMEOUT_SEC = 10.0  # 처리 중 프레임 결과를 기다리는 최대 시간
+
+# (user_id, result dict) - result: seq, received_ts, done_ts, state, is_fallen, keypoints, width, height, confidence
+InferenceListener = Callable[[str, dict], None]
+
+
+def _worker_main(env_dir: str, max_batch: int, in_q, out_q):
+    """워커 프로세스: JPEG 디코딩 → 배치 판정 → 결과 전송."""
+    for path in (_CLIENT_DIR, _PROJECT_ROOT):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+    import cv2
+    import numpy as np
+    from admin_ui.unified_fall_runner import FallModels
+    from multi_camera import BatchedFallBackend
+
+    os.environ["ADMIN_UI_ENV_DIR"] = env_dir
+    models = FallModels(env_dir)
+    backend = BatchedFallBackend(models, env_dir, max_batch=max_batch, draw_overlays=False)
+    backend.start()
+    # 클라이언트별 처리 중인 프레임 정보 (dispatcher가 클라이언트당 1장만 보내므로 1개)
+    meta: dict[str, tuple[int, float]] = {}
+    registered: set[str] = set()
+
+    def _on_result(user_id):
+        def _cb(_frame, state_str, is_fallen, runner):
+            seq, received_ts = meta.pop(user_id, (0, 0.0))
+            keypoints, _track_id, _prediction, confidence, (w, h) = runner.get_last_pose()
+            out_q.put((user_id, {
+                "seq": seq,
+                "received_ts": received_ts,
+                "done_ts": time.time(),
+                "state": state_str,
+                "is_fallen": bool(is_fallen),
+                "confidence": confidence,
+                "keypoints": keypoints,
+                "width": w,
+                "height": h,
+            }))
+        return _cb
+
+    def _on_error(user_id):
+        def _cb(exc):
+            seq, received_ts = meta.pop(user_id, (0, 0.0))
+            out_q.put((user_id, {"seq": seq, "received_ts": received_ts, "done_ts": time.time(),
+                                 "error": f"inference: {exc}"}))
+        return _cb
+
+    out_q.put(("__ready__", {"model": models.model_name, "pid": os.getpid()}))
+    while True:
+        msg = in_q.get()
+        kind = msg[0]
+        if kind == "stop":
+            break
+        if kind == "remove":
+            backend.unregister(msg[1])
+            registered.discard(msg[1])
+            meta.pop(msg[1], None)
+            continue
+        _, user_id, seq, received_ts, jpeg = msg
+        try:
+            frame = cv2.imdecode(np.frombuffer(jpeg, np.uint8), cv2.IMREAD_COLOR)
+            if frame is None:
+                out_q.put((user_id, {"seq": seq, "received_ts": received_ts, "done_ts": time.time(), "error": "decode"}))
+                continue
+            if user_id not in registered:
+                backend.register(user_id, _on_result(user_id), _on_error(user_id))
+                registered.add(user_id)
+            meta[user_id] = (seq, received_ts)
+            backend.submit(user_id, frame)
+        except Exception as e:
+            # 이 프레임의 결과를 보내야 dispatcher가 다음 프레임을 보낸다
+            meta.pop(user_id, None)
+            out_q.put((user_id, {"seq": seq, "received_ts": received_ts, "done_ts": time.time(), "error": str(e)}))
+    backend.stop()
+
+
+class _ClientState:
+    __slots__ = ("worker", "in_flight", "sent_at", "pending", "submitted", "processed", "dropped", "timeouts",
+                 "latencies", "last_state")
+
+    def __init__(self, worker: int):
+        self.worker = worker
+        self.in_flight = 0  # 처리 중인 프레임 seq (0 = 없음). 다른 seq의 결과는 죽은 워커/시간 초과로 버린 것이므로 무시
+        self.sent_at = 0.0  # in_flight를 워커에 보낸 시각 (monotonic)
+        self.pending: tuple[int, float, bytes] | None = None
+        self.submitted = 0
+        self.processed = 0
+        self.dropped = 0
+        self.timeouts = 0
+        self.latencies: deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self.last_state = "Normal"
+
+
+class ServerInference:
+    """워커 프로세스 풀 + 클라이언트별 배정/흐름 제어 (server 프로세스 쪽)."""
+
+    def __init__(self, workers: int = DEFAULT_WORKERS, max_batch: int = DEFAULT_MAX_BATCH, env_dir: str = _SCRIPT_DIR):
+        self._num_workers = max(1, workers)
+        self._max_batch = max_batch
+        self._env_dir = env_dir
+        self._lock = threading.Lock()
+        self._clients: dict[str, _ClientState] = {}
+        self._seq = itertools.count(1)
+        self._listeners: list[InferenceListener] = []
+        self._procs: list = []
+        self._in_qs: list = []
+        self._out_q = None
+        self._result_thread: threading.Thread | None = None
+        self._started = False
+        self._ready_workers = 0
+        self._ready_pids: set[int] = set()
+        self._dead_workers: set[int] = set()  # 재시작 상한 초과로 비운 워커 번호
+        self._respawns = 0
+        self.model_name = ""
+
+    def add_listener(self, listener: InferenceListener):
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: InferenceListener):
+        try:
+            self._listeners.remove(listener)
+        except ValueError:
+            pass
+
+    def start(self):
+        """워커 시작 (모델 로드). 서버 판정 클라이언트가 처음 접속할 때 호출."""
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+            self._ctx = mp.get_context("spawn")
+            self._out_q = self._ctx.Queue()
+            for _ in range(self._num_workers):
+                in_q, proc = self._spawn_worker()
+                self._in_qs.append(in_q)
+                self._procs.append(proc)
+        self._result_thread = threading.Thread(target=self._collect_results, name="inference-results", daemon=True)
+        self._result_thread.start()
+        print(f"[ServerInference] 워커 {self._num_workers}개 시작")
+
+    def _spawn_worker(self):
+        in_q = self._ctx.Queue()
+        proc = self._ctx.Process(
+            target=_worker_main,
+            args=(self._env_dir, self._max_batch, in_q, self._out_q),
+            daemon=True,
+        )
+        proc.start()
+        return in_q, proc
+
+    def stop(self):
+        with self._lock:
+            if not self._started:
+                return
+            self._started = False
+            for in_q in self._in_qs:
+                in_q.put(("stop",))
+        for proc in self._procs:
+            proc.join(timeout=3)
+            if proc.is_alive():
+                proc.terminate()
+        if self._out_q is not None:
+            self._out_q.put(("__stop__", {}))
+
+    def _assign_worker(self) -> int:
+        """담당 클라이언트가 가장 적은 워커 (모두 비웠으면 -1)."""
+        load = [0] * self._num_workers
+        for c in self._clients.values():
+            if c.worker >= 0:
+                load[c.worker] += 1
+        alive = [i for i in range(self._num_workers) if i not in self._dead_workers]
+        if not alive:
+            return -1
+        return min(alive, key=lambda i: load[i])
+
+    def submit(self, user_id: str, jpeg: bytes, received_ts: float):
+        """프레임 제출. 이 클라이언트의 이전 프레임이 처리 중이면 최신 1장만 대기시킨다."""
+        if not self._started:
+            self.start()
+        with self._lock:
+            client = self._clients.get(user_id)
+            if client is None:
+                client = _ClientState(self._assign_worker())
+                self._clients[user_id] = client
+            item = (next(self._seq), received_ts, jpeg)
+            if client.worker < 0:
+                client.dropped += 1
+                return
+            if client.in_flight:
+                if client.pending is not None:
+                    client.dropped += 1
+                client.pending = item
+                return
+            self._send_locked(user_id, client, item)
+
+    def _send_locked(self, user_id: str, client: _ClientState, item: tuple[int, float, bytes]):
+        seq, received_ts, jpeg = item
+        client.in_flight = seq
+        client.sent_at = time.monotonic()
+        client.submitted += 1
+        self._in_qs[client.worker].put(("frame", user_id, seq, received_ts, jpeg))
+
+    def remove(self, user_id: str):
+        """클라이언트 연결 종료: 워커의 스트림 상태 해제."""
+        with self._lock:
+            client = self._clients.pop(user_id, None)
+            if client is not None and self._started and client.worker >= 0:
+                self._in_qs[client.worker].put(("remove", user_id))
+
+    def _check_workers(self):
+        """죽은 워커 감지: 담당 클라이언트의 처리 중/대기 프레임을 비우고 워커 재시작.
+
+        새 워커는 필터/ST-GCN 버퍼가 비어 있으므로 클라이언트 상태는 다음 프레임부터 다시 쌓인다.
+        재시작 상한을 넘으면 그 워커를 비우고 담당 클라이언트를 남은 워커로 재배정한다.
+        """
+        with self._lock:
+            if not self._started:
+                return
+            dead = [
+                i for i, proc in enumerate(self._procs)
+                if i not in self._dead_workers and not proc.is_alive()
+            ]
+            for i in dead:
+                proc = self._procs[i]
+                print(f"[ServerInference] 워커 {i} 종료 감지 (exitcode={proc.exitcode})")
+                if proc.pid in self._ready_pids:
+                    self._ready_pids.discard(proc.pid)
+                    self._ready_workers -= 1
+                if self._respawns < MAX_RESPAWNS:
+                    self._respawns += 1
+                    self._in_qs[i], self._procs[i] = self._spawn_worker()
+                    print(f"[ServerInference] 워커 {i} 재시작 ({self._respawns}/{MAX_RESPAWNS})")
+                else:
+                    self._dead_workers.add(i)
+                    print(f"[ServerInference] 워커 재시작 상한 초과 - 워커 {i} 담당 클라이언트 재배정")
+            if not dead:
+                return
+            for client in self._clients.values():
+                if client.worker not in dead:
+                    continue
+                client.in_flight = 0
+                if client.pending is not None:
+                    client.dropped += 1
+                    client.pending = None
+                if client.worker in self._dead_workers:
+                    client.worker = self._assign_worker()
+
+    def _expire_in_flight(self):
+        """INFLIGHT_TIMEOUT_SEC가 지나도 결과가 없는 처리 중 프레임을 포기하고 대기 프레임을 보낸다."""
+        now = time.monotonic()
+        with self._lock:
+            if not self._started:
+                return
+            for user_id, client in self._clients.items():
+                if not client.in_flight or now - client.sent_at < INFLIGHT_TIMEOUT_SEC:
+                    continue
+                print(f"[ServerInference] {user_id} 판정 결과 시간 초과 (seq={client.in_flight})")
+                client.in_flight = 0
+                client.timeouts += 1
+                if client.pending is not None and client.worker >= 0:
+                    item, client.pending = client.pending, None
+                    self._send_locked(user_id, client, item)
+
+    def _collect_results(self):
+        next_check = time.monotonic() + HEALTH_CHECK_SEC
+        while True:
+            try:
+                user_id, result = self._out_q.get(timeout=HEALTH_CHECK_SEC)
+            except queue.Empty:
+                user_id, result = None, None
+            except (EOFError, OSError):
+                return
+            # 다른 워커 결과가 계속 와도 주기적으로 생존 확인
+            if time.monotonic() >= next_check:
+                self._check_workers()
+                self._expire_in_flight()
+                next_check = time.monotonic() + HEALTH_CHECK_SEC
+            if user_id is None:
+                continue
+            if user_id == "__stop__":
+                return
+            if user_id == "__ready__":
+                with self._lock:
+                    self._ready_pids.add(result.get("pid"))
+                    self._ready_workers += 1
+                self.model_name = result.get("model", "")
+                continue
+            with self._lock:
+                client = self._clients.get(user_id)
+                if client is None or client.in_flight != result.get("seq"):
+                    continue
+                client.in_flight = 0
+                if "error" not in result:
+                    client.processed += 1
+                    client.latencies.append(result["done_ts"] - result["received_ts"])
+                    client.last_state = result["state"]
+                if client.pending is not None:
+                    item, client.pending = client.pending, None
+                    self._send_locked(user_id, client, item)
+            if "error" in result:
+                continue
+            for listener in list(self._listeners):
+                try:
+                    listener(user_id, result)
+                except Exception as e:
+                    print(f"[ServerInference] listener 오류: {e}")
+
+    def stats(self) -> dict:
+        """워커 수와 클라이언트별 처리/버림 수, 지연(ms, 서버 수신 → 판정 완료)."""
+        with self._lock:
+            clients = {}
+            for user_id, c in self._clients.items():
+                lat = sorted(c.latencies)
+                clients[user_id] = {
+                    "worker": c.worker,
+                    "submitted": c.submitted,
+                    "processed": c.processed,
+                    "dropped": c.dropped,
+                    "timeouts": c.timeouts,
+                    "state": c.last_state,
+                    "latency_p50_ms": lat[len(lat) // 2] * 1000 if lat else 0.0,
+                    "latency_p95_ms": lat[min(len(lat) - 1, int(len(lat) * 0.95))] * 1000 if lat else 0.0,
+                }
+        return {
+            "workers": self._num_workers if self._started else 0,
+            "ready_workers": self._ready_workers,
+            "model": self.model_name,
+            "clients": clients,
+        }
@@ -0,0 +1,435 @@
+# -*- coding: utf-8 -*-
+"""
+api_server 부하 테스트 (오프라인, MySQL 불필요).
+
+별도 프로세스에서 FastAPI app을 띄우고(MySqlClient는 메모리 스텁으로 교체),
+N개의 가상 클라이언트가 실제 클라이언트와 같은 순서로 동작한다.
+    회원가입 → 로그인 → HTTP keepalive 1회 → /ws/{user_id} 영상 스트림(JPEG) + 웹소켓 keepalive → 주기적 알람
+
+측정 항목:
+- 클라이언트별 전송 fps / 서버 수신(ingest) fps / 유실 프레임 / 송신 버퍼 적체로 건너뛴 프레임
+- 알람 지연 (클라이언트 sent_ts → /alarms/ws 구독자 수신)
+- 서버 프로세스 CPU / RSS (psutil 설치 시)
+
+실행 (server 폴더에서):
+    python load_test.py --clients 16 --fps 15 --width 640 --height 480 --duration 30
+    python load_test.py --clients 50 --fps 10 --alarm-interval 5 --json result.json
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing as mp
+import os
+import socket
+import statistics
+import sys
+import threading
+import time
+import uuid
+
+import cv2
+import numpy as np
+import requests
+
+_SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+_PROJECT_ROOT = os.path.dirname(_SCRIPT_DIR)
+if _SCRIPT_DIR not in sys.path:
+    sys.path.insert(0, _SCRIPT_DIR)
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
+
+WS_KEEPALIVE_SEC = 5
+# 송신 버퍼에 이 이상 쌓이면 해당 프레임 건너뜀 (client UplinkController와 동일 기준)
+BACKLOG_SKIP_BYTES = 256 * 1024
+SERVER_START_TIMEOUT_SEC = 15
+
+
+class StubMySqlClient:
+    """api_server가 사용하는 MySqlClient 메서드의 메모리 구현 (users 테이블만)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._users: dict[str, dict] = {}
+        self._next_id = 1
+
+    def fetch_one(self, query: str, params: tuple | dict | None = None) -> dict | None:
+        if "FROM users" not in query or not params:
+            return None
+        with self._lock:
+            row = self._users.get(params[0])
+        if row is None:
+            return None
+        if "password" in query and len(params) > 1 and row.get("password") != params[1]:
+            return None
+        return {"user_id": row["user_id"]}
+
+    def fetch_all(self, query: str, params: tuple | dict | None = None) -> list[dict]:
+        return []
+
+    def insert(self, table: str, data: dict) -> int:
+        with self._lock:
+            index_no = self._next_id
+            self._next_id += 1
+            if table == "users":
+                self._users[data["user_id"]] = dict(data, index_no=index_no)
+        return index_no
+
+    def execute(self, query: str, params: tuple | dict | None = None) -> int:
+        return 0
+
+    def update(self, table: str, data: dict, where: str, params: tuple | dict) -> int:
+        return 0
+
+    def delete(self, table: str, where: str, params: tuple | dict) -> int:
+        return 0
+
+
+def _serve(port: int, conn):
+    """서버 프로세스: 스텁 DB로 app 실행, 부모의 요청에 프레임 시퀀스 응답."""
+    import uvicorn
+    import api_server
+
+    api_server._db = StubMySqlClient()
+    api_server._presence.start()
+    thread = threading.Thread(
+        target=uvicorn.run,
+        args=(api_server.app,),
+        kwargs={"host": "127.0.0.1", "port": port, "log_level": "warning"},
+        daemon=True,
+    )
+    thread.start()
+    while True:
+        msg = conn.recv()
+        if msg[0] == "frame_seqs":
+            conn.send({user_id: api_server.get_frame_seq(user_id) for user_id in msg[1]})
+        elif msg[0] == "stop":
+            break
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _make_jpeg(width: int, height: int, quality: int, seed: int) -> bytes:
+    """카메라 영상과 비슷한 크기가 나오도록 그라데이션 + 노이즈 이미지를 인코딩."""
+    rng = np.random.default_rng(seed)
+    grad = np.linspace(0, 255, width, dtype=np.float32)[None, :, None]
+    img = np.broadcast_to(grad, (height, width, 3)).copy()
+    img += rng.normal(0, 20, img.shape)
+    img = np.clip(img, 0, 255).astype(np.uint8)
+    ok, buf = cv2.imencode(".jpg", img, [int(cv2.IMWRITE_JPEG_QUALITY), quality])
+    return buf.tobytes() if ok else b""
+
+
+class ClientStats:
+    def __init__(self, user_id: str):
+        self.user_id = user_id
+        self.sent = 0
+        self.skipped = 0
+        self.alarms = 0
+        self.auth_failed = False  # 가입/로그인 응답이 2xx가 아님 → 스트림 단계 진행 안 함
+        self.errors: list[str] = []
+        self.stream_start = 0.0
+        self.stream_end = 0.0
+
+
+async def _post(session: requests.Session, url: str, payload: dict) -> requests.Response:
+    return await asyncio.to_thread(session.post, url, json=payload, timeout=5)
+
+
+async def simulate_client(idx: int, args, base: str, stats: ClientStats, stop: asyncio.Event, ready: asyncio.Event):
+    import websockets
+
+    session = requests.Session()
+    user_id = stats.user_id
+    password = "loadtest"
+    try:
+        # RegisterRequest 필수 항목(user_id, password, name, device_id) + 클라이언트 가입 화면과 같은 선택 항목
+        resp = await _post(session, f"{base}/users/register", {
+            "user_id": user_id,
+            "password": password,
+            "name": f"부하테스트{idx:03d}",
+            "device_id": f"loadtest-{idx}",
+            "gender": "M",
+            "birth_date": "1950-01-01",
+            "phone": "010-0000-0000",
+            "emergency_phone": "010-0000-0000",
+            "user_type": "NORMAL",
+        })
+        if not 200 <= resp.status_code < 300:
+            stats.auth_failed = True
+            stats.errors.append(f"register {resp.status_code}: {resp.text[:100]}")
+        else:
+            resp = await _post(session, f"{base}/auth/login", {"user_id": user_id, "password": password})
+            if not 200 <= resp.status_code < 300:
+                stats.auth_failed = True
+                stats.errors.append(f"login {resp.status_code}: {resp.text[:100]}")
+        if stats.auth_failed:
+            ready.set()
+            return
+        await _post(session, f"{base}/keepalive", {"user_id": user_id})
+    except Exception as e:
+        stats.auth_failed = True
+        stats.errors.append(f"http: {e}")
+        ready.set()
+        return
+
+    jpeg = _make_jpeg(args.width, args.height, args.quality, seed=idx)
+    interval = 1.0 / args.fps
+    ws_uri = base.replace("http://", "ws://") + f"/ws/{user_id}"
+    try:
+        async with websockets.connect(ws_uri, max_size=2**20) as ws:
+            async def _drain_control():
+                # 서버 tier 제어 메시지 수신 (내용은 무시, 수신 버퍼가 쌓이지 않게만)
+                async for _ in ws:
+                    pass
+
+            rx_task = asyncio.create_task(_drain_control())
+            alarm_tasks: set[asyncio.Task] = set()
+            ready.set()
+            stats.stream_start = time.monotonic()
+            next_keepalive = stats.stream_start + WS_KEEPALIVE_SEC
+            next_alarm = stats.stream_start + args.alarm_interval * (1 + idx / max(1, args.clients))
+            next_frame = stats.stream_start
+            try:
+                while not stop.is_set():
+                    now = time.monotonic()
+                    if now >= next_keepalive:
+                        await ws.send(json.dumps({"type": "keepalive"}))
+                        next_keepalive = now + WS_KEEPALIVE_SEC
+                    if args.alarm_interval > 0 and now >= next_alarm:
+                        task = asyncio.create_task(_send_alarm(session, base, user_id, stats))
+                        alarm_tasks.add(task)
+                        task.add_done_callback(alarm_tasks.discard)
+                        next_alarm = now + args.alarm_interval
+                    if ws.transport.get_write_buffer_size() > BACKLOG_SKIP_BYTES:
+                        stats.skipped += 1
+                    else:
+                        await ws.send(jpeg)
+                        stats.sent += 1
+                    next_frame += interval
+                    await asyncio.sleep(max(0.0, next_frame - time.monotonic()))
+            finally:
+                stats.stream_end = time.monotonic()
+                rx_task.cancel()
+                if alarm_tasks:
+                    await asyncio.gather(*alarm_tasks, return_exceptions=True)
+    except Exception as e:
+        stats.errors.append(f"ws: {e}")
+        ready.set()
+
+
+async def _send_alarm(session: requests.Session, base: str, user_id: str, stats: ClientStats):
+    try:
+        resp = await _post(session, f"{base}/alarm", {
+            "event_type": "ALERT",
+            "message": "load test",
+            "device_id": user_id,
+            "user_id": user_id,
+            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "sent_ts": time.time(),
+            "event_id": uuid.uuid4().hex,
+        })
+        if resp.status_code == 200:
+            stats.alarms += 1
+        else:
+            stats.errors.append(f"alarm {resp.status_code}")
+    except Exception as e:
+        stats.errors.append(f"alarm: {e}")
+
+
+async def watch_alarms(base: str, latencies: list[float], stop: asyncio.Event):
+    """관리 콘솔처럼 /alarms/ws를 구독해 sent_ts 기준 지연 기록."""
+    import websockets
+
+    async with websockets.connect(base.replace("http://", "ws://") + "/alarms/ws") as ws:
+        while not stop.is_set():
+            try:
+                raw = await asyncio.wait_for(ws.recv(), timeout=0.5)
+            except asyncio.TimeoutError:
+                continue
+            msg = json.loads(raw)
+            data = msg.get("data") or {}
+            if msg.get("type") == "alarm" and data.get("sent_ts"):
+                latencies.append(time.time() - float(data["sent_ts"]))
+
+
+async def watch_process(pid: int, samples: list[tuple[float, float]], stop: asyncio.Event):
+    """서버 프로세스 CPU(%) / RSS(MB) 1초 간격 샘플링."""
+    try:
+        import psutil
+    except ImportError:
+        print("[LoadTest] psutil 미설치: 서버 CPU/RSS 측정 생략")
+        return
+    proc = psutil.Process(pid)
+    proc.cpu_percent(None)
+    while not stop.is_set():
+        await asyncio.sleep(1.0)
+        try:
+            samples.append((proc.cpu_percent(None), proc.memory_info().rss / (1024 * 1024)))
+        except psutil.Error:
+            return
+
+
+def _percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+async def run_load_test(args, base: str, server_pid: int, conn) -> dict:
+    stop = asyncio.Event()
+    clients = [ClientStats(f"loadtest_{i:03d}") for i in range(args.clients)]
+    user_ids = [c.user_id for c in clients]
+    latencies: list[float] = []
+    samples: list[tuple[float, float]] = []
+
+    watchers = [
+        asyncio.create_task(watch_alarms(base, latencies, stop)),
+        asyncio.create_task(watch_process(server_pid, samples, stop)),
+    ]
+    readies = [asyncio.Event() for _ in clients]
+    tasks = []
+    for i, (stats, ready) in enumerate(zip(clients, readies)):
+        tasks.append(asyncio.create_task(simulate_client(i, args, base, stats, stop, ready)))
+        if args.ramp_sec > 0:
+            await asyncio.sleep(args.ramp_sec / args.clients)
+    await asyncio.gather(*(r.wait() for r in readies))
+
+    # 모든 클라이언트 연결 후 측정 구간 시작 (서버 시퀀스는 연결 종료 시에도 증가하므로 종료 전에 스냅샷)
+    conn.send(("frame_seqs", user_ids))
+    seq_start = conn.recv()
+    sent_start = {c.user_id: c.sent for c in clients}
+    t0 = time.monotonic()
+    await asyncio.sleep(args.duration)
+    conn.send(("frame_seqs", user_ids))
+    seq_end = conn.recv()
+    sent_end = {c.user_id: c.sent for c in clients}
+    elapsed = time.monotonic() - t0
+
+    stop.set()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    # 마지막 알람 전달 대기
+    await asyncio.sleep(0.5)
+    for w in watchers:
+        w.cancel()
+    await asyncio.gather(*watchers, return_exceptions=True)
+
+    per_client = []
+    for c in clients:
+        sent = sent_end[c.user_id] - sent_start[c.user_id]
+        ingested = seq_end.get(c.user_id, 0) - seq_start.get(c.user_id, 0)
+        per_client.append({
+            "user_id": c.user_id,
+            "sent_fps": sent / elapsed,
+            "ingest_fps": ingested / elapsed,
+            "dropped": max(0, sent - ingested),
+            "skipped": c.skipped,
+            "alarms": c.alarms,
+            "errors": c.errors[:5],
+        })
+    ingest = [p["ingest_fps"] for p in per_client]
+    return {
+        "config": {
+            "clients": args.clients, "fps": args.fps, "width": args.width, "height": args.height,
+            "quality": args.quality, "duration": args.duration, "alarm_interval": args.alarm_interval,
+        },
+        "elapsed_sec": elapsed,
+        "ingest_fps": {
+            "total": sum(ingest),
+            "min": min(ingest) if ingest else 0.0,
+            "mean": statistics.mean(ingest) if ingest else 0.0,
+        },
+        "auth_failures": sum(1 for c in clients if c.auth_failed),
+        "dropped_total": sum(p["dropped"] for p in per_client),
+        "skipped_total": sum(p["skipped"] for p in per_client),
+        "alarm_latency_ms": {
+            "count": len(latencies),
+            "p50": _percentile(latencies, 0.5) * 1000,
+            "p95": _percentile(latencies, 0.95) * 1000,
+            "max": max(latencies) * 1000 if latencies else 0.0,
+        },
+        "server": {
+            "cpu_avg": statistics.mean(s[0] for s in samples) if samples else None,
+            "cpu_max": max(s[0] for s in samples) if samples else None,
+            "rss_max_mb": max(s[1] for s in samples) if samples else None,
+        },
+        "clients": per_client,
+    }
+
+
+def print_report(result: dict):
+    cfg = result["config"]
+    print(f"\n=== api_server 부하 테스트: 클라이언트 {cfg['clients']} × {cfg['fps']} fps "
+          f"({cfg['width']}x{cfg['height']}, Q{cfg['quality']}), {result['elapsed_sec']:.1f}초 ===")
+    print(f"{'user_id':<16}{'sent fps':>10}{'ingest fps':>12}{'dropped':>10}{'skipped':>10}{'alarms':>8}")
+    for p in result["clients"]:
+        print(f"{p['user_id']:<16}{p['sent_fps']:>10.1f}{p['ingest_fps']:>12.1f}"
+              f"{p['dropped']:>10}{p['skipped']:>10}{p['alarms']:>8}")
+        for err in p["errors"]:
+            print(f"    ! {err}")
+    ing = result["ingest_fps"]
+    print(f"\n수신 fps 합계 {ing['total']:.1f} (클라이언트 최소 {ing['min']:.1f} / 평균 {ing['mean']:.1f})")
+    print(f"유실 프레임 {result['dropped_total']} / 송신 적체로 건너뜀 {result['skipped_total']}")
+    if result["auth_failures"]:
+        print(f"가입/로그인 실패 {result['auth_failures']}명 (스트림 미실행, 위 오류 참고)")
+    lat = result["alarm_latency_ms"]
+    print(f"알람 지연 {lat['count']}건: p50 {lat['p50']:.1f} ms / p95 {lat['p95']:.1f} ms / max {lat['max']:.1f} ms")
+    srv = result["server"]
+    if srv["cpu_avg"] is not None:
+        print(f"서버 CPU 평균 {srv['cpu_avg']:.0f}% / 최대 {srv['cpu_max']:.0f}%, RSS 최대 {srv['rss_max_mb']:.0f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="api_server 부하 테스트 (스텁 DB, 로컬 실행)")
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--fps", type=float, default=15.0)
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    parser.add_argument("--quality", type=int, default=70)
+    parser.add_argument("--duration", type=float, default=20.0, help="측정 구간(초), 접속 완료 후부터")
+    parser.add_argument("--alarm-interval", type=float, default=10.0, help="클라이언트별 알람 간격(초), 0이면 알람 없음")
+    parser.add_argument("--ramp-sec", type=float, default=2.0, help="전체 클라이언트 접속에 걸리는 시간")
+    parser.add_argument("--port", type=int, default=0, help="0이면 빈 포트 자동 선택")
+    parser.add_argument("--json", dest="json_path", default=None, help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    port = args.port or _free_port()
+    base = f"http://127.0.0.1:{port}"
+    parent_conn, child_conn = mp.Pipe()
+    server = mp.Process(target=_serve, args=(port, child_conn), daemon=True)
+    server.start()
+    try:
+        deadline = time.time() + SERVER_START_TIMEOUT_SEC
+        while True:
+            try:
+                if requests.get(f"{base}/health", timeout=1).status_code == 200:
+                    break
+            except requests.RequestException:
+                pass
+            if time.time() > deadline or not server.is_alive():
+                print("[LoadTest] 서버 시작 실패")
+                return 1
+            time.sleep(0.2)
+
+        result = asyncio.run(run_load_test(args, base, server.pid, parent_conn))
+        print_report(result)
+        if args.json_path:
+            with open(args.json_path, "w", encoding="utf-8") as f:
+                json.dump(result, f, ensure_ascii=False, indent=2)
+            print(f"\n결과 저장: {args.json_path}")
+        return 1 if result["auth_failures"] else 0
+    finally:
+        if server.is_alive():
+            parent_conn.send(("stop",))
+            server.join(timeout=3)
+            if server.is_alive():
+                server.terminate()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,7 +4,7 @@ MainWindow: VMS 서버 메인 화면 (main_windows.ui 로드).
 
 상용 VMS 서버 화면과 동일한 틀:
 - 메뉴 영역 (menu_area)
-- 디바이스 장치 리스트 (device_list_panel, device_list_widget)
+- 디바이스 장치 리스트 (device_list_panel, device_list_view + DeviceListModel)
 - N×N 격자타일 영상 영역 (grid_area, grid_layout) — client/엣지박스 영상 수신용
 - 이벤트 수신 리스트 (event_list_panel, event_list_widget)
 
@@ -25,8 +25,8 @@ from PyQt6.QtWidgets import (
     QPushButton,
     QInputDialog,
 )
-from PyQt6.QtGui import QColor, QImage, QPixmap
-from PyQt6.QtCore import QTimer, Qt
+from PyQt6.QtGui import QPixmap
+from PyQt6.QtCore import QTimer, Qt, QObject, pyqtSignal
 
 _SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 _PROJECT_ROOT = os.path.dirname(_SCRIPT_DIR)
@@ -37,8 +37,21 @@ from admin_manage_window import AdminManageWindow
 from user_manage_window import UserManageWindow
 from event_manage_window import EventManageWindow
 from db_client import MySqlClient
-from api_server import start_api_server, get_keepalive_status, get_latest_frame, pop_alarm
+from api_server import (
+    start_api_server, get_keepalive_status, get_latest_frame_with_seq, get_frame_seq,
+    subscribe_alarms, record_alarm_handled, add_presence_listener, remove_presence_listener,
+    request_stream_tier, release_stream_tier, get_latest_keypoints,
+)
 from alarm_popup_window import AlarmPopupWindow
+from grid_renderer import GridCellRenderer
+from device_list_model import UserDirectory, DeviceListModel, IndexNoRole
+
+
+class _ServerSignalBridge(QObject):
+    """api_server 스레드 → Qt 메인 스레드 이벤트 전달 (queued signal)."""
+
+    alarm_ready = pyqtSignal()
+    presence_changed = pyqtSignal(str, bool)
 
 
 class MainWindow(QMainWindow):
@@ -51,7 +64,7 @@ class MainWindow(QMainWindow):
         self._setup_ui()
 
     def _setup_ui(self):
-        """UI 로드 후 초기화·시그널 연결. device_list_widget, grid_layout, event_list_widget 사용."""
+        """UI 로드 후 초기화·시그널 연결. device_list_view, grid_layout, event_list_widget 사용."""
         if hasattr(self, "menubar"):
             self.menubar.setVisible(False)
 
@@ -60,19 +73,30 @@ class MainWindow(QMainWindow):
         self._event_manage_win = None
         self._db = MySqlClient(base_dir=_SCRIPT_DIR)
         start_api_server()
-        self._keepalive_timer = QTimer(self)
-        self._keepalive_timer.timeout.connect(self._load_user_list)
-        self._keepalive_timer.start(3000)
+        # 장치 목록: 사용자 디렉터리 캐시 + 모델 (바뀐 행만 갱신, 선택 유지)
+        self._user_directory = UserDirectory(self._db)
+        self._device_model = DeviceListModel(status_fn=get_keepalive_status, parent=self)
+        if hasattr(self, "device_list_view"):
+            self.device_list_view.setModel(self._device_model)
+        self._bridge = _ServerSignalBridge(self)
+        # 접속 상태는 online/offline 전환 이벤트로 해당 행만 갱신
+        self._bridge.presence_changed.connect(self._device_model.set_online)
+        self._presence_listener = self._bridge.presence_changed.emit
+        add_presence_listener(self._presence_listener)
+        # 사용자 추가/수정은 updated_at 증분 동기화 (느린 주기)
+        self._user_list_timer = QTimer(self)
+        self._user_list_timer.timeout.connect(self._sync_user_list)
+        self._user_list_timer.start(30000)
         self._grid_cells = []
         self._build_grid_cells()
         self._video_timer = QTimer(self)
         self._video_timer.timeout.connect(self._refresh_grid_frames)
         self._video_timer.start(100)
-        self._alarm_timer = QTimer(self)
-        self._alarm_timer.timeout.connect(self._poll_alarm)
-        self._alarm_timer.start(500)
         # 클라이언트별 알람 팝업 1개만 유지 (user_id 기준)
         self._active_alarm_popups: dict[str, AlarmPopupWindow] = {}
+        # 알람 수신 즉시 메인 스레드에서 대기 알람 전부 처리 (폴링 없음)
+        self._bridge.alarm_ready.connect(self._drain_alarms)
+        self._alarm_sub = subscribe_alarms(notify=self._bridge.alarm_ready.emit)
 
         if hasattr(self, "manage_menu_button"):
             menu = QMenu(self)
@@ -130,14 +154,26 @@ class MainWindow(QMainWindow):
                 vbox.addWidget(video, 1)
                 vbox.addWidget(btn)
                 self.grid_layout.addWidget(frame, i, j)
-                cell = {"frame": frame, "title": title, "video": video, "btn": btn, "user_id": None}
+                cell = {
+                    "frame": frame,
+                    "title": title,
+                    "video": video,
+                    "btn": btn,
+                    "user_id": None,
+                    "renderer": GridCellRenderer(video),
+                    "title_text": "미지정",
+                    "tier_token": None,
+                }
                 btn.clicked.connect(lambda _=False, c=cell: self._toggle_monitor(c))
                 self._grid_cells.append(cell)
 
     def _toggle_monitor(self, cell: dict):
         if cell["user_id"]:
             cell["user_id"] = None
-            cell["title"].setText("미지정")
+            release_stream_tier(cell["tier_token"])
+            cell["tier_token"] = None
+            cell["renderer"].reset()
+            self._set_cell_title(cell, "미지정")
             cell["btn"].setText("모니터링")
             cell["video"].setText("영상 없음")
             cell["video"].setPixmap(QPixmap())
@@ -159,65 +195,60 @@ class MainWindow(QMainWindow):
             return
         user_id = row.get("user_id")
         cell["user_id"] = user_id
-        cell["title"].setText(user_id)
+        # 격자 셀은 썸네일 단계면 충분
+        cell["tier_token"] = request_stream_tier(user_id, "thumbnail")
+        cell["renderer"].reset()
+        self._set_cell_title(cell, user_id)
         cell["btn"].setText("해제")
 
+    def _set_cell_title(self, cell: dict, text: str):
+        """제목이 바뀐 경우에만 setText (매 타이머마다 레이아웃 재계산 방지)."""
+        if cell.get("title_text") == text:
+            return
+        cell["title_text"] = text
+        cell["title"].setText(text)
+
     def _get_selected_index_no(self):
-        if not hasattr(self, "device_list_widget"):
+        if not hasattr(self, "device_list_view"):
             return None
-        item = self.device_list_widget.currentItem()
-        if item is None:
+        index = self.device_list_view.currentIndex()
+        if not index.isValid():
             return None
-        parts = [p.strip() for p in item.text().split("|")]
-        if len(parts) >= 2:
-            return parts[1]
-        return None
+        index_no = index.data(IndexNoRole)
+        return str(index_no) if index_no is not None else None
 
     def _load_user_list(self):
-        if not hasattr(self, "device_list_widget"):
+        """사용자 변경 알림(UserManageWindow.list_updated) 시: 디렉터리 전체 재조회 후 변경 행만 반영."""
+        try:
+            self._user_directory.reload()
+        except Exception:
             return
-        self.device_list_widget.clear()
+        self._device_model.set_users(self._user_directory.ordered_rows())
+
+    def _sync_user_list(self):
+        """주기 동기화: updated_at 증분 조회, 변경이 있을 때만 모델 갱신."""
         try:
-            rows = self._db.fetch_all(
-                "SELECT index_no, user_id, name, phone FROM users ORDER BY created_at DESC"
-            )
+            changed = self._user_directory.sync()
         except Exception:
             return
-        for row in rows:
-            index_no = row.get("index_no") or ""
-            user_id = row.get("user_id") or ""
-            name = row.get("name") or ""
-            phone = row.get("phone") or ""
-            is_online = get_keepalive_status(user_id)
-            status_text = "ON" if is_online else "OFF"
-            text = f"{status_text} | {index_no} | {user_id} | {name} | {phone}"
-            item = QListWidgetItem(text)
-            if is_online:
-                item.setBackground(QColor("#1b5e20"))
-                item.setForeground(QColor("#e8f5e9"))
-            else:
-                item.setBackground(QColor("#7f1d1d"))
-                item.setForeground(QColor("#fee2e2"))
-            self.device_list_widget.addItem(item)
+        if changed:
+            self._device_model.set_users(self._user_directory.ordered_rows())
 
     def _refresh_grid_frames(self):
+        """새 프레임(시퀀스 변경) 또는 셀 크기 변경이 있는 셀만 다시 그림. 제목에 셀별 렌더링 fps 표시."""
         for cell in self._grid_cells:
             user_id = cell.get("user_id")
             if not user_id:
                 continue
-            frame = get_latest_frame(user_id)
-            if frame is None:
-                continue
-            h, w, ch = frame.shape
-            bytes_per_line = ch * w
-            qimg = QImage(frame.data, w, h, bytes_per_line, QImage.Format.Format_RGB888)
-            pix = QPixmap.fromImage(qimg).scaled(
-                cell["video"].width(),
-                cell["video"].height(),
-                Qt.AspectRatioMode.KeepAspectRatio,
-                Qt.TransformationMode.SmoothTransformation,
-            )
-            cell["video"].setPixmap(pix)
+            renderer = cell["renderer"]
+            if not renderer.is_current(get_frame_seq(user_id)):
+                seq, frame = get_latest_frame_with_seq(user_id)
+                telemetry = get_latest_keypoints(user_id) if frame is None else None
+                if telemetry is not None:
+                    renderer.render_keypoints(seq, telemetry)
+                else:
+                    renderer.render(seq, frame)
+            self._set_cell_title(cell, f"{user_id} ({renderer.fps:.0f} fps)")
 
     def _append_event_to_list(self, data: dict, user_id: str):
         """메인 화면 하단 이벤트 리스트에 항목 추가."""
@@ -231,10 +262,13 @@ class MainWindow(QMainWindow):
         self.event_list_widget.insertItem(0, item)
         self.event_list_widget.scrollToTop()
 
-    def _poll_alarm(self):
-        data = pop_alarm()
-        if not data:
-            return
+    def _drain_alarms(self):
+        """대기 중인 알람을 한 번에 모두 처리."""
+        for data in self._alarm_sub.drain():
+            self._handle_alarm(data)
+            record_alarm_handled(data)
+
+    def _handle_alarm(self, data: dict):
         device_id = data.get("device_id")
         user_id = data.get("user_id")
         if not user_id and device_id:
@@ -266,3 +300,8 @@ class MainWindow(QMainWindow):
         popup.show()
         popup.raise_()
         popup.activateWindow()
+
+    def closeEvent(self, event):
+        self._alarm_sub.close()
+        remove_presence_listener(self._presence_listener)
+        super().closeEvent(event)
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+PresenceWheel: 타이밍 휠 기반 접속 상태(online/offline) 관리.
+
+- touch(user_id): 프레임/keepalive 수신 시 호출. 만료 슬롯만 옮기므로 O(1)
+- tick(): tick_sec마다 호출. 커서가 도달한 슬롯의 사용자만 offline 처리 (전체 스캔 없음)
+- 상태가 바뀔 때만 리스너에 (user_id, online) 이벤트 전달 → 장치 목록 증분 갱신
+"""
+
+import math
+import threading
+from typing import Callable
+
+DEFAULT_TIMEOUT_SEC = 10.0
+DEFAULT_TICK_SEC = 1.0
+
+PresenceListener = Callable[[str, bool], None]
+
+
+class PresenceWheel:
+    """user_id 접속 상태 타이밍 휠 (스레드 안전)."""
+
+    def __init__(self, timeout_sec: float = DEFAULT_TIMEOUT_SEC, tick_sec: float = DEFAULT_TICK_SEC):
+        self.tick_sec = tick_sec
+        # 마지막 touch 후 timeout_sec(=슬롯 n-1개 tick) 지나면 만료
+        self._n = int(math.ceil(timeout_sec / tick_sec)) + 1
+        self._slots: list[set[str]] = [set() for _ in range(self._n)]
+        self._slot_of: dict[str, int] = {}
+        self._cursor = 0
+        self._lock = threading.Lock()
+        self._listeners: list[PresenceListener] = []
+        self._ticker: threading.Thread | None = None
+        self._stop = threading.Event()
+
+    def add_listener(self, listener: PresenceListener):
+        with self._lock:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: PresenceListener):
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def _emit(self, events: list[tuple[str, bool]]):
+        if not events:
+            return
+        with self._lock:
+            listeners = list(self._listeners)
+        for user_id, online in events:
+            for listener in listeners:
+                try:
+                    listener(user_id, online)
+                except Exception as e:
+                    print(f"[Presence] listener 오류: {e}")
+
+    def touch(self, user_id: str):
+        """수신 신호 기록. offline → online 전환 시 이벤트 발생."""
+        with self._lock:
+            slot = (self._cursor + self._n - 1) % self._n
+            old = self._slot_of.get(user_id)
+            if old == slot:
+                return
+            if old is not None:
+                self._slots[old].discard(user_id)
+            self._slots[slot].add(user_id)
+            self._slot_of[user_id] = slot
+            went_online = old is None
+        if went_online:
+            self._emit([(user_id, True)])
+
+    def remove(self, user_id: str):
+        """연결 종료 등으로 즉시 offline 처리."""
+        with self._lock:
+            old = self._slot_of.pop(user_id, None)
+            if old is not None:
+                self._slots[old].discard(user_id)
+        if old is not None:
+            self._emit([(user_id, False)])
+
+    def tick(self):
+        """커서를 한 칸 전진시키고 해당 슬롯 사용자 만료."""
+        with self._lock:
+            self._cursor = (self._cursor + 1) % self._n
+            expired = self._slots[self._cursor]
+            self._slots[self._cursor] = set()
+            for user_id in expired:
+                self._slot_of.pop(user_id, None)
+        self._emit([(user_id, False) for user_id in expired])
+
+    def is_online(self, user_id: str) -> bool:
+        with self._lock:
+            return user_id in self._slot_of
+
+    def online_users(self) -> set[str]:
+        with self._lock:
+            return set(self._slot_of)
+
+    def start(self):
+        """백그라운드 tick 스레드 시작 (중복 호출 무시)."""
+        if self._ticker is not None:
+            return
+        self._stop.clear()
+
+        def _run():
+            while not self._stop.wait(self.tick_sec):
+                self.tick()
+
+        self._ticker = threading.Thread(target=_run, daemon=True)
+        self._ticker.start()
+
+    def stop(self):
+        self._stop.set()
+        self._ticker = None
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+클라이언트 영상 스트림 해상도 단계(simulcast tier) 요청 관리.
+
+서버 화면별로 필요한 단계를 요청(acquire)하고, user_id별로 가장 높은 단계를
+/ws/{user_id} 제어 메시지로 클라이언트에 전달한다. 단계가 바뀌면 리스너로 알려
+클라이언트가 다음 메시지를 보내기 전에도 바로 전달할 수 있게 한다.
+- 격자 셀: thumbnail / 알람 팝업: normal / 녹화: full
+- 요청이 없으면 DEFAULT_TIER (녹화 pre-roll용 최소 품질 유지)
+"""
+
+import itertools
+import threading
+from typing import Callable
+
+# 단계별 상한 (클라이언트 UplinkController가 이 범위 안에서 적응형으로 조정)
+TIERS = {
+    "thumbnail": {"max_width": 320, "max_quality": 60, "max_fps": 10},
+    "normal": {"max_width": 640, "max_quality": 70, "max_fps": 15},
+    "full": {"max_width": 0, "max_quality": 80, "max_fps": 30},  # max_width 0 = 원본 해상도
+}
+TIER_ORDER = ["thumbnail", "normal", "full"]
+DEFAULT_TIER = "thumbnail"
+
+# (user_id, 새 단계) - acquire/release를 호출한 스레드에서 호출
+TierListener = Callable[[str, str], None]
+
+
+def tier_message(tier: str) -> dict:
+    """클라이언트로 보낼 제어 메시지."""
+    return {"type": "tier", "tier": tier, **TIERS[tier]}
+
+
+class TierDemand:
+    """user_id별 단계 요청 (토큰 기반, 스레드 안전)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tokens = itertools.count(1)
+        self._owner: dict[int, str] = {}  # token -> user_id
+        self._by_user: dict[str, dict[int, str]] = {}  # user_id -> {token: tier}
+        self._listeners: list[TierListener] = []
+
+    def add_listener(self, listener: TierListener):
+        with self._lock:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: TierListener):
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def _notify(self, user_id: str, tier: str, listeners: list[TierListener]):
+        for listener in listeners:
+            try:
+                listener(user_id, tier)
+            except Exception as e:
+                print(f"[TierDemand] listener 오류: {e}")
+
+    def _tier_locked(self, user_id: str) -> str:
+        reqs = self._by_user.get(user_id)
+        if not reqs:
+            return DEFAULT_TIER
+        return max(reqs.values(), key=TIER_ORDER.index)
+
+    def acquire(self, user_id: str, tier: str) -> int:
+        if tier not in TIERS:
+            raise ValueError(f"unknown tier: {tier}")
+        with self._lock:
+            before = self._tier_locked(user_id)
+            token = next(self._tokens)
+            self._owner[token] = user_id
+            self._by_user.setdefault(user_id, {})[token] = tier
+            after = self._tier_locked(user_id)
+            listeners = list(self._listeners) if after != before else []
+        self._notify(user_id, after, listeners)
+        return token
+
+    def release(self, token: int | None):
+        if token is None:
+            return
+        with self._lock:
+            user_id = self._owner.pop(token, None)
+            if user_id is None:
+                return
+            before = self._tier_locked(user_id)
+            reqs = self._by_user.get(user_id)
+            if reqs is not None:
+                reqs.pop(token, None)
+                if not reqs:
+                    del self._by_user[user_id]
+            after = self._tier_locked(user_id)
+            listeners = list(self._listeners) if after != before else []
+        self._notify(user_id, after, listeners)
+
+    def tier_for(self, user_id: str) -> str:
+        with self._lock:
+            return self._tier_locked(user_id)
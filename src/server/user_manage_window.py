@@ -239,6 +239,7 @@ class UserManageWindow(QDialog):
             return
         self._load_users()
         self._clear_form()
+        self.list_updated.emit()
 
     def _update_user(self):
         index_no = self.ed_index_no.text().strip()
@@ -273,6 +274,7 @@ class UserManageWindow(QDialog):
             QMessageBox.critical(self, "DB 오류", f"사용자 수정에 실패했습니다.\n{exc}")
             return
         self._load_users()
+        self.list_updated.emit()
 
     def _delete_user(self):
         index_no = self.ed_index_no.text().strip()